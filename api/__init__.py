@@ -1,5 +1,6 @@
 """Initialize a aplicação Flask e configure extensões necessárias."""
 
+import os
 from contextlib import suppress
 
 from flask import Flask
@@ -7,12 +8,32 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import MetaData
 
+from api.sessao import SessaoRoteada
 from config import config
 
-# Inicializa extensões Flask sem vincular a uma aplicação específica
-db = SQLAlchemy()
-migrate = Migrate()
+# Nomes previsíveis para restrições: erros de integridade são traduzidos em
+# respostas da API pelo nome da restrição (ver api.services.restricoes)
+CONVENCAO_NOMES = {
+    "ix": "ix_%(column_0_label)s",
+    "uq": "uq_%(table_name)s_%(column_0_name)s",
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+    "pk": "pk_%(table_name)s",
+}
+
+# Inicializa extensões Flask sem vincular a uma aplicação específica.
+# Objetos gravados permanecem carregados após o commit: a resposta da escrita
+# usa os valores já conhecidos sem um novo SELECT de cada registro
+db = SQLAlchemy(
+    metadata=MetaData(naming_convention=CONVENCAO_NOMES),
+    session_options={"class_": SessaoRoteada, "expire_on_commit": False},
+)
+# Migrações do esquema (Alembic) na raiz do projeto, independente do diretório
+# de trabalho de quem executa ``flask db``
+migrate = Migrate(
+    directory=os.path.join(os.path.dirname(os.path.dirname(__file__)), "migrations")
+)
 jwt = JWTManager()
 app = Flask(__name__)
 cors = CORS()
@@ -33,19 +54,38 @@ def create_app(config_name="default"):
     global app
     app.config.from_object(config[config_name])
 
+    # Inclui o bind somente leitura (réplica) antes de criar os engines
+    from api.services.banco import configurar_bind_leitura, configurar_banco
+
+    configurar_bind_leitura(app)
+
     # Inicializa extensões com a aplicação
     db.init_app(app)
     migrate.init_app(app, db)
     cors.init_app(app)
     jwt.init_app(app)
+
+    # Aplica o perfil do banco (PRAGMAs do SQLite) antes da primeira conexão
+    # e roteia leituras para o bind somente leitura
+    from api.sessao import BIND_LEITURA, roteador_leitura
+
+    with app.app_context():
+        configurar_banco(app, db)
+        roteador_leitura.init_app(app, db.engines.get(BIND_LEITURA))
+
     init_database(app=app)
     # Registra blueprints das rotas da aplicação
+    from api.routes.admin import admin_bp
     from api.routes.advogados import advogados_bp
+    from api.routes.anexos import anexos_bp
+    from api.routes.autocompletar import autocompletar_bp
     from api.routes.auth import auth_bp
     from api.routes.clientes import clientes_bp
     from api.routes.dashboard import dashboard_bp
     from api.routes.main import main_bp
+    from api.routes.prazos import prazos_bp
     from api.routes.processos import processos_bp
+    from api.routes.sincronizacao import sincronizacao_bp
 
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
@@ -53,6 +93,21 @@ def create_app(config_name="default"):
     app.register_blueprint(clientes_bp, url_prefix="/api/clientes")
     app.register_blueprint(advogados_bp, url_prefix="/api/advogados")
     app.register_blueprint(dashboard_bp, url_prefix="/api/dashboard")
+    app.register_blueprint(sincronizacao_bp, url_prefix="/api/sync")
+    app.register_blueprint(anexos_bp, url_prefix="/api/anexos")
+    app.register_blueprint(admin_bp, url_prefix="/api/admin")
+    app.register_blueprint(prazos_bp, url_prefix="/api/prazos")
+    app.register_blueprint(autocompletar_bp, url_prefix="/api/autocomplete")
+
+    # Aplica compressão de respostas sobre a aplicação WSGI
+    from api.middleware import CompressaoMiddleware
+
+    app.wsgi_app = CompressaoMiddleware(
+        app.wsgi_app,
+        tamanho_minimo=app.config["COMPRESSION_MIN_SIZE"],
+        nivel=app.config["COMPRESSION_LEVEL"],
+        cache_max_bytes=app.config["COMPRESSION_CACHE_MAX_BYTES"],
+    )
 
     # Registra manipuladores de erro personalizados
 
@@ -66,7 +121,40 @@ def init_database(app: Flask) -> None:
     with app.app_context():
         from api.models.usuario import Usuario
 
-        db.create_all()
+        # Registra assinantes de alterações (log de sincronização, stream,
+        # invalidação do cache de detalhes, cópias do processo nos prazos,
+        # última movimentação e histórico de alterações dos processos e
+        # índices de autocompletar)
+        import api.services.historico  # noqa: F401
+        import api.services.movimentacao  # noqa: F401
+        import api.services.prazos  # noqa: F401
+        import api.services.sincronizacao  # noqa: F401
+        from api.services.admissao import controle_admissao
+        from api.services.agrupamento import agrupador_requisicoes
+        from api.services.autocompletar import indice_autocompletar
+        from api.services.cache import cache_registros
+        from api.services.escrita import coordenador_escrita
+        from api.services.idempotencia import controle_idempotencia
+        from api.services.memoria import diagnostico_memoria
+        from api.services.notificacoes import canal_eventos
+        from api.services.perfilamento import perfilador
+
+        canal_eventos.init_app(app)
+        coordenador_escrita.init_app(app)
+        cache_registros.init_app(app)
+        indice_autocompletar.init_app(app)
+        perfilador.init_app(app)
+        diagnostico_memoria.init_app(app)
+        # O agrupamento antecede a vaga por endpoint do controle de admissão
+        agrupador_requisicoes.init_app(app)
+        controle_idempotencia.init_app(app)
+        controle_admissao.init_app(app)
+
+        # Bancos vazios são criados na revisão mais recente das migrações; os
+        # existentes são atualizados por flask init-db (ou flask db upgrade)
+        from api.services.esquema import preparar_esquema
+
+        preparar_esquema(app)
 
         with suppress(Exception):
             usuario = Usuario(
@@ -0,0 +1,5 @@
+"""Defina middlewares WSGI aplicados sobre a aplicação Flask."""
+
+from api.middleware.compressao import CompressaoMiddleware
+
+__all__ = ["CompressaoMiddleware"]
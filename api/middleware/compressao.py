@@ -0,0 +1,328 @@
+"""Implemente middleware WSGI de compressão de respostas HTTP."""
+
+import hashlib
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependência opcional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependência opcional
+    zstandard = None
+
+
+# Tipos de conteúdo que se beneficiam de compressão
+TIPOS_COMPRESSIVEIS = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+# Tipos que não devem ser comprimidos mesmo sendo texto (streams de eventos)
+TIPOS_IGNORADOS = ("text/event-stream",)
+
+# Cabeçalhos condicionais com ETags das representações comprimidas
+CABECALHOS_CONDICIONAIS = ("HTTP_IF_MATCH", "HTTP_IF_NONE_MATCH")
+
+
+class _CompressorGzip:
+    """Encapsule compressão gzip incremental via zlib."""
+
+    def __init__(self, nivel):
+        self._obj = zlib.compressobj(nivel, zlib.DEFLATED, 31)
+
+    def comprimir(self, dados):
+        return self._obj.compress(dados)
+
+    def descarregar(self):
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finalizar(self):
+        return self._obj.flush()
+
+
+class _CompressorBrotli:
+    """Encapsule compressão brotli incremental."""
+
+    def __init__(self, nivel):
+        self._obj = brotli.Compressor(quality=min(nivel, 11))
+
+    def comprimir(self, dados):
+        return self._obj.process(dados)
+
+    def descarregar(self):
+        return self._obj.flush()
+
+    def finalizar(self):
+        return self._obj.finish()
+
+
+class _CompressorZstd:
+    """Encapsule compressão zstd incremental."""
+
+    def __init__(self, nivel):
+        self._obj = zstandard.ZstdCompressor(level=nivel).compressobj()
+
+    def comprimir(self, dados):
+        return self._obj.compress(dados)
+
+    def descarregar(self):
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finalizar(self):
+        return self._obj.flush()
+
+
+def algoritmos_disponiveis():
+    """Retorne os algoritmos instalados, em ordem de preferência do servidor."""
+    algoritmos = OrderedDict()
+    if zstandard is not None:
+        algoritmos["zstd"] = _CompressorZstd
+    if brotli is not None:
+        algoritmos["br"] = _CompressorBrotli
+    algoritmos["gzip"] = _CompressorGzip
+    return algoritmos
+
+
+class CacheComprimido:
+    """Mantenha respostas já comprimidas em LRU limitado por bytes.
+
+    As entradas são endereçadas pelo digest do corpo original, de modo que
+    payloads idênticos (como os do dashboard) são comprimidos uma única vez.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._itens = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def obter(self, chave):
+        """Retorne os bytes comprimidos da chave ou None se ausentes."""
+        with self._lock:
+            dados = self._itens.get(chave)
+            if dados is not None:
+                self._itens.move_to_end(chave)
+            return dados
+
+    def guardar(self, chave, dados):
+        """Armazene bytes comprimidos, descartando os menos usados."""
+        if len(dados) > self.max_bytes:
+            return
+
+        with self._lock:
+            anterior = self._itens.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= len(anterior)
+
+            self._itens[chave] = dados
+            self._bytes += len(dados)
+
+            while self._bytes > self.max_bytes:
+                _, removido = self._itens.popitem(last=False)
+                self._bytes -= len(removido)
+
+
+class CompressaoMiddleware:
+    """Comprima respostas acima de um tamanho mínimo conforme Accept-Encoding.
+
+    Respostas com corpo conhecido são comprimidas de uma vez (com cache
+    opcional); respostas em streaming são comprimidas bloco a bloco.
+
+    Cada codificação é uma representação distinta com ETag forte própria
+    (``"3"`` passa a ``"3-gzip"``). Nas requisições, o sufixo é removido de
+    ``If-Match``/``If-None-Match``, de modo que a aplicação compara sempre as
+    ETags que ela mesma gerou, sem depender da codificação negociada.
+    """
+
+    def __init__(self, wsgi_app, tamanho_minimo=1024, nivel=6, cache_max_bytes=0):
+        self.wsgi_app = wsgi_app
+        self.tamanho_minimo = tamanho_minimo
+        self.nivel = nivel
+        self.algoritmos = algoritmos_disponiveis()
+        self.cache = CacheComprimido(cache_max_bytes) if cache_max_bytes else None
+        self._sufixos = re.compile(
+            f'-(?:{"|".join(map(re.escape, self.algoritmos))})"'
+        )
+
+    def __call__(self, environ, start_response):
+        for nome in CABECALHOS_CONDICIONAIS:
+            if nome in environ:
+                environ[nome] = self._sufixos.sub('"', environ[nome])
+
+        capturado = {}
+        buffer_write = []
+
+        def capturar(status, headers, exc_info=None):
+            if exc_info and capturado.get("enviado"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            capturado["status"] = status
+            capturado["headers"] = headers
+            return buffer_write.append
+
+        corpo = self.wsgi_app(environ, capturar)
+        iterador = iter(corpo)
+
+        # Garante que a aplicação já informou status e cabeçalhos
+        primeiros = list(buffer_write)
+        if "status" not in capturado:
+            primeiros.extend(_proximo(iterador))
+
+        status, headers = capturado["status"], capturado["headers"]
+        codificacao = self._negociar(environ, status, headers)
+
+        if codificacao is None:
+            capturado["enviado"] = True
+            start_response(status, headers)
+
+            # Preserva o iterável original (ex.: wsgi.file_wrapper) se intacto
+            if not primeiros:
+                return corpo
+            return _encadear(primeiros, iterador, corpo)
+
+        tamanho = _cabecalho(headers, "Content-Length")
+        if tamanho is not None:
+            dados = b"".join(primeiros) + b"".join(iterador)
+            _fechar(corpo)
+
+            comprimido = self._comprimir(codificacao, dados)
+            start_response(
+                status,
+                _cabecalhos_comprimidos(headers, codificacao, len(comprimido)),
+            )
+            return [comprimido]
+
+        start_response(status, _cabecalhos_comprimidos(headers, codificacao))
+        return self._comprimir_fluxo(codificacao, primeiros, iterador, corpo)
+
+    def _negociar(self, environ, status, headers):
+        """Escolha a codificação a usar ou None se a resposta não deve mudar."""
+        if environ.get("REQUEST_METHOD") == "HEAD":
+            return None
+
+        codigo = int(status.split(" ", 1)[0])
+        if codigo < 200 or codigo in (204, 206, 304):
+            return None
+
+        if _cabecalho(headers, "Content-Encoding") or _cabecalho(
+            headers, "Content-Range"
+        ):
+            return None
+
+        if "no-transform" in (_cabecalho(headers, "Cache-Control") or ""):
+            return None
+
+        tipo = (_cabecalho(headers, "Content-Type") or "").lower()
+        if tipo.startswith(TIPOS_IGNORADOS) or not tipo.startswith(
+            TIPOS_COMPRESSIVEIS
+        ):
+            return None
+
+        tamanho = _cabecalho(headers, "Content-Length")
+        if tamanho is not None and int(tamanho) < self.tamanho_minimo:
+            return None
+
+        aceitas = parse_accept_header(environ.get("HTTP_ACCEPT_ENCODING", ""))
+        return aceitas.best_match(list(self.algoritmos))
+
+    def _comprimir(self, codificacao, dados):
+        """Comprima um corpo completo, reaproveitando o cache quando possível."""
+        chave = None
+        if self.cache is not None:
+            chave = (codificacao, hashlib.blake2b(dados, digest_size=16).digest())
+            comprimido = self.cache.obter(chave)
+            if comprimido is not None:
+                return comprimido
+
+        compressor = self.algoritmos[codificacao](self.nivel)
+        comprimido = compressor.comprimir(dados) + compressor.finalizar()
+
+        if chave is not None:
+            self.cache.guardar(chave, comprimido)
+
+        return comprimido
+
+    def _comprimir_fluxo(self, codificacao, primeiros, iterador, corpo):
+        """Comprima uma resposta em streaming, descarregando a cada bloco."""
+        compressor = self.algoritmos[codificacao](self.nivel)
+        try:
+            for bloco in _encadear(primeiros, iterador):
+                if bloco:
+                    yield compressor.comprimir(bloco) + compressor.descarregar()
+            yield compressor.finalizar()
+        finally:
+            _fechar(corpo)
+
+
+def _proximo(iterador):
+    """Retorne o próximo bloco do iterador como lista (vazia se esgotado)."""
+    for bloco in iterador:
+        return [bloco]
+    return []
+
+
+def _encadear(primeiros, iterador, corpo=None):
+    """Produza os blocos já lidos seguidos do restante do iterador."""
+    try:
+        yield from primeiros
+        yield from iterador
+    finally:
+        if corpo is not None:
+            _fechar(corpo)
+
+
+def _fechar(corpo):
+    """Chame close() no iterável da resposta, conforme exige a PEP 3333."""
+    if hasattr(corpo, "close"):
+        corpo.close()
+
+
+def _cabecalho(headers, nome):
+    """Retorne o valor de um cabeçalho da lista WSGI (sem diferenciar caixa)."""
+    nome = nome.lower()
+    for chave, valor in headers:
+        if chave.lower() == nome:
+            return valor
+    return None
+
+
+def _adicionar_vary(headers):
+    """Retorne cabeçalhos com Accept-Encoding incluído em Vary."""
+    vary = _cabecalho(headers, "Vary")
+    headers = [(k, v) for k, v in headers if k.lower() != "vary"]
+    if vary and "accept-encoding" not in vary.lower():
+        vary = f"{vary}, Accept-Encoding"
+    headers.append(("Vary", vary or "Accept-Encoding"))
+    return headers
+
+
+def _cabecalhos_comprimidos(headers, codificacao, tamanho=None):
+    """Ajuste cabeçalhos para uma resposta comprimida.
+
+    ETags fortes recebem o sufixo da codificação, pois os bytes enviados mudam
+    com a codificação negociada; ETags fracas permanecem iguais.
+    """
+    ajustados = []
+    for chave, valor in _adicionar_vary(headers):
+        nome = chave.lower()
+        if nome == "content-length":
+            continue
+        if nome == "etag" and not valor.startswith("W/"):
+            valor = f'{valor[:-1]}-{codificacao}"'
+        ajustados.append((chave, valor))
+
+    ajustados.append(("Content-Encoding", codificacao))
+    if tamanho is not None:
+        ajustados.append(("Content-Length", str(tamanho)))
+
+    return ajustados
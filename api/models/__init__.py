@@ -2,6 +2,29 @@
 
 from datetime import datetime
 
-from api.models import advogado, cliente, processo, usuario
+from api.models import (
+    advogado,
+    alteracao,
+    anexo,
+    arquivo,
+    cliente,
+    historico,
+    idempotencia,
+    prazo,
+    processo,
+    usuario,
+)
 
-__all__ = ["datetime", "cliente", "advogado", "processo", "usuario"]
+__all__ = [
+    "datetime",
+    "cliente",
+    "advogado",
+    "alteracao",
+    "anexo",
+    "arquivo",
+    "historico",
+    "idempotencia",
+    "prazo",
+    "processo",
+    "usuario",
+]
@@ -17,20 +17,25 @@ class BaseModel(db.Model):
 
     def save(self):
         """Salve o objeto atual no banco de dados."""
-        db.session.add(self)
-        db.session.commit()
+        from api.services.escrita import coordenador_escrita
+
+        coordenador_escrita.salvar(self)
 
     def delete(self):
         """Remova o objeto atual do banco de dados."""
-        db.session.delete(self)
-        db.session.commit()
+        from api.services.escrita import coordenador_escrita
+
+        with coordenador_escrita.transacao() as session:
+            session.delete(self)
 
     def update(self, **kwargs):
         """Atualize campos do objeto com os valores fornecidos."""
-        for key, value in kwargs.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
-        db.session.commit()
+        from api.services.escrita import coordenador_escrita
+
+        with coordenador_escrita.transacao():
+            for key, value in kwargs.items():
+                if hasattr(self, key):
+                    setattr(self, key, value)
 
     def to_dict(self):
         """Converta o objeto para dicionário Python."""
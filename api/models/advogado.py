@@ -1,5 +1,7 @@
 """Defina o modelo Advogado para gerenciamento da equipe jurídica."""
 
+from sqlalchemy.orm import validates
+
 from api import db
 from api.models._base import BaseModel
 
@@ -12,6 +14,8 @@ class Advogado(BaseModel):
     # Informações pessoais e profissionais
     nome = db.Column(db.String(200), nullable=False, index=True)
     cpf = db.Column(db.String(14), unique=True, nullable=False)
+    # Somente os dígitos do CPF: unicidade e busca por documento
+    cpf_digitos = db.Column(db.String(11), unique=True, index=True)
     oab_numero = db.Column(db.String(20), unique=True, nullable=False, index=True)
     oab_estado = db.Column(db.String(2), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -40,9 +44,21 @@ class Advogado(BaseModel):
     biografia = db.Column(db.Text, nullable=True)
     observacoes = db.Column(db.Text, nullable=True)
 
+    # Versão do registro para controle de concorrência otimista
+    versao = db.Column(db.Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": versao}
+
     # Relacionamento com processos (um advogado pode ter vários processos)
     processos = db.relationship("Processo", backref="advogado_responsavel", lazy=True)
 
+    @validates("cpf")
+    def _normalizar_cpf(self, chave, valor):
+        """Mantenha os dígitos do CPF junto ao valor digitado."""
+        from api.services.documentos import normalizar_cpf
+
+        self.cpf_digitos = normalizar_cpf(valor)
+        return valor
+
     @property
     def oab_completa(self):
         """Retorne o número da OAB formatado com estado."""
@@ -82,11 +98,14 @@ class Advogado(BaseModel):
 
     def set_especialidades_list(self, especialidades_list):
         """Defina especialidades do advogado a partir de uma lista."""
+        self.especialidades = self.serializar_especialidades(especialidades_list)
+
+    @staticmethod
+    def serializar_especialidades(especialidades_list):
+        """Converta lista de especialidades no JSON armazenado na coluna."""
         import json
 
-        self.especialidades = (
-            json.dumps(especialidades_list) if especialidades_list else None
-        )
+        return json.dumps(especialidades_list) if especialidades_list else None
 
     def __repr__(self):
         """Retorne representação string do objeto Advogado."""
@@ -0,0 +1,31 @@
+"""Defina o modelo Alteracao que registra o log de mudanças para sincronização."""
+
+from api import db
+from api.models._base import BaseModel
+
+
+class Alteracao(BaseModel):
+    """Represente uma alteração de registro no log de sincronização incremental.
+
+    O ``id`` autoincremental funciona como token monotônico: clientes offline
+    solicitam apenas as alterações com ``id`` maior que o último token recebido.
+    A monotonicidade depende do escritor único do SQLite (ver
+    ``api.services.sincronizacao``).
+    """
+
+    __tablename__ = "alteracoes"
+    __table_args__ = (
+        # Localiza entradas de um mesmo registro (compactação do log)
+        db.Index("ix_alteracoes_tabela_registro", "tabela", "registro_id"),
+    )
+
+    # Registro alterado
+    tabela = db.Column(db.String(50), nullable=False)
+    registro_id = db.Column(db.Integer, nullable=False)
+
+    # Tipo de alteração: upsert (criação/atualização) ou delete (tombstone)
+    operacao = db.Column(db.String(10), nullable=False)
+
+    def __repr__(self):
+        """Retorne representação string do objeto Alteracao."""
+        return f"<Alteracao {self.id} {self.operacao} {self.tabela}#{self.registro_id}>"
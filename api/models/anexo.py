@@ -0,0 +1,25 @@
+"""Defina o modelo Anexo para documentos armazenados por conteúdo."""
+
+from api import db
+from api.models._base import BaseModel
+
+
+class Anexo(BaseModel):
+    """Represente um arquivo armazenado em disco, identificado pelo seu SHA-256.
+
+    O mesmo conteúdo enviado várias vezes (inclusive para andamentos
+    diferentes) é gravado uma única vez e compartilhado entre as referências.
+    """
+
+    __tablename__ = "anexos"
+
+    # Hash SHA-256 (hexadecimal) do conteúdo: endereço do arquivo em disco
+    sha256 = db.Column(db.String(64), unique=True, nullable=False, index=True)
+
+    # Metadados do conteúdo
+    tamanho = db.Column(db.BigInteger, nullable=False)
+    tipo_conteudo = db.Column(db.String(100), nullable=False)
+
+    def __repr__(self):
+        """Retorne representação string do objeto Anexo."""
+        return f"<Anexo {self.sha256[:12]} ({self.tamanho} bytes)>"
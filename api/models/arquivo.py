@@ -0,0 +1,40 @@
+"""Defina as tabelas de arquivo de processos encerrados e seus andamentos."""
+
+from api import db
+from api.models.processo import Andamento, Processo
+
+
+def _tabela_arquivo(tabela, nome, *indices):
+    """Crie tabela de arquivo com as mesmas colunas da tabela de origem.
+
+    Índices, unicidade e chaves estrangeiras não são copiados: a tabela de
+    arquivo é consultada apenas por chave primária e pelos índices informados.
+    """
+    colunas = [
+        db.Column(coluna.name, coluna.type, primary_key=coluna.primary_key)
+        for coluna in tabela.columns
+    ]
+    return db.Table(
+        nome,
+        *colunas,
+        db.Column("arquivado_em", db.DateTime, nullable=False),
+        *indices,
+    )
+
+
+# Processos finalizados/arquivados movidos para fora da tabela principal
+processos_arquivo = _tabela_arquivo(
+    Processo.__table__,
+    "processos_arquivo",
+    db.Index("ix_processos_arquivo_numero", "numero_processo"),
+    # Processos arquivados impedem a exclusão do cliente e do advogado
+    db.Index("ix_processos_arquivo_cliente", "cliente_id"),
+    db.Index("ix_processos_arquivo_advogado", "advogado_id"),
+)
+
+# Andamentos dos processos arquivados
+andamentos_arquivo = _tabela_arquivo(
+    Andamento.__table__,
+    "andamentos_arquivo",
+    db.Index("ix_andamentos_arquivo_processo_data", "processo_id", "data_andamento"),
+)
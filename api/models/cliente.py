@@ -1,5 +1,7 @@
 """Defina o modelo Cliente para gerenciamento de clientes jurídicos."""
 
+from sqlalchemy.orm import validates
+
 from api import db
 from api.models._base import BaseModel
 
@@ -12,6 +14,10 @@ class Cliente(BaseModel):
     # Informações pessoais básicas
     nome = db.Column(db.String(200), nullable=False, index=True)
     cpf_cnpj = db.Column(db.String(20), unique=True, nullable=False, index=True)
+
+    # Somente os dígitos do CPF/CNPJ: unicidade e busca por documento
+    # (nulo quando o documento não tem 11 nem 14 dígitos)
+    cpf_cnpj_digitos = db.Column(db.String(14), unique=True, index=True)
     email = db.Column(db.String(120), nullable=True)
     telefone = db.Column(db.String(20), nullable=True)
 
@@ -33,9 +39,21 @@ class Cliente(BaseModel):
     observacoes = db.Column(db.Text, nullable=True)
     ativo = db.Column(db.Boolean, default=True, nullable=False)
 
+    # Versão do registro para controle de concorrência otimista
+    versao = db.Column(db.Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": versao}
+
     # Relacionamento com processos
     processos = db.relationship("Processo", backref="cliente", lazy=True)
 
+    @validates("cpf_cnpj")
+    def _normalizar_cpf_cnpj(self, chave, valor):
+        """Mantenha os dígitos do CPF/CNPJ junto ao valor digitado."""
+        from api.services.documentos import normalizar_documento
+
+        self.cpf_cnpj_digitos = normalizar_documento(valor)
+        return valor
+
     @property
     def endereco_completo(self):
         """Retorne o endereço completo formatado do cliente."""
@@ -0,0 +1,34 @@
+"""Defina o modelo HistoricoProcesso com as alterações de cada processo."""
+
+from api import db
+from api.models._base import BaseModel
+
+
+class HistoricoProcesso(BaseModel):
+    """Represente uma alteração de processo no histórico (somente inclusão).
+
+    ``alteracoes`` guarda em JSON apenas os campos alterados, no formato
+    ``{"campo": [anterior, novo]}``. As entradas são mantidas mesmo após a
+    exclusão do processo.
+    """
+
+    __tablename__ = "historico_processos"
+    __table_args__ = (
+        # Histórico de um processo em ordem cronológica (paginação por chave)
+        db.Index("ix_historico_processos_processo_data", "processo_id", "alterado_em"),
+    )
+
+    # Processo alterado (sem chave estrangeira: o histórico sobrevive à exclusão)
+    processo_id = db.Column(db.Integer, nullable=False)
+
+    # Momento, autor e tipo da alteração (insert, update ou delete)
+    alterado_em = db.Column(db.DateTime, nullable=False)
+    usuario_id = db.Column(db.Integer)
+    operacao = db.Column(db.String(10), nullable=False)
+
+    # Diferenças por campo em JSON compacto
+    alteracoes = db.Column(db.Text, nullable=False)
+
+    def __repr__(self):
+        """Retorne representação string do objeto HistoricoProcesso."""
+        return f"<HistoricoProcesso {self.id} {self.operacao} #{self.processo_id}>"
@@ -0,0 +1,40 @@
+"""Defina o modelo ChaveIdempotencia com as respostas de requisições repetíveis."""
+
+from api import db
+from api.models._base import BaseModel
+
+
+class ChaveIdempotencia(BaseModel):
+    """Represente uma chave ``Idempotency-Key`` e a resposta produzida por ela.
+
+    A linha é reservada (``status`` nulo) antes de executar a view; a resposta
+    é gravada ao final e reproduzida para repetições da mesma chave até
+    ``expira_em``.
+    """
+
+    __tablename__ = "chaves_idempotencia"
+    __table_args__ = (
+        # Uma chave por autor: a reserva concorrente falha na restrição
+        db.UniqueConstraint("escopo", "chave", name="uq_chaves_idempotencia_escopo"),
+        # Limpeza das chaves expiradas
+        db.Index("ix_chaves_idempotencia_expira_em", "expira_em"),
+    )
+
+    # Autor da requisição (usuário do token ou IP) e chave enviada pelo cliente
+    escopo = db.Column(db.String(100), nullable=False)
+    chave = db.Column(db.String(255), nullable=False)
+
+    # Endpoint e SHA-256 de método, caminho e corpo da requisição original
+    endpoint = db.Column(db.String(100), nullable=False)
+    impressao = db.Column(db.String(64), nullable=False)
+
+    # Resposta gravada (status nulo enquanto a requisição está em andamento)
+    status = db.Column(db.Integer)
+    tipo_conteudo = db.Column(db.String(100))
+    corpo = db.Column(db.LargeBinary)
+
+    expira_em = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        """Retorne representação string do objeto ChaveIdempotencia."""
+        return f"<ChaveIdempotencia {self.escopo} {self.chave} {self.status}>"
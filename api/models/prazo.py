@@ -0,0 +1,72 @@
+"""Defina os modelos Prazo e Feriado para controle de prazos processuais."""
+
+from api import db
+from api.models._base import BaseModel
+
+
+class Prazo(BaseModel):
+    """Represente um prazo processual com vencimento calculado pelo calendário.
+
+    ``processo_id`` e ``andamento_id`` não possuem chave estrangeira: processos
+    encerrados podem ser movidos para as tabelas de arquivo mantendo o
+    histórico de prazos. ``advogado_id`` e ``tribunal`` são cópias dos dados do
+    processo, mantidas pelas escritas no processo, para que as consultas por
+    advogado e vencimento percorram um único índice.
+    """
+
+    __tablename__ = "prazos"
+    __table_args__ = (
+        # Prazos abertos por data de vencimento (com e sem filtro de advogado)
+        db.Index("ix_prazos_status_vencimento", "status", "data_vencimento"),
+        db.Index(
+            "ix_prazos_advogado_status_vencimento",
+            "advogado_id",
+            "status",
+            "data_vencimento",
+        ),
+    )
+
+    # Origem do prazo
+    processo_id = db.Column(db.Integer, nullable=False, index=True)
+    andamento_id = db.Column(db.Integer, index=True)
+    descricao = db.Column(db.String(200), nullable=False)
+
+    # Contagem: quantidade de dias, tipo (uteis ou corridos) e início
+    # (intimação/publicação, excluída da contagem)
+    dias = db.Column(db.Integer, nullable=False)
+    contagem = db.Column(db.String(10), nullable=False, default="uteis")
+    data_inicio = db.Column(db.Date, nullable=False)
+    data_vencimento = db.Column(db.Date, nullable=False)
+
+    # Situação: aberto, cumprido ou cancelado
+    status = db.Column(db.String(20), nullable=False, default="aberto")
+    cumprido_em = db.Column(db.DateTime)
+
+    # Dados copiados do processo
+    advogado_id = db.Column(db.Integer)
+    tribunal = db.Column(db.String(200))
+
+    def __repr__(self):
+        """Retorne representação string do objeto Prazo."""
+        return f"<Prazo {self.descricao[:30]} - {self.data_vencimento}>"
+
+
+class Feriado(BaseModel):
+    """Represente um dia (ou período) sem expediente forense.
+
+    Sem ``tribunal`` o feriado é nacional. ``suspensao`` indica períodos em
+    que a contagem de prazos fica suspensa também para prazos em dias
+    corridos (ex.: recesso de 20/12 a 20/01).
+    """
+
+    __tablename__ = "feriados"
+
+    data_inicio = db.Column(db.Date, nullable=False, index=True)
+    data_fim = db.Column(db.Date, nullable=False)
+    descricao = db.Column(db.String(200), nullable=False)
+    tribunal = db.Column(db.String(200), index=True)
+    suspensao = db.Column(db.Boolean, nullable=False, default=False)
+
+    def __repr__(self):
+        """Retorne representação string do objeto Feriado."""
+        return f"<Feriado {self.data_inicio} {self.descricao}>"
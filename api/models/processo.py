@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import Numeric
+from sqlalchemy import Numeric, func
 
 from api import db
 from api.models._base import BaseModel
@@ -12,6 +12,14 @@ class Processo(BaseModel):
     """Represente um processo jurídico com todas suas informações relevantes."""
 
     __tablename__ = "processos"
+    __table_args__ = (
+        # Índice de cobertura para listagens resumidas (id, número e status)
+        db.Index("ix_processos_status_numero", "status", "numero_processo"),
+        # Processos parados: faixa de última movimentação dentro de cada status
+        db.Index(
+            "ix_processos_status_movimentacao", "status", "ultima_movimentacao_em"
+        ),
+    )
 
     # Identificação do processo
     numero_processo = db.Column(db.String(50), unique=True, index=True)
@@ -28,6 +36,10 @@ class Processo(BaseModel):
     data_distribuicao = db.Column(db.Date)
     data_conclusao = db.Column(db.Date)
 
+    # Data do último andamento (ou da criação), mantida pelas escritas de
+    # andamentos em api.services.movimentacao
+    ultima_movimentacao_em = db.Column(db.DateTime, default=func.now())
+
     # Informações do tribunal
     tribunal = db.Column(db.String(200))
     vara = db.Column(db.String(100))
@@ -45,6 +57,10 @@ class Processo(BaseModel):
     observacoes = db.Column(db.Text)
     observacoes_internas = db.Column(db.Text)
 
+    # Versão do registro para controle de concorrência otimista
+    versao = db.Column(db.Integer, nullable=False, default=1)
+    __mapper_args__ = {"version_id_col": versao}
+
     # Relacionamentos com outras entidades
     cliente_id = db.Column(db.Integer, db.ForeignKey("clientes.id"))
     advogado_id = db.Column(db.Integer, db.ForeignKey("advogados.id"))
@@ -90,13 +106,21 @@ class Processo(BaseModel):
         return prioridade_map.get(self.prioridade, self.prioridade.title())
 
     def get_ultimo_andamento(self):
-        """Retorne o andamento mais recente do processo."""
-        from api.models.processo import (
-            Andamento,  # Import local para evitar circular import
+        """Retorne o andamento mais recente do processo.
+
+        A consulta percorre o índice ``(processo_id, data_andamento DESC)`` e lê
+        apenas uma linha, sem carregar a lista completa de andamentos.
+        """
+        return self.get_andamentos_recentes(1).first()
+
+    def get_andamentos_recentes(self, limite):
+        """Retorne query dos andamentos mais recentes, limitada a ``limite``."""
+        return (
+            Andamento.query.filter(Andamento.processo_id == self.id)
+            .order_by(Andamento.data_andamento.desc())
+            .limit(limite)
         )
 
-        return self.andamentos.order_by(Andamento.data_andamento.desc()).first()
-
     def __repr__(self):
         """Retorne representação string do objeto Processo."""
         return f"<Processo {self.numero_processo} - {self.titulo[:50]}>"
@@ -116,6 +140,11 @@ class Andamento(BaseModel):
     observacoes = db.Column(db.Text)
     documento_anexo = db.Column(db.String(500))  # caminho para arquivo anexo
 
+    # Documento enviado pela API (armazenado por conteúdo) e nome original
+    anexo_id = db.Column(db.Integer, db.ForeignKey("anexos.id"), index=True)
+    anexo_nome = db.Column(db.String(255))
+    anexo = db.relationship("Anexo")
+
     # Relacionamento com processo
     processo_id = db.Column(db.Integer, db.ForeignKey("processos.id"))
 
@@ -126,3 +155,11 @@ class Andamento(BaseModel):
     def __repr__(self):
         """Retorne representação string do objeto Andamento."""
         return f"<Andamento {self.tipo_andamento} - {self.data_andamento.strftime('%d/%m/%Y')}>"
+
+
+# Índice composto para consultar andamentos de um processo já ordenados por data
+db.Index(
+    "ix_andamentos_processo_data",
+    Andamento.processo_id,
+    Andamento.data_andamento.desc(),
+)
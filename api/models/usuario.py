@@ -44,8 +44,9 @@ class Usuario(BaseModel):
         """
         # Inclui informações básicas do usuário no token
         additional_claims = {"tipo_usuario": self.tipo_usuario, "nome": self.nome}
+        # O subject (sub) do JWT deve ser texto
         return create_access_token(
-            identity=self.id, additional_claims=additional_claims
+            identity=str(self.id), additional_claims=additional_claims
         )
 
     def __repr__(self):
@@ -1,7 +1,10 @@
 from flask import Response, jsonify
+from sqlalchemy.exc import IntegrityError
 from werkzeug.exceptions import HTTPException
 
 from api import app
+from api.services.escrita import BancoOcupado
+from api.services.restricoes import traduzir_violacao
 
 
 @app.after_request
@@ -9,7 +12,9 @@ def after_party(response: Response) -> Response:
     _resp = response
 
     _resp.headers["Access-Control-Allow-Origin"] = "*"
-    _resp.headers["Access-Control-Allow-Headers"] = "Content-Type,Authorization"
+    _resp.headers["Access-Control-Allow-Headers"] = (
+        "Content-Type,Authorization,Idempotency-Key"
+    )
     return _resp
 
 
@@ -112,6 +117,29 @@ def internal_server_error(error: HTTPException) -> Response:
     ), 500
 
 
+@app.errorhandler(BancoOcupado)
+def banco_ocupado(error: BancoOcupado) -> Response:
+    """Trate escritas sem bloqueio do banco dentro do prazo (503 com Retry-After)."""
+    return jsonify(
+        {
+            "erro": "Banco de dados ocupado, tente novamente",
+            "codigo": 503,
+        }
+    ), 503, {"Retry-After": "1"}
+
+
+@app.errorhandler(IntegrityError)
+def violacao_restricao(error: IntegrityError) -> Response:
+    """Trate violações de restrições do banco (UNIQUE e FOREIGN KEY)."""
+    violacao = traduzir_violacao(error)
+    if violacao is None:
+        return internal_server_error(error)
+
+    return jsonify(
+        {"erro": violacao.mensagem, "codigo": violacao.status}
+    ), violacao.status
+
+
 @app.errorhandler(HTTPException)
 def handle_http_exception(error: HTTPException) -> Response:
     """Trate outras exceções HTTP não capturadas especificamente."""
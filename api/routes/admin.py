@@ -0,0 +1,224 @@
+"""Defina rotas administrativas de diagnóstico de desempenho e memória."""
+
+from functools import wraps
+
+from flask import Blueprint, jsonify, request, send_file
+from flask_jwt_extended import get_jwt, jwt_required
+
+from api import db
+from api.services.memoria import (
+    RastreamentoInativo,
+    SnapshotNaoEncontrado,
+    diagnostico_memoria,
+    objetos_orm,
+)
+from api.services.metricas import metricas_servicos
+from api.services.perfilamento import (
+    listar_perfis,
+    obter_perfil,
+    para_speedscope,
+    perfilador,
+)
+
+# Cria blueprint para rotas administrativas
+admin_bp = Blueprint("admin", __name__)
+
+
+def admin_requerido(funcao):
+    """Restrinja a rota a tokens com ``tipo_usuario`` igual a ``admin``."""
+
+    @wraps(funcao)
+    @jwt_required()
+    def verificar(*args, **kwargs):
+        if get_jwt().get("tipo_usuario") != "admin":
+            return jsonify({"erro": "Acesso restrito a administradores"}), 403
+        return funcao(*args, **kwargs)
+
+    return verificar
+
+
+@admin_bp.route("/metricas", methods=["GET"])
+@admin_requerido
+def metricas():
+    """Obtenha os contadores de escrita, leitura, cache, admissão e índices."""
+    try:
+        return jsonify(metricas_servicos()), 200
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@admin_bp.route("/perfis", methods=["GET"])
+@admin_requerido
+def listar():
+    """Liste os perfis de requisições gravados, mais recentes primeiro."""
+    try:
+        limite = max(1, min(request.args.get("limite", 50, type=int), 500))
+        return jsonify(
+            {"perfis": listar_perfis(limite), "metricas": perfilador.metricas()}
+        ), 200
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@admin_bp.route("/perfis/<perfil_id>", methods=["GET"])
+@admin_requerido
+def baixar(perfil_id):
+    """Baixe um perfil em formato pstats (padrão) ou speedscope (JSON).
+
+    O arquivo pstats é lido com ``python -m pstats <arquivo>`` ou ferramentas
+    como snakeviz; o JSON é aberto em https://www.speedscope.app.
+    """
+    try:
+        encontrado = obter_perfil(perfil_id)
+        if encontrado is None:
+            return jsonify({"erro": "Perfil não encontrado"}), 404
+        metadados, caminho = encontrado
+
+        formato = request.args.get("formato", "pstats")
+        if formato == "pstats":
+            return send_file(
+                caminho,
+                mimetype="application/octet-stream",
+                as_attachment=True,
+                download_name=f"{perfil_id}.prof",
+            )
+        if formato == "speedscope":
+            nome = f"{metadados['metodo']} {metadados['caminho']}"
+            response = jsonify(para_speedscope(caminho, nome))
+            response.headers["Content-Disposition"] = (
+                f"attachment; filename={perfil_id}.speedscope.json"
+            )
+            return response, 200
+
+        return jsonify(
+            {"erro": "Formato inválido", "formatos": ["pstats", "speedscope"]}
+        ), 400
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@admin_bp.route("/memoria", methods=["GET"])
+@admin_requerido
+def estado_memoria():
+    """Obtenha o estado do tracemalloc, RSS e snapshots deste worker."""
+    try:
+        return jsonify(diagnostico_memoria.estado()), 200
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@admin_bp.route("/memoria/iniciar", methods=["POST"])
+@admin_requerido
+def iniciar_memoria():
+    """Inicie o rastreamento de alocações (``quadros`` níveis de pilha)."""
+    try:
+        data = request.get_json(silent=True) or {}
+        quadros = data.get("quadros")
+        if quadros is not None and (not isinstance(quadros, int) or quadros < 1):
+            return jsonify({"erro": "Quadros deve ser um inteiro positivo"}), 400
+
+        return jsonify(diagnostico_memoria.iniciar(quadros)), 200
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@admin_bp.route("/memoria/parar", methods=["POST"])
+@admin_requerido
+def parar_memoria():
+    """Pare o rastreamento de alocações."""
+    try:
+        return jsonify(diagnostico_memoria.parar()), 200
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@admin_bp.route("/memoria/snapshots", methods=["POST"])
+@admin_requerido
+def capturar_snapshot():
+    """Guarde um snapshot das alocações e retorne as linhas que mais alocam."""
+    try:
+        data = request.get_json(silent=True) or {}
+        limite = max(1, min(request.args.get("limite", 20, type=int), 200))
+        return jsonify(diagnostico_memoria.capturar(data.get("nome"), limite)), 201
+
+    except RastreamentoInativo as erro:
+        return jsonify({"erro": str(erro)}), 409
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@admin_bp.route("/memoria/snapshots", methods=["DELETE"])
+@admin_bp.route("/memoria/snapshots/<int:snapshot_id>", methods=["DELETE"])
+@admin_requerido
+def descartar_snapshot(snapshot_id=None):
+    """Descarte um snapshot guardado, ou todos."""
+    try:
+        diagnostico_memoria.descartar(snapshot_id)
+        return jsonify({"mensagem": "Snapshot descartado com sucesso"}), 200
+
+    except SnapshotNaoEncontrado as erro:
+        return jsonify({"erro": str(erro)}), 404
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@admin_bp.route("/memoria/comparar", methods=["GET"])
+@admin_requerido
+def comparar_snapshots():
+    """Compare dois snapshots (``antigo`` e ``novo``) agrupando por linha.
+
+    ``agrupar`` aceita ``lineno`` (padrão), ``filename`` ou ``traceback``.
+    """
+    try:
+        antigo = request.args.get("antigo", type=int)
+        novo = request.args.get("novo", type=int)
+        if antigo is None or novo is None:
+            return jsonify({"erro": "Informe os snapshots antigo e novo"}), 400
+
+        limite = max(1, min(request.args.get("limite", 30, type=int), 200))
+        return jsonify(
+            diagnostico_memoria.comparar(
+                antigo, novo, request.args.get("agrupar", "lineno"), limite
+            )
+        ), 200
+
+    except SnapshotNaoEncontrado as erro:
+        return jsonify({"erro": str(erro)}), 404
+
+    except ValueError as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@admin_bp.route("/memoria/orm", methods=["GET"])
+@admin_requerido
+def objetos_orm_vivos():
+    """Conte instâncias vivas por modelo e o tamanho dos identity maps."""
+    try:
+        modelos = [mapper.class_ for mapper in db.Model.registry.mappers]
+        return jsonify(objetos_orm(modelos)), 200
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@admin_bp.route("/memoria/requisicoes", methods=["GET"])
+@admin_requerido
+def picos_requisicoes():
+    """Liste o pico de alocação das requisições amostradas, por endpoint."""
+    try:
+        limite = max(1, min(request.args.get("limite", 20, type=int), 500))
+        return jsonify(diagnostico_memoria.requisicoes(limite)), 200
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
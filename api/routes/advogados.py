@@ -1,15 +1,123 @@
 """Defina rotas para gerenciamento de advogados da equipe jurídica."""
 
-from flask import Blueprint, jsonify, request
+from datetime import date
+
+from flask import Blueprint, Response, jsonify, request
+from flask import current_app as app
 from flask_jwt_extended import jwt_required
-from sqlalchemy import or_
+from sqlalchemy import or_, select
+from sqlalchemy.orm import load_only
 
 from api import db
 from api.models.advogado import Advogado
+from api.models.processo import Processo
+from api.services.arquivamento import possui_processos
+from api.services.cache import cache_registros, impressao_responsavel, variante
+from api.services.campos import (
+    Campo,
+    buscar_em_blocos,
+    coluna,
+    colunas_selecionadas,
+    contar_por,
+    iso,
+    ordenar_por_ids,
+    selecionar_campos,
+    separar_ids,
+    serializar_campos,
+)
+from api.services.concorrencia import (
+    atualizar_versionado,
+    gerar_etag,
+    versao_atual,
+    versoes_if_match,
+)
+from api.services.documentos import (
+    busca_por_documento,
+    digitos_documento,
+    documento_valido,
+    normalizar_cpf,
+)
+from api.services.escrita import ERROS_ESCRITA, coordenador_escrita
 
 # Cria blueprint para rotas de advogados
 advogados_bp = Blueprint("advogados", __name__)
 
+# Campos disponíveis no detalhe do advogado (parâmetros fields/include)
+CAMPOS_DETALHE = {
+    "id": coluna(Advogado.id),
+    "nome": coluna(Advogado.nome),
+    "cpf": coluna(Advogado.cpf),
+    "oab_numero": coluna(Advogado.oab_numero),
+    "oab_estado": coluna(Advogado.oab_estado),
+    "oab_completa": Campo(
+        (Advogado.oab_numero, Advogado.oab_estado), lambda a: a.oab_completa
+    ),
+    "email": coluna(Advogado.email),
+    "telefone": coluna(Advogado.telefone),
+    "data_admissao": coluna(Advogado.data_admissao, iso),
+    "data_demissao": coluna(Advogado.data_demissao, iso),
+    "endereco_rua": coluna(Advogado.endereco_rua),
+    "endereco_numero": coluna(Advogado.endereco_numero),
+    "endereco_complemento": coluna(Advogado.endereco_complemento),
+    "endereco_bairro": coluna(Advogado.endereco_bairro),
+    "endereco_cidade": coluna(Advogado.endereco_cidade),
+    "endereco_estado": coluna(Advogado.endereco_estado),
+    "endereco_cep": coluna(Advogado.endereco_cep),
+    "endereco_completo": Campo(
+        (
+            Advogado.endereco_rua,
+            Advogado.endereco_numero,
+            Advogado.endereco_complemento,
+            Advogado.endereco_bairro,
+            Advogado.endereco_cidade,
+            Advogado.endereco_estado,
+            Advogado.endereco_cep,
+        ),
+        lambda a: a.endereco_completo,
+    ),
+    "biografia": coluna(Advogado.biografia),
+    "observacoes": coluna(Advogado.observacoes),
+    "especialidades": Campo(
+        (Advogado.especialidades,), lambda a: a.get_especialidades_list()
+    ),
+    "ativo": coluna(Advogado.ativo),
+    "versao": coluna(Advogado.versao),
+    "created_at": coluna(Advogado.created_at, iso),
+    "updated_at": coluna(Advogado.updated_at, iso),
+    "total_processos": Campo((), None),
+}
+
+# Campos retornados por padrão na listagem de advogados
+CAMPOS_LISTAGEM_PADRAO = [
+    "id",
+    "nome",
+    "oab_numero",
+    "oab_estado",
+    "oab_completa",
+    "email",
+    "telefone",
+    "ativo",
+    "total_processos",
+    "especialidades",
+]
+
+
+def _serializar_lista(advogados, campos):
+    """Serialize advogados da listagem contando processos em uma única consulta."""
+    total_processos = {}
+    if "total_processos" in campos:
+        total_processos = contar_por(
+            Processo.advogado_id, [advogado.id for advogado in advogados]
+        )
+
+    advogados_data = []
+    for advogado in advogados:
+        advogado_data = serializar_campos(advogado, campos, CAMPOS_DETALHE)
+        if "total_processos" in campos:
+            advogado_data["total_processos"] = total_processos.get(advogado.id, 0)
+        advogados_data.append(advogado_data)
+    return advogados_data
+
 
 @advogados_bp.route("/", methods=["GET"])
 def listar_advogados():
@@ -21,21 +129,61 @@ def listar_advogados():
         search = request.args.get("search", "")
         ativo_only = request.args.get("ativo", "true").lower() == "true"
 
-        # Monta query base
-        query = Advogado.query
+        # Campos solicitados pelo cliente da API
+        try:
+            campos = selecionar_campos(
+                request.args, CAMPOS_DETALHE, CAMPOS_LISTAGEM_PADRAO
+            )
+        except ValueError as e:
+            return jsonify(
+                {"erro": str(e), "campos_permitidos": list(CAMPOS_DETALHE)}
+            ), 400
+
+        # Monta query base carregando apenas as colunas necessárias
+        query = Advogado.query.options(
+            load_only(*colunas_selecionadas(campos, CAMPOS_DETALHE, Advogado.id))
+        )
+
+        # Busca em lote (?ids=3,1,2): uma consulta IN, na ordem solicitada
+        if "ids" in request.args:
+            try:
+                ids = separar_ids(request.args["ids"], app.config["LOTE_IDS_MAXIMO"])
+            except ValueError as e:
+                return jsonify({"erro": str(e)}), 400
+
+            advogados, nao_encontrados = ordenar_por_ids(
+                buscar_em_blocos(query, Advogado.id, ids), ids
+            )
+            return jsonify(
+                {
+                    "advogados": _serializar_lista(advogados, campos),
+                    "nao_encontrados": nao_encontrados,
+                }
+            ), 200
 
         # Filtro por status ativo
         if ativo_only:
             query = query.filter(Advogado.ativo == True)  # noqa: E712
 
-        # Filtro de busca por nome, OAB ou email
+        # Filtro de busca por nome, OAB ou email; buscas numéricas também
+        # comparam o prefixo dos dígitos do CPF ou, em registros ainda sem
+        # dígitos, o CPF digitado
         if search:
-            search_filter = or_(
+            condicoes = [
                 Advogado.nome.ilike(f"%{search}%"),
                 Advogado.oab_numero.ilike(f"%{search}%"),
                 Advogado.email.ilike(f"%{search}%"),
-            )
-            query = query.filter(search_filter)
+            ]
+            if busca_por_documento(search):
+                digitos = digitos_documento(search)
+                condicoes.append(
+                    (Advogado.cpf_digitos >= digitos)
+                    & (Advogado.cpf_digitos < digitos + ":")
+                )
+                condicoes.append(
+                    Advogado.cpf_digitos.is_(None) & Advogado.cpf.ilike(f"%{search}%")
+                )
+            query = query.filter(or_(*condicoes))
 
         # Ordena por nome
         query = query.order_by(Advogado.nome)
@@ -45,23 +193,8 @@ def listar_advogados():
             page=page, per_page=per_page, error_out=False
         )
 
-        # Monta resposta
-        advogados_data = []
-        for advogado in advogados_paginados.items:
-            advogados_data.append(
-                {
-                    "id": advogado.id,
-                    "nome": advogado.nome,
-                    "oab_numero": advogado.oab_numero,
-                    "oab_estado": advogado.oab_estado,
-                    "oab_completa": advogado.oab_completa,
-                    "email": advogado.email,
-                    "telefone": advogado.telefone,
-                    "ativo": advogado.ativo,
-                    "total_processos": len(advogado.processos),
-                    "especialidades": advogado.get_especialidades_list(),
-                }
-            )
+        # Monta resposta contando processos da página em uma única consulta
+        advogados_data = _serializar_lista(advogados_paginados.items, campos)
 
         return jsonify(
             {
@@ -94,19 +227,9 @@ def criar_advogado():
             if not data.get(campo):
                 return jsonify({"erro": f"Campo {campo} é obrigatório"}), 400
 
-        # Verifica se CPF já existe
-        if Advogado.query.filter_by(cpf=data["cpf"]).first():
-            return jsonify({"erro": "CPF já cadastrado"}), 409
-
-        # Verifica se OAB já existe
-        if Advogado.query.filter_by(
-            oab_numero=data["oab_numero"], oab_estado=data["oab_estado"]
-        ).first():
-            return jsonify({"erro": "Número da OAB já cadastrado"}), 409
-
-        # Verifica se email já existe
-        if Advogado.query.filter_by(email=data["email"]).first():
-            return jsonify({"erro": "Email já cadastrado"}), 409
+        # CPF com 11 dígitos e dígitos verificadores corretos
+        if not documento_valido(normalizar_cpf(data["cpf"])):
+            return jsonify({"erro": "CPF inválido"}), 400
 
         # Cria novo advogado
         advogado = Advogado(
@@ -132,7 +255,8 @@ def criar_advogado():
         if "especialidades" in data:
             advogado.set_especialidades_list(data["especialidades"])
 
-        # Salva no banco de dados
+        # Salva no banco de dados (CPF, OAB e email duplicados violam as
+        # restrições únicas da tabela)
         advogado.save()
 
         return jsonify(
@@ -147,54 +271,96 @@ def criar_advogado():
             }
         ), 201
 
+    except ERROS_ESCRITA:
+        raise
+
     except Exception:
         return jsonify({"erro": "Erro interno do servidor"}), 500
 
 
 @advogados_bp.route("/<int:advogado_id>", methods=["GET"])
 def obter_advogado(advogado_id):
-    """Obtenha detalhes completos de um advogado específico."""
+    """Obtenha detalhes completos de um advogado específico.
+
+    Aceita ``fields``/``include`` para restringir os campos retornados.
+    """
     try:
-        # Busca advogado pelo ID
-        advogado = Advogado.query.get(advogado_id)
+        # Campos solicitados pelo cliente da API
+        try:
+            campos = selecionar_campos(request.args, CAMPOS_DETALHE)
+        except ValueError as e:
+            return jsonify(
+                {"erro": str(e), "campos_permitidos": list(CAMPOS_DETALHE)}
+            ), 400
+
+        # Resposta em cache enquanto a impressão (versão) do advogado não mudar;
+        # com o cache desabilitado a impressão não é consultada
+        impressao = None
+        if cache_registros.habilitado:
+            impressao = impressao_responsavel(Advogado, advogado_id, campos)
+        chave = variante(campos)
+        if impressao is not None:
+            dados = cache_registros.obter("advogados", advogado_id, chave, impressao)
+            if dados is not None:
+                return Response(dados, mimetype="application/json"), 200, {
+                    "ETag": gerar_etag(impressao[0])
+                }
+
+        # Busca advogado pelo ID carregando apenas as colunas necessárias
+        advogado = db.session.get(
+            Advogado,
+            advogado_id,
+            options=[
+                load_only(
+                    *colunas_selecionadas(
+                        campos, CAMPOS_DETALHE, Advogado.id, Advogado.versao
+                    )
+                )
+            ],
+        )
 
         if not advogado:
             return jsonify({"erro": "Advogado não encontrado"}), 404
 
-        # Retorna dados completos do advogado
-        return jsonify(
-            {
-                "id": advogado.id,
-                "nome": advogado.nome,
-                "cpf": advogado.cpf,
-                "oab_numero": advogado.oab_numero,
-                "oab_estado": advogado.oab_estado,
-                "oab_completa": advogado.oab_completa,
-                "email": advogado.email,
-                "telefone": advogado.telefone,
-                "data_admissao": advogado.data_admissao.isoformat()
-                if advogado.data_admissao
-                else None,
-                "data_demissao": advogado.data_demissao.isoformat()
-                if advogado.data_demissao
-                else None,
-                "endereco_rua": advogado.endereco_rua,
-                "endereco_numero": advogado.endereco_numero,
-                "endereco_complemento": advogado.endereco_complemento,
-                "endereco_bairro": advogado.endereco_bairro,
-                "endereco_cidade": advogado.endereco_cidade,
-                "endereco_estado": advogado.endereco_estado,
-                "endereco_cep": advogado.endereco_cep,
-                "endereco_completo": advogado.endereco_completo,
-                "biografia": advogado.biografia,
-                "observacoes": advogado.observacoes,
-                "especialidades": advogado.get_especialidades_list(),
-                "ativo": advogado.ativo,
-                "created_at": advogado.created_at.isoformat(),
-                "updated_at": advogado.updated_at.isoformat(),
-                "total_processos": len(advogado.processos),
-            }
-        ), 200
+        advogado_data = serializar_campos(advogado, campos, CAMPOS_DETALHE)
+        if "total_processos" in campos:
+            advogado_data["total_processos"] = contar_por(
+                Processo.advogado_id, [advogado.id]
+            ).get(advogado.id, 0)
+
+        # Guarda a resposta serializada para as próximas leituras
+        resposta = jsonify(advogado_data)
+        if impressao is not None:
+            cache_registros.guardar(
+                "advogados", advogado_id, chave, impressao, resposta.get_data()
+            )
+
+        # Retorna dados do advogado
+        return resposta, 200, {"ETag": gerar_etag(advogado.versao)}
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@advogados_bp.get("/documento/<documento>")
+def obter_advogado_por_documento(documento):
+    """Obtenha o advogado pelo CPF, com ou sem pontuação.
+
+    A busca é exata pelos dígitos normalizados; a resposta é a mesma do
+    detalhe do advogado (aceita ``fields``/``include``).
+    """
+    try:
+        digitos = normalizar_cpf(documento)
+        if digitos is None:
+            return jsonify({"erro": "CPF deve ter 11 dígitos"}), 400
+
+        advogado_id = db.session.scalar(
+            select(Advogado.id).where(Advogado.cpf_digitos == digitos)
+        )
+        if advogado_id is None:
+            return jsonify({"erro": "Advogado não encontrado"}), 404
+
+        return obter_advogado(advogado_id)
 
     except Exception:
         return jsonify({"erro": "Erro interno do servidor"}), 500
@@ -202,39 +368,25 @@ def obter_advogado(advogado_id):
 
 @advogados_bp.route("/<int:advogado_id>", methods=["PUT"])
 def atualizar_advogado(advogado_id):
-    """Atualize informações de um advogado existente."""
+    """Atualize informações de um advogado existente.
+
+    A atualização é condicionada à versão informada no cabeçalho If-Match,
+    retornando 412 quando o advogado foi alterado por outra requisição.
+    """
     try:
-        # Busca advogado pelo ID
-        advogado = Advogado.query.get(advogado_id)
+        # Obtém versões aceitas a partir do cabeçalho If-Match
+        if_match = request.headers.get("If-Match")
+        if not if_match and app.config["REQUIRE_IF_MATCH"]:
+            return jsonify({"erro": "Cabeçalho If-Match é obrigatório"}), 428
 
-        if not advogado:
-            return jsonify({"erro": "Advogado não encontrado"}), 404
+        try:
+            versoes = versoes_if_match(if_match)
+        except ValueError:
+            return jsonify({"erro": "Cabeçalho If-Match inválido"}), 400
 
         # Obtém dados do request
         data = request.get_json()
 
-        # Verifica unicidade de campos se alterados
-        if "cpf" in data and data["cpf"] != advogado.cpf:
-            if Advogado.query.filter_by(cpf=data["cpf"]).first():
-                return jsonify({"erro": "CPF já cadastrado"}), 409
-
-        if "email" in data and data["email"] != advogado.email:
-            if Advogado.query.filter_by(email=data["email"]).first():
-                return jsonify({"erro": "Email já cadastrado"}), 409
-
-        if (
-            "oab_numero" in data
-            and "oab_estado" in data
-            and (
-                data["oab_numero"] != advogado.oab_numero
-                or data["oab_estado"] != advogado.oab_estado
-            )
-        ):
-            if Advogado.query.filter_by(
-                oab_numero=data["oab_numero"], oab_estado=data["oab_estado"]
-            ).first():
-                return jsonify({"erro": "Número da OAB já cadastrado"}), 409
-
         # Atualiza campos permitidos
         campos_atualizaveis = [
             "nome",
@@ -257,16 +409,52 @@ def atualizar_advogado(advogado_id):
             "ativo",
         ]
 
-        for campo in campos_atualizaveis:
-            if campo in data:
-                setattr(advogado, campo, data[campo])
+        valores = {campo: data[campo] for campo in campos_atualizaveis if campo in data}
+
+        # Converte datas recebidas em formato ISO
+        for campo in ("data_admissao", "data_demissao"):
+            if valores.get(campo):
+                valores[campo] = date.fromisoformat(valores[campo])
 
         # Atualiza especialidades se fornecidas
         if "especialidades" in data:
-            advogado.set_especialidades_list(data["especialidades"])
+            valores["especialidades"] = Advogado.serializar_especialidades(
+                data["especialidades"]
+            )
+
+        # Novo CPF: valida e atualiza também os dígitos normalizados
+        if "cpf" in valores:
+            digitos = normalizar_cpf(valores["cpf"])
+            if not documento_valido(digitos):
+                return jsonify({"erro": "CPF inválido"}), 400
+            valores["cpf_digitos"] = digitos
+
+        # Executa UPDATE condicionado à versão esperada
+        advogado = atualizar_versionado(
+            Advogado,
+            advogado_id,
+            versoes,
+            valores,
+            [
+                Advogado.id,
+                Advogado.nome,
+                Advogado.oab_numero,
+                Advogado.oab_estado,
+                Advogado.email,
+            ],
+        )
 
-        # Salva alterações
-        db.session.commit()
+        if not advogado:
+            versao = versao_atual(Advogado, advogado_id)
+            if versao is None:
+                return jsonify({"erro": "Advogado não encontrado"}), 404
+
+            return jsonify(
+                {
+                    "erro": "Advogado alterado por outra requisição",
+                    "versao_atual": versao,
+                }
+            ), 412, {"ETag": gerar_etag(versao)}
 
         return jsonify(
             {
@@ -274,11 +462,15 @@ def atualizar_advogado(advogado_id):
                 "advogado": {
                     "id": advogado.id,
                     "nome": advogado.nome,
-                    "oab_completa": advogado.oab_completa,
+                    "oab_completa": f"OAB/{advogado.oab_estado} {advogado.oab_numero}",
                     "email": advogado.email,
+                    "versao": advogado.versao,
                 },
             }
-        ), 200
+        ), 200, {"ETag": gerar_etag(advogado.versao)}
+
+    except ERROS_ESCRITA:
+        raise
 
     except Exception:
         return jsonify({"erro": "Erro interno do servidor"}), 500
@@ -294,17 +486,20 @@ def excluir_advogado(advogado_id):
         if not advogado:
             return jsonify({"erro": "Advogado não encontrado"}), 404
 
-        # Verifica se advogado tem processos ativos
-        if advogado.processos:
+        # Verifica se advogado tem processos, inclusive arquivados
+        if possui_processos("advogado_id", advogado.id):
             return jsonify(
                 {"erro": "Não é possível excluir advogado com processos associados"}
             ), 400
 
         # Realiza soft delete (marca como inativo)
         advogado.ativo = False
-        db.session.commit()
+        coordenador_escrita.confirmar()
 
         return jsonify({"mensagem": "Advogado excluído com sucesso"}), 200
 
+    except ERROS_ESCRITA:
+        raise
+
     except Exception:
         return jsonify({"erro": "Erro interno do servidor"}), 500
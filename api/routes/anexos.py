@@ -0,0 +1,115 @@
+"""Defina rotas de upload e download de anexos armazenados por conteúdo."""
+
+from flask import Blueprint, Response, jsonify, request, send_file, url_for
+from flask import current_app as app
+
+from api.services.anexos import (
+    AnexoMuitoGrande,
+    AnexoVazio,
+    caminho_blob,
+    gravar_anexo,
+    obter_anexo,
+)
+from api.services.escrita import ERROS_ESCRITA
+
+# Cria blueprint para rotas de anexos
+anexos_bp = Blueprint("anexos", __name__)
+
+
+def serializar_anexo(anexo):
+    """Converta um anexo no formato de resposta da API."""
+    return {
+        "sha256": anexo.sha256,
+        "tamanho": anexo.tamanho,
+        "tipo_conteudo": anexo.tipo_conteudo,
+        "url": url_for("anexos.baixar_anexo", sha256=anexo.sha256),
+    }
+
+
+def enviar_anexo(anexo, nome=None):
+    """Envie o arquivo do anexo com suporte a Range, ETag e cache.
+
+    O conteúdo de um hash nunca muda: o ETag é o próprio SHA-256 e a resposta
+    pode ficar em cache indefinidamente. ``no-transform`` impede que o
+    middleware de compressão leia o corpo, preservando o ``sendfile`` do
+    servidor e as respostas parciais (206).
+    """
+    response = send_file(
+        caminho_blob(anexo.sha256),
+        mimetype=anexo.tipo_conteudo,
+        as_attachment=nome is not None,
+        download_name=nome,
+        conditional=True,
+        etag=anexo.sha256,
+        max_age=app.config["ANEXOS_CACHE_SEGUNDOS"],
+    )
+    response.cache_control.immutable = True
+    response.cache_control.no_transform = True
+    return response
+
+
+@anexos_bp.route("/", methods=["POST"])
+def enviar():
+    """Receba um anexo pelo corpo da requisição, lido em blocos.
+
+    O corpo é o próprio arquivo (não multipart) e o Content-Type informado é
+    mantido no download. Conteúdo já armazenado não é gravado novamente.
+    """
+    try:
+        # Recusa antes de ler o corpo quando o tamanho declarado excede o limite
+        tamanho_maximo = app.config["ANEXOS_TAMANHO_MAXIMO"]
+        if request.content_length and request.content_length > tamanho_maximo:
+            return jsonify(
+                {"erro": f"Anexo excede o tamanho máximo de {tamanho_maximo} bytes"}
+            ), 413
+
+        anexo, novo = gravar_anexo(request.stream, request.mimetype)
+        return jsonify(
+            {
+                "mensagem": "Anexo enviado com sucesso"
+                if novo
+                else "Anexo já armazenado",
+                "anexo": serializar_anexo(anexo),
+            }
+        ), 201 if novo else 200
+
+    except AnexoVazio as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    except AnexoMuitoGrande as erro:
+        return jsonify({"erro": str(erro)}), 413
+
+    except ERROS_ESCRITA:
+        raise
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@anexos_bp.route("/<sha256>", methods=["GET"])
+def baixar_anexo(sha256):
+    """Baixe o conteúdo de um anexo pelo seu SHA-256."""
+    try:
+        anexo = obter_anexo(sha256)
+        if not anexo:
+            return jsonify({"erro": "Anexo não encontrado"}), 404
+
+        return enviar_anexo(anexo)
+
+    except FileNotFoundError:
+        return jsonify({"erro": "Arquivo do anexo não encontrado"}), 404
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@anexos_bp.after_request
+def add_headers(response: Response) -> Response:
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    response.headers["Access-Control-Allow-Headers"] = (
+        "Content-Type,Authorization,Range,If-None-Match"
+    )
+    response.headers["Access-Control-Expose-Headers"] = (
+        "Content-Range,Content-Length,ETag,Accept-Ranges"
+    )
+    return response
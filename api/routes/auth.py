@@ -5,6 +5,7 @@ from flask_jwt_extended import get_jwt_identity, jwt_required
 
 from api import db
 from api.models.usuario import Usuario
+from api.services.escrita import ERROS_ESCRITA, coordenador_escrita
 
 # Cria blueprint para rotas de autenticação
 auth_bp = Blueprint("auth", __name__)
@@ -61,19 +62,16 @@ def registro():
             if not data.get(campo):
                 return jsonify({"erro": f"Campo {campo} é obrigatório"}), 400
 
-        # Verifica se email já existe
-        if Usuario.query.filter_by(email=data["email"]).first():
-            return jsonify({"erro": "Email já cadastrado"}), 409
-
-        # Cria novo usuário
+        # Cria novo usuário: o registro aberto sempre cria o perfil "usuario"
+        # (administradores são criados com ``flask create-admin``)
         usuario = Usuario(
             nome=data["nome"],
             email=data["email"],
-            tipo_usuario=data.get("tipo_usuario", "usuario"),
+            tipo_usuario="usuario",
         )
         usuario.set_password(data["senha"])
 
-        # Salva no banco de dados
+        # Salva no banco de dados (email duplicado viola a restrição única)
         usuario.save()
 
         return jsonify(
@@ -88,11 +86,15 @@ def registro():
             }
         ), 201
 
+    except ERROS_ESCRITA:
+        raise
+
     except Exception:
         return jsonify({"erro": "Erro interno do servidor"}), 500
 
 
 @auth_bp.route("/perfil", methods=["GET"])
+@jwt_required()
 def perfil():
     """Retorne informações do perfil do usuário autenticado."""
     try:
@@ -122,6 +124,7 @@ def perfil():
 
 
 @auth_bp.route("/perfil", methods=["PUT"])
+@jwt_required()
 def atualizar_perfil():
     """Atualize informações do perfil do usuário autenticado."""
     try:
@@ -145,7 +148,7 @@ def atualizar_perfil():
             usuario.set_password(data["senha"])
 
         # Salva alterações
-        db.session.commit()
+        coordenador_escrita.confirmar()
 
         return jsonify(
             {
@@ -159,5 +162,8 @@ def atualizar_perfil():
             }
         ), 200
 
+    except ERROS_ESCRITA:
+        raise
+
     except Exception:
         return jsonify({"erro": "Erro interno do servidor"}), 500
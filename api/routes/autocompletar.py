@@ -0,0 +1,43 @@
+"""Defina a rota de autocompletar dos seletores de clientes, advogados e processos."""
+
+from flask import Blueprint, jsonify, request
+from flask import current_app as app
+
+from api.services.autocompletar import TIPOS, indice_autocompletar
+
+# Cria blueprint para a rota de autocompletar
+autocompletar_bp = Blueprint("autocompletar", __name__)
+
+
+@autocompletar_bp.get("/", strict_slashes=False)
+def autocompletar():
+    """Retorne os registros do ``tipo`` que completam a consulta ``q``.
+
+    Nomes e títulos são comparados sem acentos e sem diferenciar maiúsculas;
+    CPF/CNPJ, OAB e número CNJ podem ser digitados com ou sem pontuação.
+    """
+    try:
+        tipo = request.args.get("tipo", "")
+        if tipo not in TIPOS:
+            return jsonify(
+                {"erro": "Tipo inválido", "tipos_permitidos": list(TIPOS)}
+            ), 400
+
+        limite = min(
+            request.args.get("limite", app.config["AUTOCOMPLETE_LIMITE"], type=int),
+            app.config["AUTOCOMPLETE_LIMITE_MAXIMO"],
+        )
+        if limite < 1:
+            return jsonify({"erro": "Limite deve ser maior que zero"}), 400
+
+        consulta = request.args.get("q", "")
+        return jsonify(
+            {
+                "tipo": tipo,
+                "q": consulta,
+                "resultados": indice_autocompletar.buscar(tipo, consulta, limite),
+            }
+        ), 200
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
@@ -1,17 +1,113 @@
 """Defina rotas para gerenciamento de clientes jurídicos."""
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
+from flask import current_app as app
 from flask_jwt_extended import jwt_required
-from sqlalchemy import or_
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import load_only
 
 from api import db
 from api.models.cliente import Cliente
+from api.models.processo import Processo
+from api.services.arquivamento import possui_processos
+from api.services.cache import cache_registros, impressao_responsavel, variante
+from api.services.campos import (
+    Campo,
+    buscar_em_blocos,
+    coluna,
+    colunas_selecionadas,
+    contar_por,
+    iso,
+    ordenar_por_ids,
+    selecionar_campos,
+    separar_ids,
+    serializar_campos,
+)
+from api.services.concorrencia import (
+    atualizar_versionado,
+    gerar_etag,
+    versao_atual,
+    versoes_if_match,
+)
+from api.services.documentos import (
+    busca_por_documento,
+    digitos_documento,
+    documento_valido,
+    normalizar_documento,
+)
+from api.services.escrita import ERROS_ESCRITA, coordenador_escrita
 
 # Cria blueprint para rotas de clientes
 clientes_bp = Blueprint("clientes", __name__)
 
+# Campos disponíveis no detalhe do cliente (parâmetros fields/include)
+CAMPOS_DETALHE = {
+    "id": coluna(Cliente.id),
+    "nome": coluna(Cliente.nome),
+    "cpf_cnpj": coluna(Cliente.cpf_cnpj),
+    "email": coluna(Cliente.email),
+    "telefone": coluna(Cliente.telefone),
+    "tipo_pessoa": coluna(Cliente.tipo_pessoa),
+    "endereco_rua": coluna(Cliente.endereco_rua),
+    "endereco_numero": coluna(Cliente.endereco_numero),
+    "endereco_complemento": coluna(Cliente.endereco_complemento),
+    "endereco_bairro": coluna(Cliente.endereco_bairro),
+    "endereco_cidade": coluna(Cliente.endereco_cidade),
+    "endereco_estado": coluna(Cliente.endereco_estado),
+    "endereco_cep": coluna(Cliente.endereco_cep),
+    "endereco_completo": Campo(
+        (
+            Cliente.endereco_rua,
+            Cliente.endereco_numero,
+            Cliente.endereco_complemento,
+            Cliente.endereco_bairro,
+            Cliente.endereco_cidade,
+            Cliente.endereco_estado,
+            Cliente.endereco_cep,
+        ),
+        lambda c: c.endereco_completo,
+    ),
+    "profissao": coluna(Cliente.profissao),
+    "estado_civil": coluna(Cliente.estado_civil),
+    "observacoes": coluna(Cliente.observacoes),
+    "ativo": coluna(Cliente.ativo),
+    "versao": coluna(Cliente.versao),
+    "created_at": coluna(Cliente.created_at, iso),
+    "updated_at": coluna(Cliente.updated_at, iso),
+    "total_processos": Campo((), None),
+}
+
+# Campos retornados por padrão na listagem de clientes
+CAMPOS_LISTAGEM_PADRAO = [
+    "id",
+    "nome",
+    "cpf_cnpj",
+    "email",
+    "telefone",
+    "tipo_pessoa",
+    "ativo",
+    "total_processos",
+]
+
+
+def _serializar_lista(clientes, campos):
+    """Serialize clientes da listagem contando processos em uma única consulta."""
+    total_processos = {}
+    if "total_processos" in campos:
+        total_processos = contar_por(
+            Processo.cliente_id, [cliente.id for cliente in clientes]
+        )
+
+    clientes_data = []
+    for cliente in clientes:
+        cliente_data = serializar_campos(cliente, campos, CAMPOS_DETALHE)
+        if "total_processos" in campos:
+            cliente_data["total_processos"] = total_processos.get(cliente.id, 0)
+        clientes_data.append(cliente_data)
+    return clientes_data
+
 
-@clientes_bp.route("/", methods=["GET", "POST", "OPTIONS"])
+@clientes_bp.route("/", methods=["GET", "OPTIONS"])
 def listar_clientes():
     """Liste todos os clientes com opção de busca e paginação."""
     try:
@@ -21,15 +117,61 @@ def listar_clientes():
         search = request.args.get("search", "")
         ativo_only = request.args.get("ativo", "true").lower() == "true"
 
-        # Monta query base
-        query = Cliente.query
+        # Campos solicitados pelo cliente da API
+        try:
+            campos = selecionar_campos(
+                request.args, CAMPOS_DETALHE, CAMPOS_LISTAGEM_PADRAO
+            )
+        except ValueError as e:
+            return jsonify(
+                {"erro": str(e), "campos_permitidos": list(CAMPOS_DETALHE)}
+            ), 400
+
+        # Monta query base carregando apenas as colunas necessárias
+        query = Cliente.query.options(
+            load_only(*colunas_selecionadas(campos, CAMPOS_DETALHE, Cliente.id))
+        )
+
+        # Busca em lote (?ids=3,1,2): uma consulta IN, na ordem solicitada
+        if "ids" in request.args:
+            try:
+                ids = separar_ids(request.args["ids"], app.config["LOTE_IDS_MAXIMO"])
+            except ValueError as e:
+                return jsonify({"erro": str(e)}), 400
+
+            clientes, nao_encontrados = ordenar_por_ids(
+                buscar_em_blocos(query, Cliente.id, ids), ids
+            )
+            return jsonify(
+                {
+                    "clientes": _serializar_lista(clientes, campos),
+                    "nao_encontrados": nao_encontrados,
+                }
+            ), 200
 
         # Filtro por status ativo
         if ativo_only:
             query = query.filter(Cliente.ativo == True)  # noqa: E712
 
-        # Filtro de busca por nome, CPF/CNPJ ou email
-        if search:
+        # Busca por CPF/CNPJ (só dígitos e pontuação): prefixo dos dígitos
+        # normalizados, pelo índice; registros ainda sem dígitos (duplicados ou
+        # não preenchidos) pelo documento digitado. Demais buscas por nome,
+        # CPF/CNPJ ou email
+        if search and busca_por_documento(search):
+            digitos = digitos_documento(search)
+            query = query.filter(
+                or_(
+                    and_(
+                        Cliente.cpf_cnpj_digitos >= digitos,
+                        Cliente.cpf_cnpj_digitos < digitos + ":",
+                    ),
+                    and_(
+                        Cliente.cpf_cnpj_digitos.is_(None),
+                        Cliente.cpf_cnpj.ilike(f"%{search}%"),
+                    ),
+                )
+            )
+        elif search:
             search_filter = or_(
                 Cliente.nome.ilike(f"%{search}%"),
                 Cliente.cpf_cnpj.ilike(f"%{search}%"),
@@ -45,21 +187,8 @@ def listar_clientes():
             page=page, per_page=per_page, error_out=False
         )
 
-        # Monta resposta
-        clientes_data = []
-        for cliente in clientes_paginados.items:
-            clientes_data.append(
-                {
-                    "id": cliente.id,
-                    "nome": cliente.nome,
-                    "cpf_cnpj": cliente.cpf_cnpj,
-                    "email": cliente.email,
-                    "telefone": cliente.telefone,
-                    "tipo_pessoa": cliente.tipo_pessoa,
-                    "ativo": cliente.ativo,
-                    "total_processos": len(cliente.processos),
-                }
-            )
+        # Monta resposta contando processos da página em uma única consulta
+        clientes_data = _serializar_lista(clientes_paginados.items, campos)
 
         return jsonify(
             {
@@ -92,9 +221,9 @@ def criar_cliente():
             if not data.get(campo):
                 return jsonify({"erro": f"Campo {campo} é obrigatório"}), 400
 
-        # Verifica se CPF/CNPJ já existe
-        if Cliente.query.filter_by(cpf_cnpj=data["cpf_cnpj"]).first():
-            return jsonify({"erro": "CPF/CNPJ já cadastrado"}), 409
+        # CPF (11 dígitos) ou CNPJ (14) com dígitos verificadores corretos
+        if not documento_valido(normalizar_documento(data["cpf_cnpj"])):
+            return jsonify({"erro": "CPF/CNPJ inválido"}), 400
 
         # Cria novo cliente
         cliente = Cliente(
@@ -115,7 +244,8 @@ def criar_cliente():
             observacoes=data.get("observacoes"),
         )
 
-        # Salva no banco de dados
+        # Salva no banco de dados (CPF/CNPJ duplicado, com qualquer formatação,
+        # viola a restrição única dos dígitos)
         cliente.save()
 
         return jsonify(
@@ -131,46 +261,109 @@ def criar_cliente():
             }
         ), 201
 
+    except ERROS_ESCRITA:
+        raise
+
     except Exception:
         return jsonify({"erro": "Erro interno do servidor"}), 500
 
 
 @clientes_bp.route("/<int:cliente_id>", methods=["GET"])
 def obter_cliente(cliente_id):
-    """Obtenha detalhes completos de um cliente específico."""
+    """Obtenha detalhes completos de um cliente específico.
+
+    Aceita ``fields``/``include`` para restringir os campos retornados.
+    """
     try:
-        # Busca cliente pelo ID
-        cliente = Cliente.query.get(cliente_id)
+        # Campos solicitados pelo cliente da API
+        try:
+            campos = selecionar_campos(request.args, CAMPOS_DETALHE)
+        except ValueError as e:
+            return jsonify(
+                {"erro": str(e), "campos_permitidos": list(CAMPOS_DETALHE)}
+            ), 400
+
+        # Resposta em cache enquanto a impressão (versão) do cliente não mudar;
+        # com o cache desabilitado a impressão não é consultada
+        impressao = None
+        if cache_registros.habilitado:
+            impressao = impressao_responsavel(Cliente, cliente_id, campos)
+        chave = variante(campos)
+        if impressao is not None:
+            dados = cache_registros.obter("clientes", cliente_id, chave, impressao)
+            if dados is not None:
+                return Response(dados, mimetype="application/json"), 200, {
+                    "ETag": gerar_etag(impressao[0])
+                }
+
+        # Busca cliente pelo ID carregando apenas as colunas necessárias
+        cliente = db.session.get(
+            Cliente,
+            cliente_id,
+            options=[
+                load_only(
+                    *colunas_selecionadas(
+                        campos, CAMPOS_DETALHE, Cliente.id, Cliente.versao
+                    )
+                )
+            ],
+        )
 
         if not cliente:
             return jsonify({"erro": "Cliente não encontrado"}), 404
 
-        # Retorna dados completos do cliente
-        return jsonify(
-            {
-                "id": cliente.id,
-                "nome": cliente.nome,
-                "cpf_cnpj": cliente.cpf_cnpj,
-                "email": cliente.email,
-                "telefone": cliente.telefone,
-                "tipo_pessoa": cliente.tipo_pessoa,
-                "endereco_rua": cliente.endereco_rua,
-                "endereco_numero": cliente.endereco_numero,
-                "endereco_complemento": cliente.endereco_complemento,
-                "endereco_bairro": cliente.endereco_bairro,
-                "endereco_cidade": cliente.endereco_cidade,
-                "endereco_estado": cliente.endereco_estado,
-                "endereco_cep": cliente.endereco_cep,
-                "endereco_completo": cliente.endereco_completo,
-                "profissao": cliente.profissao,
-                "estado_civil": cliente.estado_civil,
-                "observacoes": cliente.observacoes,
-                "ativo": cliente.ativo,
-                "created_at": cliente.created_at.isoformat(),
-                "updated_at": cliente.updated_at.isoformat(),
-                "total_processos": len(cliente.processos),
-            }
-        ), 200
+        cliente_data = serializar_campos(cliente, campos, CAMPOS_DETALHE)
+        if "total_processos" in campos:
+            cliente_data["total_processos"] = contar_por(
+                Processo.cliente_id, [cliente.id]
+            ).get(cliente.id, 0)
+
+        # Guarda a resposta serializada para as próximas leituras
+        resposta = jsonify(cliente_data)
+        if impressao is not None:
+            cache_registros.guardar(
+                "clientes", cliente_id, chave, impressao, resposta.get_data()
+            )
+
+        # Retorna dados do cliente
+        return resposta, 200, {"ETag": gerar_etag(cliente.versao)}
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@clientes_bp.get("/documento/<documento>")
+def obter_cliente_por_documento(documento):
+    """Obtenha o cliente pelo CPF/CNPJ, com ou sem pontuação.
+
+    A busca é exata pelos dígitos normalizados; a resposta é a mesma do
+    detalhe do cliente (aceita ``fields``/``include``).
+    """
+    try:
+        digitos = normalizar_documento(documento)
+        if digitos is None:
+            return jsonify(
+                {"erro": "Documento deve ter 11 (CPF) ou 14 (CNPJ) dígitos"}
+            ), 400
+
+        # Registros ainda sem dígitos são comparados pelo documento digitado
+        cliente_id = db.session.scalar(
+            select(Cliente.id)
+            .where(
+                or_(
+                    Cliente.cpf_cnpj_digitos == digitos,
+                    and_(
+                        Cliente.cpf_cnpj_digitos.is_(None),
+                        Cliente.cpf_cnpj == documento,
+                    ),
+                )
+            )
+            .limit(1)
+        )
+        if cliente_id is None:
+            return jsonify({"erro": "Cliente não encontrado"}), 404
+
+        return obter_cliente(cliente_id)
 
     except Exception:
         return jsonify({"erro": "Erro interno do servidor"}), 500
@@ -178,22 +371,25 @@ def obter_cliente(cliente_id):
 
 @clientes_bp.route("/<int:cliente_id>", methods=["PUT"])
 def atualizar_cliente(cliente_id):
-    """Atualize informações de um cliente existente."""
+    """Atualize informações de um cliente existente.
+
+    A atualização é condicionada à versão informada no cabeçalho If-Match,
+    retornando 412 quando o cliente foi alterado por outra requisição.
+    """
     try:
-        # Busca cliente pelo ID
-        cliente = Cliente.query.get(cliente_id)
+        # Obtém versões aceitas a partir do cabeçalho If-Match
+        if_match = request.headers.get("If-Match")
+        if not if_match and app.config["REQUIRE_IF_MATCH"]:
+            return jsonify({"erro": "Cabeçalho If-Match é obrigatório"}), 428
 
-        if not cliente:
-            return jsonify({"erro": "Cliente não encontrado"}), 404
+        try:
+            versoes = versoes_if_match(if_match)
+        except ValueError:
+            return jsonify({"erro": "Cabeçalho If-Match inválido"}), 400
 
         # Obtém dados do request
         data = request.get_json()
 
-        # Verifica se CPF/CNPJ já existe em outro cliente
-        if "cpf_cnpj" in data and data["cpf_cnpj"] != cliente.cpf_cnpj:
-            if Cliente.query.filter_by(cpf_cnpj=data["cpf_cnpj"]).first():
-                return jsonify({"erro": "CPF/CNPJ já cadastrado"}), 409
-
         # Atualiza campos permitidos
         campos_atualizaveis = [
             "nome",
@@ -214,12 +410,41 @@ def atualizar_cliente(cliente_id):
             "ativo",
         ]
 
-        for campo in campos_atualizaveis:
-            if campo in data:
-                setattr(cliente, campo, data[campo])
+        valores = {campo: data[campo] for campo in campos_atualizaveis if campo in data}
+
+        # Novo CPF/CNPJ: valida e atualiza também os dígitos normalizados
+        if "cpf_cnpj" in valores:
+            digitos = normalizar_documento(valores["cpf_cnpj"])
+            if not documento_valido(digitos):
+                return jsonify({"erro": "CPF/CNPJ inválido"}), 400
+            valores["cpf_cnpj_digitos"] = digitos
+
+        # Executa UPDATE condicionado à versão esperada
+        cliente = atualizar_versionado(
+            Cliente,
+            cliente_id,
+            versoes,
+            valores,
+            [
+                Cliente.id,
+                Cliente.nome,
+                Cliente.cpf_cnpj,
+                Cliente.email,
+                Cliente.tipo_pessoa,
+            ],
+        )
 
-        # Salva alterações
-        db.session.commit()
+        if not cliente:
+            versao = versao_atual(Cliente, cliente_id)
+            if versao is None:
+                return jsonify({"erro": "Cliente não encontrado"}), 404
+
+            return jsonify(
+                {
+                    "erro": "Cliente alterado por outra requisição",
+                    "versao_atual": versao,
+                }
+            ), 412, {"ETag": gerar_etag(versao)}
 
         return jsonify(
             {
@@ -230,9 +455,13 @@ def atualizar_cliente(cliente_id):
                     "cpf_cnpj": cliente.cpf_cnpj,
                     "email": cliente.email,
                     "tipo_pessoa": cliente.tipo_pessoa,
+                    "versao": cliente.versao,
                 },
             }
-        ), 200
+        ), 200, {"ETag": gerar_etag(cliente.versao)}
+
+    except ERROS_ESCRITA:
+        raise
 
     except Exception:
         return jsonify({"erro": "Erro interno do servidor"}), 500
@@ -248,17 +477,20 @@ def excluir_cliente(cliente_id):
         if not cliente:
             return jsonify({"erro": "Cliente não encontrado"}), 404
 
-        # Verifica se cliente tem processos ativos
-        if cliente.processos:
+        # Verifica se cliente tem processos, inclusive arquivados
+        if possui_processos("cliente_id", cliente.id):
             return jsonify(
                 {"erro": "Não é possível excluir cliente com processos associados"}
             ), 400
 
         # Realiza soft delete (marca como inativo)
         cliente.ativo = False
-        db.session.commit()
+        coordenador_escrita.confirmar()
 
         return jsonify({"mensagem": "Cliente excluído com sucesso"}), 200
 
+    except ERROS_ESCRITA:
+        raise
+
     except Exception:
         return jsonify({"erro": "Erro interno do servidor"}), 500
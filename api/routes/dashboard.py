@@ -53,6 +53,23 @@ def obter_produtividade_advogados():
         return jsonify({"erro": "Erro interno do servidor"}), 500
 
 
+@dashboard_bp.route("/processos-parados", methods=["GET"])
+def obter_processos_parados():
+    """Obtenha o total e a lista dos processos parados há mais tempo."""
+    try:
+        # Parâmetros opcionais de dias sem movimentação e limite de resultados
+        dias = max(1, request.args.get("dias", 90, type=int))
+        limite = max(1, min(request.args.get("limite", 10, type=int), 100))
+
+        # Utiliza serviço para obter processos parados
+        parados = DashboardService.get_processos_parados(dias, limite)
+
+        return jsonify({"processos_parados": parados}), 200
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
 @dashboard_bp.route("/relatorio-periodo", methods=["POST"])
 def gerar_relatorio_periodo():
     """Gere relatório de processos por período específico."""
@@ -0,0 +1,420 @@
+"""Defina rotas para controle de prazos processuais e do calendário forense."""
+
+import re
+from datetime import date, datetime, timedelta
+
+from flask import Blueprint, jsonify, request
+from sqlalchemy import select
+
+from api import db
+from api.models.prazo import Feriado, Prazo
+from api.models.processo import Andamento, Processo
+from api.routes.admin import admin_requerido
+from api.services.escrita import ERROS_ESCRITA, coordenador_escrita
+from api.services.prazos import (
+    CONTAGENS,
+    STATUS_PRAZO,
+    calcular_vencimento,
+    chave_tribunal,
+    recalcular_prazos,
+)
+
+# Cria blueprint para rotas de prazos
+prazos_bp = Blueprint("prazos", __name__)
+
+# Janela máxima de ``vencendo_em`` e quantidade máxima de dias de um prazo
+MAXIMO_JANELA_DIAS = 366
+MAXIMO_DIAS_PRAZO = 3650
+
+
+class DadosInvalidos(ValueError):
+    """Sinalize dados de prazo ou feriado inválidos na requisição."""
+
+
+def serializar_prazo(prazo):
+    """Converta um prazo em dicionário incluindo os dias restantes."""
+    return {
+        "id": prazo.id,
+        "processo_id": prazo.processo_id,
+        "andamento_id": prazo.andamento_id,
+        "descricao": prazo.descricao,
+        "dias": prazo.dias,
+        "contagem": prazo.contagem,
+        "data_inicio": prazo.data_inicio.isoformat(),
+        "data_vencimento": prazo.data_vencimento.isoformat(),
+        "dias_restantes": (prazo.data_vencimento - date.today()).days,
+        "status": prazo.status,
+        "cumprido_em": prazo.cumprido_em.isoformat() if prazo.cumprido_em else None,
+        "advogado_id": prazo.advogado_id,
+        "tribunal": prazo.tribunal,
+    }
+
+
+def serializar_feriado(feriado):
+    """Converta um feriado em dicionário."""
+    return {
+        "id": feriado.id,
+        "data_inicio": feriado.data_inicio.isoformat(),
+        "data_fim": feriado.data_fim.isoformat(),
+        "descricao": feriado.descricao,
+        "tribunal": feriado.tribunal,
+        "suspensao": feriado.suspensao,
+    }
+
+
+def _data(valor, campo):
+    """Converta uma data ISO (AAAA-MM-DD) recebida na requisição."""
+    try:
+        return date.fromisoformat(str(valor)[:10])
+    except ValueError:
+        raise DadosInvalidos(f"Data inválida em {campo}") from None
+
+
+def _contagem(dados, atual=None):
+    """Valide quantidade de dias e tipo de contagem de um prazo."""
+    dias = dados.get("dias", atual.dias if atual else None)
+    contagem = dados.get("contagem", atual.contagem if atual else "uteis")
+
+    if not isinstance(dias, int) or not 1 <= dias <= MAXIMO_DIAS_PRAZO:
+        raise DadosInvalidos(f"Dias deve ser um inteiro entre 1 e {MAXIMO_DIAS_PRAZO}")
+    if contagem not in CONTAGENS:
+        raise DadosInvalidos(f"Contagem inválida, use {' ou '.join(CONTAGENS)}")
+    return dias, contagem
+
+
+def _janela(valor):
+    """Interprete ``vencendo_em`` no formato ``7d`` (ou apenas ``7``)."""
+    encontrado = re.fullmatch(r"(\d+)d?", valor.strip().lower())
+    if not encontrado or int(encontrado.group(1)) > MAXIMO_JANELA_DIAS:
+        raise DadosInvalidos(
+            f"vencendo_em deve estar no formato 7d (máximo {MAXIMO_JANELA_DIAS}d)"
+        )
+    return int(encontrado.group(1))
+
+
+@prazos_bp.route("/", methods=["GET"])
+def listar_prazos():
+    """Liste prazos que vencem nos próximos dias, por data de vencimento.
+
+    A consulta percorre um único intervalo do índice (status, vencimento),
+    ou (advogado, status, vencimento) quando ``advogado_id`` é informado.
+    ``vencidos=true`` inclui também os prazos com vencimento já passado.
+    """
+    try:
+        hoje = date.today()
+        dias = _janela(request.args.get("vencendo_em", "7d"))
+        status = request.args.get("status", "aberto")
+        if status not in STATUS_PRAZO:
+            return jsonify({"erro": "Status inválido"}), 400
+
+        limite = max(1, min(request.args.get("limite", 100, type=int), 1000))
+        incluir_vencidos = request.args.get("vencidos", "false").lower() == "true"
+
+        # Filtros de igualdade antes do intervalo de datas
+        query = select(Prazo).where(Prazo.status == status)
+        advogado_id = request.args.get("advogado_id", type=int)
+        if advogado_id:
+            query = query.where(Prazo.advogado_id == advogado_id)
+        processo_id = request.args.get("processo_id", type=int)
+        if processo_id:
+            query = query.where(Prazo.processo_id == processo_id)
+
+        query = query.where(Prazo.data_vencimento <= hoje + timedelta(days=dias))
+        if not incluir_vencidos:
+            query = query.where(Prazo.data_vencimento >= hoje)
+
+        prazos = db.session.scalars(
+            query.order_by(Prazo.data_vencimento, Prazo.id).limit(limite)
+        ).all()
+
+        return jsonify(
+            {
+                "prazos": [serializar_prazo(prazo) for prazo in prazos],
+                "ate": (hoje + timedelta(days=dias)).isoformat(),
+                "total": len(prazos),
+            }
+        ), 200
+
+    except DadosInvalidos as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@prazos_bp.route("/calcular", methods=["GET"])
+def calcular_prazo():
+    """Calcule o vencimento de um prazo sem gravá-lo."""
+    try:
+        dados = {
+            "dias": request.args.get("dias", type=int),
+            "contagem": request.args.get("contagem", "uteis"),
+        }
+        dias, contagem = _contagem(dados)
+        inicio = _data(request.args.get("data_inicio", date.today()), "data_inicio")
+        tribunal = request.args.get("tribunal")
+
+        vencimento = calcular_vencimento(inicio, dias, contagem, tribunal)
+        return jsonify(
+            {
+                "data_inicio": inicio.isoformat(),
+                "dias": dias,
+                "contagem": contagem,
+                "tribunal": tribunal,
+                "data_vencimento": vencimento.isoformat(),
+            }
+        ), 200
+
+    except DadosInvalidos as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@prazos_bp.route("/", methods=["POST"])
+def criar_prazo():
+    """Crie um prazo a partir de um processo ou de um andamento (intimação).
+
+    Sem ``data_inicio`` a contagem parte da data do andamento, ou de hoje.
+    Advogado e tribunal são copiados do processo.
+    """
+    try:
+        data = request.get_json() or {}
+        if not data.get("descricao"):
+            return jsonify({"erro": "Descrição do prazo é obrigatória"}), 400
+        dias, contagem = _contagem(data)
+
+        processo_id = data.get("processo_id")
+        inicio = None
+        if data.get("data_inicio"):
+            inicio = _data(data["data_inicio"], "data_inicio")
+
+        # Andamento de origem: define o processo e a data de início padrão
+        andamento_id = data.get("andamento_id")
+        if andamento_id:
+            andamento = db.session.execute(
+                select(Andamento.processo_id, Andamento.data_andamento).where(
+                    Andamento.id == andamento_id
+                )
+            ).first()
+            if not andamento or (processo_id and andamento.processo_id != processo_id):
+                return jsonify({"erro": "Andamento não encontrado"}), 404
+            processo_id = andamento.processo_id
+            inicio = inicio or andamento.data_andamento.date()
+
+        if not processo_id:
+            return jsonify({"erro": "Informe o processo ou o andamento"}), 400
+
+        with coordenador_escrita.transacao() as session:
+            processo = session.execute(
+                select(Processo.advogado_id, Processo.tribunal).where(
+                    Processo.id == processo_id
+                )
+            ).first()
+            if not processo:
+                return jsonify({"erro": "Processo não encontrado"}), 404
+
+            inicio = inicio or date.today()
+            prazo = Prazo(
+                processo_id=processo_id,
+                andamento_id=andamento_id,
+                descricao=data["descricao"][:200],
+                dias=dias,
+                contagem=contagem,
+                data_inicio=inicio,
+                data_vencimento=calcular_vencimento(
+                    inicio, dias, contagem, processo.tribunal
+                ),
+                advogado_id=processo.advogado_id,
+                tribunal=processo.tribunal,
+            )
+            session.add(prazo)
+
+        return jsonify(
+            {"mensagem": "Prazo criado com sucesso", "prazo": serializar_prazo(prazo)}
+        ), 201
+
+    except DadosInvalidos as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    except ERROS_ESCRITA:
+        raise
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@prazos_bp.route("/<int:prazo_id>", methods=["GET"])
+def obter_prazo(prazo_id):
+    """Obtenha um prazo específico."""
+    try:
+        prazo = db.session.get(Prazo, prazo_id)
+        if not prazo:
+            return jsonify({"erro": "Prazo não encontrado"}), 404
+
+        return jsonify({"prazo": serializar_prazo(prazo)}), 200
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@prazos_bp.route("/<int:prazo_id>", methods=["PUT"])
+def atualizar_prazo(prazo_id):
+    """Atualize a situação ou a contagem de um prazo.
+
+    ``status`` aceita ``cumprido``, ``cancelado`` ou ``aberto`` (reabertura);
+    mudanças em dias, contagem ou início recalculam o vencimento.
+    """
+    try:
+        data = request.get_json() or {}
+        if "status" in data and data["status"] not in STATUS_PRAZO:
+            return jsonify({"erro": "Status inválido"}), 400
+
+        with coordenador_escrita.transacao() as session:
+            prazo = session.get(Prazo, prazo_id)
+            if not prazo:
+                return jsonify({"erro": "Prazo não encontrado"}), 404
+
+            if data.get("descricao"):
+                prazo.descricao = data["descricao"][:200]
+
+            if {"dias", "contagem", "data_inicio"} & data.keys():
+                prazo.dias, prazo.contagem = _contagem(data, prazo)
+                if data.get("data_inicio"):
+                    prazo.data_inicio = _data(data["data_inicio"], "data_inicio")
+                prazo.data_vencimento = calcular_vencimento(
+                    prazo.data_inicio, prazo.dias, prazo.contagem, prazo.tribunal
+                )
+
+            if "status" in data and data["status"] != prazo.status:
+                prazo.status = data["status"]
+                prazo.cumprido_em = (
+                    datetime.utcnow() if data["status"] == "cumprido" else None
+                )
+
+        return jsonify(
+            {
+                "mensagem": "Prazo atualizado com sucesso",
+                "prazo": serializar_prazo(prazo),
+            }
+        ), 200
+
+    except DadosInvalidos as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    except ERROS_ESCRITA:
+        raise
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@prazos_bp.route("/feriados", methods=["GET"])
+def listar_feriados():
+    """Liste feriados e suspensões de um ano, nacionais e do tribunal informado."""
+    try:
+        ano = request.args.get("ano", date.today().year, type=int)
+        query = select(Feriado).where(
+            Feriado.data_inicio <= date(ano, 12, 31),
+            Feriado.data_fim >= date(ano, 1, 1),
+        )
+
+        tribunal = chave_tribunal(request.args.get("tribunal"))
+        if tribunal:
+            query = query.where(
+                (Feriado.tribunal.is_(None)) | (Feriado.tribunal == tribunal)
+            )
+
+        feriados = db.session.scalars(query.order_by(Feriado.data_inicio)).all()
+        return jsonify({"feriados": [serializar_feriado(f) for f in feriados]}), 200
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+def _filtro_tribunal(tribunal):
+    """Selecione os prazos afetados por uma mudança no calendário do tribunal."""
+    if tribunal is None:
+        return ()
+    return (db.func.upper(db.func.trim(Prazo.tribunal)) == tribunal,)
+
+
+@prazos_bp.route("/feriados", methods=["POST"])
+@admin_requerido
+def criar_feriado():
+    """Inclua um feriado (ou suspensão) e recalcule os prazos abertos afetados."""
+    try:
+        data = request.get_json() or {}
+        if not data.get("data_inicio") or not data.get("descricao"):
+            return jsonify(
+                {"erro": "Data e descrição do feriado são obrigatórias"}
+            ), 400
+
+        inicio = _data(data["data_inicio"], "data_inicio")
+        fim = _data(data["data_fim"], "data_fim") if data.get("data_fim") else inicio
+        if fim < inicio:
+            return jsonify({"erro": "data_fim anterior a data_inicio"}), 400
+
+        tribunal = chave_tribunal(data.get("tribunal"))
+        with coordenador_escrita.transacao() as session:
+            feriado = Feriado(
+                data_inicio=inicio,
+                data_fim=fim,
+                descricao=data["descricao"][:200],
+                tribunal=tribunal,
+                suspensao=bool(data.get("suspensao", False)),
+            )
+            session.add(feriado)
+            session.flush()
+            recalculados = recalcular_prazos(
+                *_filtro_tribunal(tribunal), session=session
+            )
+
+        return jsonify(
+            {
+                "mensagem": "Feriado criado com sucesso",
+                "feriado": serializar_feriado(feriado),
+                "prazos_recalculados": recalculados,
+            }
+        ), 201
+
+    except DadosInvalidos as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    except ERROS_ESCRITA:
+        raise
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@prazos_bp.route("/feriados/<int:feriado_id>", methods=["DELETE"])
+@admin_requerido
+def remover_feriado(feriado_id):
+    """Remova um feriado e recalcule os prazos abertos afetados."""
+    try:
+        with coordenador_escrita.transacao() as session:
+            feriado = session.get(Feriado, feriado_id)
+            if not feriado:
+                return jsonify({"erro": "Feriado não encontrado"}), 404
+
+            tribunal = feriado.tribunal
+            session.delete(feriado)
+            session.flush()
+            recalculados = recalcular_prazos(
+                *_filtro_tribunal(tribunal), session=session
+            )
+
+        return jsonify(
+            {
+                "mensagem": "Feriado removido com sucesso",
+                "prazos_recalculados": recalculados,
+            }
+        ), 200
+
+    except ERROS_ESCRITA:
+        raise
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
@@ -1,27 +1,269 @@
 """Defina rotas para gerenciamento de processos jurídicos."""
 
+import queue
 import re
 import traceback
 from datetime import datetime
 
-from flask import Blueprint, Response, jsonify, request
+from flask import Blueprint, Response, jsonify, request, url_for
 from flask import current_app as app
-from flask_jwt_extended import get_jwt_identity
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
 from sqlalchemy import or_
+from sqlalchemy.orm import joinedload, load_only
 
 from api import db
 from api.interface.processo import ProcessoInterface
 from api.models.advogado import Advogado
 from api.models.cliente import Cliente
 from api.models.processo import Andamento, Processo
+from api.routes.anexos import enviar_anexo
+from api.services.anexos import obter_anexo
+from api.services.arquivamento import (
+    NumeroProcessoEmUso,
+    andamentos_arquivados,
+    contar_andamentos_arquivados,
+    numero_arquivado,
+    obter_andamento_arquivado,
+    obter_processo_arquivado,
+    processos_arquivados,
+)
+from api.services.cache import cache_registros, impressao_processo, variante
+from api.services.campos import (
+    Campo,
+    buscar_em_blocos,
+    coluna,
+    colunas_selecionadas,
+    contar_por,
+    decimal,
+    iso,
+    ordenar_por_ids,
+    selecionar_campos,
+    separar_ids,
+    serializar_campos,
+)
+from api.services.concorrencia import (
+    atualizar_versionado,
+    gerar_etag,
+    versao_atual,
+    versoes_if_match,
+)
+from api.services.escrita import ERROS_ESCRITA, coordenador_escrita
+from api.services.historico import listar_historico, serializar_entrada
+from api.services.movimentacao import (
+    STATUS_PARADOS_PADRAO,
+    consulta_parados,
+    contar_parados,
+    serializar_parado,
+)
+from api.services.notificacoes import (
+    FILTROS_STREAM,
+    LimiteConexoesExcedido,
+    canal_eventos,
+    formatar_sse,
+)
 
 # Cria blueprint para rotas de processos
 processos_bp = Blueprint("processos", __name__)
 
+# Campos disponíveis na listagem de processos (parâmetros fields/include)
+CAMPOS_LISTAGEM = {
+    "id": coluna(Processo.id),
+    "descricao": coluna(Processo.descricao, lambda valor: valor or ""),
+    "numero_processo": coluna(Processo.numero_processo),
+    "numero_formatado": Campo(
+        (Processo.numero_processo,), lambda p: p.numero_formatado
+    ),
+    "numero_interno": coluna(Processo.numero_interno),
+    "titulo": coluna(Processo.titulo),
+    "area_juridica": coluna(Processo.area_juridica),
+    "status": coluna(Processo.status),
+    "status_descricao": Campo((Processo.status,), lambda p: p.status_descricao),
+    "prioridade": coluna(Processo.prioridade),
+    "prioridade_descricao": Campo(
+        (Processo.prioridade,), lambda p: p.prioridade_descricao
+    ),
+    "data_distribuicao": coluna(Processo.data_distribuicao, iso),
+    "ultima_movimentacao_em": coluna(Processo.ultima_movimentacao_em, iso),
+    "valor_causa": coluna(Processo.valor_causa, decimal),
+    "cliente": Campo(
+        (Processo.cliente_id,),
+        lambda p: {
+            "id": p.cliente.id,
+            "nome": p.cliente.nome,
+            "cpf_cnpj": p.cliente.cpf_cnpj,
+        }
+        if p.cliente
+        else {},
+    ),
+    "advogado": Campo(
+        (Processo.advogado_id,),
+        lambda p: {
+            "id": p.advogado_responsavel.id,
+            "nome": p.advogado_responsavel.nome,
+            "oab_completa": p.advogado_responsavel.oab_completa,
+        }
+        if p.advogado_responsavel
+        else {},
+    ),
+    "total_andamentos": Campo((), None),
+    "created_at": coluna(Processo.created_at, iso),
+}
+
+# Campos disponíveis no detalhe do processo (parâmetros fields/include)
+CAMPOS_DETALHE = {
+    "id": coluna(Processo.id),
+    "numero_processo": coluna(Processo.numero_processo),
+    "numero_formatado": CAMPOS_LISTAGEM["numero_formatado"],
+    "numero_interno": coluna(Processo.numero_interno),
+    "titulo": coluna(Processo.titulo),
+    "descricao": coluna(Processo.descricao),
+    "area_juridica": coluna(Processo.area_juridica),
+    "tipo_acao": coluna(Processo.tipo_acao),
+    "status": coluna(Processo.status),
+    "status_descricao": CAMPOS_LISTAGEM["status_descricao"],
+    "data_distribuicao": coluna(Processo.data_distribuicao, iso),
+    "data_conclusao": coluna(Processo.data_conclusao, iso),
+    "ultima_movimentacao_em": CAMPOS_LISTAGEM["ultima_movimentacao_em"],
+    "tribunal": coluna(Processo.tribunal),
+    "vara": coluna(Processo.vara),
+    "juiz": coluna(Processo.juiz),
+    "valor_causa": coluna(Processo.valor_causa, decimal),
+    "valor_honorarios": coluna(Processo.valor_honorarios, decimal),
+    "forma_pagamento": coluna(Processo.forma_pagamento),
+    "prioridade": coluna(Processo.prioridade),
+    "prioridade_descricao": CAMPOS_LISTAGEM["prioridade_descricao"],
+    "observacoes": coluna(Processo.observacoes),
+    "observacoes_internas": coluna(Processo.observacoes_internas),
+    "cliente": Campo(
+        (Processo.cliente_id,),
+        lambda p: {
+            "id": p.cliente.id,
+            "nome": p.cliente.nome,
+            "cpf_cnpj": p.cliente.cpf_cnpj,
+            "email": p.cliente.email,
+            "telefone": p.cliente.telefone,
+        }
+        if p.cliente
+        else None,
+    ),
+    "advogado": Campo(
+        (Processo.advogado_id,),
+        lambda p: {
+            "id": p.advogado_responsavel.id,
+            "nome": p.advogado_responsavel.nome,
+            "oab_completa": p.advogado_responsavel.oab_completa,
+            "email": p.advogado_responsavel.email,
+        }
+        if p.advogado_responsavel
+        else None,
+    ),
+    "andamentos": Campo((), None),
+    "total_andamentos": Campo((), None),
+    "versao": coluna(Processo.versao),
+    "created_at": coluna(Processo.created_at, iso),
+    "updated_at": coluna(Processo.updated_at, iso),
+}
+
+
+def serializar_andamento(andamento):
+    """Converta um andamento no formato de resposta da API."""
+    return {
+        "id": andamento.id,
+        "data_andamento": andamento.data_andamento.isoformat(),
+        "tipo_andamento": andamento.tipo_andamento,
+        "descricao": andamento.descricao,
+        "observacoes": andamento.observacoes,
+        "documento_anexo": andamento.documento_anexo,
+        "anexo": {
+            "nome": andamento.anexo_nome,
+            "sha256": andamento.anexo.sha256,
+            "tamanho": andamento.anexo.tamanho,
+            "url": url_for(
+                "processos.baixar_anexo_andamento",
+                processo_id=andamento.processo_id,
+                andamento_id=andamento.id,
+            ),
+        }
+        if andamento.anexo
+        else None,
+        "usuario": {
+            "id": andamento.usuario.id,
+            "nome": andamento.usuario.nome,
+        }
+        if andamento.usuario
+        else None,
+        "created_at": andamento.created_at.isoformat(),
+    }
 
+
+def _usuario_requisicao():
+    """Retorne o ID do usuário do token da requisição, ou None sem token.
+
+    As rotas de criação não exigem autenticação: o token, se enviado, apenas
+    identifica o autor dos andamentos.
+    """
+    verify_jwt_in_request(optional=True)
+    identidade = get_jwt_identity()
+    return int(identidade) if identidade is not None else None
+
+
+def _serializar_lista(processos, campos):
+    """Serialize processos da listagem contando andamentos em uma única consulta."""
+    total_andamentos = {}
+    if "total_andamentos" in campos:
+        total_andamentos = contar_por(
+            Andamento.processo_id, [processo.id for processo in processos]
+        )
+
+    processos_data = []
+    for processo in processos:
+        processo_data = serializar_campos(processo, campos, CAMPOS_LISTAGEM)
+        if "total_andamentos" in campos:
+            processo_data["total_andamentos"] = total_andamentos.get(processo.id, 0)
+        processos_data.append(processo_data)
+    return processos_data
+
+
+def _buscar_lote(query, campos):
+    """Responda à busca em lote (``?ids=3,1,2``) mantendo a ordem solicitada.
+
+    Os IDs ausentes da tabela principal são procurados no arquivo; os que não
+    existem em nenhum dos dois são listados em ``nao_encontrados``.
+    """
+    try:
+        ids = separar_ids(request.args["ids"], app.config["LOTE_IDS_MAXIMO"])
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    processos = buscar_em_blocos(query, Processo.id, ids)
+    arquivados = set()
+    encontrados = {processo.id for processo in processos}
+    ausentes = [id_ for id_ in ids if id_ not in encontrados]
+    if ausentes:
+        do_arquivo = processos_arquivados(ausentes)
+        arquivados = {processo.id for processo in do_arquivo}
+        processos += do_arquivo
+
+    processos, nao_encontrados = ordenar_por_ids(processos, ids)
+    processos_data = _serializar_lista(processos, campos)
+    for processo_data, processo in zip(processos_data, processos):
+        if processo.id in arquivados:
+            processo_data["arquivado"] = True
+
+    return jsonify(
+        {"processos": processos_data, "nao_encontrados": nao_encontrados}
+    ), 200
+
+
+@processos_bp.get("/", strict_slashes=False)
 @processos_bp.get("/listagem")
 def listar_processos():
-    """Liste todos os processos com opção de filtros e paginação."""
+    """Liste todos os processos com opção de filtros e paginação.
+
+    Aceita ``fields``/``include`` para restringir os campos retornados; apenas
+    as colunas e relacionamentos necessários são carregados do banco. Com
+    ``ids`` retorna apenas os processos informados, sem paginação.
+    """
     try:
         # Parâmetros de consulta
         page = request.args.get("page", 1, type=int)
@@ -33,8 +275,37 @@ def listar_processos():
         cliente_id = request.args.get("cliente_id", type=int)
         prioridade = request.args.get("prioridade", "")
 
-        # Monta query base com joins para otimizar consultas
-        query = Processo.query
+        # Campos solicitados pelo cliente da API
+        try:
+            campos = selecionar_campos(request.args, CAMPOS_LISTAGEM)
+        except ValueError as e:
+            return jsonify(
+                {"erro": str(e), "campos_permitidos": list(CAMPOS_LISTAGEM)}
+            ), 400
+
+        # Monta query base carregando apenas as colunas necessárias
+        query = Processo.query.options(
+            load_only(*colunas_selecionadas(campos, CAMPOS_LISTAGEM, Processo.id))
+        )
+
+        # Carrega relacionamentos somente quando solicitados
+        if "cliente" in campos:
+            query = query.options(
+                joinedload(Processo.cliente).load_only(
+                    Cliente.id, Cliente.nome, Cliente.cpf_cnpj
+                )
+            )
+
+        if "advogado" in campos:
+            query = query.options(
+                joinedload(Processo.advogado_responsavel).load_only(
+                    Advogado.id, Advogado.nome, Advogado.oab_numero, Advogado.oab_estado
+                )
+            )
+
+        # Busca em lote: uma consulta IN (em blocos), na ordem solicitada
+        if "ids" in request.args:
+            return _buscar_lote(query, campos)
 
         # # Filtro de busca por número, título ou nome do cliente
         # if search:
@@ -66,46 +337,8 @@ def listar_processos():
             page=page, per_page=per_page, error_out=False
         )
 
-        # Monta resposta
-        processos_data = []
-        for processo in processos_paginados.items:
-            processos_data.append(
-                {
-                    "id": processo.id,
-                    "descricao": processo.descricao if processo.descricao else "",
-                    "numero_processo": processo.numero_processo,
-                    "numero_formatado": processo.numero_formatado,
-                    "numero_interno": processo.numero_interno,
-                    "titulo": processo.titulo,
-                    "area_juridica": processo.area_juridica,
-                    "status": processo.status,
-                    "status_descricao": processo.status_descricao,
-                    "prioridade": processo.prioridade,
-                    "prioridade_descricao": processo.prioridade_descricao,
-                    "data_distribuicao": processo.data_distribuicao.isoformat()
-                    if processo.data_distribuicao
-                    else None,
-                    "valor_causa": float(processo.valor_causa)
-                    if processo.valor_causa
-                    else None,
-                    "cliente": {
-                        "id": processo.cliente.id,
-                        "nome": processo.cliente.nome,
-                        "cpf_cnpj": processo.cliente.cpf_cnpj,
-                    }
-                    if processo.cliente
-                    else {},
-                    "advogado": {
-                        "id": processo.advogado_responsavel.id,
-                        "nome": processo.advogado_responsavel.nome,
-                        "oab_completa": processo.advogado_responsavel.oab_completa,
-                    }
-                    if processo.advogado_responsavel
-                    else {},
-                    "total_andamentos": len(processo.andamentos),
-                    "created_at": processo.created_at.isoformat(),
-                }
-            )
+        # Monta resposta contando andamentos da página em uma única consulta
+        processos_data = _serializar_lista(processos_paginados.items, campos)
 
         return jsonify(
             {
@@ -128,9 +361,60 @@ def listar_processos():
         return jsonify({"erro": "Erro interno do servidor"}), 500
 
 
+@processos_bp.get("/parados")
+def listar_processos_parados():
+    """Liste processos sem andamentos há mais de ``dias`` (padrão 90).
+
+    ``status`` aceita uma lista separada por vírgulas (padrão ``em_andamento``)
+    e ``advogado_id`` restringe ao responsável. Os mais antigos vêm primeiro.
+    """
+    try:
+        dias = request.args.get("dias", 90, type=int)
+        if dias < 1:
+            return jsonify({"erro": "Dias deve ser um inteiro positivo"}), 400
+
+        page = max(1, request.args.get("page", 1, type=int))
+        per_page = max(1, min(request.args.get("per_page", 20, type=int), 100))
+        status = [
+            item.strip()
+            for item in request.args.get("status", "").split(",")
+            if item.strip()
+        ] or list(STATUS_PARADOS_PADRAO)
+        advogado_id = request.args.get("advogado_id", type=int)
+
+        # Faixa do índice (status, ultima_movimentacao_em) para itens e total
+        query, limite = consulta_parados(dias, status, advogado_id)
+        processos = db.session.scalars(
+            query.limit(per_page).offset((page - 1) * per_page)
+        ).all()
+        total = contar_parados(dias, status, advogado_id)
+
+        agora = datetime.utcnow()
+        return jsonify(
+            {
+                "processos": [serializar_parado(p, agora) for p in processos],
+                "sem_movimentacao_desde": limite.isoformat(),
+                "pagination": {
+                    "page": page,
+                    "per_page": per_page,
+                    "total": total,
+                    "pages": -(-total // per_page),
+                    "has_next": page * per_page < total,
+                    "has_prev": page > 1,
+                },
+            }
+        ), 200
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
 @processos_bp.post("/criar_processo")
 def criar_processo():
     """Crie um novo processo jurídico no sistema."""
+    # Token inválido é respondido pelos manipuladores do flask_jwt_extended
+    usuario_id = _usuario_requisicao()
+
     try:
         # Obtém dados do request
         data_json = request.get_json()
@@ -154,20 +438,6 @@ def criar_processo():
             if not data.get(campo):
                 return jsonify({"erro": f"Campo {campo} é obrigatório"}), 400
 
-        # Verifica se número do processo já existe
-        if Processo.query.filter_by(numero_processo=data["numero_processo"]).first():
-            return jsonify({"erro": "Número do processo já cadastrado"}), 409
-
-        # # Verifica se cliente existe
-        # cliente = Cliente.query.get(data["cliente_id"])
-        # if not cliente:
-        #     return jsonify({"erro": "Cliente não encontrado"}), 404
-
-        # # Verifica se advogado existe
-        # advogado = Advogado.query.get(data["advogado_id"])
-        # if not advogado:
-        #     return jsonify({"erro": "Advogado não encontrado"}), 404
-
         # Cria novo processo
         processo = Processo(
             numero_processo=data["numero_processo"],
@@ -193,19 +463,25 @@ def criar_processo():
             advogado_id=data.get("advogado"),
         )
 
-        # Salva no banco de dados
-        processo.save()
-
-        # Cria andamento inicial se fornecido
+        # Cria andamento inicial se fornecido, gravado na mesma transação
         if data.get("andamento_inicial"):
-            andamento = Andamento(
-                data_andamento=datetime.utcnow(),
-                tipo_andamento="Abertura do Processo",
-                descricao=data["andamento_inicial"],
-                processo_id=processo.id,
-                usuario_id=get_jwt_identity(),
+            processo.andamentos.append(
+                Andamento(
+                    data_andamento=datetime.utcnow(),
+                    tipo_andamento="Abertura do Processo",
+                    descricao=data["andamento_inicial"],
+                    usuario_id=usuario_id,
+                )
             )
-            andamento.save()
+
+        # Salva no banco de dados: número duplicado e cliente/advogado
+        # inexistentes violam as restrições da tabela, sem consultas prévias.
+        # O número de processo arquivado, fora da restrição única, é verificado
+        # com o bloqueio de escrita (o arquivamento não ocorre em paralelo)
+        with coordenador_escrita.transacao() as session:
+            if numero_arquivado(processo.numero_processo):
+                raise NumeroProcessoEmUso([processo.numero_processo])
+            session.add(processo)
 
         return jsonify(
             {
@@ -219,96 +495,115 @@ def criar_processo():
             }
         ), 200
 
+    except NumeroProcessoEmUso:
+        return jsonify({"erro": "Número do processo já cadastrado"}), 409
+
+    except ERROS_ESCRITA:
+        raise
+
     except Exception:
         return jsonify({"erro": "Erro interno do servidor"}), 500
 
 
 @processos_bp.route("/<int:processo_id>", methods=["GET"])
 def obter_processo(processo_id):
-    """Obtenha detalhes completos de um processo específico."""
+    """Obtenha detalhes completos de um processo específico.
+
+    Aceita ``fields``/``include`` para restringir os campos retornados; os
+    relacionamentos não solicitados não são consultados.
+    """
     try:
+        # Campos solicitados pelo cliente da API
+        try:
+            campos = selecionar_campos(request.args, CAMPOS_DETALHE)
+        except ValueError as e:
+            return jsonify(
+                {"erro": str(e), "campos_permitidos": list(CAMPOS_DETALHE)}
+            ), 400
+
+        # Quantidade de andamentos recentes incorporados ao detalhe
+        limite = request.args.get(
+            "andamentos_limite", app.config["ANDAMENTOS_DETALHE_LIMITE"], type=int
+        )
+        limite = max(0, min(limite, app.config["ANDAMENTOS_DETALHE_LIMITE_MAXIMO"]))
+
+        # Resposta em cache enquanto a impressão (versões) do processo não mudar;
+        # com o cache desabilitado a impressão não é consultada
+        impressao = None
+        if cache_registros.habilitado:
+            impressao = impressao_processo(processo_id, campos)
+        chave = variante(campos, limite)
+        if impressao is not None:
+            dados = cache_registros.obter("processos", processo_id, chave, impressao)
+            if dados is not None:
+                return Response(dados, mimetype="application/json"), 200, {
+                    "ETag": gerar_etag(impressao[0])
+                }
+
+        # Monta opções de carga apenas com colunas e relacionamentos necessários
+        opcoes = [
+            load_only(
+                *colunas_selecionadas(
+                    campos, CAMPOS_DETALHE, Processo.id, Processo.versao
+                )
+            )
+        ]
+
+        if "cliente" in campos:
+            opcoes.append(joinedload(Processo.cliente))
+
+        if "advogado" in campos:
+            opcoes.append(joinedload(Processo.advogado_responsavel))
+
         # Busca processo pelo ID com relacionamentos
-        processo = Processo.query.options(
-            db.joinedload(Processo.cliente),
-            db.joinedload(Processo.advogado_responsavel),
-            db.joinedload(Processo.andamentos).joinedload(Andamento.usuario),
-        ).get(processo_id)
+        processo = db.session.get(Processo, processo_id, options=opcoes)
+
+        # Processos encerrados podem ter sido movidos para o arquivo
+        arquivado = False
+        if not processo:
+            processo = obter_processo_arquivado(processo_id)
+            arquivado = processo is not None
 
         if not processo:
             return jsonify({"erro": "Processo não encontrado"}), 404
 
-        # Monta lista de andamentos
-        andamentos_data = []
-        for andamento in processo.andamentos:
-            andamentos_data.append(
-                {
-                    "id": andamento.id,
-                    "data_andamento": andamento.data_andamento.isoformat(),
-                    "tipo_andamento": andamento.tipo_andamento,
-                    "descricao": andamento.descricao,
-                    "observacoes": andamento.observacoes,
-                    "documento_anexo": andamento.documento_anexo,
-                    "usuario": {
-                        "id": andamento.usuario.id,
-                        "nome": andamento.usuario.nome,
-                    }
-                    if andamento.usuario
-                    else None,
-                    "created_at": andamento.created_at.isoformat(),
-                }
+        processo_data = serializar_campos(processo, campos, CAMPOS_DETALHE)
+
+        # Incorpora apenas os andamentos mais recentes (lista completa é paginada
+        # em /<id>/andamentos), percorrendo o índice (processo_id, data_andamento)
+        if "andamentos" in campos:
+            if arquivado:
+                andamentos = andamentos_arquivados(processo.id, limite)
+            else:
+                andamentos = processo.get_andamentos_recentes(limite).options(
+                    joinedload(Andamento.usuario), joinedload(Andamento.anexo)
+                )
+            processo_data["andamentos"] = [
+                serializar_andamento(andamento) for andamento in andamentos
+            ]
+
+        if "total_andamentos" in campos:
+            if arquivado:
+                processo_data["total_andamentos"] = contar_andamentos_arquivados(
+                    processo.id
+                )
+            else:
+                processo_data["total_andamentos"] = contar_por(
+                    Andamento.processo_id, [processo.id]
+                ).get(processo.id, 0)
+
+        if arquivado:
+            processo_data["arquivado"] = True
+
+        # Guarda a resposta serializada para as próximas leituras
+        resposta = jsonify(processo_data)
+        if impressao is not None and not arquivado:
+            cache_registros.guardar(
+                "processos", processo_id, chave, impressao, resposta.get_data()
             )
 
-        # Retorna dados completos do processo
-        return jsonify(
-            {
-                "id": processo.id,
-                "numero_processo": processo.numero_processo,
-                "numero_formatado": processo.numero_formatado,
-                "numero_interno": processo.numero_interno,
-                "titulo": processo.titulo,
-                "descricao": processo.descricao,
-                "area_juridica": processo.area_juridica,
-                "tipo_acao": processo.tipo_acao,
-                "status": processo.status,
-                "status_descricao": processo.status_descricao,
-                "data_distribuicao": processo.data_distribuicao.isoformat()
-                if processo.data_distribuicao
-                else None,
-                "data_conclusao": processo.data_conclusao.isoformat()
-                if processo.data_conclusao
-                else None,
-                "tribunal": processo.tribunal,
-                "vara": processo.vara,
-                "juiz": processo.juiz,
-                "valor_causa": float(processo.valor_causa)
-                if processo.valor_causa
-                else None,
-                "valor_honorarios": float(processo.valor_honorarios)
-                if processo.valor_honorarios
-                else None,
-                "forma_pagamento": processo.forma_pagamento,
-                "prioridade": processo.prioridade,
-                "prioridade_descricao": processo.prioridade_descricao,
-                "observacoes": processo.observacoes,
-                "observacoes_internas": processo.observacoes_internas,
-                "cliente": {
-                    "id": processo.cliente.id,
-                    "nome": processo.cliente.nome,
-                    "cpf_cnpj": processo.cliente.cpf_cnpj,
-                    "email": processo.cliente.email,
-                    "telefone": processo.cliente.telefone,
-                },
-                "advogado": {
-                    "id": processo.advogado_responsavel.id,
-                    "nome": processo.advogado_responsavel.nome,
-                    "oab_completa": processo.advogado_responsavel.oab_completa,
-                    "email": processo.advogado_responsavel.email,
-                },
-                "andamentos": andamentos_data,
-                "created_at": processo.created_at.isoformat(),
-                "updated_at": processo.updated_at.isoformat(),
-            }
-        ), 200
+        # Retorna dados do processo
+        return resposta, 200, {"ETag": gerar_etag(processo.versao)}
 
     except Exception:
         return jsonify({"erro": "Erro interno do servidor"}), 500
@@ -316,36 +611,25 @@ def obter_processo(processo_id):
 
 @processos_bp.route("/<int:processo_id>", methods=["PUT"])
 def atualizar_processo(processo_id):
-    """Atualize informações de um processo existente."""
+    """Atualize informações de um processo existente.
+
+    A atualização é condicionada à versão informada no cabeçalho If-Match,
+    retornando 412 quando o processo foi alterado por outra requisição.
+    """
     try:
-        # Busca processo pelo ID
-        processo = Processo.query.get(processo_id)
+        # Obtém versões aceitas a partir do cabeçalho If-Match
+        if_match = request.headers.get("If-Match")
+        if not if_match and app.config["REQUIRE_IF_MATCH"]:
+            return jsonify({"erro": "Cabeçalho If-Match é obrigatório"}), 428
 
-        if not processo:
-            return jsonify({"erro": "Processo não encontrado"}), 404
+        try:
+            versoes = versoes_if_match(if_match)
+        except ValueError:
+            return jsonify({"erro": "Cabeçalho If-Match inválido"}), 400
 
         # Obtém dados do request
         data = request.get_json()
 
-        # Verifica se número do processo já existe em outro processo
-        if (
-            "numero_processo" in data
-            and data["numero_processo"] != processo.numero_processo
-        ):
-            if Processo.query.filter_by(
-                numero_processo=data["numero_processo"]
-            ).first():
-                return jsonify({"erro": "Número do processo já cadastrado"}), 409
-
-        # Valida IDs de relacionamentos se alterados
-        if "cliente_id" in data and data["cliente_id"] != processo.cliente_id:
-            if not Cliente.query.get(data["cliente_id"]):
-                return jsonify({"erro": "Cliente não encontrado"}), 404
-
-        if "advogado_id" in data and data["advogado_id"] != processo.advogado_id:
-            if not Advogado.query.get(data["advogado_id"]):
-                return jsonify({"erro": "Advogado não encontrado"}), 404
-
         # Atualiza campos permitidos
         campos_atualizaveis = [
             "numero_processo",
@@ -368,27 +652,46 @@ def atualizar_processo(processo_id):
             "advogado_id",
         ]
 
-        for campo in campos_atualizaveis:
-            if campo in data:
-                setattr(processo, campo, data[campo])
+        valores = {campo: data[campo] for campo in campos_atualizaveis if campo in data}
 
         # Atualiza datas especiais
-        if "data_distribuicao" in data:
-            processo.data_distribuicao = (
-                datetime.fromisoformat(data["data_distribuicao"])
-                if data["data_distribuicao"]
-                else None
-            )
+        for campo in ("data_distribuicao", "data_conclusao"):
+            if campo in data:
+                valores[campo] = (
+                    datetime.fromisoformat(data[campo]).date() if data[campo] else None
+                )
 
-        if "data_conclusao" in data:
-            processo.data_conclusao = (
-                datetime.fromisoformat(data["data_conclusao"])
-                if data["data_conclusao"]
-                else None
-            )
+        # Número de processo arquivado continua reservado
+        if valores.get("numero_processo") and numero_arquivado(
+            valores["numero_processo"]
+        ):
+            return jsonify({"erro": "Número do processo já cadastrado"}), 409
 
-        # Salva alterações
-        db.session.commit()
+        # Executa UPDATE condicionado à versão esperada
+        processo = atualizar_versionado(
+            Processo,
+            processo_id,
+            versoes,
+            valores,
+            [
+                Processo.id,
+                Processo.numero_processo,
+                Processo.titulo,
+                Processo.status,
+            ],
+        )
+
+        if not processo:
+            versao = versao_atual(Processo, processo_id)
+            if versao is None:
+                return jsonify({"erro": "Processo não encontrado"}), 404
+
+            return jsonify(
+                {
+                    "erro": "Processo alterado por outra requisição",
+                    "versao_atual": versao,
+                }
+            ), 412, {"ETag": gerar_etag(versao)}
 
         return jsonify(
             {
@@ -398,9 +701,13 @@ def atualizar_processo(processo_id):
                     "numero_processo": processo.numero_processo,
                     "titulo": processo.titulo,
                     "status": processo.status,
+                    "versao": processo.versao,
                 },
             }
-        ), 200
+        ), 200, {"ETag": gerar_etag(processo.versao)}
+
+    except ERROS_ESCRITA:
+        raise
 
     except Exception:
         return jsonify({"erro": "Erro interno do servidor"}), 500
@@ -410,43 +717,49 @@ def atualizar_processo(processo_id):
 def listar_andamentos(processo_id):
     """Liste todos os andamentos de um processo específico."""
     try:
-        # Verifica se processo existe
-        processo = Processo.query.get(processo_id)
-        if not processo:
-            return jsonify({"erro": "Processo não encontrado"}), 404
-
         # Parâmetros de consulta
         page = request.args.get("page", 1, type=int)
         per_page = request.args.get("per_page", 20, type=int)
 
-        # Busca andamentos com paginação
-        andamentos_query = Andamento.query.filter_by(processo_id=processo_id).order_by(
-            Andamento.data_andamento.desc()
+        # Verifica se processo existe; processos arquivados são lidos do arquivo
+        if not db.session.get(Processo, processo_id, options=[load_only(Processo.id)]):
+            if not obter_processo_arquivado(processo_id):
+                return jsonify({"erro": "Processo não encontrado"}), 404
+
+            total = contar_andamentos_arquivados(processo_id)
+            paginas = (total + per_page - 1) // per_page if per_page > 0 else 0
+            andamentos = andamentos_arquivados(
+                processo_id, per_page, (page - 1) * per_page
+            )
+            return jsonify(
+                {
+                    "andamentos": [serializar_andamento(a) for a in andamentos],
+                    "pagination": {
+                        "page": page,
+                        "per_page": per_page,
+                        "total": total,
+                        "pages": paginas,
+                        "has_next": page < paginas,
+                        "has_prev": page > 1,
+                    },
+                    "arquivado": True,
+                }
+            ), 200
+
+        # Busca andamentos com paginação, ordenados pelo índice (processo_id, data)
+        andamentos_query = (
+            Andamento.query.filter_by(processo_id=processo_id)
+            .options(joinedload(Andamento.usuario), joinedload(Andamento.anexo))
+            .order_by(Andamento.data_andamento.desc())
         )
         andamentos_paginados = andamentos_query.paginate(
             page=page, per_page=per_page, error_out=False
         )
 
         # Monta resposta
-        andamentos_data = []
-        for andamento in andamentos_paginados.items:
-            andamentos_data.append(
-                {
-                    "id": andamento.id,
-                    "data_andamento": andamento.data_andamento.isoformat(),
-                    "tipo_andamento": andamento.tipo_andamento,
-                    "descricao": andamento.descricao,
-                    "observacoes": andamento.observacoes,
-                    "documento_anexo": andamento.documento_anexo,
-                    "usuario": {
-                        "id": andamento.usuario.id,
-                        "nome": andamento.usuario.nome,
-                    }
-                    if andamento.usuario
-                    else None,
-                    "created_at": andamento.created_at.isoformat(),
-                }
-            )
+        andamentos_data = [
+            serializar_andamento(andamento) for andamento in andamentos_paginados.items
+        ]
 
         return jsonify(
             {
@@ -469,12 +782,10 @@ def listar_andamentos(processo_id):
 @processos_bp.route("/<int:processo_id>/andamentos", methods=["POST"])
 def criar_andamento(processo_id):
     """Crie um novo andamento para um processo específico."""
-    try:
-        # Verifica se processo existe
-        processo = Processo.query.get(processo_id)
-        if not processo:
-            return jsonify({"erro": "Processo não encontrado"}), 404
+    # Token inválido é respondido pelos manipuladores do flask_jwt_extended
+    usuario_id = _usuario_requisicao()
 
+    try:
         # Obtém dados do request
         data = request.get_json()
 
@@ -484,6 +795,13 @@ def criar_andamento(processo_id):
                 {"erro": "Tipo e descrição do andamento são obrigatórios"}
             ), 400
 
+        # Anexo enviado previamente em /api/anexos, referenciado pelo SHA-256
+        anexo = None
+        if data.get("anexo"):
+            anexo = obter_anexo(data["anexo"])
+            if not anexo:
+                return jsonify({"erro": "Anexo não encontrado"}), 400
+
         # Cria novo andamento
         andamento = Andamento(
             data_andamento=datetime.fromisoformat(data["data_andamento"])
@@ -493,11 +811,15 @@ def criar_andamento(processo_id):
             descricao=data["descricao"],
             observacoes=data.get("observacoes"),
             documento_anexo=data.get("documento_anexo"),
+            anexo_id=anexo.id if anexo else None,
+            anexo_nome=(data.get("anexo_nome") or anexo.sha256)[:255]
+            if anexo
+            else None,
             processo_id=processo_id,
-            usuario_id=get_jwt_identity(),
+            usuario_id=usuario_id,
         )
 
-        # Salva no banco de dados
+        # Salva no banco de dados (processo inexistente viola a chave estrangeira)
         andamento.save()
 
         return jsonify(
@@ -511,13 +833,139 @@ def criar_andamento(processo_id):
             }
         ), 201
 
+    except ERROS_ESCRITA:
+        raise
+
     except Exception:
         return jsonify({"erro": "Erro interno do servidor"}), 500
 
 
+@processos_bp.get("/<int:processo_id>/historico")
+def listar_historico_processo(processo_id):
+    """Liste as alterações do processo (valores anterior e novo), recentes primeiro.
+
+    A paginação é por chave: repita a chamada com ``antes`` igual ao
+    ``proximo`` retornado enquanto ele não for nulo.
+    """
+    try:
+        limite = min(
+            request.args.get("limite", app.config["HISTORICO_LIMITE"], type=int),
+            app.config["HISTORICO_LIMITE_MAXIMO"],
+        )
+        if limite < 1:
+            return jsonify({"erro": "Limite deve ser maior que zero"}), 400
+
+        antes = request.args.get("antes")
+        if antes is not None:
+            try:
+                antes = int(antes)
+            except ValueError:
+                return jsonify({"erro": "Parâmetro antes inválido"}), 400
+
+        entradas, proximo = listar_historico(processo_id, limite, antes)
+
+        # O histórico é mantido após a exclusão: sem entradas, confirma o processo
+        if not entradas and antes is None:
+            if not db.session.get(
+                Processo, processo_id, options=[load_only(Processo.id)]
+            ) and not obter_processo_arquivado(processo_id):
+                return jsonify({"erro": "Processo não encontrado"}), 404
+
+        return jsonify(
+            {
+                "historico": [serializar_entrada(e) for e in entradas],
+                "proximo": proximo,
+            }
+        ), 200
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@processos_bp.route(
+    "/<int:processo_id>/andamentos/<int:andamento_id>/anexo", methods=["GET"]
+)
+def baixar_anexo_andamento(processo_id, andamento_id):
+    """Baixe o anexo de um andamento com o nome original do arquivo."""
+    try:
+        andamento = db.session.get(
+            Andamento, andamento_id, options=[joinedload(Andamento.anexo)]
+        )
+
+        # Andamentos de processos arquivados são lidos do arquivo
+        if not andamento:
+            andamento = obter_andamento_arquivado(andamento_id)
+
+        if not andamento or andamento.processo_id != processo_id:
+            return jsonify({"erro": "Andamento não encontrado"}), 404
+
+        if not andamento.anexo:
+            return jsonify({"erro": "Andamento não possui anexo"}), 404
+
+        return enviar_anexo(andamento.anexo, andamento.anexo_nome)
+
+    except FileNotFoundError:
+        return jsonify({"erro": "Arquivo do anexo não encontrado"}), 404
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
+
+
+@processos_bp.get("/stream")
+def stream_alteracoes():
+    """Transmita via Server-Sent Events novos andamentos e alterações de processos.
+
+    Aceita filtros ``processo_id``, ``advogado_id`` e ``cliente_id``. Conexões
+    retomadas com ``Last-Event-ID`` recebem os eventos perdidos do buffer
+    recente ou um evento ``reset`` indicando ressincronização via /api/sync.
+    """
+    # Filtros opcionais do stream
+    filtros = {}
+    for campo in FILTROS_STREAM:
+        valor = request.args.get(campo, type=int)
+        if valor is not None:
+            filtros[campo] = valor
+
+    ultimo_id = request.headers.get("Last-Event-ID") or request.args.get(
+        "last_event_id"
+    )
+
+    try:
+        assinatura = canal_eventos.assinar(filtros, ultimo_id)
+    except LimiteConexoesExcedido:
+        return jsonify(
+            {"erro": "Limite de conexões de stream atingido, tente novamente"}
+        ), 503, {"Retry-After": "5"}
+
+    def gerar():
+        try:
+            yield f"retry: {canal_eventos.heartbeat * 1000}\n\n"
+            while True:
+                try:
+                    evento = assinatura.fila.get(timeout=canal_eventos.heartbeat)
+                except queue.Empty:
+                    # Comentário SSE mantém a conexão viva em proxies
+                    yield ": heartbeat\n\n"
+                    continue
+
+                if evento is None:
+                    break
+                yield formatar_sse(evento)
+        finally:
+            canal_eventos.cancelar(assinatura)
+
+    return Response(
+        gerar(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @processos_bp.after_request
 def add_headers(response: Response) -> Response:
     response.headers["Access-Control-Allow-Origin"] = "*"
-    response.headers["Access-Control-Allow-Headers"] = "Content-Type,Authorization"
+    response.headers["Access-Control-Allow-Headers"] = (
+        "Content-Type,Authorization,Idempotency-Key"
+    )
     response.headers["Access-Control-Allow-Methods"] = "GET,PUT,POST,DELETE,OPTIONS"
     return response
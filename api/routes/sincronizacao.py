@@ -0,0 +1,136 @@
+"""Defina rota de sincronização incremental (delta-sync) para clientes offline."""
+
+from flask import Blueprint, jsonify, request
+from flask import current_app as app
+from sqlalchemy.orm import joinedload, load_only
+
+from api.models.advogado import Advogado
+from api.models.cliente import Cliente
+from api.models.processo import Andamento, Processo
+from api.routes.advogados import CAMPOS_DETALHE as CAMPOS_ADVOGADO
+from api.routes.clientes import CAMPOS_DETALHE as CAMPOS_CLIENTE
+from api.routes.processos import CAMPOS_DETALHE as CAMPOS_PROCESSO
+from api.routes.processos import serializar_andamento
+from api.services.campos import (
+    buscar_em_blocos,
+    colunas_selecionadas,
+    serializar_campos,
+)
+from api.services.sincronizacao import TABELAS_SINCRONIZADAS, listar_alteracoes
+
+# Cria blueprint para rota de sincronização
+sincronizacao_bp = Blueprint("sincronizacao", __name__)
+
+
+def _campos_escalares(disponiveis):
+    """Retorne os campos do detalhe que não dependem de consultas adicionais."""
+    return [campo for campo, spec in disponiveis.items() if spec.valor is not None]
+
+
+def _carregar(tabela, ids):
+    """Carregue e serialize os registros atuais de uma tabela sincronizada.
+
+    Returns:
+        tuple[list[dict], set[int]]: Registros serializados e IDs inativos
+    """
+    if tabela == "andamentos":
+        query = Andamento.query.options(
+            joinedload(Andamento.usuario), joinedload(Andamento.anexo)
+        )
+        registros = buscar_em_blocos(query, Andamento.id, ids)
+        return [
+            {**serializar_andamento(a), "processo_id": a.processo_id}
+            for a in registros
+        ], set()
+
+    modelo, disponiveis = {
+        "processos": (Processo, CAMPOS_PROCESSO),
+        "clientes": (Cliente, CAMPOS_CLIENTE),
+        "advogados": (Advogado, CAMPOS_ADVOGADO),
+    }[tabela]
+
+    campos = _campos_escalares(disponiveis)
+    query = modelo.query.options(
+        load_only(*colunas_selecionadas(campos, disponiveis, modelo.id))
+    )
+    if tabela == "processos":
+        query = query.options(
+            joinedload(Processo.cliente), joinedload(Processo.advogado_responsavel)
+        )
+
+    registros = buscar_em_blocos(query, modelo.id, ids)
+
+    # Clientes e advogados excluídos logicamente (ativo=False) viram tombstones
+    inativos = {r.id for r in registros if getattr(r, "ativo", True) is False}
+    return [
+        serializar_campos(r, campos, disponiveis)
+        for r in registros
+        if r.id not in inativos
+    ], inativos
+
+
+@sincronizacao_bp.route("/", methods=["GET"], strict_slashes=False)
+def sincronizar():
+    """Retorne as alterações posteriores ao token ``since`` em lotes limitados.
+
+    Cada tabela traz os registros criados/atualizados em ``atualizados`` e os
+    IDs removidos (ou excluídos logicamente) em ``removidos``. O cliente deve
+    repetir a chamada com o ``token`` retornado enquanto ``tem_mais`` for true.
+    """
+    try:
+        # Token da última sincronização do cliente
+        try:
+            desde = int(request.args.get("since", 0))
+        except ValueError:
+            return jsonify({"erro": "Token de sincronização inválido"}), 400
+
+        if desde < 0:
+            return jsonify({"erro": "Token de sincronização inválido"}), 400
+
+        limite = min(
+            request.args.get("limite", app.config["SYNC_LOTE_PADRAO"], type=int),
+            app.config["SYNC_LOTE_MAXIMO"],
+        )
+        if limite < 1:
+            return jsonify({"erro": "Limite deve ser maior que zero"}), 400
+
+        # Lê o próximo lote do log de alterações
+        operacoes, token, tem_mais = listar_alteracoes(desde, limite)
+
+        # Agrupa os IDs por tabela separando atualizações e remoções
+        alteracoes = {}
+        for tabela in TABELAS_SINCRONIZADAS:
+            atualizados = {
+                registro_id
+                for (t, registro_id), operacao in operacoes.items()
+                if t == tabela and operacao == "upsert"
+            }
+            removidos = {
+                registro_id
+                for (t, registro_id), operacao in operacoes.items()
+                if t == tabela and operacao == "delete"
+            }
+
+            registros, inativos = [], set()
+            if atualizados:
+                registros, inativos = _carregar(tabela, atualizados)
+
+            # Registros do log que não existem mais também são tombstones
+            encontrados = {r["id"] for r in registros} | inativos
+            removidos |= inativos | (atualizados - encontrados)
+
+            alteracoes[tabela] = {
+                "atualizados": registros,
+                "removidos": sorted(removidos),
+            }
+
+        return jsonify(
+            {
+                "token": str(token),
+                "tem_mais": tem_mais,
+                "alteracoes": alteracoes,
+            }
+        ), 200
+
+    except Exception:
+        return jsonify({"erro": "Erro interno do servidor"}), 500
@@ -146,9 +146,6 @@ class RegistroSchema(Schema):
     nome = fields.Str(required=True, validate=validate.Length(min=2, max=100))
     email = fields.Email(required=True)
     senha = fields.Str(required=True, validate=validate.Length(min=6))
-    tipo_usuario = fields.Str(
-        validate=validate.OneOf(["admin", "advogado", "secretario", "usuario"])
-    )
 
 
 class BuscaSchema(Schema):
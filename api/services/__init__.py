@@ -8,12 +8,14 @@ from api import db
 from api.models.advogado import Advogado
 from api.models.cliente import Cliente
 from api.models.processo import Processo
+from api.sessao import somente_leitura
 
 
 class DashboardService:
     """Forneça dados estatísticos para dashboard administrativo."""
 
     @staticmethod
+    @somente_leitura
     def get_estatisticas_gerais():
         """Obtenha estatísticas gerais do sistema.
 
@@ -69,6 +71,7 @@ class DashboardService:
         }
 
     @staticmethod
+    @somente_leitura
     def get_processos_recentes(limite=10):
         """Obtenha lista dos processos mais recentes.
 
@@ -104,6 +107,7 @@ class DashboardService:
         return processos_data
 
     @staticmethod
+    @somente_leitura
     def get_advogados_produtividade():
         """Obtenha estatísticas de produtividade dos advogados.
 
@@ -141,11 +145,40 @@ class DashboardService:
 
         return produtividade_data
 
+    @staticmethod
+    @somente_leitura
+    def get_processos_parados(dias=90, limite=10):
+        """Obtenha os processos sem movimentação há mais tempo.
+
+        Args:
+            dias (int): Dias sem andamentos para considerar o processo parado
+            limite (int): Número máximo de processos a retornar
+
+        Returns:
+            dict: Total de processos parados e os mais antigos
+        """
+        from api.services.movimentacao import (
+            consulta_parados,
+            contar_parados,
+            serializar_parado,
+        )
+
+        # Total e lista percorrem a mesma faixa do índice de movimentação
+        query, _ = consulta_parados(dias)
+        processos = db.session.scalars(query.limit(limite)).all()
+
+        return {
+            "dias": dias,
+            "total": contar_parados(dias),
+            "processos": [serializar_parado(processo) for processo in processos],
+        }
+
 
 class RelatorioService:
     """Forneça serviços para geração de relatórios."""
 
     @staticmethod
+    @somente_leitura
     def processos_por_periodo(data_inicio, data_fim):
         """Gere relatório de processos criados em um período específico.
 
@@ -210,6 +243,7 @@ class RelatorioService:
         }
 
     @staticmethod
+    @somente_leitura
     def clientes_sem_processos():
         """Identifique clientes que não possuem processos associados.
 
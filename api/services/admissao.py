@@ -0,0 +1,257 @@
+"""Controle a admissão de requisições antes que cheguem às views.
+
+Três verificações, em ordem, todas com estruturas em memória do worker:
+
+- limites de paginação: nas listagens de ``ADMISSAO_PAGINACAO_ENDPOINTS``,
+  ``per_page`` e ``limite`` acima do máximo (ou não inteiros) são recusados
+  com 400, em vez de silenciosamente carregarem milhares de registros;
+- taxa por usuário: um token bucket por usuário autenticado (ou IP) limita a
+  taxa sustentada e a rajada; o excesso recebe 429 com ``Retry-After``;
+- concorrência por endpoint: endpoints custosos (listagens e relatórios) têm
+  um número máximo de requisições simultâneas e uma fila curta; quando a
+  fila está cheia, ou a espera se esgota, a requisição é descartada com 503
+  e ``Retry-After`` sem ocupar o banco.
+"""
+
+import math
+import threading
+import time
+
+from flask import g, jsonify, request
+
+# Parâmetros de paginação verificados e a configuração com o máximo de cada um
+PARAMETROS_PAGINACAO = {
+    "per_page": "ADMISSAO_MAXIMO_PER_PAGE",
+    "limite": "ADMISSAO_MAXIMO_LIMITE",
+}
+
+# Endpoints fora do limite de taxa (monitoramento)
+ENDPOINTS_ISENTOS = frozenset({"main.health_check", "main.index", "static"})
+
+# Usuários acompanhados antes de descartar baldes já cheios
+MAXIMO_BALDES = 10000
+
+
+def _usuario():
+    """Identifique o autor da requisição: usuário do token ou endereço IP."""
+    from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+    try:
+        verify_jwt_in_request(optional=True)
+        usuario = get_jwt().get("sub")
+    except Exception:
+        usuario = None
+    if usuario is not None:
+        return f"usuario:{usuario}"
+    return f"ip:{request.remote_addr}"
+
+
+def _recusar(mensagem, status, espera=None):
+    """Monte a resposta de recusa, com ``Retry-After`` em segundos inteiros."""
+    cabecalhos = {}
+    if espera is not None:
+        cabecalhos["Retry-After"] = str(max(1, math.ceil(espera)))
+    return jsonify({"erro": mensagem}), status, cabecalhos
+
+
+class LimiteConcorrencia:
+    """Limite requisições simultâneas de um endpoint com uma fila de espera."""
+
+    def __init__(self, limite, fila):
+        self.limite = limite
+        self.fila = fila
+        self.ativos = 0
+        self.esperando = 0
+        self._condicao = threading.Condition()
+
+    def entrar(self, espera):
+        """Ocupe uma vaga, aguardando até ``espera`` segundos na fila.
+
+        Returns:
+            bool | None: True se entrou direto, False se aguardou na fila e
+            None quando a fila estava cheia ou a espera se esgotou
+        """
+        with self._condicao:
+            # Requisições novas não passam à frente das que já aguardam
+            if self.ativos < self.limite and not self.esperando:
+                self.ativos += 1
+                return True
+            if self.esperando >= self.fila:
+                return None
+
+            self.esperando += 1
+            try:
+                livre = self._condicao.wait_for(
+                    lambda: self.ativos < self.limite, espera
+                )
+            finally:
+                self.esperando -= 1
+            if not livre:
+                return None
+            self.ativos += 1
+            return False
+
+    def sair(self):
+        """Libere a vaga e acorde a próxima requisição da fila."""
+        with self._condicao:
+            self.ativos -= 1
+            self._condicao.notify()
+
+
+class ControleAdmissao:
+    """Aplique limites de paginação, taxa por usuário e concorrência."""
+
+    def __init__(self):
+        self.taxa = 0.0
+        self.rajada = 0
+        self.espera = 0.5
+        self.maximos = {}
+        self.endpoints_paginados = frozenset()
+        self._limites = {}
+        self._baldes = {}
+        self._lock = threading.Lock()
+        self._metricas = self._metricas_zeradas()
+
+    def init_app(self, app):
+        """Leia a configuração e registre os hooks de admissão."""
+        self.taxa = app.config["ADMISSAO_TAXA_POR_SEGUNDO"]
+        self.rajada = max(1, app.config["ADMISSAO_RAJADA"])
+        self.espera = app.config["ADMISSAO_ESPERA_SEGUNDOS"]
+        self.maximos = {
+            parametro: app.config[chave]
+            for parametro, chave in PARAMETROS_PAGINACAO.items()
+        }
+        self.endpoints_paginados = frozenset(app.config["ADMISSAO_PAGINACAO_ENDPOINTS"])
+        self._limites = {
+            endpoint: LimiteConcorrencia(limite, app.config["ADMISSAO_FILA"])
+            for endpoint, limite in app.config["ADMISSAO_CONCORRENCIA"].items()
+        }
+
+        # Paginação e taxa no primeiro hook: recusas não executam os demais.
+        # A vaga no endpoint é o último hook, após o agrupamento de requisições
+        # idênticas (requisições atendidas pelo resultado de outra não ocupam
+        # vaga)
+        app.before_request_funcs.setdefault(None, []).insert(0, self._admitir)
+        app.before_request(self._ocupar_vaga)
+        app.teardown_request(self._liberar)
+
+    @staticmethod
+    def _metricas_zeradas():
+        return {
+            "recusadas_paginacao": 0,
+            "recusadas_taxa": 0,
+            "descartadas_concorrencia": 0,
+            "aguardaram_fila": 0,
+        }
+
+    def _contar(self, chave):
+        with self._lock:
+            self._metricas[chave] += 1
+
+    def metricas(self):
+        """Retorne contadores de recusas e a ocupação de cada endpoint limitado."""
+        with self._lock:
+            metricas = dict(self._metricas)
+            metricas["usuarios_acompanhados"] = len(self._baldes)
+        metricas["taxa_por_segundo"] = self.taxa
+        metricas["endpoints"] = {
+            endpoint: {
+                "limite": limite.limite,
+                "ativos": limite.ativos,
+                "esperando": limite.esperando,
+            }
+            for endpoint, limite in self._limites.items()
+        }
+        return metricas
+
+    # Verificações
+
+    def _paginacao_invalida(self):
+        """Retorne a mensagem de erro se a paginação exceder os limites.
+
+        Outras rotas podem usar ``limite`` com outro significado (ou limitá-lo
+        por conta própria) e não são verificadas.
+        """
+        if request.endpoint not in self.endpoints_paginados:
+            return None
+        for parametro, maximo in self.maximos.items():
+            valor = request.args.get(parametro)
+            if valor is None:
+                continue
+            try:
+                valido = 1 <= int(valor) <= maximo
+            except ValueError:
+                valido = False
+            if not valido:
+                return f"{parametro} deve ser um inteiro entre 1 e {maximo}"
+        return None
+
+    def _consumir(self, chave):
+        """Retire uma ficha do balde do usuário.
+
+        Returns:
+            float: 0 se admitida, ou segundos até a próxima ficha
+        """
+        agora = time.monotonic()
+        with self._lock:
+            balde = self._baldes.get(chave)
+            if balde is None:
+                if len(self._baldes) >= MAXIMO_BALDES:
+                    self._descartar_baldes_cheios(agora)
+                fichas = float(self.rajada)
+            else:
+                fichas = min(self.rajada, balde[0] + (agora - balde[1]) * self.taxa)
+
+            if fichas >= 1:
+                self._baldes[chave] = (fichas - 1, agora)
+                return 0.0
+            self._baldes[chave] = (fichas, agora)
+            return (1 - fichas) / self.taxa
+
+    def _descartar_baldes_cheios(self, agora):
+        """Esqueça usuários cujo balde já se encheu (equivale a um balde novo)."""
+        reposicao = self.rajada / self.taxa
+        for chave, (_, instante) in list(self._baldes.items()):
+            if agora - instante >= reposicao:
+                del self._baldes[chave]
+
+    # Hooks da requisição
+
+    def _admitir(self):
+        if request.method == "OPTIONS":
+            return None
+
+        erro = self._paginacao_invalida()
+        if erro:
+            self._contar("recusadas_paginacao")
+            return _recusar(erro, 400)
+
+        if self.taxa > 0 and request.endpoint not in ENDPOINTS_ISENTOS:
+            espera = self._consumir(_usuario())
+            if espera:
+                self._contar("recusadas_taxa")
+                return _recusar("Limite de requisições excedido", 429, espera)
+        return None
+
+    def _ocupar_vaga(self):
+        limite = self._limites.get(request.endpoint)
+        if limite is None or request.method == "OPTIONS":
+            return None
+
+        entrada = limite.entrar(self.espera)
+        if entrada is None:
+            self._contar("descartadas_concorrencia")
+            return _recusar("Servidor ocupado, tente novamente", 503, 1)
+        if entrada is False:
+            self._contar("aguardaram_fila")
+        g.admissao_limite = limite
+        return None
+
+    def _liberar(self, exc=None):
+        limite = g.pop("admissao_limite", None)
+        if limite is not None:
+            limite.sair()
+
+
+# Instância única do controle de admissão
+controle_admissao = ControleAdmissao()
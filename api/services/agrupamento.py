@@ -0,0 +1,175 @@
+"""Agrupe requisições GET idênticas e simultâneas em uma única execução.
+
+Nos endpoints configurados em ``AGRUPAMENTO_ENDPOINTS``, a primeira
+requisição de uma chave (endpoint, argumentos normalizados e escopo de
+autorização) executa a view; as idênticas que chegam enquanto ela está em
+andamento aguardam e recebem a mesma resposta, sem repetir as consultas.
+Não é um cache: a resposta é descartada assim que entregue às que aguardavam.
+
+Se a primeira requisição falhar, responder com status diferente de 200 ou
+demorar mais que ``AGRUPAMENTO_ESPERA_SEGUNDOS``, as demais executam a view
+por conta própria.
+"""
+
+import threading
+from collections import OrderedDict
+
+from flask import current_app, g, request
+
+# Escopos de autorização: a resposta é compartilhada entre requisições do
+# mesmo perfil (``tipo_usuario`` do token) ou apenas do mesmo usuário
+ESCOPOS = ("perfil", "usuario")
+
+# Cabeçalhos da resposta que pertencem à requisição que a produziu
+CABECALHOS_PROPRIOS = frozenset({"content-length", "set-cookie", "x-perfil-id"})
+
+# Chaves com métricas individuais mantidas (as mais recentes)
+MAXIMO_CHAVES_METRICAS = 200
+
+
+def _escopo(tipo):
+    """Retorne o escopo de autorização da requisição para compor a chave."""
+    from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+    try:
+        verify_jwt_in_request(optional=True)
+        token = get_jwt()
+    except Exception:
+        token = {}
+    if tipo == "usuario":
+        return f"usuario:{token.get('sub', '')}"
+    return f"perfil:{token.get('tipo_usuario', 'anonimo')}"
+
+
+def chave_requisicao(endpoint, args, escopo):
+    """Monte a chave da requisição com os argumentos em ordem canônica."""
+    argumentos = sorted(
+        (nome, valor) for nome, valor in args.items(multi=True) if valor != ""
+    )
+    return (endpoint, tuple(argumentos), escopo)
+
+
+class _Execucao:
+    """Resposta em produção pela primeira requisição de uma chave."""
+
+    __slots__ = ("concluida", "resposta")
+
+    def __init__(self):
+        self.concluida = threading.Event()
+        self.resposta = None
+
+
+class AgrupadorRequisicoes:
+    """Compartilhe a resposta de GETs idênticos executados ao mesmo tempo."""
+
+    def __init__(self):
+        self.endpoints = {}
+        self.espera = 5.0
+        self._execucoes = {}
+        self._lock = threading.Lock()
+        self._metricas = self._metricas_zeradas()
+        self._por_chave = OrderedDict()
+
+    def init_app(self, app):
+        """Leia a configuração e registre os hooks de agrupamento."""
+        self.endpoints = dict(app.config["AGRUPAMENTO_ENDPOINTS"])
+        self.espera = app.config["AGRUPAMENTO_ESPERA_SEGUNDOS"]
+
+        invalidos = set(self.endpoints.values()) - set(ESCOPOS)
+        if invalidos:
+            raise ValueError(f"Escopo de agrupamento inválido: {invalidos}")
+
+        app.before_request(self._agrupar)
+        app.after_request(self._publicar)
+        app.teardown_request(self._encerrar)
+
+    @staticmethod
+    def _metricas_zeradas():
+        return {
+            "executadas": 0,
+            "compartilhadas": 0,
+            "esperas_esgotadas": 0,
+            "execucoes_sem_resultado": 0,
+        }
+
+    def _contar(self, chave, metrica):
+        with self._lock:
+            self._metricas[metrica] += 1
+            nome = f"{chave[0]}?{'&'.join(f'{n}={v}' for n, v in chave[1])}"
+            por_chave = self._por_chave.pop(nome, None) or self._metricas_zeradas()
+            por_chave[metrica] += 1
+            self._por_chave[nome] = por_chave
+            if len(self._por_chave) > MAXIMO_CHAVES_METRICAS:
+                self._por_chave.popitem(last=False)
+
+    def metricas(self):
+        """Retorne totais, execuções em andamento e contadores por chave."""
+        with self._lock:
+            return {
+                **self._metricas,
+                "em_andamento": len(self._execucoes),
+                "por_chave": dict(reversed(self._por_chave.items())),
+            }
+
+    # Hooks da requisição
+
+    def _agrupar(self):
+        tipo = self.endpoints.get(request.endpoint)
+        if tipo is None or request.method != "GET":
+            return None
+
+        chave = chave_requisicao(request.endpoint, request.args, _escopo(tipo))
+        with self._lock:
+            execucao = self._execucoes.get(chave)
+            if execucao is None:
+                # Primeira requisição da chave: executa a view
+                self._execucoes[chave] = nova = _Execucao()
+                g.agrupamento = (chave, nova)
+
+        if execucao is None:
+            self._contar(chave, "executadas")
+            return None
+
+        # Requisição idêntica em andamento: aguarda e reutiliza a resposta
+        if not execucao.concluida.wait(self.espera):
+            self._contar(chave, "esperas_esgotadas")
+            return None
+        if execucao.resposta is None:
+            self._contar(chave, "execucoes_sem_resultado")
+            return None
+
+        self._contar(chave, "compartilhadas")
+        status, cabecalhos, corpo = execucao.resposta
+        return current_app.response_class(corpo, status=status, headers=cabecalhos)
+
+    def _publicar(self, response):
+        agrupamento = g.pop("agrupamento", None)
+        if agrupamento is None:
+            return response
+
+        chave, execucao = agrupamento
+        if response.status_code == 200 and not response.is_streamed:
+            cabecalhos = [
+                (nome, valor)
+                for nome, valor in response.headers.items()
+                if nome.lower() not in CABECALHOS_PROPRIOS
+            ]
+            execucao.resposta = (200, cabecalhos, response.get_data())
+        self._concluir(chave, execucao)
+        return response
+
+    def _encerrar(self, exc=None):
+        # Exceção antes do after_request: as requisições em espera executam a view
+        agrupamento = g.pop("agrupamento", None)
+        if agrupamento is not None:
+            self._concluir(*agrupamento)
+
+    def _concluir(self, chave, execucao):
+        with self._lock:
+            if self._execucoes.get(chave) is execucao:
+                del self._execucoes[chave]
+        execucao.concluida.set()
+
+
+# Instância única do agrupador de requisições
+agrupador_requisicoes = AgrupadorRequisicoes()
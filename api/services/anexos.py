@@ -0,0 +1,227 @@
+"""Armazene anexos em disco endereçados pelo SHA-256 do conteúdo.
+
+Cada arquivo é gravado uma única vez em ``<diretório>/ab/cd/<sha256>``, não
+importa quantos andamentos o referenciem. O upload é lido em blocos e gravado
+em um arquivo temporário enquanto o hash é calculado; ao final o arquivo é
+movido para o caminho definitivo com ``os.replace`` (atômico no mesmo disco).
+
+O registro ``Anexo`` e a movimentação do arquivo acontecem na mesma transação
+de escrita. O coletor de órfãos remove os arquivos somente após confirmar a
+remoção dos registros, e o faz sob o bloqueio de escrita, ignorando conteúdos
+reenviados nesse intervalo: um upload e a coleta do mesmo conteúdo não se
+intercalam, e uma transação desfeita não deixa registros sem arquivo.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, exists, select
+
+from api import db
+from api.models.anexo import Anexo
+from api.models.arquivo import andamentos_arquivo
+from api.models.processo import Andamento
+from api.services.escrita import coordenador_escrita
+
+# Formato do identificador de um anexo (SHA-256 em hexadecimal)
+FORMATO_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+# Subdiretório dos uploads em andamento
+DIRETORIO_TEMPORARIO = "tmp"
+
+
+class AnexoMuitoGrande(Exception):
+    """Sinalize que o upload excedeu ``ANEXOS_TAMANHO_MAXIMO``."""
+
+
+class AnexoVazio(Exception):
+    """Sinalize que o upload não possui conteúdo."""
+
+
+def sha256_valido(valor):
+    """Verifique se o valor é um SHA-256 hexadecimal (minúsculo)."""
+    return bool(valor) and FORMATO_SHA256.match(valor) is not None
+
+
+def diretorio_anexos():
+    """Retorne o diretório raiz dos anexos, criando-o se necessário."""
+    diretorio = current_app.config.get("ANEXOS_DIRETORIO") or os.path.join(
+        current_app.instance_path, "anexos"
+    )
+    os.makedirs(os.path.join(diretorio, DIRETORIO_TEMPORARIO), exist_ok=True)
+    return diretorio
+
+
+def caminho_blob(sha256):
+    """Retorne o caminho do arquivo, distribuído em dois níveis de subdiretórios.
+
+    Os dois primeiros pares de caracteres do hash formam os subdiretórios,
+    mantendo poucos milhares de arquivos por diretório.
+    """
+    return os.path.join(diretorio_anexos(), sha256[:2], sha256[2:4], sha256)
+
+
+def gravar_anexo(fluxo, tipo_conteudo):
+    """Grave o conteúdo lido de ``fluxo`` e retorne o registro correspondente.
+
+    Args:
+        fluxo: Objeto com ``read(n)`` (ex.: ``request.stream``)
+        tipo_conteudo (str): Content-Type informado no upload
+
+    Returns:
+        tuple[Anexo, bool]: Registro do anexo e se o conteúdo é novo
+
+    Raises:
+        AnexoMuitoGrande: Se o conteúdo exceder o tamanho máximo
+        AnexoVazio: Se nenhum byte for recebido
+        BancoOcupado: Se o bloqueio de escrita não for obtido dentro do prazo
+    """
+    tamanho_maximo = current_app.config["ANEXOS_TAMANHO_MAXIMO"]
+    tamanho_bloco = current_app.config["ANEXOS_TAMANHO_BLOCO"]
+    diretorio = diretorio_anexos()
+
+    descritor, temporario = tempfile.mkstemp(
+        dir=os.path.join(diretorio, DIRETORIO_TEMPORARIO)
+    )
+    try:
+        # Lê em blocos: o arquivo nunca é mantido inteiro em memória
+        resumo = hashlib.sha256()
+        tamanho = 0
+        with os.fdopen(descritor, "wb") as arquivo:
+            while bloco := fluxo.read(tamanho_bloco):
+                tamanho += len(bloco)
+                if tamanho > tamanho_maximo:
+                    raise AnexoMuitoGrande(
+                        f"Anexo excede o tamanho máximo de {tamanho_maximo} bytes"
+                    )
+                resumo.update(bloco)
+                arquivo.write(bloco)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+
+        if tamanho == 0:
+            raise AnexoVazio("Anexo vazio")
+
+        sha256 = resumo.hexdigest()
+        destino = caminho_blob(sha256)
+
+        with coordenador_escrita.transacao() as session:
+            anexo = session.scalar(select(Anexo).where(Anexo.sha256 == sha256))
+            novo = anexo is None
+            if novo:
+                anexo = Anexo(
+                    sha256=sha256,
+                    tamanho=tamanho,
+                    tipo_conteudo=tipo_conteudo or "application/octet-stream",
+                )
+                session.add(anexo)
+            else:
+                # Renova a carência do coletor para o conteúdo reenviado
+                anexo.updated_at = datetime.utcnow()
+
+            # Conteúdo repetido reaproveita o arquivo existente
+            if not os.path.exists(destino):
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                os.replace(temporario, destino)
+
+        return anexo, novo
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+def obter_anexo(sha256):
+    """Retorne o anexo com o hash informado, ou None."""
+    if not sha256_valido(sha256):
+        return None
+    return db.session.scalar(select(Anexo).where(Anexo.sha256 == sha256))
+
+
+def _remover(caminho):
+    """Remova o arquivo, ignorando se ele já não existir."""
+    try:
+        os.remove(caminho)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def coletar_orfaos(carencia_horas=None):
+    """Remova anexos não referenciados por andamentos (ativos ou arquivados).
+
+    Registros sem referência e sem uso há mais de ``carencia_horas`` são
+    apagados junto com seus arquivos. Em seguida, arquivos sem registro e
+    uploads temporários interrompidos, ambos mais antigos que a carência,
+    também são removidos.
+
+    Returns:
+        dict: Quantidade de registros, arquivos órfãos e temporários removidos
+    """
+    if carencia_horas is None:
+        carencia_horas = current_app.config["ANEXOS_CARENCIA_HORAS"]
+    limite = datetime.utcnow() - timedelta(hours=carencia_horas)
+    limite_arquivo = time.time() - carencia_horas * 3600
+    diretorio = diretorio_anexos()
+
+    sem_referencia = (
+        select(Anexo.id, Anexo.sha256)
+        .where(
+            Anexo.updated_at < limite,
+            ~exists().where(Andamento.anexo_id == Anexo.id),
+            ~exists().where(andamentos_arquivo.c.anexo_id == Anexo.id),
+        )
+    )
+
+    with coordenador_escrita.transacao() as session:
+        orfaos = session.execute(sem_referencia).all()
+        if orfaos:
+            session.execute(
+                delete(Anexo).where(Anexo.id.in_([orfao.id for orfao in orfaos]))
+            )
+
+    # Arquivos removidos após o commit, sob o bloqueio de escrita: conteúdo
+    # reenviado depois do commit já tem novo registro e mantém o arquivo
+    hashes = [orfao.sha256 for orfao in orfaos]
+    if hashes:
+        with coordenador_escrita.transacao() as session:
+            reenviados = set(
+                session.scalars(select(Anexo.sha256).where(Anexo.sha256.in_(hashes)))
+            )
+            for sha256 in hashes:
+                if sha256 not in reenviados:
+                    _remover(caminho_blob(sha256))
+
+    # Arquivos sem registro (ex.: transação desfeita após mover o arquivo)
+    arquivos = 0
+    for raiz, _, nomes in os.walk(diretorio):
+        if os.path.relpath(raiz, diretorio).startswith(DIRETORIO_TEMPORARIO):
+            continue
+        candidatos = [
+            nome
+            for nome in nomes
+            if sha256_valido(nome)
+            and os.path.getmtime(os.path.join(raiz, nome)) < limite_arquivo
+        ]
+        if not candidatos:
+            continue
+        registrados = set(
+            db.session.scalars(select(Anexo.sha256).where(Anexo.sha256.in_(candidatos)))
+        )
+        for nome in candidatos:
+            if nome not in registrados:
+                arquivos += _remover(os.path.join(raiz, nome))
+
+    # Uploads interrompidos
+    temporarios = 0
+    pasta_temporaria = os.path.join(diretorio, DIRETORIO_TEMPORARIO)
+    for nome in os.listdir(pasta_temporaria):
+        caminho = os.path.join(pasta_temporaria, nome)
+        if os.path.getmtime(caminho) < limite_arquivo:
+            temporarios += _remover(caminho)
+
+    return {"registros": len(orfaos), "arquivos": arquivos, "temporarios": temporarios}
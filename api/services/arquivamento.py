@@ -0,0 +1,338 @@
+"""Mova processos encerrados e seus andamentos para as tabelas de arquivo.
+
+Processos finalizados ou arquivados raramente são consultados, mas ocupam a
+maior parte da tabela principal e de seus índices. O arquivamento os move em
+lotes para ``processos_arquivo``/``andamentos_arquivo``; a leitura do detalhe
+consulta o arquivo quando o processo não está na tabela principal.
+
+As cópias são feitas via Core (``INSERT ... SELECT`` seguido de ``DELETE``) e
+não passam pelos eventos da sessão: clientes de sincronização continuam com
+os registros, que apenas mudam de tabela.
+
+O número de um processo arquivado continua reservado: a criação de processo
+com o mesmo número é recusada (``numero_arquivado``) e a restauração verifica
+os números em uso antes de mover as linhas (``NumeroProcessoEmUso``).
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, exists, func, insert, literal, select, text
+from sqlalchemy.orm.attributes import set_committed_value
+
+from api import db
+from api.models.advogado import Advogado
+from api.models.anexo import Anexo
+from api.models.arquivo import andamentos_arquivo, processos_arquivo
+from api.models.cliente import Cliente
+from api.models.prazo import Prazo
+from api.models.processo import Andamento, Processo
+from api.models.usuario import Usuario
+from api.services.campos import TAMANHO_BLOCO_IN
+from api.services.escrita import coordenador_escrita
+
+# Situações de processo elegíveis ao arquivamento
+STATUS_ARQUIVAVEIS = ("finalizado", "arquivado")
+
+
+class NumeroProcessoEmUso(Exception):
+    """Sinalize números de processo presentes na tabela principal e no arquivo."""
+
+    def __init__(self, numeros):
+        super().__init__(f"Número de processo já cadastrado: {', '.join(numeros)}")
+        self.numeros = numeros
+
+
+def numero_arquivado(numero_processo):
+    """Verifique se o número pertence a um processo arquivado."""
+    return (
+        db.session.execute(
+            select(processos_arquivo.c.id)
+            .where(processos_arquivo.c.numero_processo == numero_processo)
+            .limit(1)
+        ).first()
+        is not None
+    )
+
+
+def possui_processos(campo, valor):
+    """Verifique se há processos, ativos ou arquivados, com ``campo`` = ``valor``.
+
+    Args:
+        campo (str): Coluna de referência (``cliente_id`` ou ``advogado_id``)
+        valor (int): ID do cliente ou advogado
+    """
+    return any(
+        db.session.execute(
+            select(tabela.c.id).where(tabela.c[campo] == valor).limit(1)
+        ).first()
+        is not None
+        for tabela in (Processo.__table__, processos_arquivo)
+    )
+
+
+def _mover(origem, destino, filtro, agora=None):
+    """Copie as linhas filtradas para a tabela de destino e remova-as da origem.
+
+    Returns:
+        int: Quantidade de linhas movidas
+    """
+    colunas = [coluna.name for coluna in origem.columns if coluna.name != "arquivado_em"]
+    selecao = [origem.c[nome] for nome in colunas]
+
+    # Ao arquivar, registra o momento; ao restaurar, a coluna é descartada
+    if agora is not None:
+        colunas.append("arquivado_em")
+        selecao.append(literal(agora, db.DateTime))
+
+    session = db.session
+    session.execute(
+        insert(destino).from_select(colunas, select(*selecao).where(filtro))
+    )
+    return session.execute(delete(origem).where(filtro)).rowcount
+
+
+def _ids_arquivaveis(limite_data, tamanho_lote, apos_id):
+    """Selecione o próximo lote de processos encerrados antes de ``limite_data``.
+
+    O processo (e o andamento) de maior ID nunca é arquivado: no SQLite, sem
+    AUTOINCREMENT, removê-lo permitiria reutilizar seu ID em um novo registro.
+    Processos com prazos em aberto permanecem na tabela principal.
+    """
+    maior_processo = select(func.max(Processo.id)).scalar_subquery()
+    maior_andamento = select(func.max(Andamento.id)).scalar_subquery()
+    processo_do_maior_andamento = (
+        select(Andamento.processo_id)
+        .where(Andamento.id == maior_andamento)
+        .scalar_subquery()
+    )
+
+    return (
+        db.session.execute(
+            select(Processo.id)
+            .where(
+                Processo.status.in_(STATUS_ARQUIVAVEIS),
+                Processo.updated_at < limite_data,
+                Processo.id > apos_id,
+                Processo.id < maior_processo,
+                Processo.id.is_distinct_from(processo_do_maior_andamento),
+                ~exists().where(
+                    Prazo.processo_id == Processo.id, Prazo.status == "aberto"
+                ),
+            )
+            .order_by(Processo.id)
+            .limit(tamanho_lote)
+        )
+        .scalars()
+        .all()
+    )
+
+
+def arquivar_processos(dias, tamanho_lote=500):
+    """Arquive processos encerrados sem alterações há mais de ``dias`` dias.
+
+    Cada lote é movido em uma transação própria, mantendo curtos os períodos
+    com o bloqueio de escrita.
+
+    Args:
+        dias (int): Idade mínima (pela última atualização) para arquivar
+        tamanho_lote (int): Quantidade de processos por transação
+
+    Returns:
+        tuple[int, int]: Processos e andamentos arquivados
+    """
+    limite_data = datetime.utcnow() - timedelta(days=dias)
+    total_processos = total_andamentos = 0
+    ultimo_id = 0
+
+    while True:
+        ids = _ids_arquivaveis(limite_data, tamanho_lote, ultimo_id)
+        if not ids:
+            break
+        ultimo_id = ids[-1]
+
+        # Andamentos primeiro: referenciam o processo por chave estrangeira
+        agora = datetime.utcnow()
+        with coordenador_escrita.transacao():
+            total_andamentos += _mover(
+                Andamento.__table__,
+                andamentos_arquivo,
+                Andamento.__table__.c.processo_id.in_(ids),
+                agora,
+            )
+            total_processos += _mover(
+                Processo.__table__,
+                processos_arquivo,
+                Processo.__table__.c.id.in_(ids),
+                agora,
+            )
+
+    return total_processos, total_andamentos
+
+
+def restaurar_processos(ids):
+    """Devolva processos arquivados (e seus andamentos) à tabela principal.
+
+    Returns:
+        tuple[int, int]: Processos e andamentos restaurados
+
+    Raises:
+        NumeroProcessoEmUso: Se algum número já estiver na tabela principal;
+            nenhum processo é restaurado
+    """
+    with coordenador_escrita.transacao() as session:
+        # Verificado com o bloqueio de escrita: nenhuma criação concorrente
+        em_uso = session.scalars(
+            select(processos_arquivo.c.numero_processo)
+            .where(
+                processos_arquivo.c.id.in_(ids),
+                processos_arquivo.c.numero_processo.in_(
+                    select(Processo.numero_processo)
+                ),
+            )
+            .order_by(processos_arquivo.c.numero_processo)
+        ).all()
+        if em_uso:
+            raise NumeroProcessoEmUso(em_uso)
+
+        processos = _mover(
+            processos_arquivo, Processo.__table__, processos_arquivo.c.id.in_(ids)
+        )
+        andamentos = _mover(
+            andamentos_arquivo,
+            Andamento.__table__,
+            andamentos_arquivo.c.processo_id.in_(ids),
+        )
+
+    return processos, andamentos
+
+
+def liberar_espaco(paginas=None):
+    """Devolva ao sistema as páginas livres do arquivo SQLite.
+
+    Com ``auto_vacuum=INCREMENTAL`` executa ``PRAGMA incremental_vacuum``,
+    que libera páginas sem reescrever o banco. Bancos criados sem esse modo
+    são convertidos com um ``VACUUM`` completo, executado uma única vez.
+
+    Args:
+        paginas (int | None): Máximo de páginas liberadas (None para todas)
+
+    Returns:
+        int: Páginas livres restantes
+    """
+    engine = db.engines[None]
+    if engine.dialect.name != "sqlite":
+        return 0
+
+    # VACUUM não pode ser executado dentro de uma transação
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conexao:
+        if conexao.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+            conexao.execute(text("PRAGMA auto_vacuum=INCREMENTAL"))
+            conexao.execute(text("VACUUM"))
+        elif paginas:
+            conexao.execute(text(f"PRAGMA incremental_vacuum({int(paginas)})"))
+        else:
+            conexao.execute(text("PRAGMA incremental_vacuum"))
+
+        return conexao.execute(text("PRAGMA freelist_count")).scalar()
+
+
+def _anexar(objetos, atributo, chave, modelo):
+    """Carregue um relacionamento muitos-para-um de objetos fora da sessão.
+
+    ``set_committed_value`` não dispara backrefs nem cascatas, evitando que
+    os objetos reconstruídos do arquivo sejam incluídos na sessão.
+    """
+    ids = {getattr(obj, chave) for obj in objetos} - {None}
+    relacionados = {}
+    if ids:
+        relacionados = {
+            registro.id: registro
+            for registro in db.session.scalars(
+                select(modelo).where(modelo.id.in_(ids))
+            )
+        }
+    for obj in objetos:
+        set_committed_value(obj, atributo, relacionados.get(getattr(obj, chave)))
+
+
+def _reconstruir(modelo, linha):
+    """Crie instância transitória do modelo a partir de uma linha do arquivo."""
+    return modelo(
+        **{coluna.name: linha._mapping[coluna.name] for coluna in modelo.__table__.columns}
+    )
+
+
+def obter_processo_arquivado(processo_id):
+    """Retorne o processo arquivado como instância de ``Processo`` (ou None).
+
+    A instância não pertence à sessão e serve apenas para leitura; cliente e
+    advogado responsável já vêm carregados.
+    """
+    linha = db.session.execute(
+        select(processos_arquivo).where(processos_arquivo.c.id == processo_id)
+    ).first()
+    if linha is None:
+        return None
+
+    processo = _reconstruir(Processo, linha)
+    _anexar([processo], "cliente", "cliente_id", Cliente)
+    _anexar([processo], "advogado_responsavel", "advogado_id", Advogado)
+    return processo
+
+
+def processos_arquivados(ids):
+    """Retorne os processos arquivados com os IDs informados (busca em lote)."""
+    ids = sorted(ids)
+    processos = []
+    for inicio in range(0, len(ids), TAMANHO_BLOCO_IN):
+        bloco = ids[inicio : inicio + TAMANHO_BLOCO_IN]
+        processos.extend(
+            _reconstruir(Processo, linha)
+            for linha in db.session.execute(
+                select(processos_arquivo).where(processos_arquivo.c.id.in_(bloco))
+            )
+        )
+
+    _anexar(processos, "cliente", "cliente_id", Cliente)
+    _anexar(processos, "advogado_responsavel", "advogado_id", Advogado)
+    return processos
+
+
+def andamentos_arquivados(processo_id, limite=None, deslocamento=0):
+    """Retorne andamentos arquivados do processo, dos mais recentes aos antigos."""
+    consulta = (
+        select(andamentos_arquivo)
+        .where(andamentos_arquivo.c.processo_id == processo_id)
+        .order_by(andamentos_arquivo.c.data_andamento.desc())
+        .offset(deslocamento)
+    )
+    if limite is not None:
+        consulta = consulta.limit(limite)
+
+    andamentos = [
+        _reconstruir(Andamento, linha)
+        for linha in db.session.execute(consulta)
+    ]
+    _anexar(andamentos, "usuario", "usuario_id", Usuario)
+    _anexar(andamentos, "anexo", "anexo_id", Anexo)
+    return andamentos
+
+
+def obter_andamento_arquivado(andamento_id):
+    """Retorne o andamento arquivado como instância de ``Andamento`` (ou None)."""
+    linha = db.session.execute(
+        select(andamentos_arquivo).where(andamentos_arquivo.c.id == andamento_id)
+    ).first()
+    if linha is None:
+        return None
+
+    andamento = _reconstruir(Andamento, linha)
+    _anexar([andamento], "anexo", "anexo_id", Anexo)
+    return andamento
+
+
+def contar_andamentos_arquivados(processo_id):
+    """Retorne a quantidade de andamentos arquivados do processo."""
+    return db.session.execute(
+        select(func.count()).where(andamentos_arquivo.c.processo_id == processo_id)
+    ).scalar()
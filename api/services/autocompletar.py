@@ -0,0 +1,384 @@
+"""Atenda buscas de autocompletar por prefixo a partir de índices em memória.
+
+Cada tipo (cliente, advogado e processo) tem um índice com listas ordenadas
+de termos ``(termo, id)``: nomes e títulos sem acentos e em minúsculas, e os
+dígitos de CPF/CNPJ, OAB e número CNJ. A busca localiza o prefixo com
+``bisect`` e percorre apenas os termos que começam por ele, parando ao
+reunir ``limite`` registros. Termos principais (início do nome, documentos)
+vêm antes dos termos secundários (demais palavras do nome ou título).
+
+O índice é montado na primeira busca do tipo e mantido pelas escritas do
+worker (eventos de commit). Escritas de outros workers são incorporadas na
+reconstrução, feita pela primeira busca após ``AUTOCOMPLETE_TTL_SEGUNDOS``
+enquanto as buscas simultâneas continuam usando o índice anterior.
+"""
+
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Callable, NamedTuple
+
+from sqlalchemy import select
+
+from api import db
+from api.models.advogado import Advogado
+from api.models.cliente import Cliente
+from api.models.processo import Processo
+from api.services.documentos import busca_por_documento, digitos_documento
+from api.services.eventos import ao_gravar, apos_commit, dados_transacao
+
+# Palavras mais curtas não iniciam termos secundários (ex.: "da", "de")
+TAMANHO_MINIMO_PALAVRA = 3
+
+
+def dobrar(texto):
+    """Remova acentos, converta para minúsculas e normalize os espaços."""
+    decomposto = unicodedata.normalize("NFKD", texto or "")
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acentos.casefold().split())
+
+
+def termo_busca(consulta):
+    """Converta a consulta no prefixo buscado no índice.
+
+    Consultas formadas por dígitos e pontuação (CPF, CNPJ, número CNJ) são
+    reduzidas aos dígitos; as demais são dobradas como os nomes.
+    """
+    if busca_por_documento(consulta):
+        return digitos_documento(consulta)
+    return dobrar(consulta)
+
+
+def _palavras_seguintes(texto):
+    """Retorne o texto a partir de cada palavra após a primeira."""
+    palavras = texto.split(" ")
+    return [
+        " ".join(palavras[i:])
+        for i in range(1, len(palavras))
+        if len(palavras[i]) >= TAMANHO_MINIMO_PALAVRA
+    ]
+
+
+class TipoAutocompletar(NamedTuple):
+    """Descreva as colunas lidas e os termos de um tipo de registro.
+
+    Attributes:
+        modelo: Modelo consultado na montagem do índice
+        colunas: Colunas lidas de cada registro (a primeira é o ``id``)
+        filtro: Condição dos registros indexados (ou None)
+        termos: Função que recebe a linha e retorna os termos principais e
+            secundários
+        item: Função que recebe a linha e retorna o item da resposta
+    """
+
+    modelo: type
+    colunas: tuple
+    filtro: object
+    termos: Callable
+    item: Callable
+
+
+def _termos_cliente(linha):
+    nome = dobrar(linha.nome)
+    return [nome, digitos_documento(linha.cpf_cnpj)], _palavras_seguintes(nome)
+
+
+def _termos_advogado(linha):
+    nome = dobrar(linha.nome)
+    oab = dobrar(linha.oab_numero)
+    principais = [
+        nome,
+        digitos_documento(linha.cpf),
+        oab,
+        digitos_documento(oab),
+        f"{dobrar(linha.oab_estado)}{oab}",
+    ]
+    return principais, _palavras_seguintes(nome)
+
+
+def _termos_processo(linha):
+    titulo = dobrar(linha.titulo)
+    principais = [
+        digitos_documento(linha.numero_processo),
+        dobrar(linha.numero_interno),
+    ]
+    return principais, [titulo, *_palavras_seguintes(titulo)]
+
+
+TIPOS = {
+    "cliente": TipoAutocompletar(
+        Cliente,
+        (Cliente.id, Cliente.nome, Cliente.cpf_cnpj),
+        Cliente.ativo.is_(True),
+        _termos_cliente,
+        lambda linha: {
+            "id": linha.id,
+            "nome": linha.nome,
+            "cpf_cnpj": linha.cpf_cnpj,
+        },
+    ),
+    "advogado": TipoAutocompletar(
+        Advogado,
+        (
+            Advogado.id,
+            Advogado.nome,
+            Advogado.cpf,
+            Advogado.oab_numero,
+            Advogado.oab_estado,
+        ),
+        Advogado.ativo.is_(True),
+        _termos_advogado,
+        lambda linha: {
+            "id": linha.id,
+            "nome": linha.nome,
+            "oab_completa": f"OAB/{linha.oab_estado} {linha.oab_numero}",
+        },
+    ),
+    "processo": TipoAutocompletar(
+        Processo,
+        (
+            Processo.id,
+            Processo.numero_processo,
+            Processo.numero_interno,
+            Processo.titulo,
+            Processo.status,
+        ),
+        None,
+        _termos_processo,
+        lambda linha: {
+            "id": linha.id,
+            "numero_processo": linha.numero_processo,
+            "titulo": linha.titulo,
+            "status": linha.status,
+        },
+    ),
+}
+
+# Tipo indexado de cada tabela
+TIPO_POR_TABELA = {tipo.modelo.__tablename__: nome for nome, tipo in TIPOS.items()}
+
+
+def consulta_tipo(tipo, ids=None):
+    """Monte a consulta das linhas indexadas do tipo (opcionalmente por IDs)."""
+    definicao = TIPOS[tipo]
+    query = select(*definicao.colunas)
+    if definicao.filtro is not None:
+        query = query.where(definicao.filtro)
+    if ids is not None:
+        query = query.where(definicao.colunas[0].in_(ids))
+    return query
+
+
+def extrair(tipo, linha):
+    """Retorne os termos principais, secundários e o item de uma linha."""
+    definicao = TIPOS[tipo]
+    principais, secundarios = definicao.termos(linha)
+    return (
+        sorted({termo for termo in principais if termo}),
+        sorted({termo for termo in secundarios if termo} - set(principais)),
+        definicao.item(linha),
+    )
+
+
+class IndicePrefixos:
+    """Mantenha listas ordenadas de termos para busca por prefixo."""
+
+    def __init__(self):
+        self.principais = []
+        self.secundarios = []
+        self.itens = {}
+        self._termos = {}
+
+    @classmethod
+    def construir(cls, registros):
+        """Monte o índice de uma vez a partir de ``(id, extraido)``."""
+        indice = cls()
+        for registro_id, (principais, secundarios, item) in registros:
+            indice.principais.extend((termo, registro_id) for termo in principais)
+            indice.secundarios.extend((termo, registro_id) for termo in secundarios)
+            indice._termos[registro_id] = (principais, secundarios)
+            indice.itens[registro_id] = item
+        indice.principais.sort()
+        indice.secundarios.sort()
+        return indice
+
+    def atualizar(self, registro_id, extraido):
+        """Substitua os termos do registro (``extraido`` None o remove)."""
+        anteriores = self._termos.pop(registro_id, None)
+        if anteriores is not None:
+            for lista, termos in zip((self.principais, self.secundarios), anteriores):
+                for termo in termos:
+                    posicao = bisect_left(lista, (termo, registro_id))
+                    if posicao < len(lista) and lista[posicao] == (termo, registro_id):
+                        del lista[posicao]
+            del self.itens[registro_id]
+
+        if extraido is None:
+            return
+        principais, secundarios, item = extraido
+        for termo in principais:
+            insort(self.principais, (termo, registro_id))
+        for termo in secundarios:
+            insort(self.secundarios, (termo, registro_id))
+        self._termos[registro_id] = (principais, secundarios)
+        self.itens[registro_id] = item
+
+    def buscar(self, prefixo, limite):
+        """Retorne até ``limite`` itens com algum termo iniciado pelo prefixo."""
+        encontrados = {}
+        for lista in (self.principais, self.secundarios):
+            posicao = bisect_left(lista, (prefixo,))
+            while len(encontrados) < limite and posicao < len(lista):
+                termo, registro_id = lista[posicao]
+                if not termo.startswith(prefixo):
+                    break
+                encontrados.setdefault(registro_id, self.itens[registro_id])
+                posicao += 1
+        return list(encontrados.values())
+
+    def __len__(self):
+        return len(self.itens)
+
+
+class IndiceAutocompletar:
+    """Monte sob demanda, atualize e consulte os índices de cada tipo."""
+
+    def __init__(self):
+        self.ttl = 300.0
+        self._indices = {}
+        self._construido_em = {}
+        self._pendentes = {}
+        self._lock = threading.Lock()
+        self._construcao = {tipo: threading.Lock() for tipo in TIPOS}
+        self._metricas = {"buscas": 0, "construcoes": 0, "atualizacoes": 0}
+
+    def init_app(self, app):
+        """Leia a validade dos índices e descarte os já montados."""
+        self.ttl = app.config["AUTOCOMPLETE_TTL_SEGUNDOS"]
+        with self._lock:
+            self._indices.clear()
+            self._construido_em.clear()
+
+    def construido(self, tipo):
+        """Informe se o índice do tipo já foi montado (ou está em montagem)."""
+        with self._lock:
+            return tipo in self._indices or tipo in self._pendentes
+
+    def _construir(self, tipo):
+        """Leia os registros do tipo e substitua o índice.
+
+        Atualizações confirmadas durante a leitura são guardadas e aplicadas
+        ao índice novo antes da troca.
+        """
+        with self._lock:
+            self._pendentes[tipo] = []
+        try:
+            linhas = db.session.execute(consulta_tipo(tipo)).all()
+            indice = IndicePrefixos.construir(
+                (linha.id, extrair(tipo, linha)) for linha in linhas
+            )
+            with self._lock:
+                for registro_id, extraido in self._pendentes[tipo]:
+                    indice.atualizar(registro_id, extraido)
+                self._indices[tipo] = indice
+                self._construido_em[tipo] = time.monotonic()
+                self._metricas["construcoes"] += 1
+        finally:
+            with self._lock:
+                self._pendentes.pop(tipo, None)
+
+    def _garantir(self, tipo):
+        """Monte o índice ausente ou reconstrua o expirado.
+
+        Com um índice expirado disponível, buscas simultâneas à reconstrução
+        usam o índice anterior em vez de aguardar.
+        """
+        with self._lock:
+            montado_em = self._construido_em.get(tipo)
+        if montado_em is not None and time.monotonic() - montado_em < self.ttl:
+            return
+
+        construcao = self._construcao[tipo]
+        if not construcao.acquire(blocking=montado_em is None):
+            return
+        try:
+            with self._lock:
+                montado_em = self._construido_em.get(tipo)
+            if montado_em is None or time.monotonic() - montado_em >= self.ttl:
+                self._construir(tipo)
+        finally:
+            construcao.release()
+
+    def buscar(self, tipo, consulta, limite):
+        """Retorne até ``limite`` registros do tipo que completam a consulta."""
+        prefixo = termo_busca(consulta)
+        if not prefixo:
+            return []
+        self._garantir(tipo)
+        with self._lock:
+            self._metricas["buscas"] += 1
+            return self._indices[tipo].buscar(prefixo, limite)
+
+    def aplicar(self, tipo, alteracoes):
+        """Aplique ``{id: extraido}`` confirmados (None remove o registro)."""
+        with self._lock:
+            if tipo in self._pendentes:
+                self._pendentes[tipo].extend(alteracoes.items())
+            indice = self._indices.get(tipo)
+            if indice is None:
+                return
+            for registro_id, extraido in alteracoes.items():
+                indice.atualizar(registro_id, extraido)
+            self._metricas["atualizacoes"] += len(alteracoes)
+
+    def metricas(self):
+        """Retorne contadores e o tamanho de cada índice montado."""
+        agora = time.monotonic()
+        with self._lock:
+            return {
+                **self._metricas,
+                "indices": {
+                    tipo: {
+                        "registros": len(indice),
+                        "termos": len(indice.principais) + len(indice.secundarios),
+                        "idade_segundos": round(agora - self._construido_em[tipo]),
+                    }
+                    for tipo, indice in self._indices.items()
+                },
+            }
+
+
+# Instância única dos índices de autocompletar
+indice_autocompletar = IndiceAutocompletar()
+
+
+@ao_gravar
+def coletar_autocompletar(session, alteracoes):
+    """Leia, na transação, os termos dos registros alterados de tipos indexados.
+
+    Só consulta o banco para tipos com índice montado neste worker.
+    """
+    ids = {}
+    for alteracao in alteracoes:
+        tipo = TIPO_POR_TABELA.get(alteracao.tabela)
+        if tipo is None or not indice_autocompletar.construido(tipo):
+            continue
+        ids.setdefault(tipo, {})[alteracao.registro_id] = alteracao.operacao
+
+    pendentes = dados_transacao(session).setdefault("autocompletar", {})
+    for tipo, operacoes in ids.items():
+        # Removidos, inativos e ausentes saem do índice
+        mudancas = dict.fromkeys(operacoes)
+        vigentes = [i for i, operacao in operacoes.items() if operacao != "delete"]
+        if vigentes:
+            for linha in session.connection().execute(consulta_tipo(tipo, vigentes)):
+                mudancas[linha.id] = extrair(tipo, linha)
+        pendentes.setdefault(tipo, {}).update(mudancas)
+
+
+@apos_commit
+def atualizar_autocompletar(session, alteracoes):
+    """Aplique aos índices as alterações da transação confirmada."""
+    for tipo, mudancas in dados_transacao(session).get("autocompletar", {}).items():
+        indice_autocompletar.aplicar(tipo, mudancas)
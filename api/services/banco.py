@@ -0,0 +1,232 @@
+"""Configure o engine do banco de dados e meça o comportamento sob concorrência."""
+
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+
+from api.sessao import BIND_LEITURA
+
+# Opções de pool reportadas na inicialização
+OPCOES_POOL = ("max_overflow", "timeout", "recycle", "pre_ping")
+
+# PRAGMAs que alteram o arquivo e não se aplicam a conexões somente leitura
+PRAGMAS_ESCRITA = ("journal_mode", "synchronous", "auto_vacuum")
+
+
+def aplicar_pragmas(engine, pragmas):
+    """Aplique os PRAGMAs do SQLite em toda nova conexão do engine.
+
+    Args:
+        engine (Engine): Engine SQLAlchemy da aplicação
+        pragmas (dict): Nome e valor de cada PRAGMA (ex.: ``journal_mode``)
+    """
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _configurar_conexao(dbapi_connection, connection_record):
+        """Execute os PRAGMAs antes de a conexão entrar no pool."""
+        cursor = dbapi_connection.cursor()
+        try:
+            for nome, valor in pragmas.items():
+                cursor.execute(f"PRAGMA {nome}={valor}")
+        finally:
+            cursor.close()
+
+
+def relatorio_engine(engine, pragmas=()):
+    """Retorne as configurações efetivas do engine e do pool.
+
+    Os PRAGMAs são lidos de volta do banco, refletindo o valor realmente em
+    uso (ex.: ``journal_mode`` permanece ``memory`` em bancos em memória).
+
+    Args:
+        engine (Engine): Engine SQLAlchemy da aplicação
+        pragmas (Iterable[str]): Nomes dos PRAGMAs a consultar
+
+    Returns:
+        dict: URL (sem senha), dialeto, pool e PRAGMAs efetivos
+    """
+    pool = engine.pool
+    relatorio = {
+        "url": engine.url.render_as_string(hide_password=True),
+        "dialeto": engine.dialect.name,
+        "pool": type(pool).__name__,
+    }
+
+    # Nem todas as classes de pool possuem tamanho e overflow
+    if hasattr(pool, "size"):
+        relatorio["pool_size"] = pool.size()
+    for opcao in OPCOES_POOL:
+        valor = getattr(pool, f"_{opcao}", None)
+        if valor is not None:
+            relatorio[opcao] = valor
+
+    if engine.dialect.name == "sqlite" and pragmas:
+        with engine.connect() as conexao:
+            relatorio["pragmas"] = {
+                nome: conexao.execute(text(f"PRAGMA {nome}")).scalar()
+                for nome in pragmas
+            }
+
+    return relatorio
+
+
+def url_sqlite_somente_leitura(uri):
+    """Retorne a URL ``mode=ro`` para o mesmo arquivo de um banco SQLite.
+
+    Returns:
+        str | None: URL somente leitura, ou None se o banco não for um
+        arquivo SQLite (ex.: banco em memória ou outro dialeto)
+    """
+    if not uri:
+        return None
+
+    url = make_url(uri)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    if url.query.get("uri"):
+        return None
+
+    url = url.set(database=f"file:{url.database}").update_query_dict(
+        {"mode": "ro", "uri": "true"}
+    )
+    return url.render_as_string(hide_password=False)
+
+
+def configurar_bind_leitura(app):
+    """Inclua o bind somente leitura em ``SQLALCHEMY_BINDS``, se configurado.
+
+    Usa ``LEITURA_DATABASE_URL`` (réplica) ou, com
+    ``LEITURA_SQLITE_SOMENTE_LEITURA``, um segundo pool ``mode=ro`` sobre o
+    arquivo SQLite principal. Deve ser chamado antes de ``db.init_app``.
+    """
+    url = app.config.get("LEITURA_DATABASE_URL")
+    if not url and app.config.get("LEITURA_SQLITE_SOMENTE_LEITURA"):
+        url = url_sqlite_somente_leitura(app.config.get("SQLALCHEMY_DATABASE_URI"))
+
+    if not url:
+        return
+
+    # Binds adicionais não herdam SQLALCHEMY_ENGINE_OPTIONS
+    binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+    binds[BIND_LEITURA] = {"url": url, **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {})}
+    app.config["SQLALCHEMY_BINDS"] = binds
+
+
+def configurar_banco(app, db):
+    """Aplique o perfil de banco do ambiente e registre o relatório no log."""
+    pragmas = app.config.get("SQLITE_PRAGMAS", {})
+    pragmas_leitura = {
+        nome: valor for nome, valor in pragmas.items() if nome not in PRAGMAS_ESCRITA
+    }
+
+    for chave, engine in db.engines.items():
+        aplicar_pragmas(engine, pragmas_leitura if chave == BIND_LEITURA else pragmas)
+
+    relatorio = relatorio_engine(db.engine, pragmas)
+    if BIND_LEITURA in db.engines:
+        # A réplica indisponível não impede a inicialização: leituras usam o principal
+        try:
+            relatorio[BIND_LEITURA] = relatorio_engine(
+                db.engines[BIND_LEITURA], pragmas_leitura
+            )
+        except Exception as erro:
+            relatorio[BIND_LEITURA] = {"erro": str(erro)}
+    app.logger.info("Configuração do banco de dados: %s", relatorio)
+    return relatorio
+
+
+def percentil(valores, percentual):
+    """Retorne o percentil informado de uma lista de medições."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(len(ordenados) * percentual / 100))
+    return ordenados[indice]
+
+
+def benchmark_leitura_escrita(pragmas, leitores=4, duracao=3.0, linhas_por_escrita=500):
+    """Meça a latência de leituras enquanto um escritor grava continuamente.
+
+    Cria um banco temporário em arquivo com os PRAGMAs informados; uma thread
+    grava lotes de linhas em transações sucessivas enquanto ``leitores``
+    threads consultam a mesma tabela. No modo rollback-journal o commit exige
+    bloqueio exclusivo e as leituras aguardam; em WAL elas seguem sem espera.
+
+    Args:
+        pragmas (dict): PRAGMAs aplicados às conexões do banco temporário
+        leitores (int): Quantidade de threads de leitura
+        duracao (float): Duração da medição em segundos
+        linhas_por_escrita (int): Linhas inseridas por transação de escrita
+
+    Returns:
+        dict: Leituras, escritas, erros e latências de leitura (ms)
+    """
+    diretorio = tempfile.mkdtemp()
+    caminho = os.path.join(diretorio, "benchmark.db")
+    engine = create_engine(
+        f"sqlite:///{caminho}",
+        pool_size=leitores + 1,
+        connect_args={"check_same_thread": False},
+    )
+    aplicar_pragmas(engine, pragmas)
+
+    with engine.begin() as conexao:
+        conexao.execute(
+            text("CREATE TABLE registros (id INTEGER PRIMARY KEY, valor TEXT)")
+        )
+
+    fim = time.perf_counter() + duracao
+    latencias, erros, escritas = [], [], [0]
+    lock = threading.Lock()
+
+    def escrever():
+        while time.perf_counter() < fim:
+            try:
+                with engine.begin() as conexao:
+                    conexao.execute(
+                        text("INSERT INTO registros (valor) VALUES (:valor)"),
+                        [{"valor": "x" * 200}] * linhas_por_escrita,
+                    )
+                escritas[0] += 1
+            except Exception as erro:
+                with lock:
+                    erros.append(str(erro.__cause__ or erro))
+
+    def ler():
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            try:
+                with engine.connect() as conexao:
+                    conexao.execute(text("SELECT COUNT(*) FROM registros")).scalar()
+                with lock:
+                    latencias.append((time.perf_counter() - inicio) * 1000)
+            except Exception as erro:
+                with lock:
+                    erros.append(str(erro.__cause__ or erro))
+
+    threads = [threading.Thread(target=escrever)]
+    threads += [threading.Thread(target=ler) for _ in range(leitores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    engine.dispose()
+    shutil.rmtree(diretorio, ignore_errors=True)
+
+    return {
+        "leituras": len(latencias),
+        "escritas": escritas[0],
+        "erros": len(erros),
+        "leitura_p50_ms": round(statistics.median(latencias), 2) if latencias else 0.0,
+        "leitura_p95_ms": round(percentil(latencias, 95), 2),
+        "leitura_max_ms": round(max(latencias, default=0.0), 2),
+    }
@@ -0,0 +1,319 @@
+"""Mantenha em cache as respostas de detalhe de processos, clientes e advogados.
+
+Cada resposta serializada é guardada junto com a "impressão" do registro: uma
+tupla com a versão do registro e dos dados incorporados à resposta (cliente e
+advogado do processo, quantidade e última alteração dos andamentos,
+contagens). A impressão é obtida com uma única consulta sobre colunas
+indexadas e, se coincidir com a da entrada guardada, a resposta é servida sem
+carregar e serializar o registro.
+
+Como a impressão reflete o estado do banco, entradas de outros workers (camada
+em disco compartilhada) nunca são servidas desatualizadas. Além disso, os
+commits deste worker descartam imediatamente as entradas afetadas, inclusive
+a do processo quando um andamento é incluído, alterado ou removido.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import func, select
+
+from api import db
+from api.models.advogado import Advogado
+from api.models.cliente import Cliente
+from api.models.processo import Andamento, Processo
+from api.services.eventos import ao_gravar, apos_commit, dados_transacao
+
+# Gravações em disco entre duas limpezas de arquivos expirados
+LIMPEZA_DISCO_A_CADA = 500
+
+
+class CacheRegistros:
+    """Guarde respostas serializadas em LRU limitado por bytes e em disco (opcional)."""
+
+    def __init__(self):
+        self.habilitado = True
+        self.max_bytes = 32 * 1024 * 1024
+        self.ttl = 300.0
+        self.diretorio = None
+        self._itens = OrderedDict()
+        self._variantes = {}
+        self._bytes = 0
+        self._gravacoes_disco = 0
+        self._lock = threading.Lock()
+        self._metricas = self._metricas_zeradas()
+
+    def init_app(self, app):
+        """Configure orçamento de memória, validade e camada em disco."""
+        self.habilitado = app.config["CACHE_REGISTROS_HABILITADO"]
+        self.max_bytes = app.config["CACHE_REGISTROS_MAX_BYTES"]
+        self.ttl = app.config["CACHE_REGISTROS_TTL_SEGUNDOS"]
+        self.diretorio = app.config.get("CACHE_REGISTROS_DIRETORIO")
+        if self.diretorio:
+            os.makedirs(self.diretorio, exist_ok=True)
+
+    # Métricas
+
+    @staticmethod
+    def _metricas_zeradas():
+        return {
+            "acertos": 0,
+            "acertos_disco": 0,
+            "falhas": 0,
+            "invalidacoes": 0,
+            "descartes": 0,
+        }
+
+    def _contar(self, chave):
+        self._metricas[chave] += 1
+
+    def metricas(self):
+        """Retorne contadores, entradas e bytes ocupados em memória."""
+        with self._lock:
+            return {
+                **self._metricas,
+                "entradas": len(self._itens),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "disco": bool(self.diretorio),
+            }
+
+    # Leitura e gravação
+
+    def obter(self, tabela, registro_id, variante, impressao):
+        """Retorne a resposta guardada para a impressão informada, ou None."""
+        if not self.habilitado:
+            return None
+
+        chave = (tabela, registro_id, variante)
+        agora = time.monotonic()
+        with self._lock:
+            entrada = self._itens.get(chave)
+            if entrada is not None:
+                impressao_guardada, dados, expira = entrada
+                if impressao_guardada == impressao and expira > agora:
+                    self._itens.move_to_end(chave)
+                    self._contar("acertos")
+                    return dados
+                self._remover(chave)
+
+        dados = self._ler_disco(chave, impressao)
+        with self._lock:
+            self._contar("acertos_disco" if dados is not None else "falhas")
+        if dados is not None:
+            self._guardar_memoria(chave, impressao, dados)
+        return dados
+
+    def guardar(self, tabela, registro_id, variante, impressao, dados):
+        """Guarde a resposta serializada (bytes) sob a impressão do registro."""
+        if not self.habilitado:
+            return
+
+        chave = (tabela, registro_id, variante)
+        self._guardar_memoria(chave, impressao, dados)
+        self._gravar_disco(chave, impressao, dados)
+
+    def invalidar(self, tabela, registro_id):
+        """Descarte da memória todas as variantes em cache do registro."""
+        with self._lock:
+            for variante in self._variantes.pop((tabela, registro_id), ()):
+                self._remover((tabela, registro_id, variante), manter_indice=True)
+                self._contar("invalidacoes")
+
+    def limpar(self):
+        """Descarte todas as entradas em memória."""
+        with self._lock:
+            self._itens.clear()
+            self._variantes.clear()
+            self._bytes = 0
+
+    # Camada em memória
+
+    def _guardar_memoria(self, chave, impressao, dados):
+        if len(dados) > self.max_bytes:
+            return
+
+        expira = time.monotonic() + self.ttl
+        with self._lock:
+            self._remover(chave)
+            self._itens[chave] = (impressao, dados, expira)
+            self._variantes.setdefault(chave[:2], set()).add(chave[2])
+            self._bytes += len(dados)
+
+            # Descarta as entradas menos usadas até caber no orçamento
+            while self._bytes > self.max_bytes:
+                antiga = next(iter(self._itens))
+                self._remover(antiga)
+                self._contar("descartes")
+
+    def _remover(self, chave, manter_indice=False):
+        """Remova a entrada (chamado com o lock adquirido)."""
+        entrada = self._itens.pop(chave, None)
+        if entrada is None:
+            return
+        self._bytes -= len(entrada[1])
+        if not manter_indice:
+            variantes = self._variantes.get(chave[:2])
+            if variantes is not None:
+                variantes.discard(chave[2])
+                if not variantes:
+                    del self._variantes[chave[:2]]
+
+    # Camada em disco (compartilhada entre workers)
+
+    def _caminho(self, chave, impressao):
+        nome = hashlib.sha256(repr((chave, impressao)).encode()).hexdigest()
+        return os.path.join(self.diretorio, nome[:2], nome)
+
+    def _ler_disco(self, chave, impressao):
+        if not self.diretorio:
+            return None
+
+        caminho = self._caminho(chave, impressao)
+        try:
+            if time.time() - os.path.getmtime(caminho) > self.ttl:
+                return None
+            with open(caminho, "rb") as arquivo:
+                return arquivo.read()
+        except OSError:
+            return None
+
+    def _gravar_disco(self, chave, impressao, dados):
+        if not self.diretorio:
+            return
+
+        caminho = self._caminho(chave, impressao)
+        try:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+            # Grava em arquivo temporário e renomeia: leitores nunca veem
+            # um arquivo parcialmente escrito
+            descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho))
+            with os.fdopen(descritor, "wb") as arquivo:
+                arquivo.write(dados)
+            os.replace(temporario, caminho)
+        except OSError:
+            return
+
+        with self._lock:
+            self._gravacoes_disco += 1
+            limpar = self._gravacoes_disco % LIMPEZA_DISCO_A_CADA == 0
+        if limpar:
+            self.limpar_disco()
+
+    def limpar_disco(self):
+        """Remova arquivos do cache em disco mais antigos que a validade.
+
+        Returns:
+            int: Quantidade de arquivos removidos
+        """
+        if not self.diretorio:
+            return 0
+
+        limite = time.time() - self.ttl
+        removidos = 0
+        for raiz, _, nomes in os.walk(self.diretorio):
+            for nome in nomes:
+                caminho = os.path.join(raiz, nome)
+                try:
+                    if os.path.getmtime(caminho) < limite:
+                        os.remove(caminho)
+                        removidos += 1
+                except OSError:
+                    continue
+        return removidos
+
+
+# Cache compartilhado pelas requisições deste worker
+cache_registros = CacheRegistros()
+
+
+def variante(campos, *extras):
+    """Identifique a variante da resposta (campos solicitados e parâmetros)."""
+    return (tuple(campos), extras)
+
+
+def _versao(modelo, coluna_id):
+    """Subconsulta escalar com a versão do registro relacionado."""
+    return select(modelo.versao).where(modelo.id == coluna_id).scalar_subquery()
+
+
+def impressao_processo(processo_id, campos):
+    """Retorne a impressão do processo para os campos solicitados, ou None.
+
+    Inclui as versões de cliente e advogado incorporados e, quando a resposta
+    traz andamentos, a quantidade e a última alteração deles (índice
+    ``processo_id``). A última movimentação não altera a versão e também
+    entra na impressão quando solicitada. O nome do autor de cada andamento
+    não faz parte da impressão e é atualizado pela validade das entradas.
+    """
+    colunas = [Processo.versao]
+    if "ultima_movimentacao_em" in campos:
+        colunas.append(Processo.ultima_movimentacao_em)
+    if "cliente" in campos:
+        colunas.append(_versao(Cliente, Processo.cliente_id))
+    if "advogado" in campos:
+        colunas.append(_versao(Advogado, Processo.advogado_id))
+    if "andamentos" in campos or "total_andamentos" in campos:
+        do_processo = Andamento.processo_id == Processo.id
+        colunas.append(select(func.count()).where(do_processo).scalar_subquery())
+        colunas.append(
+            select(func.max(Andamento.updated_at)).where(do_processo).scalar_subquery()
+        )
+
+    linha = db.session.execute(
+        select(*colunas).where(Processo.id == processo_id)
+    ).first()
+    return tuple(linha) if linha is not None else None
+
+
+def impressao_responsavel(modelo, registro_id, campos):
+    """Retorne a impressão de cliente ou advogado, ou None se não existir.
+
+    Com ``total_processos`` a contagem de processos faz parte da impressão.
+    """
+    colunas = [modelo.versao]
+    if "total_processos" in campos:
+        chave = Processo.cliente_id if modelo is Cliente else Processo.advogado_id
+        colunas.append(select(func.count()).where(chave == modelo.id).scalar_subquery())
+
+    linha = db.session.execute(
+        select(*colunas).where(modelo.id == registro_id)
+    ).first()
+    return tuple(linha) if linha is not None else None
+
+
+# Tabelas cujas respostas de detalhe estão em cache
+TABELAS_CACHE = ("processos", "clientes", "advogados")
+
+
+@ao_gravar
+def coletar_invalidacoes(session, alteracoes):
+    """Anote os registros a descartar do cache quando a transação confirmar.
+
+    Alterações de andamentos invalidam o processo ao qual pertencem.
+    """
+    if not cache_registros.habilitado:
+        return
+
+    pendentes = dados_transacao(session).setdefault("cache_invalidar", set())
+    for alteracao in alteracoes:
+        if alteracao.tabela in TABELAS_CACHE:
+            pendentes.add((alteracao.tabela, alteracao.registro_id))
+        elif alteracao.tabela == "andamentos":
+            processo_id = (alteracao.valores or {}).get("processo_id")
+            if processo_id is None and alteracao.objeto is not None:
+                processo_id = alteracao.objeto.processo_id
+            if processo_id is not None:
+                pendentes.add(("processos", processo_id))
+
+
+@apos_commit
+def invalidar_alteracoes(session, alteracoes):
+    """Descarte do cache os registros alterados pela transação confirmada."""
+    for tabela, registro_id in dados_transacao(session).get("cache_invalidar", ()):
+        cache_registros.invalidar(tabela, registro_id)
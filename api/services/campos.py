@@ -0,0 +1,163 @@
+"""Implemente seleção de campos (sparse fieldsets) para as respostas da API."""
+
+from typing import Callable, NamedTuple
+
+from sqlalchemy import func
+
+from api import db
+
+# Quantidade máxima de IDs por cláusula IN nas consultas em lote
+TAMANHO_BLOCO_IN = 500
+
+
+class Campo(NamedTuple):
+    """Descreva um campo da resposta e as colunas necessárias para montá-lo.
+
+    Attributes:
+        colunas: Atributos do modelo carregados via ``load_only``
+        valor: Função que extrai o valor serializado do objeto, ou None
+            quando o campo é preenchido pela própria rota (ex.: contagens)
+    """
+
+    colunas: tuple
+    valor: Callable | None
+
+
+def coluna(atributo, conversor=None):
+    """Crie um campo que expõe diretamente uma coluna do modelo.
+
+    Args:
+        atributo: Atributo mapeado do modelo (ex.: ``Processo.titulo``)
+        conversor (Callable | None): Função aplicada ao valor antes da resposta
+    """
+    nome = atributo.key
+    if conversor is None:
+        return Campo((atributo,), lambda obj: getattr(obj, nome))
+    return Campo((atributo,), lambda obj: conversor(getattr(obj, nome)))
+
+
+def selecionar_campos(args, disponiveis, padrao=None):
+    """Interprete os parâmetros ``fields`` e ``include`` da requisição.
+
+    ``fields`` substitui o conjunto padrão de campos; ``include`` acrescenta
+    campos (tipicamente objetos aninhados) ao conjunto resultante.
+
+    Args:
+        args (MultiDict): Parâmetros de consulta da requisição
+        disponiveis (dict): Campos permitidos (whitelist) do endpoint
+        padrao (list | None): Campos retornados quando ``fields`` é omitido
+
+    Returns:
+        list[str]: Campos solicitados, sem repetições
+
+    Raises:
+        ValueError: Se algum campo solicitado não estiver na whitelist
+    """
+    fields = args.get("fields")
+    campos = _separar(fields) if fields else list(padrao or disponiveis)
+    campos += _separar(args.get("include", ""))
+
+    invalidos = [campo for campo in campos if campo not in disponiveis]
+    if invalidos:
+        raise ValueError(f"Campos inválidos: {', '.join(invalidos)}")
+
+    return list(dict.fromkeys(campos))
+
+
+def colunas_selecionadas(campos, disponiveis, *obrigatorias):
+    """Retorne as colunas do modelo necessárias para os campos solicitados."""
+    colunas = {coluna.key: coluna for coluna in obrigatorias}
+    for campo in campos:
+        colunas.update({coluna.key: coluna for coluna in disponiveis[campo].colunas})
+    return list(colunas.values())
+
+
+def serializar_campos(obj, campos, disponiveis):
+    """Monte o dicionário de resposta apenas com os campos solicitados."""
+    return {
+        campo: disponiveis[campo].valor(obj)
+        for campo in campos
+        if disponiveis[campo].valor is not None
+    }
+
+
+def contar_por(chave_estrangeira, ids):
+    """Conte registros relacionados aos IDs informados em uma única consulta.
+
+    Args:
+        chave_estrangeira: Coluna de chave estrangeira (ex.: ``Andamento.processo_id``)
+        ids (list[int]): IDs dos registros pais da página atual
+
+    Returns:
+        dict[int, int]: Quantidade de registros relacionados por ID
+    """
+    if not ids:
+        return {}
+
+    return dict(
+        db.session.query(chave_estrangeira, func.count())
+        .filter(chave_estrangeira.in_(ids))
+        .group_by(chave_estrangeira)
+        .all()
+    )
+
+
+def separar_ids(valor, limite):
+    """Interprete a lista de IDs do parâmetro ``ids`` (ex.: ``"3,1,2"``).
+
+    A ordem informada é mantida e IDs repetidos são descartados.
+
+    Raises:
+        ValueError: Se algum ID não for inteiro positivo ou exceder ``limite``
+    """
+    try:
+        ids = [int(nome) for nome in _separar(valor)]
+    except ValueError:
+        raise ValueError("Parâmetro ids deve conter inteiros separados por vírgula")
+
+    if any(id_ < 1 for id_ in ids):
+        raise ValueError("Parâmetro ids deve conter inteiros positivos")
+
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > limite:
+        raise ValueError(f"Máximo de {limite} IDs por requisição")
+
+    return ids
+
+
+def buscar_em_blocos(query, coluna_id, ids):
+    """Execute a consulta filtrando IDs em blocos para limitar o tamanho do IN."""
+    ids = sorted(ids)
+    registros = []
+    for inicio in range(0, len(ids), TAMANHO_BLOCO_IN):
+        bloco = ids[inicio : inicio + TAMANHO_BLOCO_IN]
+        registros.extend(query.filter(coluna_id.in_(bloco)).all())
+    return registros
+
+
+def ordenar_por_ids(registros, ids):
+    """Ordene os registros conforme ``ids`` e liste os IDs não encontrados.
+
+    Returns:
+        tuple[list, list[int]]: Registros na ordem solicitada e IDs ausentes
+    """
+    por_id = {registro.id: registro for registro in registros}
+    return (
+        [por_id[id_] for id_ in ids if id_ in por_id],
+        [id_ for id_ in ids if id_ not in por_id],
+    )
+
+
+def iso(valor):
+    """Retorne data/hora em formato ISO ou None."""
+    return valor.isoformat() if valor else None
+
+
+def decimal(valor):
+    """Retorne valor numérico como float ou None."""
+    return float(valor) if valor else None
+
+
+def _separar(valor):
+    """Separe uma lista de nomes delimitada por vírgulas."""
+    return [nome.strip() for nome in valor.split(",") if nome.strip()]
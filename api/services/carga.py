@@ -0,0 +1,472 @@
+"""Meça vazão e latência da API sob requisições concorrentes.
+
+O teste de carga inicia a aplicação em um servidor WSGI local (werkzeug com
+uma thread por requisição), garante uma massa de dados gerada e dispara, a
+partir de várias threads clientes, uma combinação ponderada de cenários com
+tempo de espera aleatório entre as requisições de cada cliente. O resultado
+é um relatório JSON com vazão, percentis de latência, erros e erros de
+bloqueio do banco, por cenário e no total, para comparação entre versões.
+
+A massa de dados é identificada pelo prefixo ``CARGA-`` (número dos processos
+e nome de clientes e advogados) e é apenas acrescentada: registros existentes
+não são alterados.
+"""
+
+import http.client
+import json
+import random
+import subprocess
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+from werkzeug.security import generate_password_hash
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from api import db
+from api.models.advogado import Advogado
+from api.models.cliente import Cliente
+from api.models.processo import Andamento, Processo
+from api.models.usuario import Usuario
+from api.services.admissao import controle_admissao
+from api.services.banco import percentil
+from api.services.metricas import metricas_servicos
+
+# Prefixo dos registros da massa de dados e credenciais do usuário de carga
+PREFIXO = "CARGA-"
+EMAIL_USUARIO = "carga@jurisrem.local"
+SENHA_USUARIO = "carga123"
+
+# Combinação padrão de cenários (peso relativo de cada um)
+MIX_PADRAO = {
+    "login": 5,
+    "listagem": 40,
+    "detalhe": 30,
+    "andamento": 10,
+    "dashboard": 15,
+}
+
+# Valores usados na massa de dados e nos filtros da listagem
+STATUS = ("em_andamento", "suspenso", "finalizado", "arquivado")
+AREAS = ("civil", "criminal", "trabalhista", "tributario", "familia")
+PRIORIDADES = ("baixa", "normal", "alta", "urgente")
+
+# Linhas inseridas por comando ao gerar a massa de dados
+LOTE_INSERCAO = 1000
+
+
+def interpretar_mix(texto):
+    """Converta ``"listagem=40,detalhe=30"`` no dicionário de pesos.
+
+    Raises:
+        ValueError: Se um cenário for desconhecido ou um peso for inválido
+    """
+    mix = {}
+    for parte in filter(None, (item.strip() for item in texto.split(","))):
+        nome, _, peso = parte.partition("=")
+        if nome not in MIX_PADRAO:
+            raise ValueError(
+                f"Cenário desconhecido: {nome} (use {', '.join(MIX_PADRAO)})"
+            )
+        mix[nome] = float(peso or 1)
+        if mix[nome] < 0:
+            raise ValueError(f"Peso negativo para o cenário {nome}")
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Informe ao menos um cenário com peso positivo")
+    return mix
+
+
+def _inserir(modelo, linhas):
+    for inicio in range(0, len(linhas), LOTE_INSERCAO):
+        db.session.execute(insert(modelo), linhas[inicio : inicio + LOTE_INSERCAO])
+
+
+def gerar_massa(processos=2000, andamentos_por_processo=5, semente=42):
+    """Garanta a massa de dados do teste de carga e retorne os IDs dos processos.
+
+    Gera o usuário de carga, clientes (um para cada 10 processos), advogados
+    (um para cada 50) e os processos que faltarem para atingir ``processos``,
+    cada um com ``andamentos_por_processo`` andamentos.
+    """
+    aleatorio = random.Random(semente)
+    agora = datetime.utcnow()
+
+    usuario = db.session.scalar(
+        select(Usuario.id).where(Usuario.email == EMAIL_USUARIO)
+    )
+    if usuario is None:
+        _inserir(
+            Usuario,
+            [
+                {
+                    "nome": "Usuário de carga",
+                    "email": EMAIL_USUARIO,
+                    "senha_hash": generate_password_hash(SENHA_USUARIO),
+                    "tipo_usuario": "usuario",
+                    "ativo": True,
+                }
+            ],
+        )
+
+    existentes = db.session.scalar(
+        select(func.count())
+        .select_from(Processo)
+        .where(Processo.numero_processo.startswith(PREFIXO))
+    )
+    faltantes = max(0, processos - existentes)
+
+    if faltantes:
+        # Sufixo único por execução: a massa pode crescer em chamadas sucessivas
+        lote = f"{agora:%Y%m%d%H%M%S}"
+        quantidade_clientes = max(1, faltantes // 10)
+        quantidade_advogados = max(1, faltantes // 50)
+
+        _inserir(
+            Cliente,
+            [
+                {
+                    "nome": f"Cliente {PREFIXO}{lote}-{indice}",
+                    "cpf_cnpj": f"C{lote}{indice:05d}",
+                    "tipo_pessoa": "fisica",
+                }
+                for indice in range(quantidade_clientes)
+            ],
+        )
+        _inserir(
+            Advogado,
+            [
+                {
+                    "nome": f"Advogado {PREFIXO}{lote}-{indice}",
+                    "cpf": f"{lote[-6:]}{indice:08d}",
+                    "oab_numero": f"C{lote}{indice:05d}",
+                    "oab_estado": "SP",
+                    "email": f"advogado{indice}.{lote}@carga.local",
+                }
+                for indice in range(quantidade_advogados)
+            ],
+        )
+
+        clientes = db.session.scalars(
+            select(Cliente.id).where(
+                Cliente.nome.startswith(f"Cliente {PREFIXO}{lote}-")
+            )
+        ).all()
+        advogados = db.session.scalars(
+            select(Advogado.id).where(
+                Advogado.nome.startswith(f"Advogado {PREFIXO}{lote}-")
+            )
+        ).all()
+
+        _inserir(
+            Processo,
+            [
+                {
+                    "numero_processo": f"{PREFIXO}{lote}-{indice}",
+                    "titulo": f"Processo de carga {indice}",
+                    "descricao": "Processo gerado para teste de carga",
+                    "area_juridica": aleatorio.choice(AREAS),
+                    "status": aleatorio.choice(STATUS),
+                    "prioridade": aleatorio.choice(PRIORIDADES),
+                    "data_distribuicao": (
+                        agora - timedelta(days=aleatorio.randint(0, 1500))
+                    ).date(),
+                    "cliente_id": aleatorio.choice(clientes),
+                    "advogado_id": aleatorio.choice(advogados),
+                }
+                for indice in range(faltantes)
+            ],
+        )
+
+        novos = db.session.scalars(
+            select(Processo.id).where(
+                Processo.numero_processo.startswith(f"{PREFIXO}{lote}-")
+            )
+        ).all()
+        _inserir(
+            Andamento,
+            [
+                {
+                    "processo_id": processo_id,
+                    "tipo_andamento": "movimentacao",
+                    "descricao": f"Andamento de carga {ordem}",
+                    "data_andamento": agora
+                    - timedelta(days=aleatorio.randint(0, 700)),
+                }
+                for processo_id in novos
+                for ordem in range(andamentos_por_processo)
+            ],
+        )
+        db.session.commit()
+
+    return db.session.scalars(
+        select(Processo.id).where(Processo.numero_processo.startswith(PREFIXO))
+    ).all()
+
+
+class _RequisicaoSilenciosa(WSGIRequestHandler):
+    """Atenda requisições sem registrar cada uma no log de acesso."""
+
+    def log_request(self, code="-", size="-"):
+        pass
+
+
+class _Cliente:
+    """Cliente HTTP de uma thread, com conexão persistente."""
+
+    def __init__(self, host, porta):
+        self.host = host
+        self.porta = porta
+        self.conexao = None
+
+    def requisitar(self, metodo, caminho, corpo=None):
+        """Execute a requisição e retorne status, corpo e cabeçalho Retry-After."""
+        cabecalhos = {"Accept-Encoding": "identity"}
+        dados = None
+        if corpo is not None:
+            dados = json.dumps(corpo).encode()
+            cabecalhos["Content-Type"] = "application/json"
+
+        for tentativa in range(2):
+            if self.conexao is None:
+                self.conexao = http.client.HTTPConnection(
+                    self.host, self.porta, timeout=30
+                )
+            try:
+                self.conexao.request(metodo, caminho, body=dados, headers=cabecalhos)
+                resposta = self.conexao.getresponse()
+                conteudo = resposta.read()
+                if resposta.getheader("Connection", "").lower() == "close":
+                    self.fechar()
+                return resposta.status, conteudo, resposta.getheader("Retry-After")
+            except (http.client.HTTPException, OSError):
+                # Conexão encerrada pelo servidor: reconecta uma vez
+                self.fechar()
+                if tentativa:
+                    raise
+
+    def fechar(self):
+        if self.conexao is not None:
+            self.conexao.close()
+            self.conexao = None
+
+
+def _cenarios(processo_ids, advogado_ids, aleatorio):
+    """Retorne a função de cada cenário: (método, caminho, corpo)."""
+
+    def login():
+        credenciais = {"email": EMAIL_USUARIO, "senha": SENHA_USUARIO}
+        return "POST", "/api/auth/login", credenciais
+
+    def listagem():
+        filtros = [f"page={aleatorio.randint(1, 20)}", "per_page=20"]
+        if aleatorio.random() < 0.5:
+            filtros.append(f"status={aleatorio.choice(STATUS)}")
+        if aleatorio.random() < 0.3:
+            filtros.append(f"area_juridica={aleatorio.choice(AREAS)}")
+        if aleatorio.random() < 0.2 and advogado_ids:
+            filtros.append(f"advogado_id={aleatorio.choice(advogado_ids)}")
+        if aleatorio.random() < 0.1:
+            filtros.append(f"search={PREFIXO}")
+        return "GET", f"/api/processos/listagem?{'&'.join(filtros)}", None
+
+    def detalhe():
+        return "GET", f"/api/processos/{aleatorio.choice(processo_ids)}", None
+
+    def andamento():
+        return (
+            "POST",
+            f"/api/processos/{aleatorio.choice(processo_ids)}/andamentos",
+            {
+                "tipo_andamento": "movimentacao",
+                "descricao": "Andamento do teste de carga",
+            },
+        )
+
+    def dashboard():
+        caminho = aleatorio.choice(
+            (
+                "/api/dashboard/estatisticas",
+                "/api/dashboard/processos-recentes",
+                "/api/dashboard/advogados-produtividade",
+            )
+        )
+        return "GET", caminho, None
+
+    return {
+        "login": login,
+        "listagem": listagem,
+        "detalhe": detalhe,
+        "andamento": andamento,
+        "dashboard": dashboard,
+    }
+
+
+def _resumo(medicoes, duracao):
+    """Agregue as medições (latência em ms, status, bloqueio) de um cenário."""
+    latencias = [latencia for latencia, _, _ in medicoes]
+    erros = sum(1 for _, status, _ in medicoes if status is None or status >= 500)
+    bloqueios = sum(1 for _, _, bloqueio in medicoes if bloqueio)
+    status = {}
+    for _, codigo, _ in medicoes:
+        chave = str(codigo) if codigo is not None else "falha_conexao"
+        status[chave] = status.get(chave, 0) + 1
+
+    return {
+        "requisicoes": len(medicoes),
+        "por_segundo": round(len(medicoes) / duracao, 2) if duracao else 0.0,
+        "erros": erros,
+        "taxa_erros": round(erros / len(medicoes), 4) if medicoes else 0.0,
+        "erros_bloqueio": bloqueios,
+        "p50_ms": round(percentil(latencias, 50), 2),
+        "p95_ms": round(percentil(latencias, 95), 2),
+        "p99_ms": round(percentil(latencias, 99), 2),
+        "max_ms": round(max(latencias, default=0.0), 2),
+        "status": dict(sorted(status.items())),
+    }
+
+
+def _diferenca(antes, depois, grupo):
+    """Calcule a variação dos contadores numéricos de um grupo das métricas."""
+    antes, depois = antes.get(grupo, {}), depois.get(grupo, {})
+    return {
+        chave: valor - antes.get(chave, 0)
+        for chave, valor in depois.items()
+        if isinstance(valor, (int, float)) and not isinstance(valor, bool)
+    }
+
+
+def _revisao():
+    """Retorne o commit atual do repositório, se disponível."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def executar_carga(
+    app,
+    threads=8,
+    duracao=30.0,
+    aquecimento=2.0,
+    pensamento_ms=200.0,
+    mix=None,
+    processos=2000,
+    semente=42,
+):
+    """Execute o teste de carga contra um servidor local e retorne o relatório.
+
+    Args:
+        app (Flask): Aplicação a servir (banco configurado recebe a massa de dados)
+        threads (int): Clientes concorrentes
+        duracao (float): Duração da medição em segundos (após o aquecimento)
+        aquecimento (float): Segundos iniciais descartados do relatório
+        pensamento_ms (float): Espera média entre requisições de um cliente
+            (distribuição exponencial); 0 desativa a espera
+        mix (dict | None): Peso de cada cenário (padrão: ``MIX_PADRAO``)
+        processos (int): Quantidade de processos da massa de dados
+        semente (int): Semente dos sorteios, para execuções comparáveis
+
+    Returns:
+        dict: Configuração, totais, resultados por cenário e métricas do servidor
+    """
+    mix = mix or MIX_PADRAO
+    with app.app_context():
+        processo_ids = gerar_massa(processos, semente=semente)
+        advogado_ids = db.session.scalars(
+            select(Advogado.id).where(Advogado.nome.startswith(f"Advogado {PREFIXO}"))
+        ).all()
+        db.session.remove()
+
+    # Os clientes virtuais compartilham um usuário: o limite de taxa por
+    # usuário mediria apenas a si mesmo e fica desativado durante o teste
+    taxa_usuario = controle_admissao.taxa
+    controle_admissao.taxa = 0
+
+    servidor = make_server(
+        "127.0.0.1", 0, app, threaded=True, request_handler=_RequisicaoSilenciosa
+    )
+    servidor.daemon_threads = True
+    thread_servidor = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread_servidor.start()
+    host, porta = "127.0.0.1", servidor.server_port
+
+    nomes = list(mix)
+    pesos = [mix[nome] for nome in nomes]
+    medicoes = {nome: [] for nome in nomes}
+    lock = threading.Lock()
+
+    inicio_medicao = time.perf_counter() + aquecimento
+    fim = inicio_medicao + duracao
+    antes = {}
+
+    def cliente(indice):
+        aleatorio = random.Random(semente + indice)
+        cenarios = _cenarios(processo_ids, advogado_ids, aleatorio)
+        conexao = _Cliente(host, porta)
+        try:
+            while (agora := time.perf_counter()) < fim:
+                nome = aleatorio.choices(nomes, pesos)[0]
+                metodo, caminho, corpo = cenarios[nome]()
+                inicio = time.perf_counter()
+                try:
+                    status, _, retry_after = conexao.requisitar(metodo, caminho, corpo)
+                except (http.client.HTTPException, OSError):
+                    status, retry_after = None, None
+                latencia = (time.perf_counter() - inicio) * 1000
+
+                # Banco ocupado: 503 com Retry-After (ver BancoOcupado)
+                bloqueio = status == 503 and retry_after is not None
+                if agora >= inicio_medicao:
+                    with lock:
+                        medicoes[nome].append((latencia, status, bloqueio))
+
+                if pensamento_ms > 0:
+                    time.sleep(aleatorio.expovariate(1000 / pensamento_ms))
+        finally:
+            conexao.fechar()
+
+    try:
+        clientes = [
+            threading.Thread(target=cliente, args=(indice,))
+            for indice in range(threads)
+        ]
+        for thread in clientes:
+            thread.start()
+
+        # Métricas de escrita do servidor ao fim do aquecimento
+        time.sleep(max(0.0, inicio_medicao - time.perf_counter()))
+        antes = metricas_servicos()
+
+        for thread in clientes:
+            thread.join()
+        depois = metricas_servicos()
+    finally:
+        servidor.shutdown()
+        thread_servidor.join()
+        controle_admissao.taxa = taxa_usuario
+
+    todas = [medicao for lista in medicoes.values() for medicao in lista]
+    return {
+        "revisao": _revisao(),
+        "executado_em": datetime.utcnow().isoformat(),
+        "configuracao": {
+            "threads": threads,
+            "duracao": duracao,
+            "aquecimento": aquecimento,
+            "pensamento_ms": pensamento_ms,
+            "mix": mix,
+            "processos": len(processo_ids),
+            "semente": semente,
+        },
+        "total": _resumo(todas, duracao),
+        "cenarios": {nome: _resumo(medicoes[nome], duracao) for nome in nomes},
+        "servidor_escrita": _diferenca(antes, depois, "escrita"),
+        "servidor_admissao": _diferenca(antes, depois, "admissao"),
+    }
@@ -0,0 +1,135 @@
+"""Implemente controle de concorrência otimista baseado em versão de registro."""
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from api import db
+from api.services.escrita import coordenador_escrita
+from api.services.restricoes import anotar_gravados
+from api.services.eventos import (
+    EventoAlteracao,
+    colunas_rastreadas,
+    registrar_alteracoes,
+)
+
+
+def gerar_etag(versao):
+    """Retorne o valor de ETag correspondente à versão de um registro.
+
+    Args:
+        versao (int): Versão atual do registro
+
+    Returns:
+        str: ETag forte no formato ``"<versao>"``
+    """
+    return f'"{versao}"'
+
+
+def versoes_if_match(valor):
+    """Extraia as versões aceitas a partir do cabeçalho If-Match.
+
+    Args:
+        valor (str | None): Conteúdo bruto do cabeçalho If-Match
+
+    Returns:
+        list[int] | None: Versões aceitas (vazia se todas as ETags forem
+        fracas), ou None quando o cabeçalho estiver ausente ou for ``*``
+        (qualquer versão existente)
+
+    Raises:
+        ValueError: Se alguma ETag informada não representar uma versão válida
+    """
+    if not valor or valor.strip() == "*":
+        return None
+
+    versoes = []
+    for etag in valor.split(","):
+        etag = etag.strip()
+
+        # If-Match usa comparação forte: ETags fracas nunca correspondem
+        if etag.startswith("W/"):
+            continue
+
+        versoes.append(int(etag.strip('"')))
+
+    return versoes
+
+
+def atualizar_versionado(modelo, registro_id, versoes, valores, retorno):
+    """Atualize um registro com um único UPDATE condicionado à sua versão.
+
+    O comando gerado é ``UPDATE ... SET versao = versao + 1 WHERE id = ? AND
+    versao IN (...)``, dispensando o SELECT prévio e impedindo que uma escrita
+    concorrente seja sobrescrita silenciosamente.
+
+    Args:
+        modelo (type): Classe do modelo versionado (possui coluna ``versao``)
+        registro_id (int): ID do registro a ser atualizado
+        versoes (list[int] | None): Versões aceitas, ou None para qualquer uma
+        valores (dict): Colunas e valores a serem atualizados
+        retorno (list): Colunas retornadas pelo UPDATE via RETURNING
+
+    Returns:
+        Row | None: Linha atualizada, ou None se nenhum registro corresponder
+    """
+    stmt = (
+        update(modelo)
+        .where(modelo.id == registro_id)
+        .values(**valores, versao=modelo.versao + 1)
+        .returning(*retorno, modelo.versao)
+        .execution_options(synchronize_session=False)
+    )
+
+    if versoes is not None:
+        stmt = stmt.where(modelo.versao.in_(versoes))
+
+    rastreadas = sorted(colunas_rastreadas(modelo.__tablename__) & valores.keys())
+
+    with coordenador_escrita.transacao() as session:
+        # Valores anteriores solicitados por assinantes (ex.: histórico), lidos
+        # já com o bloqueio de escrita
+        anteriores = None
+        if rastreadas:
+            atual = session.execute(
+                select(*(modelo.__table__.c[nome] for nome in rastreadas)).where(
+                    modelo.id == registro_id
+                )
+            ).first()
+            anteriores = dict(atual._mapping) if atual is not None else None
+
+        try:
+            linha = session.execute(stmt).first()
+        except IntegrityError as erro:
+            anotar_gravados(erro, [(modelo.__table__, valores)])
+            raise
+
+        # UPDATE via Core não dispara eventos de flush: notifica explicitamente
+        if linha is not None:
+            registrar_alteracoes(
+                session,
+                [
+                    EventoAlteracao(
+                        modelo.__tablename__,
+                        registro_id,
+                        "update",
+                        valores=valores,
+                        anteriores=anteriores,
+                    )
+                ],
+            )
+
+            # Instância já carregada na sessão deixaria de refletir a linha
+            carregado = session.identity_map.get(
+                session.identity_key(modelo, registro_id)
+            )
+            if carregado is not None:
+                session.expire(carregado)
+
+    return linha
+
+
+def versao_atual(modelo, registro_id):
+    """Retorne a versão atual de um registro ou None se ele não existir."""
+    return db.session.execute(
+        db.select(modelo.versao).where(modelo.id == registro_id)
+    ).scalar()
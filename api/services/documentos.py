@@ -0,0 +1,217 @@
+"""Normalize e valide CPF/CNPJ e mantenha as colunas de dígitos indexadas.
+
+``Cliente.cpf_cnpj`` e ``Advogado.cpf`` guardam o documento como digitado;
+as colunas ``cpf_cnpj_digitos`` e ``cpf_digitos`` guardam apenas os dígitos
+(11 para CPF, 14 para CNPJ) com restrição única, de modo que formatações
+diferentes do mesmo documento não coexistem e a busca por documento usa o
+índice em vez de ``LIKE``.
+
+As colunas de dígitos são acrescentadas a bancos existentes por uma migração
+e preenchidas por ``flask init-db`` logo após as migrações
+(``popular_colunas_documento``).
+Registros que permanecem sem dígitos (documento duplicado ou não reconhecível)
+continuam encontrados pelas buscas pelo documento como digitado.
+"""
+
+from operator import mul
+
+from sqlalchemy import bindparam, select, update
+
+from api.models.advogado import Advogado
+from api.models.cliente import Cliente
+from api.services.escrita import coordenador_escrita
+
+# Quantidade de dígitos de cada tipo de documento
+DIGITOS_CPF = 11
+DIGITOS_CNPJ = 14
+
+# Pesos dos dígitos verificadores (primeiro e segundo)
+PESOS_CPF = (tuple(range(10, 1, -1)), tuple(range(11, 1, -1)))
+PESOS_CNPJ = (
+    (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2),
+    (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2),
+)
+
+# Converte os dígitos ASCII nos valores 0 a 9 (bytes.translate)
+VALORES_DIGITOS = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+# Caracteres de formatação aceitos em buscas por documento
+PONTUACAO_DOCUMENTO = frozenset(" .-/")
+
+# Registros lidos por transação no preenchimento inicial
+TAMANHO_LOTE_BACKFILL = 1000
+
+
+def digitos_documento(valor):
+    """Retorne apenas os dígitos ASCII do documento."""
+    return "".join(c for c in valor or "" if "0" <= c <= "9")
+
+
+def busca_por_documento(texto):
+    """Verifique se o texto buscado é um documento (dígitos e pontuação)."""
+    texto = (texto or "").strip()
+    return any("0" <= c <= "9" for c in texto) and all(
+        "0" <= c <= "9" or c in PONTUACAO_DOCUMENTO for c in texto
+    )
+
+
+def normalizar_documento(valor):
+    """Retorne os dígitos do CPF/CNPJ, ou None se não tiver 11 nem 14 dígitos."""
+    digitos = digitos_documento(valor)
+    return digitos if len(digitos) in (DIGITOS_CPF, DIGITOS_CNPJ) else None
+
+
+def normalizar_cpf(valor):
+    """Retorne os dígitos do CPF, ou None se não tiver 11 dígitos."""
+    digitos = digitos_documento(valor)
+    return digitos if len(digitos) == DIGITOS_CPF else None
+
+
+def _verificador(valores, pesos):
+    resto = sum(map(mul, valores, pesos)) % 11
+    return 0 if resto < 2 else 11 - resto
+
+
+def documentos_validos(documentos):
+    """Valide os dígitos verificadores de vários documentos normalizados.
+
+    Pensada para importações em lote: cada documento é convertido de uma vez
+    (``bytes.translate``) e as somas ponderadas usam ``map`` com
+    ``operator.mul``, sem chamadas Python por dígito.
+
+    Args:
+        documentos (Iterable[str | None]): Documentos somente com dígitos
+
+    Returns:
+        list[bool]: Validade de cada documento, na mesma ordem
+    """
+    resultado = []
+    for documento in documentos:
+        if not documento or len(documento) not in (DIGITOS_CPF, DIGITOS_CNPJ):
+            resultado.append(False)
+            continue
+
+        valores = documento.encode("ascii").translate(VALORES_DIGITOS)
+        # Sequências repetidas (000.000.000-00) passam no cálculo mas são inválidas
+        if valores.count(valores[0]) == len(valores):
+            resultado.append(False)
+            continue
+
+        pesos = PESOS_CPF if len(valores) == DIGITOS_CPF else PESOS_CNPJ
+        base = len(valores) - 2
+        resultado.append(
+            valores[base] == _verificador(valores[:base], pesos[0])
+            and valores[base + 1] == _verificador(valores[: base + 1], pesos[1])
+        )
+    return resultado
+
+
+def documento_valido(documento):
+    """Verifique se o documento normalizado é um CPF ou CNPJ válido."""
+    return documentos_validos([documento])[0]
+
+
+def popular_documentos(
+    modelo,
+    coluna,
+    coluna_digitos,
+    tamanho_lote=TAMANHO_LOTE_BACKFILL,
+    normalizar=normalizar_documento,
+):
+    """Preencha a coluna de dígitos dos registros existentes, em lotes.
+
+    Cada lote lê uma faixa de IDs e grava os dígitos com um UPDATE em lote,
+    sem alterar ``updated_at`` nem a versão. Registros cujo documento
+    normalizado já pertence a outro ficam sem dígitos e são informados como
+    duplicados, para correção manual.
+
+    Args:
+        normalizar: Função que extrai os dígitos (``normalizar_cpf`` para
+            colunas que aceitam apenas CPF)
+
+    Returns:
+        dict: Quantidades de preenchidos, inválidos (dígito verificador
+        incorreto, preenchidos mesmo assim), sem documento reconhecível e os
+        IDs duplicados
+    """
+    tabela = modelo.__table__
+    gravar = (
+        update(tabela)
+        .where(tabela.c.id == bindparam("b_id"))
+        .values(
+            {
+                coluna_digitos.name: bindparam("b_digitos"),
+                "updated_at": tabela.c.updated_at,
+            }
+        )
+    )
+
+    resumo = {"preenchidos": 0, "invalidos": 0, "sem_documento": 0, "duplicados": []}
+    apos_id = 0
+    while True:
+        with coordenador_escrita.transacao() as session:
+            linhas = session.execute(
+                select(tabela.c.id, coluna)
+                .where(tabela.c.id > apos_id, coluna_digitos.is_(None))
+                .order_by(tabela.c.id)
+                .limit(tamanho_lote)
+            ).all()
+            if not linhas:
+                return resumo
+            apos_id = linhas[-1].id
+
+            normalizados = {
+                linha.id: normalizar(linha[1]) for linha in linhas
+            }
+            resumo["sem_documento"] += sum(
+                1 for digitos in normalizados.values() if digitos is None
+            )
+
+            # Documentos já gravados em outros registros (ou repetidos no lote)
+            ocupados = set(
+                session.scalars(
+                    select(coluna_digitos).where(
+                        coluna_digitos.in_(
+                            sorted({d for d in normalizados.values() if d})
+                        )
+                    )
+                )
+            )
+            parametros = []
+            for registro_id, digitos in normalizados.items():
+                if digitos is None:
+                    continue
+                if digitos in ocupados:
+                    resumo["duplicados"].append(registro_id)
+                    continue
+                ocupados.add(digitos)
+                parametros.append({"b_id": registro_id, "b_digitos": digitos})
+
+            if parametros:
+                session.execute(gravar, parametros)
+            resumo["preenchidos"] += len(parametros)
+            resumo["invalidos"] += documentos_validos(
+                p["b_digitos"] for p in parametros
+            ).count(False)
+
+
+def colunas_documento():
+    """Retorne modelo, coluna do documento, coluna de dígitos e normalização."""
+    return (
+        (Cliente, Cliente.cpf_cnpj, Cliente.cpf_cnpj_digitos, normalizar_documento),
+        (Advogado, Advogado.cpf, Advogado.cpf_digitos, normalizar_cpf),
+    )
+
+
+def popular_colunas_documento(tamanho_lote=TAMANHO_LOTE_BACKFILL):
+    """Preencha os dígitos ainda nulos do CPF/CNPJ de clientes e advogados.
+
+    Returns:
+        dict: Resumo de ``popular_documentos`` por tabela
+    """
+    return {
+        modelo.__tablename__: popular_documentos(
+            modelo, coluna, coluna_digitos, tamanho_lote, normalizar
+        )
+        for modelo, coluna, coluna_digitos, normalizar in colunas_documento()
+    }
@@ -0,0 +1,338 @@
+"""Coordene as transações de escrita no banco e trate a contenção de bloqueios.
+
+No SQLite apenas uma conexão escreve por vez. As transações de escrita são
+iniciadas com ``BEGIN IMMEDIATE``, que reserva o bloqueio de escrita antes de
+qualquer comando: se o banco estiver ocupado, a falha ocorre antes de a
+sessão gravar algo e a tentativa pode ser repetida sem perda de estado.
+
+Opcionalmente (``ESCRITA_FILA_UNICA``), as escritas do processo passam por um
+único escritor: inserções de registros novos são enfileiradas e gravadas em
+lote, várias requisições confirmadas em um único commit (group commit).
+"""
+
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session
+
+from api import db
+from api.services.restricoes import anotar_gravados, gravados_da_sessao
+
+# Códigos de erro do SQLite que indicam contenção de bloqueio
+ERROS_BLOQUEIO = ("SQLITE_BUSY", "SQLITE_LOCKED")
+
+
+class BancoOcupado(Exception):
+    """Sinalize que o bloqueio de escrita não foi obtido dentro do prazo."""
+
+
+# Exceções das escritas que as rotas deixam propagar: a resposta é dada pelos
+# manipuladores de erro da aplicação (api.routes)
+ERROS_ESCRITA = (BancoOcupado, IntegrityError)
+
+
+def erro_de_bloqueio(erro):
+    """Verifique se a exceção representa banco ocupado ou bloqueado."""
+    if not isinstance(erro, OperationalError):
+        return False
+    nome = getattr(erro.orig, "sqlite_errorname", "")
+    if nome.startswith(ERROS_BLOQUEIO):
+        return True
+    mensagem = str(erro.orig).lower()
+    return "database is locked" in mensagem or "database is busy" in mensagem
+
+
+class _ItemFila:
+    """Represente uma inserção aguardando o escritor único."""
+
+    def __init__(self, objeto):
+        self.objeto = objeto
+        self.id_original = objeto.id
+        self.concluido = threading.Event()
+        self.erro = None
+        self.cancelado = False
+        self.em_gravacao = False
+        self._lock = threading.Lock()
+
+    def reservar(self):
+        """Marque o item como em gravação; retorne False se foi cancelado."""
+        with self._lock:
+            self.em_gravacao = not self.cancelado
+            return self.em_gravacao
+
+    def cancelar(self):
+        """Cancele o item ainda não gravado; retorne False se já em gravação."""
+        with self._lock:
+            self.cancelado = not self.em_gravacao
+            return self.cancelado
+
+
+class CoordenadorEscrita:
+    """Serialize e repita transações de escrita sob contenção de bloqueio."""
+
+    def __init__(self):
+        self.prazo = 10.0
+        self.espera_base = 0.01
+        self.espera_maxima = 0.5
+        self.tamanho_lote = 50
+        self.janela_lote = 0.002
+        self.fila_unica = False
+        self._app = None
+        self._fila = None
+        self._escritor = None
+        self._trava = threading.RLock()
+        self._lock_escritor = threading.Lock()
+        self._local = threading.local()
+        self._lock_metricas = threading.Lock()
+        self._metricas = self._metricas_zeradas()
+
+    def init_app(self, app):
+        """Configure prazos e o modo escritor único a partir da aplicação."""
+        self._app = app
+        self.prazo = app.config["ESCRITA_PRAZO_SEGUNDOS"]
+        self.espera_base = app.config["ESCRITA_ESPERA_BASE_SEGUNDOS"]
+        self.espera_maxima = app.config["ESCRITA_ESPERA_MAXIMA_SEGUNDOS"]
+        self.tamanho_lote = app.config["ESCRITA_LOTE_MAXIMO"]
+        self.janela_lote = app.config["ESCRITA_JANELA_LOTE_MS"] / 1000
+        self.fila_unica = app.config["ESCRITA_FILA_UNICA"]
+
+    # Métricas de contenção
+
+    @staticmethod
+    def _metricas_zeradas():
+        return {
+            "transacoes": 0,
+            "bloqueios": 0,
+            "repeticoes": 0,
+            "prazo_esgotado": 0,
+            "espera_total_ms": 0.0,
+            "espera_maxima_ms": 0.0,
+            "lotes": 0,
+            "itens_em_lote": 0,
+        }
+
+    def _contar(self, **valores):
+        with self._lock_metricas:
+            for chave, valor in valores.items():
+                self._metricas[chave] += valor
+
+    def metricas(self):
+        """Retorne os contadores de contenção acumulados no processo."""
+        with self._lock_metricas:
+            metricas = dict(self._metricas)
+        metricas["espera_total_ms"] = round(metricas["espera_total_ms"], 2)
+        metricas["espera_maxima_ms"] = round(metricas["espera_maxima_ms"], 2)
+        metricas["fila_unica"] = self.fila_unica
+        return metricas
+
+    def zerar_metricas(self):
+        """Reinicie os contadores de contenção."""
+        with self._lock_metricas:
+            self._metricas = self._metricas_zeradas()
+
+    # Transações de escrita
+
+    def _iniciar_imediato(self, session):
+        """Execute ``BEGIN IMMEDIATE`` repetindo com backoff até o prazo.
+
+        Raises:
+            BancoOcupado: Se o bloqueio não for obtido dentro do prazo
+        """
+        conexao = session.connection()
+        if conexao.dialect.name != "sqlite":
+            return
+
+        # Transação já iniciada por um flush anterior: o bloqueio já é nosso
+        if conexao.connection.dbapi_connection.in_transaction:
+            return
+
+        inicio = time.monotonic()
+        tentativa = 0
+        while True:
+            try:
+                conexao.exec_driver_sql("BEGIN IMMEDIATE")
+                break
+            except OperationalError as erro:
+                if not erro_de_bloqueio(erro):
+                    raise
+                self._contar(bloqueios=1)
+
+                restante = inicio + self.prazo - time.monotonic()
+                if restante <= 0:
+                    self._contar(prazo_esgotado=1)
+                    raise BancoOcupado(
+                        "Banco de dados ocupado: tente novamente"
+                    ) from erro
+
+                # Backoff exponencial com jitter completo, limitado ao prazo
+                teto = min(self.espera_maxima, self.espera_base * 2**tentativa)
+                time.sleep(min(restante, random.uniform(0, teto)))
+                tentativa += 1
+                self._contar(repeticoes=1)
+
+        espera = (time.monotonic() - inicio) * 1000
+        with self._lock_metricas:
+            self._metricas["espera_total_ms"] += espera
+            self._metricas["espera_maxima_ms"] = max(
+                self._metricas["espera_maxima_ms"], espera
+            )
+
+    @contextmanager
+    def transacao(self, session=None):
+        """Execute o bloco em uma transação de escrita confirmada ao final.
+
+        O bloqueio de escrita é obtido antes do bloco; alterações feitas no
+        bloco são gravadas no commit. Em caso de erro a transação é desfeita.
+        Blocos aninhados participam da transação mais externa.
+
+        Raises:
+            BancoOcupado: Se o bloqueio não for obtido dentro do prazo
+        """
+        session = db.session if session is None else session
+        if getattr(self._local, "profundidade", 0):
+            self._local.profundidade += 1
+            try:
+                yield session
+            finally:
+                self._local.profundidade -= 1
+            return
+
+        travado = False
+        self._local.profundidade = 1
+        try:
+            if self.fila_unica:
+                self._trava.acquire()
+                travado = True
+
+            self._iniciar_imediato(session)
+            yield session
+            session.commit()
+            self._contar(transacoes=1)
+        except BaseException as erro:
+            # Registros gravados, para traduzir a restrição violada após o rollback
+            if isinstance(erro, IntegrityError):
+                anotar_gravados(erro, gravados_da_sessao(session))
+            session.rollback()
+            raise
+        finally:
+            self._local.profundidade = 0
+            if travado:
+                self._trava.release()
+
+    def confirmar(self, session=None):
+        """Grave as alterações pendentes da sessão como transação de escrita."""
+        with self.transacao(session):
+            pass
+
+    def salvar(self, objeto):
+        """Grave o objeto; registros novos usam o escritor único, se ativo.
+
+        Objetos novos sem relacionamentos carregados são inseridos pelo
+        escritor do processo, agrupados com inserções de outras requisições,
+        e em seguida anexados à sessão corrente.
+        """
+        if self._pode_enfileirar(objeto):
+            self._enfileirar(objeto)
+            db.session.add(objeto)
+            return
+
+        with self.transacao() as session:
+            session.add(objeto)
+
+    def _pode_enfileirar(self, objeto):
+        """Verifique se o objeto pode ser gravado por outra sessão."""
+        if not self.fila_unica or getattr(self._local, "profundidade", 0):
+            return False
+
+        estado = inspect(objeto)
+        if not estado.transient:
+            return False
+
+        # Objetos relacionados pertencem à sessão da requisição
+        relacionamentos = estado.mapper.relationships.keys()
+        return not any(chave in estado.dict for chave in relacionamentos)
+
+    # Escritor único com group commit
+
+    def _enfileirar(self, objeto):
+        """Entregue a inserção ao escritor único e aguarde o commit."""
+        if self._escritor is None or not self._escritor.is_alive():
+            with self._lock_escritor:
+                if self._escritor is None or not self._escritor.is_alive():
+                    self._fila = queue.Queue()
+                    self._escritor = threading.Thread(
+                        target=self._executar_escritor,
+                        name="escritor-banco",
+                        daemon=True,
+                    )
+                    self._escritor.start()
+
+        item = _ItemFila(objeto)
+        self._fila.put(item)
+
+        # A espera é limitada: o escritor pode ter parado ou travado. Item ainda
+        # na fila é cancelado e não será gravado; item já em gravação ganha
+        # mais um prazo (o do seu BEGIN IMMEDIATE) antes de a requisição desistir
+        concluido = item.concluido.wait(self.prazo)
+        if not concluido and not item.cancelar():
+            concluido = item.concluido.wait(self.prazo)
+        if not concluido:
+            self._contar(prazo_esgotado=1)
+            raise BancoOcupado("Escritor do banco não respondeu: tente novamente")
+        if item.erro is not None:
+            raise item.erro
+
+    def _executar_escritor(self):
+        """Agrupe inserções enfileiradas e grave cada lote em um commit."""
+        with self._app.app_context():
+            # Conexão dedicada: as requisições que aguardam o escritor podem
+            # estar ocupando todas as conexões do pool
+            session = Session(db.engine.connect(), expire_on_commit=False)
+            while True:
+                lote = [self._fila.get()]
+
+                # Aguarda brevemente por outras inserções para o mesmo commit
+                limite = time.monotonic() + self.janela_lote
+                while len(lote) < self.tamanho_lote:
+                    try:
+                        lote.append(
+                            self._fila.get(timeout=max(0, limite - time.monotonic()))
+                        )
+                    except queue.Empty:
+                        break
+
+                # Itens cuja requisição desistiu de esperar não são gravados
+                lote = [item for item in lote if item.reservar()]
+                if lote:
+                    self._gravar_lote(session, lote)
+
+    def _gravar_lote(self, session, lote):
+        """Grave o lote; se falhar, regrave cada item isoladamente."""
+        try:
+            with self._trava, self.transacao(session):
+                session.add_all(item.objeto for item in lote)
+            self._contar(lotes=1, itens_em_lote=len(lote))
+        except Exception as erro:
+            if len(lote) > 1 and not isinstance(erro, BancoOcupado):
+                for item in lote:
+                    # Descarta a chave atribuída no INSERT desfeito
+                    item.objeto.id = item.id_original
+                    self._gravar_lote(session, [item])
+                return
+            for item in lote:
+                item.erro = erro
+        finally:
+            # Libera os objetos para serem anexados à sessão de cada requisição
+            session.expunge_all()
+
+        for item in lote:
+            item.concluido.set()
+
+
+# Coordenador compartilhado pelas requisições deste worker
+coordenador_escrita = CoordenadorEscrita()
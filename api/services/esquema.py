@@ -0,0 +1,86 @@
+"""Acompanhe a revisão do esquema do banco principal (migrações do Alembic).
+
+O esquema evolui pelas migrações de ``migrations/`` (Flask-Migrate). Um banco
+sem tabelas é criado a partir dos modelos e marcado com a revisão mais
+recente; bancos existentes são atualizados por ``flask init-db`` (ou
+``flask db upgrade``), nunca na inicialização da aplicação, que apenas avisa
+quando há migrações pendentes.
+"""
+
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from flask_migrate import upgrade
+from sqlalchemy import inspect
+
+from api import db, migrate
+
+# Revisão do esquema criado antes das migrações (bancos sem alembic_version)
+REVISAO_INICIAL = "bba2690529c0"
+
+
+def _scripts():
+    """Retorne o diretório de migrações configurado no Flask-Migrate."""
+    return ScriptDirectory.from_config(migrate.get_config())
+
+
+def _criar_tabelas(conexao):
+    """Crie as tabelas dos modelos e marque o banco na revisão mais recente."""
+    # O bind somente leitura não possui tabelas próprias
+    db.metadatas[None].create_all(conexao)
+    MigrationContext.configure(conexao).stamp(_scripts(), "head")
+
+
+def revisoes(conexao):
+    """Retorne a revisão do banco (None se não marcado) e a mais recente."""
+    atual = MigrationContext.configure(conexao).get_current_revision()
+    return atual, _scripts().get_current_head()
+
+
+def preparar_esquema(app):
+    """Crie as tabelas de um banco vazio ou avise sobre migrações pendentes.
+
+    Args:
+        app (Flask): Aplicação cujo banco principal é verificado
+
+    Returns:
+        bool: True se as tabelas foram criadas
+    """
+    with db.engine.begin() as conexao:
+        if not inspect(conexao).get_table_names():
+            _criar_tabelas(conexao)
+            return True
+        atual, recente = revisoes(conexao)
+
+    if atual != recente:
+        app.logger.warning(
+            "Banco na revisão %s, a mais recente é %s: execute flask init-db "
+            "(ou flask db upgrade)",
+            atual,
+            recente,
+        )
+    return False
+
+
+def migrar_banco():
+    """Crie o banco ou aplique as migrações pendentes até a mais recente.
+
+    Bancos criados antes das migrações (sem ``alembic_version``) são marcados
+    com a revisão inicial e recebem todas as migrações seguintes.
+
+    Returns:
+        tuple: Revisão anterior do banco (None se criado agora) e a atual
+    """
+    with db.engine.begin() as conexao:
+        if not inspect(conexao).get_table_names():
+            _criar_tabelas(conexao)
+            return None, _scripts().get_current_head()
+
+        contexto = MigrationContext.configure(conexao)
+        anterior = contexto.get_current_revision()
+        if anterior is None:
+            contexto.stamp(_scripts(), REVISAO_INICIAL)
+            anterior = REVISAO_INICIAL
+
+    upgrade()
+    with db.engine.connect() as conexao:
+        return anterior, revisoes(conexao)[0]
@@ -0,0 +1,143 @@
+"""Centralize a captura de alterações de registros feitas pela sessão do ORM.
+
+As alterações são coletadas após cada flush (ou informadas explicitamente por
+escritas feitas via Core) e repassadas a dois tipos de assinantes:
+
+- ``ao_gravar``: executados dentro da transação, podendo gravar dados
+  complementares (ex.: log de sincronização) no mesmo commit;
+- ``apos_commit``: executados somente depois do commit bem-sucedido (ex.:
+  invalidação de cache e notificações), recebendo a sessão e as alterações
+  acumuladas. Nesta fase não é possível emitir SQL: dados adicionais devem
+  ser coletados em ``ao_gravar`` e guardados em ``session.info``.
+"""
+
+import logging
+from typing import Any, NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Assinantes registrados para cada fase
+_assinantes_gravacao = []
+_assinantes_commit = []
+
+# Colunas cujos valores anteriores acompanham as alterações via Core, por tabela
+_colunas_rastreadas = {}
+
+
+class EventoAlteracao(NamedTuple):
+    """Descreva a alteração de um registro.
+
+    Attributes:
+        tabela: Nome da tabela do registro alterado
+        registro_id: Chave primária do registro
+        operacao: ``insert``, ``update`` ou ``delete``
+        objeto: Instância do modelo (None quando a escrita foi feita via Core)
+        valores: Colunas atribuídas em escritas via Core (ou None)
+        anteriores: Valores das colunas rastreadas antes da escrita via Core
+    """
+
+    tabela: str
+    registro_id: int
+    operacao: str
+    objeto: Any = None
+    valores: dict | None = None
+    anteriores: dict | None = None
+
+
+def ao_gravar(funcao):
+    """Registre assinante chamado dentro da transação com as alterações."""
+    _assinantes_gravacao.append(funcao)
+    return funcao
+
+
+def apos_commit(funcao):
+    """Registre assinante chamado após o commit com as alterações efetivadas."""
+    _assinantes_commit.append(funcao)
+    return funcao
+
+
+def rastrear_colunas(tabela, colunas):
+    """Solicite os valores anteriores das colunas nas alterações via Core.
+
+    Escritas via Core que alteram alguma dessas colunas leem os valores
+    atuais antes do UPDATE e os informam em ``EventoAlteracao.anteriores``.
+    """
+    _colunas_rastreadas.setdefault(tabela, set()).update(colunas)
+
+
+def colunas_rastreadas(tabela):
+    """Retorne as colunas da tabela com valores anteriores solicitados."""
+    return _colunas_rastreadas.get(tabela, set())
+
+
+def registrar_alteracoes(session, alteracoes):
+    """Repasse alterações aos assinantes da transação e acumule para o commit.
+
+    Escritas feitas via Core (``update()``/``insert()``) não disparam os
+    eventos de flush e devem chamar esta função explicitamente.
+    """
+    if not alteracoes:
+        return
+
+    for assinante in _assinantes_gravacao:
+        assinante(session, alteracoes)
+
+    session.info.setdefault("alteracoes_pendentes", []).extend(alteracoes)
+
+
+def dados_transacao(session):
+    """Retorne dicionário auxiliar descartado ao fim da transação corrente.
+
+    Assinantes ``ao_gravar`` guardam aqui o que os assinantes ``apos_commit``
+    precisam, pois após o commit não é possível consultar o banco.
+    """
+    return session.info.setdefault("dados_transacao", {})
+
+
+@event.listens_for(Session, "after_flush")
+def _capturar_flush(session, flush_context):
+    """Colete registros inseridos, alterados e removidos no flush."""
+    from api.models._base import BaseModel
+
+    alteracoes = []
+    for operacao, objetos in (
+        ("insert", session.new),
+        ("update", session.dirty),
+        ("delete", session.deleted),
+    ):
+        for obj in objetos:
+            if not isinstance(obj, BaseModel):
+                continue
+            if operacao == "update" and not session.is_modified(obj):
+                continue
+            alteracoes.append(EventoAlteracao(obj.__tablename__, obj.id, operacao, obj))
+
+    registrar_alteracoes(session, alteracoes)
+
+
+@event.listens_for(Session, "after_commit")
+def _notificar_commit(session):
+    """Entregue as alterações efetivadas aos assinantes pós-commit."""
+    alteracoes = session.info.pop("alteracoes_pendentes", None)
+    if not alteracoes:
+        session.info.pop("dados_transacao", None)
+        return
+
+    # O commit já foi efetivado: falhas de assinantes não devem propagar
+    for assinante in _assinantes_commit:
+        try:
+            assinante(session, alteracoes)
+        except Exception:
+            logger.exception("Falha ao notificar alterações após commit")
+
+    session.info.pop("dados_transacao", None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_rollback(session):
+    """Descarte alterações acumuladas de uma transação desfeita."""
+    session.info.pop("alteracoes_pendentes", None)
+    session.info.pop("dados_transacao", None)
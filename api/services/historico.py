@@ -0,0 +1,211 @@
+"""Registre o histórico de alterações dos processos (quem alterou o quê e quando).
+
+As diferenças por campo são obtidas dos eventos de gravação: nas escritas
+pelo ORM, do histórico dos atributos da sessão; nas escritas via Core
+(``atualizar_versionado``), dos valores atribuídos e dos valores anteriores
+que o UPDATE lê sob o mesmo bloqueio de escrita. As entradas de um flush são
+inseridas em lote, na mesma transação da escrita, sem consultas adicionais
+por processo.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask import has_request_context
+from sqlalchemy import insert, inspect, select, tuple_
+
+from api import db
+from api.models.historico import HistoricoProcesso
+from api.models.processo import Processo
+from api.services.eventos import ao_gravar, rastrear_colunas
+
+# Campos do processo acompanhados pelo histórico (textos longos ficam de fora)
+CAMPOS_HISTORICO = (
+    "numero_processo",
+    "numero_interno",
+    "titulo",
+    "area_juridica",
+    "tipo_acao",
+    "status",
+    "prioridade",
+    "tribunal",
+    "vara",
+    "juiz",
+    "valor_causa",
+    "valor_honorarios",
+    "forma_pagamento",
+    "data_distribuicao",
+    "data_conclusao",
+    "cliente_id",
+    "advogado_id",
+)
+
+rastrear_colunas(Processo.__tablename__, CAMPOS_HISTORICO)
+
+
+def _usuario_atual():
+    """Retorne o ID do usuário do token da requisição, se houver."""
+    from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+    if not has_request_context():
+        return None
+    try:
+        verify_jwt_in_request(optional=True)
+        return int(get_jwt()["sub"])
+    except Exception:
+        return None
+
+
+def _normalizar(campo, valor):
+    """Converta o valor ao tipo da coluna, em formato serializável em JSON.
+
+    Valores atribuídos via Core chegam como enviados pelo cliente (ex.:
+    ``"1500.00"``); a conversão evita registrar campos que não mudaram.
+    """
+    if valor is None or valor == "":
+        return None
+    tipo = Processo.__table__.c[campo].type.python_type
+    try:
+        if tipo is Decimal:
+            return float(valor)
+        if tipo is int:
+            return int(valor)
+    except (TypeError, ValueError):
+        return valor
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return valor
+
+
+def _diferencas(pares):
+    """Monte ``{campo: [anterior, novo]}`` com os campos efetivamente alterados."""
+    diferencas = {}
+    for campo, anterior, novo in pares:
+        anterior, novo = _normalizar(campo, anterior), _normalizar(campo, novo)
+        if anterior != novo:
+            diferencas[campo] = [anterior, novo]
+    return diferencas
+
+
+def _diferencas_objeto(objeto, operacao):
+    """Obtenha as diferenças de um processo gravado pelo ORM."""
+    estado = inspect(objeto)
+    if operacao == "insert":
+        return _diferencas(
+            (campo, None, estado.dict.get(campo)) for campo in CAMPOS_HISTORICO
+        )
+    if operacao == "delete":
+        return _diferencas(
+            (campo, estado.dict.get(campo), None) for campo in CAMPOS_HISTORICO
+        )
+
+    pares = []
+    for campo in CAMPOS_HISTORICO:
+        historico = estado.attrs[campo].history
+        if historico.added or historico.deleted:
+            pares.append(
+                (
+                    campo,
+                    historico.deleted[0] if historico.deleted else None,
+                    historico.added[0] if historico.added else None,
+                )
+            )
+    return _diferencas(pares)
+
+
+def _diferencas_core(alteracao):
+    """Obtenha as diferenças de um UPDATE via Core com valores anteriores."""
+    if alteracao.anteriores is None:
+        return {}
+    return _diferencas(
+        (campo, alteracao.anteriores.get(campo), alteracao.valores[campo])
+        for campo in CAMPOS_HISTORICO
+        if campo in alteracao.valores
+    )
+
+
+@ao_gravar
+def registrar_historico(session, alteracoes):
+    """Grave as diferenças dos processos alterados na mesma transação."""
+    linhas = []
+    for alteracao in alteracoes:
+        if alteracao.tabela != Processo.__tablename__:
+            continue
+
+        if alteracao.objeto is not None:
+            diferencas = _diferencas_objeto(alteracao.objeto, alteracao.operacao)
+        elif alteracao.valores is not None:
+            diferencas = _diferencas_core(alteracao)
+        else:
+            continue
+
+        # Atualizações sem mudança nos campos acompanhados não geram entrada
+        if alteracao.operacao == "update" and not diferencas:
+            continue
+        linhas.append(
+            {
+                "processo_id": alteracao.registro_id,
+                "operacao": alteracao.operacao,
+                "alteracoes": diferencas,
+            }
+        )
+
+    if not linhas:
+        return
+
+    agora = datetime.utcnow()
+    usuario_id = _usuario_atual()
+    for linha in linhas:
+        linha.update(
+            alterado_em=agora,
+            usuario_id=usuario_id,
+            alteracoes=json.dumps(linha["alteracoes"], separators=(",", ":")),
+        )
+
+    # Usa Core na conexão da transação para não disparar um novo flush
+    session.connection().execute(insert(HistoricoProcesso.__table__), linhas)
+
+
+def listar_historico(processo_id, limite, antes=None):
+    """Retorne as entradas do histórico do processo, mais recentes primeiro.
+
+    A paginação é por chave: ``antes`` é o ID da última entrada recebida e a
+    consulta continua a partir dela no índice (processo_id, alterado_em),
+    sem OFFSET.
+
+    Returns:
+        tuple[list, int | None]: Entradas e o ID para a próxima página (None
+        quando não há mais entradas)
+    """
+    tabela = HistoricoProcesso.__table__
+    query = (
+        select(tabela)
+        .where(tabela.c.processo_id == processo_id)
+        .order_by(tabela.c.alterado_em.desc(), tabela.c.id.desc())
+        .limit(limite + 1)
+    )
+    if antes is not None:
+        cursor = (
+            select(tabela.c.alterado_em)
+            .where(tabela.c.id == antes, tabela.c.processo_id == processo_id)
+            .scalar_subquery()
+        )
+        query = query.where(
+            tuple_(tabela.c.alterado_em, tabela.c.id) < tuple_(cursor, antes)
+        )
+
+    entradas = db.session.execute(query).all()
+    proximo = entradas[limite - 1].id if len(entradas) > limite else None
+    return entradas[:limite], proximo
+
+
+def serializar_entrada(entrada):
+    """Converta uma entrada do histórico em dicionário."""
+    return {
+        "id": entrada.id,
+        "alterado_em": entrada.alterado_em.isoformat(),
+        "usuario_id": entrada.usuario_id,
+        "operacao": entrada.operacao,
+        "alteracoes": json.loads(entrada.alteracoes),
+    }
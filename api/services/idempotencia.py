@@ -0,0 +1,347 @@
+"""Torne repetíveis as requisições POST que criam registros (``Idempotency-Key``).
+
+Nos endpoints configurados em ``IDEMPOTENCIA_ENDPOINTS``, uma requisição com
+o cabeçalho ``Idempotency-Key`` reserva a chave (tabela
+``chaves_idempotencia``) antes de executar a view e grava a resposta ao final.
+Repetições da mesma chave pelo mesmo autor:
+
+- com a resposta gravada, recebem a resposta original sem executar a view
+  (cabeçalho ``Idempotent-Replayed: true``);
+- com a original ainda em andamento, aguardam até
+  ``IDEMPOTENCIA_ESPERA_SEGUNDOS`` por ela e, esgotada a espera, recebem 409
+  com ``Retry-After`` (a restrição única da reserva impede duas execuções);
+- com corpo, método ou caminho diferentes, recebem 422.
+
+Respostas 5xx e exceções liberam a reserva para que o cliente possa repetir.
+Reservas abandonadas (worker interrompido) expiram após
+``IDEMPOTENCIA_RESERVA_SEGUNDOS``; respostas gravadas, após
+``IDEMPOTENCIA_TTL_HORAS``.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app, g, jsonify, request
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from api import db
+from api.models.idempotencia import ChaveIdempotencia
+from api.services.escrita import coordenador_escrita
+
+logger = logging.getLogger(__name__)
+
+# Cabeçalho enviado pelo cliente e cabeçalho das respostas reproduzidas
+CABECALHO_CHAVE = "Idempotency-Key"
+CABECALHO_REPRODUZIDA = "Idempotent-Replayed"
+
+# Tamanho máximo da chave (coluna ``chave``)
+TAMANHO_MAXIMO_CHAVE = 255
+
+# Chaves expiradas removidas por transação na limpeza
+TAMANHO_LOTE_LIMPEZA = 1000
+
+# Intervalos da consulta à reserva em andamento (segundos)
+INTERVALO_MINIMO_ESPERA = 0.02
+INTERVALO_MAXIMO_ESPERA = 0.2
+
+
+def _autor():
+    """Identifique o autor da chave: usuário do token ou endereço IP."""
+    from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+    try:
+        verify_jwt_in_request(optional=True)
+        usuario = get_jwt().get("sub")
+    except Exception:
+        usuario = None
+    if usuario is not None:
+        return f"usuario:{usuario}"
+    return f"ip:{request.remote_addr}"
+
+
+def impressao_requisicao(metodo, caminho, corpo):
+    """Calcule o SHA-256 de método, caminho e corpo da requisição.
+
+    Corpos JSON são normalizados (chaves ordenadas, sem espaços), de modo que
+    a mesma requisição serializada de outra forma produz a mesma impressão.
+    """
+    try:
+        corpo = json.dumps(
+            json.loads(corpo), sort_keys=True, separators=(",", ":")
+        ).encode()
+    except ValueError:
+        pass
+    resumo = hashlib.sha256(f"{metodo} {caminho}\n".encode())
+    resumo.update(corpo)
+    return resumo.hexdigest()
+
+
+def limpar_expiradas(tamanho_lote=TAMANHO_LOTE_LIMPEZA, lotes=None):
+    """Remova as chaves expiradas em transações curtas.
+
+    Args:
+        tamanho_lote: Chaves removidas por transação
+        lotes: Máximo de transações (None remove todas as expiradas)
+
+    Returns:
+        int: Quantidade de chaves removidas
+    """
+    tabela = ChaveIdempotencia.__table__
+    total = 0
+    while lotes is None or lotes > 0:
+        with coordenador_escrita.transacao() as session:
+            ids = select(tabela.c.id).where(
+                tabela.c.expira_em < datetime.utcnow()
+            ).limit(tamanho_lote)
+            removidas = session.execute(
+                delete(tabela).where(tabela.c.id.in_(ids.scalar_subquery()))
+            ).rowcount
+        total += removidas
+        if removidas < tamanho_lote:
+            break
+        if lotes is not None:
+            lotes -= 1
+    return total
+
+
+class ControleIdempotencia:
+    """Reserve chaves, grave respostas e reproduza-as nas repetições."""
+
+    def __init__(self):
+        self.endpoints = frozenset()
+        self.ttl = timedelta(hours=24)
+        self.reserva = timedelta(seconds=60)
+        self.espera = 2.0
+        self.intervalo_limpeza = 600.0
+        self._limpar_em = 0.0
+        self._lock = threading.Lock()
+        self._metricas = {
+            "reservadas": 0,
+            "gravadas": 0,
+            "reproduzidas": 0,
+            "liberadas": 0,
+            "em_andamento_recusadas": 0,
+            "impressao_divergente": 0,
+            "limpas": 0,
+        }
+
+    def init_app(self, app):
+        """Leia a configuração e registre os hooks de idempotência."""
+        self.endpoints = frozenset(app.config["IDEMPOTENCIA_ENDPOINTS"])
+        self.ttl = timedelta(hours=app.config["IDEMPOTENCIA_TTL_HORAS"])
+        self.reserva = timedelta(seconds=app.config["IDEMPOTENCIA_RESERVA_SEGUNDOS"])
+        self.espera = app.config["IDEMPOTENCIA_ESPERA_SEGUNDOS"]
+        self.intervalo_limpeza = app.config["IDEMPOTENCIA_LIMPEZA_SEGUNDOS"]
+
+        app.before_request(self._reservar)
+        app.after_request(self._gravar)
+        app.teardown_request(self._encerrar)
+
+    def _contar(self, chave, quantidade=1):
+        with self._lock:
+            self._metricas[chave] += quantidade
+
+    def metricas(self):
+        """Retorne os contadores de reservas, reproduções e recusas."""
+        with self._lock:
+            return dict(self._metricas)
+
+    # Acesso à tabela de chaves
+
+    def _inserir_reserva(self, escopo, chave, impressao):
+        """Reserve a chave; retorne None se outra requisição já a possui."""
+        tabela = ChaveIdempotencia.__table__
+        agora = datetime.utcnow()
+        try:
+            with coordenador_escrita.transacao() as session:
+                # Chave expirada ainda não removida pela limpeza é reaproveitada
+                session.execute(
+                    delete(tabela).where(
+                        tabela.c.escopo == escopo,
+                        tabela.c.chave == chave,
+                        tabela.c.expira_em < agora,
+                    )
+                )
+                return session.execute(
+                    insert(tabela).values(
+                        escopo=escopo,
+                        chave=chave,
+                        endpoint=request.endpoint,
+                        impressao=impressao,
+                        expira_em=agora + self.reserva,
+                    )
+                ).inserted_primary_key[0]
+        except IntegrityError:
+            return None
+
+    @staticmethod
+    def _consultar(escopo, chave):
+        tabela = ChaveIdempotencia.__table__
+        # Encerra a leitura anterior: cada consulta enxerga o último commit
+        db.session.rollback()
+        return db.session.execute(
+            select(
+                tabela.c.impressao,
+                tabela.c.status,
+                tabela.c.tipo_conteudo,
+                tabela.c.corpo,
+                tabela.c.expira_em,
+            ).where(tabela.c.escopo == escopo, tabela.c.chave == chave)
+        ).first()
+
+    def _aguardar_resposta(self, escopo, chave, impressao):
+        """Consulte a chave até a resposta ser gravada ou a espera se esgotar.
+
+        Repetições com outra impressão retornam na primeira consulta.
+
+        Returns:
+            Row | None: Linha da chave (None se removida ou expirada)
+        """
+        limite = time.monotonic() + self.espera
+        intervalo = INTERVALO_MINIMO_ESPERA
+        while True:
+            linha = self._consultar(escopo, chave)
+            if linha is None or linha.expira_em < datetime.utcnow():
+                return None
+            if (
+                linha.status is not None
+                or linha.impressao != impressao
+                or time.monotonic() >= limite
+            ):
+                return linha
+            time.sleep(min(intervalo, max(0.0, limite - time.monotonic())))
+            intervalo = min(intervalo * 2, INTERVALO_MAXIMO_ESPERA)
+
+    def _remover_reserva(self, reserva_id):
+        tabela = ChaveIdempotencia.__table__
+        try:
+            with coordenador_escrita.transacao() as session:
+                session.execute(
+                    delete(tabela).where(
+                        tabela.c.id == reserva_id, tabela.c.status.is_(None)
+                    )
+                )
+            self._contar("liberadas")
+        except Exception:
+            # A reserva expira sozinha após IDEMPOTENCIA_RESERVA_SEGUNDOS
+            logger.exception("Falha ao liberar a chave de idempotência")
+
+    def _limpar_periodicamente(self):
+        """Remova um lote de chaves expiradas a cada intervalo de limpeza."""
+        agora = time.monotonic()
+        with self._lock:
+            if agora < self._limpar_em:
+                return
+            self._limpar_em = agora + self.intervalo_limpeza
+        try:
+            self._contar("limpas", limpar_expiradas(lotes=1))
+        except Exception:
+            logger.exception("Falha na limpeza das chaves de idempotência")
+
+    # Hooks da requisição
+
+    def _reservar(self):
+        if request.method != "POST" or request.endpoint not in self.endpoints:
+            return None
+        chave = request.headers.get(CABECALHO_CHAVE)
+        if chave is None:
+            return None
+
+        chave = chave.strip()
+        if not 0 < len(chave) <= TAMANHO_MAXIMO_CHAVE or not chave.isprintable():
+            return jsonify(
+                {
+                    "erro": f"{CABECALHO_CHAVE} deve ter entre 1 e "
+                    f"{TAMANHO_MAXIMO_CHAVE} caracteres imprimíveis"
+                }
+            ), 400
+
+        escopo = _autor()
+        impressao = impressao_requisicao(
+            request.method, request.path, request.get_data()
+        )
+        # Nova tentativa se a chave encontrada expirar ou for liberada (banco
+        # ocupado é respondido com 503 pelo manipulador de BancoOcupado)
+        for _ in range(2):
+            reserva_id = self._inserir_reserva(escopo, chave, impressao)
+            if reserva_id is not None:
+                self._contar("reservadas")
+                g.idempotencia = reserva_id
+                return None
+
+            linha = self._aguardar_resposta(escopo, chave, impressao)
+            if linha is not None:
+                return self._responder_repeticao(linha, impressao)
+
+        return self._em_andamento()
+
+    def _responder_repeticao(self, linha, impressao):
+        """Reproduza a resposta gravada ou recuse a repetição."""
+        if linha.impressao != impressao:
+            self._contar("impressao_divergente")
+            return jsonify(
+                {"erro": f"{CABECALHO_CHAVE} já utilizada com outra requisição"}
+            ), 422
+        if linha.status is None:
+            return self._em_andamento()
+
+        self._contar("reproduzidas")
+        return current_app.response_class(
+            linha.corpo,
+            status=linha.status,
+            content_type=linha.tipo_conteudo,
+            headers={CABECALHO_REPRODUZIDA: "true"},
+        )
+
+    def _em_andamento(self):
+        self._contar("em_andamento_recusadas")
+        return jsonify(
+            {"erro": "Requisição com esta chave ainda em andamento"}
+        ), 409, {"Retry-After": "1"}
+
+    def _gravar(self, response):
+        reserva_id = g.pop("idempotencia", None)
+        if reserva_id is None:
+            return response
+
+        # Falhas do servidor não são definitivas: o cliente deve poder repetir
+        if response.status_code >= 500 or response.is_streamed:
+            self._remover_reserva(reserva_id)
+            return response
+
+        tabela = ChaveIdempotencia.__table__
+        try:
+            with coordenador_escrita.transacao() as session:
+                session.execute(
+                    update(tabela)
+                    .where(tabela.c.id == reserva_id)
+                    .values(
+                        status=response.status_code,
+                        tipo_conteudo=response.content_type,
+                        corpo=response.get_data(),
+                        expira_em=datetime.utcnow() + self.ttl,
+                    )
+                )
+            self._contar("gravadas")
+        except Exception:
+            # A view já executou: a resposta é entregue sem ser gravada e a
+            # reserva permanece até expirar, recusando repetições com 409
+            logger.exception("Falha ao gravar a resposta idempotente")
+
+        self._limpar_periodicamente()
+        return response
+
+    def _encerrar(self, exc=None):
+        # Exceção antes do after_request: libera a chave para nova tentativa
+        reserva_id = g.pop("idempotencia", None)
+        if reserva_id is not None:
+            self._remover_reserva(reserva_id)
+
+
+# Instância única do controle de idempotência
+controle_idempotencia = ControleIdempotencia()
@@ -0,0 +1,339 @@
+"""Diagnostique o uso de memória do worker com tracemalloc.
+
+O rastreamento é ligado e desligado em tempo de execução (ou ao iniciar o
+worker, com ``MEMORIA_TRACEMALLOC``). Com ele ativo é possível guardar
+snapshots numerados e comparar dois deles agrupando as alocações por linha,
+arquivo ou pilha, além de medir o pico de alocação de uma amostra das
+requisições, agregado por endpoint.
+
+Cada worker do gunicorn é um processo: os dados se referem apenas ao worker
+que atendeu a requisição (``pid`` nas respostas).
+"""
+
+import gc
+import os
+import random
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+
+from flask import request
+from sqlalchemy.orm import Session
+
+# Agrupamentos aceitos na comparação de snapshots
+AGRUPAMENTOS = ("lineno", "filename", "traceback")
+
+# Medições recentes de pico por requisição mantidas em memória
+MAXIMO_MEDICOES = 500
+
+# Alocações do próprio tracemalloc e do import system não interessam
+FILTROS_SNAPSHOT = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class RastreamentoInativo(Exception):
+    """Sinalize que a operação exige o tracemalloc ativo."""
+
+
+class SnapshotNaoEncontrado(Exception):
+    """Sinalize que o snapshot solicitado não existe (ou foi descartado)."""
+
+
+def _kib(valor):
+    return round(valor / 1024, 1)
+
+
+def _rss_atual():
+    """Retorne a memória residente do processo em bytes, se disponível."""
+    try:
+        with open("/proc/self/statm") as arquivo:
+            paginas = int(arquivo.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _serializar_estatistica(estatistica, agrupamento):
+    quadro = estatistica.traceback[0]
+    dados = {
+        "arquivo": quadro.filename,
+        "tamanho_kib": _kib(estatistica.size),
+        "blocos": estatistica.count,
+    }
+    if agrupamento != "filename":
+        dados["linha"] = quadro.lineno
+    if agrupamento == "traceback":
+        dados["pilha"] = estatistica.traceback.format()
+    if hasattr(estatistica, "size_diff"):
+        dados["diferenca_kib"] = _kib(estatistica.size_diff)
+        dados["diferenca_blocos"] = estatistica.count_diff
+    return dados
+
+
+class DiagnosticoMemoria:
+    """Controle o tracemalloc, os snapshots e a medição de pico por requisição."""
+
+    def __init__(self):
+        self.quadros = 1
+        self.max_snapshots = 10
+        self.amostragem = 0.0
+        self._snapshots = {}
+        self._proximo_id = 1
+        self._medindo = threading.Lock()
+        self._lock = threading.Lock()
+        self._medicoes = deque(maxlen=MAXIMO_MEDICOES)
+        self._por_endpoint = {}
+
+    def init_app(self, app):
+        """Registre os hooks de medição e inicie o rastreamento se configurado."""
+        self.quadros = app.config["MEMORIA_QUADROS"]
+        self.max_snapshots = app.config["MEMORIA_MAX_SNAPSHOTS"]
+        self.amostragem = app.config["MEMORIA_AMOSTRAGEM"]
+
+        app.before_request(self._iniciar_medicao)
+        app.teardown_request(self._encerrar_medicao)
+
+        if app.config["MEMORIA_TRACEMALLOC"]:
+            self.iniciar()
+
+    # Rastreamento
+
+    def iniciar(self, quadros=None):
+        """Inicie o tracemalloc guardando ``quadros`` níveis de pilha."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(quadros or self.quadros)
+        return self.estado()
+
+    def parar(self):
+        """Pare o tracemalloc; os snapshots já guardados são mantidos."""
+        tracemalloc.stop()
+        return self.estado()
+
+    def estado(self):
+        """Retorne memória rastreada, sobrecarga, RSS e snapshots guardados."""
+        ativo = tracemalloc.is_tracing()
+        atual, pico = tracemalloc.get_traced_memory() if ativo else (0, 0)
+        rss = _rss_atual()
+        return {
+            "pid": os.getpid(),
+            "rastreando": ativo,
+            "quadros": tracemalloc.get_traceback_limit() if ativo else None,
+            "rastreada_kib": _kib(atual),
+            "pico_kib": _kib(pico),
+            "sobrecarga_kib": _kib(tracemalloc.get_tracemalloc_memory()),
+            "rss_kib": _kib(rss) if rss is not None else None,
+            "snapshots": self.listar_snapshots(),
+        }
+
+    # Snapshots
+
+    def capturar(self, nome=None, limite=20):
+        """Guarde um snapshot e retorne as linhas que mais alocam.
+
+        Raises:
+            RastreamentoInativo: Se o tracemalloc não estiver ativo
+        """
+        if not tracemalloc.is_tracing():
+            raise RastreamentoInativo("Rastreamento de memória inativo")
+
+        # Coleta ciclos antes para não contar objetos já inalcançáveis
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces(FILTROS_SNAPSHOT)
+
+        with self._lock:
+            snapshot_id = self._proximo_id
+            self._proximo_id += 1
+            self._snapshots[snapshot_id] = {
+                "snapshot": snapshot,
+                "nome": nome,
+                "criado_em": datetime.utcnow().isoformat(),
+                "rastreada_kib": _kib(tracemalloc.get_traced_memory()[0]),
+            }
+
+            # Descarta os mais antigos além do limite
+            while len(self._snapshots) > self.max_snapshots:
+                del self._snapshots[min(self._snapshots)]
+
+        estatisticas = snapshot.statistics("lineno")[:limite]
+        return {
+            "id": snapshot_id,
+            "pid": os.getpid(),
+            "nome": nome,
+            "total_kib": _kib(sum(trace.size for trace in snapshot.traces)),
+            "maiores": [_serializar_estatistica(item, "lineno") for item in estatisticas],
+        }
+
+    def listar_snapshots(self):
+        """Retorne os snapshots guardados (sem as alocações)."""
+        with self._lock:
+            return [
+                {
+                    "id": snapshot_id,
+                    "nome": dados["nome"],
+                    "criado_em": dados["criado_em"],
+                    "rastreada_kib": dados["rastreada_kib"],
+                }
+                for snapshot_id, dados in self._snapshots.items()
+            ]
+
+    def descartar(self, snapshot_id=None):
+        """Descarte um snapshot, ou todos quando ``snapshot_id`` for None."""
+        with self._lock:
+            if snapshot_id is None:
+                self._snapshots.clear()
+            elif self._snapshots.pop(snapshot_id, None) is None:
+                raise SnapshotNaoEncontrado(f"Snapshot {snapshot_id} não encontrado")
+
+    def comparar(self, antigo_id, novo_id, agrupamento="lineno", limite=30):
+        """Compare dois snapshots e retorne as maiores variações de memória.
+
+        Raises:
+            SnapshotNaoEncontrado: Se algum dos snapshots não existir
+            ValueError: Se o agrupamento não for suportado
+        """
+        if agrupamento not in AGRUPAMENTOS:
+            raise ValueError(f"Agrupamento deve ser um de: {', '.join(AGRUPAMENTOS)}")
+
+        with self._lock:
+            antigo = self._snapshots.get(antigo_id)
+            novo = self._snapshots.get(novo_id)
+        for snapshot_id, dados in ((antigo_id, antigo), (novo_id, novo)):
+            if dados is None:
+                raise SnapshotNaoEncontrado(f"Snapshot {snapshot_id} não encontrado")
+
+        diferencas = novo["snapshot"].compare_to(antigo["snapshot"], agrupamento)
+        return {
+            "antigo": antigo_id,
+            "novo": novo_id,
+            "agrupamento": agrupamento,
+            "diferenca_total_kib": _kib(sum(item.size_diff for item in diferencas)),
+            "diferencas": [
+                _serializar_estatistica(item, agrupamento)
+                for item in diferencas[:limite]
+            ],
+        }
+
+    # Medição de pico por requisição
+
+    def _iniciar_medicao(self):
+        if not tracemalloc.is_tracing() or self.amostragem <= 0:
+            return
+        if random.random() >= self.amostragem:
+            return
+
+        # O pico do tracemalloc é global: mede uma requisição por vez
+        if not self._medindo.acquire(blocking=False):
+            return
+
+        tracemalloc.reset_peak()
+        request.environ["jurisrem.memoria"] = (
+            tracemalloc.get_traced_memory()[0],
+            time.perf_counter(),
+        )
+
+    def _encerrar_medicao(self, exc=None):
+        inicio = request.environ.pop("jurisrem.memoria", None)
+        if inicio is None:
+            return
+
+        try:
+            if not tracemalloc.is_tracing():
+                return
+            atual, pico = tracemalloc.get_traced_memory()
+            self._registrar(
+                request.endpoint or request.path,
+                pico - inicio[0],
+                atual - inicio[0],
+                time.perf_counter() - inicio[1],
+            )
+        finally:
+            self._medindo.release()
+
+    def _registrar(self, endpoint, pico, retido, duracao):
+        medicao = {
+            "endpoint": endpoint,
+            "metodo": request.method,
+            "caminho": request.full_path.rstrip("?"),
+            "pico_kib": _kib(pico),
+            "retido_kib": _kib(retido),
+            "duracao_ms": round(duracao * 1000, 2),
+            "em": datetime.utcnow().isoformat(),
+        }
+        with self._lock:
+            self._medicoes.append(medicao)
+            agregado = self._por_endpoint.setdefault(
+                endpoint,
+                {"requisicoes": 0, "pico_max": 0, "pico_total": 0, "retido_total": 0},
+            )
+            agregado["requisicoes"] += 1
+            agregado["pico_max"] = max(agregado["pico_max"], pico)
+            agregado["pico_total"] += pico
+            agregado["retido_total"] += retido
+
+    def requisicoes(self, limite=20):
+        """Retorne os endpoints com maior pico e as medições mais recentes."""
+        with self._lock:
+            agregados = [
+                {
+                    "endpoint": endpoint,
+                    "requisicoes": dados["requisicoes"],
+                    "pico_max_kib": _kib(dados["pico_max"]),
+                    "pico_medio_kib": _kib(dados["pico_total"] / dados["requisicoes"]),
+                    "retido_medio_kib": _kib(
+                        dados["retido_total"] / dados["requisicoes"]
+                    ),
+                }
+                for endpoint, dados in self._por_endpoint.items()
+            ]
+            recentes = list(self._medicoes)[-limite:]
+
+        agregados.sort(key=lambda item: item["pico_max_kib"], reverse=True)
+        return {
+            "pid": os.getpid(),
+            "amostragem": self.amostragem,
+            "por_endpoint": agregados[:limite],
+            "recentes": recentes[::-1],
+        }
+
+
+# Diagnóstico compartilhado pelas requisições deste worker
+diagnostico_memoria = DiagnosticoMemoria()
+
+
+def objetos_orm(modelos):
+    """Conte instâncias vivas por modelo e o tamanho dos identity maps.
+
+    Percorre os objetos rastreados pelo coletor de lixo: sessões que não
+    foram encerradas ou instâncias retidas por caches aparecem aqui mesmo
+    depois do fim da requisição que as criou.
+
+    Args:
+        modelos (Iterable[type]): Classes mapeadas a contar
+    """
+    classes = {modelo: modelo.__name__ for modelo in modelos}
+    contagem = dict.fromkeys(classes.values(), 0)
+    sessoes = []
+
+    gc.collect()
+    for objeto in gc.get_objects():
+        classe = type(objeto)
+        if classe in classes:
+            contagem[classes[classe]] += 1
+        elif isinstance(objeto, Session):
+            sessoes.append(len(objeto.identity_map))
+
+    return {
+        "pid": os.getpid(),
+        "objetos_por_modelo": dict(
+            sorted(contagem.items(), key=lambda item: item[1], reverse=True)
+        ),
+        "sessoes": len(sessoes),
+        "mapa_identidade_total": sum(sessoes),
+        "mapa_identidade_maior": max(sessoes, default=0),
+    }
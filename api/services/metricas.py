@@ -0,0 +1,26 @@
+"""Reúna os contadores internos dos serviços deste worker.
+
+Os contadores incluem dados de outros usuários (argumentos de requisições
+agrupadas, chaves de idempotência) e só são expostos na rota administrativa.
+"""
+
+from api.services.admissao import controle_admissao
+from api.services.agrupamento import agrupador_requisicoes
+from api.services.autocompletar import indice_autocompletar
+from api.services.cache import cache_registros
+from api.services.escrita import coordenador_escrita
+from api.services.idempotencia import controle_idempotencia
+from api.sessao import roteador_leitura
+
+
+def metricas_servicos():
+    """Retorne as métricas de escrita, leitura, cache, admissão e índices."""
+    return {
+        "escrita": coordenador_escrita.metricas(),
+        "leitura": roteador_leitura.metricas(),
+        "cache_registros": cache_registros.metricas(),
+        "admissao": controle_admissao.metricas(),
+        "agrupamento": agrupador_requisicoes.metricas(),
+        "idempotencia": controle_idempotencia.metricas(),
+        "autocompletar": indice_autocompletar.metricas(),
+    }
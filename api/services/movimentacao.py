@@ -0,0 +1,181 @@
+"""Mantenha a data da última movimentação (andamento) de cada processo.
+
+``Processo.ultima_movimentacao_em`` é atualizada na mesma transação que grava
+o andamento, permitindo localizar processos parados com uma faixa do índice
+(status, ultima_movimentacao_em) em vez de agregar os andamentos de todos os
+processos. Processos sem andamentos usam a data de criação.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import load_only
+
+from api import db
+from api.models.processo import Andamento, Processo
+from api.services.escrita import coordenador_escrita
+from api.services.eventos import ao_gravar
+
+# Processos recalculados por transação no preenchimento inicial
+TAMANHO_LOTE_BACKFILL = 1000
+
+# Status considerados por padrão na busca de processos parados
+STATUS_PARADOS_PADRAO = ("em_andamento",)
+
+
+def _movimentacao_recalculada():
+    """Expressão com a data do último andamento do processo (ou da criação)."""
+    ultimo_andamento = (
+        select(func.max(Andamento.data_andamento))
+        .where(Andamento.processo_id == Processo.id)
+        .scalar_subquery()
+    )
+    return func.coalesce(ultimo_andamento, Processo.created_at)
+
+
+def _atualizar(session, condicao, valor):
+    """Atualize a movimentação sem alterar ``updated_at`` nem a versão.
+
+    A data é derivada dos andamentos: não caracteriza edição do processo
+    (If-Match, arquivamento por inatividade e log de sincronização).
+    """
+    session.execute(
+        update(Processo)
+        .where(condicao)
+        .values(ultima_movimentacao_em=valor, updated_at=Processo.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+@ao_gravar
+def registrar_movimentacoes(session, alteracoes):
+    """Avance a última movimentação dos processos que receberam andamentos.
+
+    Inclusões só avançam a data (nunca a recuam); alterações e remoções de
+    andamentos recalculam o valor a partir dos andamentos restantes.
+    """
+    novas = {}
+    recalcular = set()
+    for alteracao in alteracoes:
+        if alteracao.tabela != "andamentos" or alteracao.objeto is None:
+            continue
+
+        processo_id = alteracao.objeto.processo_id
+        if alteracao.operacao == "insert":
+            data = alteracao.objeto.data_andamento or datetime.utcnow()
+            novas[processo_id] = max(novas.get(processo_id, data), data)
+        else:
+            recalcular.add(processo_id)
+
+    for processo_id, data in novas.items():
+        if processo_id in recalcular:
+            continue
+        _atualizar(
+            session,
+            (Processo.id == processo_id)
+            & or_(
+                Processo.ultima_movimentacao_em.is_(None),
+                Processo.ultima_movimentacao_em < data,
+            ),
+            data,
+        )
+
+    if recalcular:
+        _atualizar(
+            session, Processo.id.in_(recalcular), _movimentacao_recalculada()
+        )
+
+
+def popular_ultima_movimentacao(tamanho_lote=TAMANHO_LOTE_BACKFILL):
+    """Recalcule a última movimentação de todos os processos, em lotes.
+
+    Cada lote é um UPDATE por faixa de IDs em uma transação curta, sem
+    carregar os processos na memória.
+
+    Returns:
+        int: Quantidade de processos recalculados
+    """
+    total = 0
+    apos_id = 0
+    while True:
+        with coordenador_escrita.transacao() as session:
+            ids = (
+                session.execute(
+                    select(Processo.id)
+                    .where(Processo.id > apos_id)
+                    .order_by(Processo.id)
+                    .limit(tamanho_lote)
+                )
+                .scalars()
+                .all()
+            )
+            if ids:
+                _atualizar(
+                    session,
+                    Processo.id.between(ids[0], ids[-1]),
+                    _movimentacao_recalculada(),
+                )
+
+        if not ids:
+            return total
+        total += len(ids)
+        apos_id = ids[-1]
+
+
+def _filtros_parados(dias, status, advogado_id):
+    """Monte os filtros de processos sem movimentação há mais de ``dias``."""
+    limite = datetime.utcnow() - timedelta(days=dias)
+    filtros = [
+        Processo.status.in_(status),
+        Processo.ultima_movimentacao_em < limite,
+    ]
+    if advogado_id:
+        filtros.append(Processo.advogado_id == advogado_id)
+    return filtros, limite
+
+
+def consulta_parados(dias, status=STATUS_PARADOS_PADRAO, advogado_id=None):
+    """Monte a consulta de processos parados, mais antigos primeiro.
+
+    Percorre a faixa ``ultima_movimentacao_em < limite`` do índice
+    (status, ultima_movimentacao_em) de cada status, já ordenada.
+
+    Returns:
+        tuple: Consulta e a data limite
+    """
+    filtros, limite = _filtros_parados(dias, status, advogado_id)
+    query = (
+        select(Processo)
+        .options(
+            load_only(
+                Processo.numero_processo,
+                Processo.titulo,
+                Processo.status,
+                Processo.advogado_id,
+                Processo.ultima_movimentacao_em,
+            )
+        )
+        .where(*filtros)
+        .order_by(Processo.ultima_movimentacao_em, Processo.id)
+    )
+    return query, limite
+
+
+def contar_parados(dias, status=STATUS_PARADOS_PADRAO, advogado_id=None):
+    """Conte os processos parados (sem ``advogado_id``, apenas pelo índice)."""
+    filtros, _ = _filtros_parados(dias, status, advogado_id)
+    return db.session.scalar(select(func.count(Processo.id)).where(*filtros))
+
+
+def serializar_parado(processo, agora=None):
+    """Converta um processo parado em dicionário com os dias sem movimentação."""
+    agora = agora or datetime.utcnow()
+    return {
+        "id": processo.id,
+        "numero_processo": processo.numero_processo,
+        "titulo": processo.titulo,
+        "status": processo.status,
+        "advogado_id": processo.advogado_id,
+        "ultima_movimentacao_em": processo.ultima_movimentacao_em.isoformat(),
+        "dias_parado": (agora - processo.ultima_movimentacao_em).days,
+    }
@@ -0,0 +1,234 @@
+"""Implemente pub/sub em processo para o stream (SSE) de alterações de processos."""
+
+import itertools
+import json
+import queue
+import threading
+import uuid
+from collections import deque
+
+from sqlalchemy import inspect, select
+
+from api.models.processo import Processo
+from api.services.eventos import ao_gravar, apos_commit, dados_transacao
+
+# Filtros aceitos pelo stream e campos correspondentes no evento
+FILTROS_STREAM = ("processo_id", "advogado_id", "cliente_id")
+
+# Tipo de evento publicado para cada tabela acompanhada
+TIPOS_EVENTO = {"processos": "processo", "andamentos": "andamento"}
+
+
+class LimiteConexoesExcedido(Exception):
+    """Sinalize que o worker atingiu o máximo de streams simultâneos."""
+
+
+class Assinatura:
+    """Represente uma conexão de stream com fila própria e limitada."""
+
+    def __init__(self, filtros, tamanho_fila):
+        self.filtros = filtros
+        self.fila = queue.Queue(maxsize=tamanho_fila)
+        self.encerrada = False
+
+    def aceita(self, evento):
+        """Verifique se o evento atende a todos os filtros da assinatura."""
+        dados = evento["dados"]
+        return all(dados.get(campo) == valor for campo, valor in self.filtros.items())
+
+    def entregar(self, evento):
+        """Enfileire o evento; encerra a assinatura se o cliente não acompanhar.
+
+        Um cliente lento não bloqueia a publicação: ao estourar a fila, a
+        conexão é encerrada e o cliente retoma pelo ``Last-Event-ID``.
+        """
+        try:
+            self.fila.put_nowait(evento)
+        except queue.Full:
+            self.encerrar()
+
+    def encerrar(self):
+        """Sinalize o fim do stream para o gerador da conexão."""
+        if self.encerrada:
+            return
+        self.encerrada = True
+
+        # Garante espaço para o marcador de encerramento
+        with self.fila.mutex:
+            self.fila.queue.clear()
+        self.fila.put_nowait(None)
+
+
+class CanalEventos:
+    """Distribua eventos publicados aos streams abertos neste worker.
+
+    Mantém um buffer curto dos últimos eventos para que conexões retomadas
+    com ``Last-Event-ID`` recebam o que perderam. Os IDs são prefixados por
+    uma época aleatória do processo; um ID de outra época (outro worker ou
+    reinício) resulta em evento ``reset`` para o cliente ressincronizar.
+    """
+
+    def __init__(self):
+        self.max_conexoes = 50
+        self.tamanho_fila = 100
+        self.heartbeat = 15
+        self.epoca = uuid.uuid4().hex[:8]
+        self._sequencia = itertools.count(1)
+        self._buffer = deque(maxlen=500)
+        self._assinaturas = set()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Configure limites do canal a partir da configuração da aplicação."""
+        self.max_conexoes = app.config["SSE_MAX_CONEXOES"]
+        self.tamanho_fila = app.config["SSE_TAMANHO_FILA"]
+        self.heartbeat = app.config["SSE_HEARTBEAT_SEGUNDOS"]
+        self._buffer = deque(self._buffer, maxlen=app.config["SSE_BUFFER_REPLAY"])
+
+    @property
+    def conexoes(self):
+        """Retorne a quantidade de streams abertos."""
+        return len(self._assinaturas)
+
+    def publicar(self, tipo, dados):
+        """Publique um evento para os streams cujos filtros o aceitam."""
+        with self._lock:
+            evento = {
+                "id": f"{self.epoca}-{next(self._sequencia)}",
+                "tipo": tipo,
+                "dados": dados,
+            }
+            self._buffer.append(evento)
+            assinaturas = list(self._assinaturas)
+
+        for assinatura in assinaturas:
+            if assinatura.aceita(evento):
+                assinatura.entregar(evento)
+
+    def assinar(self, filtros, ultimo_id=None):
+        """Abra uma assinatura, reenviando eventos posteriores a ``ultimo_id``.
+
+        Raises:
+            LimiteConexoesExcedido: Se o limite de streams do worker foi atingido
+        """
+        assinatura = Assinatura(filtros, self.tamanho_fila)
+
+        with self._lock:
+            if len(self._assinaturas) >= self.max_conexoes:
+                raise LimiteConexoesExcedido()
+
+            if ultimo_id:
+                for evento in self._pendentes(ultimo_id):
+                    if evento["tipo"] == "reset" or assinatura.aceita(evento):
+                        assinatura.entregar(evento)
+
+            self._assinaturas.add(assinatura)
+
+        return assinatura
+
+    def cancelar(self, assinatura):
+        """Remova a assinatura do canal ao fim da conexão."""
+        with self._lock:
+            self._assinaturas.discard(assinatura)
+
+    def _pendentes(self, ultimo_id):
+        """Retorne eventos do buffer posteriores a ``ultimo_id``."""
+        epoca, _, sequencia = ultimo_id.partition("-")
+        if epoca != self.epoca or not sequencia.isdigit():
+            return [_evento_reset(self.epoca)]
+
+        sequencia = int(sequencia)
+        eventos = [e for e in self._buffer if _sequencia(e) > sequencia]
+
+        # Eventos já descartados do buffer: o cliente precisa ressincronizar
+        if self._buffer and _sequencia(self._buffer[0]) > sequencia + 1:
+            return [_evento_reset(self.epoca), *eventos]
+
+        return eventos
+
+
+def _sequencia(evento):
+    """Extraia a sequência numérica do ID do evento."""
+    return int(evento["id"].rsplit("-", 1)[1])
+
+
+def _evento_reset(epoca):
+    """Crie evento que orienta o cliente a ressincronizar via /api/sync."""
+    return {"id": f"{epoca}-0", "tipo": "reset", "dados": {}}
+
+
+def formatar_sse(evento):
+    """Serialize o evento no formato text/event-stream."""
+    return (
+        f"id: {evento['id']}\n"
+        f"event: {evento['tipo']}\n"
+        f"data: {json.dumps(evento['dados'])}\n\n"
+    )
+
+
+# Canal compartilhado pelas requisições deste worker
+canal_eventos = CanalEventos()
+
+
+@ao_gravar
+def coletar_eventos(session, alteracoes):
+    """Monte os eventos de processos e andamentos ainda dentro da transação.
+
+    Cliente e advogado do processo são lidos via Core na conexão corrente,
+    pois após o commit não é mais possível emitir SQL.
+    """
+    relevantes = [a for a in alteracoes if a.tabela in TIPOS_EVENTO]
+    if not relevantes:
+        return
+
+    eventos = []
+    for alteracao in relevantes:
+        valores = dict(alteracao.valores or {})
+        if alteracao.objeto is not None:
+            valores = {**inspect(alteracao.objeto).dict, **valores}
+        processo_id = (
+            alteracao.registro_id
+            if alteracao.tabela == "processos"
+            else valores.get("processo_id")
+        )
+        eventos.append((alteracao, processo_id, valores))
+
+    # Busca cliente e advogado dos processos envolvidos em uma única consulta
+    ids = {processo_id for _, processo_id, _ in eventos if processo_id}
+    processos = {
+        linha.id: linha
+        for linha in session.connection().execute(
+            select(Processo.id, Processo.cliente_id, Processo.advogado_id).where(
+                Processo.id.in_(ids)
+            )
+        )
+    }
+
+    pendentes = dados_transacao(session).setdefault("eventos_stream", [])
+    for alteracao, processo_id, valores in eventos:
+        # Processos removidos não existem mais: usa os valores em memória
+        processo = processos.get(processo_id) or valores
+        dados = {
+            "operacao": alteracao.operacao,
+            "processo_id": processo_id,
+            "cliente_id": _valor(processo, "cliente_id"),
+            "advogado_id": _valor(processo, "advogado_id"),
+        }
+        if alteracao.tabela == "andamentos":
+            dados["andamento_id"] = alteracao.registro_id
+
+        pendentes.append((TIPOS_EVENTO[alteracao.tabela], dados))
+
+
+def _valor(origem, campo):
+    """Leia um campo de uma linha do banco ou de um dicionário de valores."""
+    if isinstance(origem, dict):
+        return origem.get(campo)
+    return getattr(origem, campo)
+
+
+@apos_commit
+def publicar_eventos(session, alteracoes):
+    """Publique no canal os eventos coletados da transação efetivada."""
+    for tipo, dados in dados_transacao(session).get("eventos_stream", []):
+        canal_eventos.publicar(tipo, dados)
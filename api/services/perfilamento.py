@@ -0,0 +1,313 @@
+"""Perfile requisições com cProfile e guarde os resultados em disco.
+
+Uma requisição é perfilada quando um administrador informa ``?__profile=1``
+ou quando é sorteada pela amostragem ``PERFIL_AMOSTRAGEM``. O perfil cobre
+os hooks e a view (do primeiro ``before_request`` ao ``teardown_request``) e
+é gravado em ``<diretório>/<id>.prof`` (formato pstats), acompanhado de
+``<id>.json`` com rota, argumentos, status e duração.
+
+A partir do Python 3.12 o cProfile observa todas as threads e apenas um
+perfilador pode estar ativo por processo: requisições que chegam enquanto
+outra é perfilada seguem sem perfil, e os tempos de requisições concorrentes
+podem aparecer no perfil da requisição ativa.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from flask import current_app, request
+
+# Parâmetro que solicita o perfil da requisição (somente administradores)
+PARAMETRO_PERFIL = "__profile"
+
+# Formato do identificador de um perfil
+FORMATO_ID = re.compile(r"^\d{8}T\d{12}-[0-9a-f]{8}$")
+
+# Profundidade máxima e menor peso (segundos) das pilhas exportadas
+PROFUNDIDADE_MAXIMA = 64
+PESO_MINIMO = 1e-6
+
+
+def diretorio_perfis():
+    """Retorne o diretório dos perfis, criando-o se necessário."""
+    diretorio = current_app.config.get("PERFIL_DIRETORIO") or os.path.join(
+        current_app.instance_path, "perfis"
+    )
+    os.makedirs(diretorio, exist_ok=True)
+    return diretorio
+
+
+def id_valido(perfil_id):
+    """Verifique se o identificador tem o formato gerado pelo perfilador."""
+    return bool(perfil_id) and FORMATO_ID.match(perfil_id) is not None
+
+
+def _administrador():
+    """Verifique se o token da requisição pertence a um administrador."""
+    from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt().get("tipo_usuario") == "admin"
+    except Exception:
+        return False
+
+
+class PerfiladorRequisicoes:
+    """Ative o cProfile nas requisições solicitadas ou sorteadas."""
+
+    def __init__(self):
+        self.amostragem = 0.0
+        self.maximo_arquivos = 200
+        self._ativo = threading.Lock()
+        self._lock = threading.Lock()
+        self._metricas = {"amostrados": 0, "solicitados": 0, "ocupado": 0, "erros": 0}
+
+    def init_app(self, app):
+        """Registre os hooks que iniciam e encerram o perfil da requisição."""
+        self.amostragem = app.config["PERFIL_AMOSTRAGEM"]
+        self.maximo_arquivos = app.config["PERFIL_MAXIMO_ARQUIVOS"]
+
+        # Executa antes dos demais hooks para incluí-los no perfil
+        app.before_request_funcs.setdefault(None, []).insert(0, self._iniciar)
+        app.after_request(self._registrar_status)
+        app.teardown_request(self._encerrar)
+
+    def _contar(self, chave):
+        with self._lock:
+            self._metricas[chave] += 1
+
+    def metricas(self):
+        """Retorne contadores de requisições perfiladas, ignoradas e falhas."""
+        with self._lock:
+            return {**self._metricas, "amostragem": self.amostragem}
+
+    # Hooks da requisição
+
+    def _motivo(self):
+        """Retorne o motivo para perfilar a requisição, ou None."""
+        if request.args.get(PARAMETRO_PERFIL) == "1" and _administrador():
+            return "solicitado"
+        if self.amostragem > 0 and random.random() < self.amostragem:
+            return "amostragem"
+        return None
+
+    def _iniciar(self):
+        motivo = self._motivo()
+        if motivo is None:
+            return
+
+        # Um único perfilador ativo por processo
+        if not self._ativo.acquire(blocking=False):
+            self._contar("ocupado")
+            return
+
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()
+        except ValueError:
+            # Outra ferramenta de perfil (ex.: depurador) já está ativa
+            self._ativo.release()
+            self._contar("ocupado")
+            return
+
+        request.environ["jurisrem.perfil"] = {
+            "perfil": perfil,
+            "motivo": motivo,
+            "id": f"{datetime.now():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}",
+            "inicio": datetime.utcnow().isoformat(),
+            "relogio": time.perf_counter(),
+        }
+
+    def _registrar_status(self, response):
+        estado = request.environ.get("jurisrem.perfil")
+        if estado is not None:
+            estado["status"] = response.status_code
+            response.headers["X-Perfil-Id"] = estado["id"]
+        return response
+
+    def _encerrar(self, exc=None):
+        estado = request.environ.pop("jurisrem.perfil", None)
+        if estado is None:
+            return
+
+        perfil = estado["perfil"]
+        try:
+            perfil.disable()
+            duracao = time.perf_counter() - estado["relogio"]
+            self._gravar(perfil, estado, duracao, exc)
+            self._contar(
+                "solicitados" if estado["motivo"] == "solicitado" else "amostrados"
+            )
+        except OSError:
+            # Falha ao gravar o perfil não afeta a resposta
+            current_app.logger.exception("Falha ao gravar perfil da requisição")
+            self._contar("erros")
+        finally:
+            self._ativo.release()
+
+    # Armazenamento
+
+    def _gravar(self, perfil, estado, duracao, exc):
+        diretorio = diretorio_perfis()
+        perfil_id = estado["id"]
+
+        argumentos = request.args.to_dict(flat=False)
+        argumentos.pop(PARAMETRO_PERFIL, None)
+        metadados = {
+            "id": perfil_id,
+            "metodo": request.method,
+            "rota": request.url_rule.rule if request.url_rule else None,
+            "endpoint": request.endpoint,
+            "caminho": request.path,
+            "argumentos": argumentos,
+            "status": estado.get("status", 500),
+            "erro": repr(exc) if exc is not None else None,
+            "duracao_ms": round(duracao * 1000, 2),
+            "motivo": estado["motivo"],
+            "inicio": estado["inicio"],
+        }
+
+        perfil.dump_stats(os.path.join(diretorio, f"{perfil_id}.prof"))
+        with open(os.path.join(diretorio, f"{perfil_id}.json"), "w") as arquivo:
+            json.dump(metadados, arquivo)
+
+        self._remover_antigos(diretorio)
+
+    def _remover_antigos(self, diretorio):
+        """Mantenha apenas os ``PERFIL_MAXIMO_ARQUIVOS`` perfis mais recentes."""
+        ids = sorted(
+            nome[:-5] for nome in os.listdir(diretorio) if nome.endswith(".json")
+        )
+        for perfil_id in ids[: max(0, len(ids) - self.maximo_arquivos)]:
+            for extensao in (".json", ".prof"):
+                try:
+                    os.remove(os.path.join(diretorio, perfil_id + extensao))
+                except FileNotFoundError:
+                    continue
+
+
+# Perfilador compartilhado pelas requisições deste worker
+perfilador = PerfiladorRequisicoes()
+
+
+def listar_perfis(limite=50):
+    """Retorne os metadados dos perfis mais recentes primeiro."""
+    diretorio = diretorio_perfis()
+    ids = sorted(
+        (nome[:-5] for nome in os.listdir(diretorio) if nome.endswith(".json")),
+        reverse=True,
+    )
+
+    perfis = []
+    for perfil_id in ids[:limite]:
+        try:
+            with open(os.path.join(diretorio, f"{perfil_id}.json")) as arquivo:
+                perfis.append(json.load(arquivo))
+        except (OSError, ValueError):
+            continue
+    return perfis
+
+
+def obter_perfil(perfil_id):
+    """Retorne os metadados e o caminho do arquivo pstats, ou None."""
+    if not id_valido(perfil_id):
+        return None
+
+    diretorio = diretorio_perfis()
+    caminho = os.path.join(diretorio, f"{perfil_id}.prof")
+    try:
+        with open(os.path.join(diretorio, f"{perfil_id}.json")) as arquivo:
+            metadados = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+    if not os.path.exists(caminho):
+        return None
+    return metadados, caminho
+
+
+def _nome_funcao(funcao):
+    arquivo, linha, nome = funcao
+    if arquivo == "~":
+        return {"name": nome}
+    return {"name": nome, "file": arquivo, "line": linha}
+
+
+def para_speedscope(caminho, nome):
+    """Converta um arquivo pstats no formato JSON do speedscope.
+
+    O pstats guarda tempos por par chamador/chamado, não pilhas completas. As
+    pilhas são reconstruídas a partir das funções raiz: o tempo de cada
+    chamado é dividido entre os chamadores na proporção registrada para cada
+    um, e o tempo próprio de cada função vira uma amostra com esse peso.
+    Chamadas recursivas são cortadas no primeiro ciclo.
+
+    Returns:
+        dict: Documento no formato ``sampled`` do speedscope (segundos)
+    """
+    estatisticas = pstats.Stats(caminho).stats
+
+    # Chamados de cada função, com o tempo acumulado a partir dela
+    chamados = {}
+    raizes = []
+    for funcao, (_, _, _, acumulado, chamadores) in estatisticas.items():
+        if not chamadores:
+            raizes.append(funcao)
+        for chamador, valores in chamadores.items():
+            chamados.setdefault(chamador, []).append((funcao, valores[3]))
+
+    quadros, indices = [], {}
+    amostras, pesos = [], []
+
+    def indice(funcao):
+        if funcao not in indices:
+            indices[funcao] = len(quadros)
+            quadros.append(_nome_funcao(funcao))
+        return indices[funcao]
+
+    def visitar(funcao, pilha, fator):
+        proprio = estatisticas[funcao][2] * fator
+        pilha = pilha + [indice(funcao)]
+        if proprio >= PESO_MINIMO:
+            amostras.append(pilha)
+            pesos.append(proprio)
+        if len(pilha) >= PROFUNDIDADE_MAXIMA:
+            return
+
+        for filho, acumulado_aqui in chamados.get(funcao, ()):
+            acumulado_total = estatisticas[filho][3]
+            if indices.get(filho) in pilha or acumulado_total <= 0:
+                continue
+            fator_filho = fator * acumulado_aqui / acumulado_total
+            if acumulado_total * fator_filho >= PESO_MINIMO:
+                visitar(filho, pilha, fator_filho)
+
+    for raiz in sorted(raizes, key=lambda funcao: -estatisticas[funcao][3]):
+        visitar(raiz, [], 1.0)
+
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": nome,
+        "exporter": "jurisrem-api",
+        "activeProfileIndex": 0,
+        "shared": {"frames": quadros},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": nome,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(pesos),
+                "samples": amostras,
+                "weights": pesos,
+            }
+        ],
+    }
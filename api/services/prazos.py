@@ -0,0 +1,316 @@
+"""Calcule o vencimento de prazos processuais pelo calendário forense.
+
+Os prazos em dias úteis excluem o dia do início e contam apenas dias com
+expediente: sem fins de semana, feriados nacionais, feriados do tribunal do
+processo e períodos de suspensão. Prazos em dias corridos contam todos os
+dias, exceto as suspensões, e o vencimento em dia sem expediente é
+prorrogado para o primeiro dia útil seguinte.
+
+O ``Calendario`` mantém vetores ordenados com os dias úteis e os dias
+contáveis de um intervalo: o vencimento de cada prazo é obtido por busca
+binária e deslocamento no vetor. Assim o recálculo de todos os prazos
+abertos após uma mudança no calendário monta os vetores uma vez por tribunal
+e grava os vencimentos alterados em um único UPDATE em lote.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+
+from sqlalchemy import delete, inspect, select, update
+
+from api import db
+from api.models.prazo import Feriado, Prazo
+from api.services.eventos import ao_gravar
+
+# Tipos de contagem e situações de um prazo
+CONTAGENS = ("uteis", "corridos")
+STATUS_PRAZO = ("aberto", "cumprido", "cancelado")
+
+# Dias além do maior prazo incluídos inicialmente nos vetores do calendário
+MARGEM_DIAS = 400
+
+# Limite de expansão dos vetores (suspensões sem fim tornariam o cálculo infinito)
+HORIZONTE_MAXIMO_DIAS = 20 * 366
+
+# Colunas do processo copiadas para os prazos
+CAMPOS_PROCESSO = ("advogado_id", "tribunal")
+
+
+def chave_tribunal(tribunal):
+    """Normalize o nome do tribunal usado para localizar seus feriados."""
+    return (tribunal or "").strip().upper() or None
+
+
+class Calendario:
+    """Conte dias úteis e corridos descontando feriados e suspensões."""
+
+    def __init__(self, sem_expediente=(), suspensoes=()):
+        self._suspensoes = set(suspensoes)
+        self._sem_expediente = set(sem_expediente) | self._suspensoes
+        self._inicio = self._fim = None
+        self._uteis = []
+        self._contaveis = []
+
+    def dia_util(self, dia):
+        """Verifique se há expediente forense na data."""
+        ordinal = dia.toordinal()
+        return (ordinal - 1) % 7 < 5 and ordinal not in self._sem_expediente
+
+    def _preparar(self, inicio, fim):
+        """Monte os vetores de dias úteis e contáveis entre os ordinais informados."""
+        if self._inicio is not None and self._inicio <= inicio and fim <= self._fim:
+            return
+
+        if self._inicio is not None:
+            inicio, fim = min(inicio, self._inicio), max(fim, self._fim)
+        self._inicio, self._fim = inicio, fim
+
+        # 1º de janeiro do ano 1 (ordinal 1) foi uma segunda-feira
+        self._uteis = [
+            ordinal
+            for ordinal in range(inicio, fim + 1)
+            if (ordinal - 1) % 7 < 5 and ordinal not in self._sem_expediente
+        ]
+        self._contaveis = [
+            ordinal
+            for ordinal in range(inicio, fim + 1)
+            if ordinal not in self._suspensoes
+        ]
+
+    def _vencimento(self, inicio, dias, contagem):
+        """Calcule o vencimento (ordinal); IndexError se os vetores não bastarem."""
+        if contagem == "uteis":
+            return self._uteis[bisect_right(self._uteis, inicio) + dias - 1]
+
+        final = self._contaveis[bisect_right(self._contaveis, inicio) + dias - 1]
+        return self._uteis[bisect_left(self._uteis, final)]
+
+    def vencimentos(self, prazos):
+        """Calcule o vencimento de vários prazos de uma vez.
+
+        Args:
+            prazos (Iterable[tuple[date, int, str]]): Início, quantidade de
+                dias (>= 1) e contagem (``uteis`` ou ``corridos``) de cada prazo
+
+        Returns:
+            list[date]: Vencimentos, na mesma ordem
+        """
+        prazos = [
+            (inicio.toordinal(), dias, contagem) for inicio, dias, contagem in prazos
+        ]
+        if not prazos:
+            return []
+
+        menor = min(inicio for inicio, _, _ in prazos)
+        maior = max(inicio + dias for inicio, dias, _ in prazos)
+        horizonte = (maior - menor) * 2 + MARGEM_DIAS
+
+        while True:
+            self._preparar(menor, menor + horizonte)
+            try:
+                return [
+                    date.fromordinal(self._vencimento(inicio, dias, contagem))
+                    for inicio, dias, contagem in prazos
+                ]
+            except IndexError:
+                # Suspensões longas: amplia o intervalo e tenta novamente
+                if horizonte > HORIZONTE_MAXIMO_DIAS:
+                    erro = "Calendário sem dias úteis suficientes"
+                    raise ValueError(erro) from None
+                horizonte *= 2
+
+    def vencimento(self, inicio, dias, contagem="uteis"):
+        """Calcule o vencimento de um prazo."""
+        return self.vencimentos([(inicio, dias, contagem)])[0]
+
+
+def _dias(inicio, fim):
+    return range(inicio.toordinal(), fim.toordinal() + 1)
+
+
+def carregar_calendarios(tribunais, session=None):
+    """Monte o calendário de cada tribunal: feriados nacionais e os próprios.
+
+    Returns:
+        dict: Chave do tribunal (ou None) e respectivo ``Calendario``
+    """
+    session = session if session is not None else db.session
+    nacionais, suspensoes_nacionais = set(), set()
+    proprios = {}
+
+    chaves = {chave_tribunal(tribunal) for tribunal in tribunais}
+    for feriado in session.execute(
+        select(
+            Feriado.data_inicio, Feriado.data_fim, Feriado.tribunal, Feriado.suspensao
+        )
+    ):
+        dias = _dias(feriado.data_inicio, feriado.data_fim)
+        chave = chave_tribunal(feriado.tribunal)
+        if chave is None:
+            destino = (nacionais, suspensoes_nacionais)
+        elif chave in chaves:
+            destino = proprios.setdefault(chave, (set(), set()))
+        else:
+            continue
+        destino[1 if feriado.suspensao else 0].update(dias)
+
+    return {
+        chave: Calendario(
+            nacionais | proprios.get(chave, (set(), set()))[0],
+            suspensoes_nacionais | proprios.get(chave, (set(), set()))[1],
+        )
+        for chave in chaves | {None}
+    }
+
+
+def calcular_vencimento(inicio, dias, contagem="uteis", tribunal=None):
+    """Calcule o vencimento de um prazo pelo calendário do tribunal."""
+    calendario = carregar_calendarios([tribunal])[chave_tribunal(tribunal)]
+    return calendario.vencimento(inicio, dias, contagem)
+
+
+def recalcular_prazos(*condicoes, session=None):
+    """Recalcule o vencimento dos prazos abertos e grave apenas os alterados.
+
+    Args:
+        *condicoes: Filtros adicionais sobre ``Prazo`` (ex.: um tribunal)
+        session: Sessão da transação de escrita (padrão: ``db.session``)
+
+    Returns:
+        int: Quantidade de prazos com vencimento alterado
+    """
+    session = session if session is not None else db.session
+    linhas = session.execute(
+        select(
+            Prazo.id,
+            Prazo.data_inicio,
+            Prazo.dias,
+            Prazo.contagem,
+            Prazo.tribunal,
+            Prazo.data_vencimento,
+        ).where(Prazo.status == "aberto", *condicoes)
+    ).all()
+    if not linhas:
+        return 0
+
+    # Agrupa por tribunal: um calendário (e um par de vetores) por grupo
+    grupos = {}
+    for linha in linhas:
+        grupos.setdefault(chave_tribunal(linha.tribunal), []).append(linha)
+    calendarios = carregar_calendarios(grupos, session)
+
+    alterados = []
+    for chave, grupo in grupos.items():
+        vencimentos = calendarios[chave].vencimentos(
+            (linha.data_inicio, linha.dias, linha.contagem) for linha in grupo
+        )
+        alterados += [
+            {"id": linha.id, "data_vencimento": vencimento}
+            for linha, vencimento in zip(grupo, vencimentos)
+            if vencimento != linha.data_vencimento
+        ]
+
+    # UPDATE em lote pela chave primária
+    if alterados:
+        session.execute(update(Prazo), alterados)
+    return len(alterados)
+
+
+def _campos_alterados(alteracao):
+    """Retorne as colunas copiadas para os prazos que mudaram no processo."""
+    if alteracao.valores is not None:
+        return {
+            campo: alteracao.valores[campo]
+            for campo in CAMPOS_PROCESSO
+            if campo in alteracao.valores
+        }
+
+    estado = inspect(alteracao.objeto)
+    return {
+        campo: getattr(alteracao.objeto, campo)
+        for campo in CAMPOS_PROCESSO
+        if estado.attrs[campo].history.has_changes()
+    }
+
+
+@ao_gravar
+def acompanhar_processos(session, alteracoes):
+    """Mantenha advogado, tribunal e vencimentos dos prazos na mesma transação.
+
+    A troca de tribunal recalcula os prazos abertos do processo; processos
+    removidos levam seus prazos.
+    """
+    for alteracao in alteracoes:
+        if alteracao.tabela != "processos":
+            continue
+
+        filtro = Prazo.processo_id == alteracao.registro_id
+        if alteracao.operacao == "delete":
+            session.execute(delete(Prazo).where(filtro))
+            continue
+        if alteracao.operacao != "update":
+            continue
+
+        campos = _campos_alterados(alteracao)
+        if not campos:
+            continue
+        session.execute(
+            update(Prazo)
+            .where(filtro)
+            .values(**campos)
+            .execution_options(synchronize_session=False)
+        )
+        if "tribunal" in campos:
+            recalcular_prazos(filtro, session=session)
+
+
+def _pascoa(ano):
+    """Calcule o domingo de Páscoa (algoritmo de Meeus/Jones/Butcher)."""
+    a = ano % 19
+    b, c = divmod(ano, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7  # noqa: E741
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return date(ano, mes, dia + 1)
+
+
+def feriados_nacionais(ano):
+    """Retorne feriados nacionais, datas móveis forenses e o recesso do ano.
+
+    Returns:
+        list[tuple[date, date, str, bool]]: Início, fim, descrição e se é
+        suspensão de prazos
+    """
+    fixos = [
+        ((1, 1), "Confraternização Universal"),
+        ((4, 21), "Tiradentes"),
+        ((5, 1), "Dia do Trabalho"),
+        ((9, 7), "Independência do Brasil"),
+        ((10, 12), "Nossa Senhora Aparecida"),
+        ((11, 2), "Finados"),
+        ((11, 15), "Proclamação da República"),
+        ((11, 20), "Dia Nacional de Zumbi e da Consciência Negra"),
+        ((12, 25), "Natal"),
+    ]
+    pascoa = _pascoa(ano)
+    moveis = [
+        (pascoa - timedelta(days=48), "Carnaval"),
+        (pascoa - timedelta(days=47), "Carnaval"),
+        (pascoa - timedelta(days=2), "Sexta-feira Santa"),
+        (pascoa + timedelta(days=60), "Corpus Christi"),
+    ]
+
+    feriados = [(date(ano, mes, dia), descricao) for (mes, dia), descricao in fixos]
+    feriados += moveis
+    resultado = [(dia, dia, descricao, False) for dia, descricao in sorted(feriados)]
+
+    # Suspensão dos prazos de 20 de dezembro a 20 de janeiro (CPC, art. 220)
+    resultado.append(
+        (date(ano, 12, 20), date(ano + 1, 1, 20), "Recesso forense", True)
+    )
+    return resultado
@@ -0,0 +1,184 @@
+"""Traduza violações de restrições do banco em respostas da API.
+
+As rotas de escrita não consultam a unicidade ou a existência de registros
+relacionados antes de gravar: o INSERT/UPDATE é enviado diretamente e as
+restrições do banco (UNIQUE e FOREIGN KEY) decidem. A ``IntegrityError``
+resultante é associada ao nome da restrição violada, que define a mensagem e
+o status HTTP da resposta. Além de evitar consultas extras, não há janela
+entre a verificação e a escrita em que outra requisição possa gravar o mesmo
+valor.
+
+O PostgreSQL informa o nome da restrição no erro. O SQLite informa apenas as
+colunas de restrições UNIQUE (``UNIQUE constraint failed: tabela.coluna``) e
+nada sobre chaves estrangeiras; nesses casos a restrição é identificada pelo
+modelo e, para chaves estrangeiras, consultando os valores gravados — somente
+quando a escrita já falhou.
+
+As transações de escrita (``coordenador_escrita.transacao`` e
+``atualizar_versionado``) anotam na ``IntegrityError`` as tabelas e os valores
+que gravavam (``anotar_gravados``); o manipulador de erros da aplicação
+(api.routes) traduz a violação a partir dessa anotação, sem tratamento nas
+rotas.
+"""
+
+import re
+from typing import NamedTuple
+
+from sqlalchemy import ForeignKeyConstraint, UniqueConstraint, event, inspect, select
+from sqlalchemy.orm import Session
+
+from api import db
+
+# Mensagem e status HTTP de cada restrição (nomes gerados pela naming_convention)
+MENSAGENS_RESTRICAO = {
+    "ix_clientes_cpf_cnpj": ("CPF/CNPJ já cadastrado", 409),
+    "ix_clientes_cpf_cnpj_digitos": ("CPF/CNPJ já cadastrado", 409),
+    "uq_advogados_cpf": ("CPF já cadastrado", 409),
+    "ix_advogados_cpf_digitos": ("CPF já cadastrado", 409),
+    "ix_advogados_oab_numero": ("Número da OAB já cadastrado", 409),
+    "uq_advogados_email": ("Email já cadastrado", 409),
+    "ix_usuarios_email": ("Email já cadastrado", 409),
+    "ix_processos_numero_processo": ("Número do processo já cadastrado", 409),
+    "fk_processos_cliente_id_clientes": ("Cliente não encontrado", 404),
+    "fk_processos_advogado_id_advogados": ("Advogado não encontrado", 404),
+    "fk_andamentos_processo_id_processos": ("Processo não encontrado", 404),
+    "fk_andamentos_usuario_id_usuarios": ("Usuário não encontrado", 404),
+    "fk_andamentos_anexo_id_anexos": ("Anexo não encontrado", 400),
+}
+
+# Mensagem de restrição UNIQUE do SQLite
+UNIQUE_SQLITE = re.compile(r"UNIQUE constraint failed: (.+)$")
+
+
+class ViolacaoRestricao(NamedTuple):
+    """Descreva a restrição violada e a resposta correspondente."""
+
+    restricao: str
+    mensagem: str
+    status: int
+
+
+def _unicidade(tabela, colunas):
+    """Retorne o nome da restrição UNIQUE (ou índice único) sobre as colunas."""
+    candidatas = [
+        restricao
+        for restricao in tabela.constraints
+        if isinstance(restricao, UniqueConstraint)
+    ]
+    candidatas += [indice for indice in tabela.indexes if indice.unique]
+
+    for restricao in candidatas:
+        if {coluna.name for coluna in restricao.columns} == colunas:
+            return restricao.name
+    return None
+
+
+def _chave_estrangeira(tabela, valores):
+    """Retorne a chave estrangeira cujo valor gravado não existe na referência."""
+    for restricao in tabela.constraints:
+        if not isinstance(restricao, ForeignKeyConstraint):
+            continue
+
+        (elemento,) = restricao.elements
+        valor = valores.get(elemento.parent.name)
+        if valor is None:
+            continue
+
+        referencia = elemento.column
+        existe = db.session.execute(
+            select(referencia).where(referencia == valor).limit(1)
+        ).first()
+        if existe is None:
+            return restricao.name
+    return None
+
+
+def restricao_violada(erro, tabela, valores=None):
+    """Identifique o nome da restrição violada por uma ``IntegrityError``.
+
+    Args:
+        erro (IntegrityError): Erro lançado pelo INSERT/UPDATE
+        tabela (Table): Tabela gravada
+        valores (dict | None): Colunas gravadas, usadas para localizar a chave
+            estrangeira inválida quando o banco não informa a restrição
+
+    Returns:
+        str | None: Nome da restrição, ou None se não identificada
+    """
+    diagnostico = getattr(erro.orig, "diag", None)
+    nome = getattr(diagnostico, "constraint_name", None)
+    if nome:
+        return nome
+
+    mensagem = str(erro.orig)
+    unico = UNIQUE_SQLITE.search(mensagem)
+    if unico:
+        nomes = [nome.strip().split(".") for nome in unico.group(1).split(",")]
+        # Escritas em várias tabelas: a restrição pertence à tabela informada
+        if any(len(nome) > 1 and nome[0] != tabela.name for nome in nomes):
+            return None
+        return _unicidade(tabela, {nome[-1] for nome in nomes})
+
+    if "FOREIGN KEY" in mensagem and valores:
+        return _chave_estrangeira(tabela, valores)
+
+    return None
+
+
+def traduzir_violacao(erro, tabela=None, valores=None):
+    """Retorne a mensagem e o status HTTP da restrição violada, ou None.
+
+    Sem ``tabela``, são consideradas as gravações anotadas no erro pela
+    transação de escrita (``anotar_gravados``).
+    """
+    if tabela is not None:
+        gravados = [(tabela, valores)]
+    else:
+        gravados = getattr(erro, "gravados", None) or []
+
+    for tabela_gravada, valores_gravados in gravados:
+        nome = restricao_violada(erro, tabela_gravada, valores_gravados)
+        if nome in MENSAGENS_RESTRICAO:
+            mensagem, status = MENSAGENS_RESTRICAO[nome]
+            return ViolacaoRestricao(nome, mensagem, status)
+    return None
+
+
+def valores_colunas(objeto):
+    """Retorne os valores atribuídos às colunas de um objeto, sem carregá-los."""
+    estado = inspect(objeto).dict
+    return {coluna.name: estado.get(coluna.key) for coluna in objeto.__table__.columns}
+
+
+@event.listens_for(Session, "before_flush")
+def _registrar_flush(session, flush_context, instances):
+    """Guarde tabela e valores dos objetos enviados ao banco pelo flush.
+
+    Se o flush falhar, o rollback retira os objetos novos da sessão e expira
+    os alterados antes de a exceção chegar à transação de escrita.
+    """
+    session.info["gravados_flush"] = [
+        (objeto.__table__, valores_colunas(objeto))
+        for objeto in (*session.new, *session.dirty)
+        if hasattr(objeto, "__table__")
+    ]
+
+
+@event.listens_for(Session, "after_commit")
+def _descartar_flush(session):
+    """Descarte os valores guardados após a confirmação da transação."""
+    session.info.pop("gravados_flush", None)
+
+
+def gravados_da_sessao(session):
+    """Retorne tabela e valores dos objetos do último flush da sessão."""
+    return session.info.pop("gravados_flush", [])
+
+
+def anotar_gravados(erro, gravados):
+    """Anote na ``IntegrityError`` as tabelas e valores da escrita que falhou.
+
+    A primeira anotação prevalece: é a da escrita mais próxima do erro.
+    """
+    if getattr(erro, "gravados", None) is None:
+        erro.gravados = list(gravados)
@@ -0,0 +1,117 @@
+"""Mantenha o log de alterações usado pela sincronização incremental (delta-sync).
+
+O token entregue aos clientes é o ``id`` autoincremental de ``alteracoes``,
+atribuído no INSERT e não no commit. Ele só é monotônico na ordem de commit
+porque o SQLite admite uma única transação de escrita por vez (ver
+``coordenador_escrita``): uma entrada com ``id`` menor nunca é confirmada
+depois de outra com ``id`` maior. Em bancos com escritas concorrentes
+(ex.: PostgreSQL), uma transação confirmada depois, com ``id`` menor, seria
+pulada pelos clientes cujo token já a ultrapassou; lá o token precisaria
+ser limitado à entrada mais antiga ainda não confirmada.
+"""
+
+from sqlalchemy import func, insert, literal, select
+
+from api import db
+from api.models.alteracao import Alteracao
+from api.services.escrita import coordenador_escrita
+from api.services.eventos import ao_gravar
+
+# Tabelas cujas alterações são expostas em /api/sync
+TABELAS_SINCRONIZADAS = ("processos", "andamentos", "clientes", "advogados")
+
+
+@ao_gravar
+def registrar_log(session, alteracoes):
+    """Grave as alterações no log dentro da mesma transação da escrita."""
+    linhas = [
+        {
+            "tabela": alteracao.tabela,
+            "registro_id": alteracao.registro_id,
+            "operacao": "delete" if alteracao.operacao == "delete" else "upsert",
+        }
+        for alteracao in alteracoes
+        if alteracao.tabela in TABELAS_SINCRONIZADAS
+    ]
+
+    # Usa Core na conexão da transação para não disparar um novo flush
+    if linhas:
+        session.connection().execute(insert(Alteracao.__table__), linhas)
+
+
+def listar_alteracoes(desde, limite):
+    """Retorne o próximo lote de alterações posteriores ao token informado.
+
+    A consulta percorre a chave primária a partir de ``desde``, de modo que o
+    custo é proporcional ao número de alterações e não ao tamanho das tabelas.
+
+    Args:
+        desde (int): Último token recebido pelo cliente
+        limite (int): Quantidade máxima de entradas do log no lote
+
+    Returns:
+        tuple[dict, int, bool]: Operação final por ``(tabela, registro_id)``,
+        novo token e se há mais alterações pendentes
+    """
+    entradas = db.session.execute(
+        select(Alteracao.id, Alteracao.tabela, Alteracao.registro_id, Alteracao.operacao)
+        .where(Alteracao.id > desde)
+        .order_by(Alteracao.id)
+        .limit(limite + 1)
+    ).all()
+
+    tem_mais = len(entradas) > limite
+    entradas = entradas[:limite]
+
+    # Mantém apenas a operação mais recente de cada registro
+    operacoes = {}
+    for entrada in entradas:
+        operacoes[(entrada.tabela, entrada.registro_id)] = entrada.operacao
+
+    token = entradas[-1].id if entradas else desde
+    return operacoes, token, tem_mais
+
+
+def token_atual():
+    """Retorne o token mais recente do log (0 se vazio)."""
+    return db.session.execute(select(func.max(Alteracao.id))).scalar() or 0
+
+
+def popular_log(modelos):
+    """Registre todos os registros existentes como ``upsert`` no log.
+
+    Utilizado uma única vez para que clientes que sincronizam a partir do
+    token 0 recebam também os registros anteriores à criação do log.
+
+    Returns:
+        int: Quantidade de entradas criadas
+    """
+    total = 0
+    with coordenador_escrita.transacao() as session:
+        for modelo in modelos:
+            resultado = session.execute(
+                insert(Alteracao.__table__).from_select(
+                    ["tabela", "registro_id", "operacao"],
+                    select(
+                        literal(modelo.__tablename__), modelo.id, literal("upsert")
+                    ).order_by(modelo.id),
+                )
+            )
+            total += resultado.rowcount
+    return total
+
+
+def compactar_log():
+    """Remova entradas superadas por alterações mais recentes do mesmo registro.
+
+    Returns:
+        int: Quantidade de entradas removidas
+    """
+    ultimas = select(func.max(Alteracao.id)).group_by(
+        Alteracao.tabela, Alteracao.registro_id
+    )
+    with coordenador_escrita.transacao() as session:
+        resultado = session.execute(
+            Alteracao.__table__.delete().where(Alteracao.id.not_in(ultimas))
+        )
+    return resultado.rowcount
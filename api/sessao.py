@@ -0,0 +1,210 @@
+"""Roteie consultas de leitura para o banco somente leitura (réplica).
+
+Requisições GET e os serviços de dashboard/relatórios consultam o bind
+``leitura`` quando configurado. Após uma escrita bem-sucedida, as leituras do
+mesmo usuário voltam ao banco principal por alguns segundos (read-your-writes),
+e se a réplica estiver indisponível as consultas usam o banco principal.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql import Select
+
+# Nome do bind somente leitura em SQLALCHEMY_BINDS
+BIND_LEITURA = "leitura"
+
+# Cookie que mantém o cliente no banco principal após uma escrita
+COOKIE_ADERENCIA = "leitura_principal"
+
+# Métodos HTTP roteados para a réplica
+METODOS_LEITURA = ("GET", "HEAD")
+
+# Indica se as consultas do contexto corrente podem usar a réplica
+_modo_leitura = ContextVar("modo_leitura", default=False)
+
+
+class RoteadorLeitura:
+    """Decida qual engine atende cada consulta e acompanhe a réplica."""
+
+    def __init__(self):
+        self.aderencia = 5.0
+        self.intervalo_verificacao = 5.0
+        self._escritas_recentes = {}
+        self._disponivel = True
+        self._verificar_em = 0.0
+        self._lock = threading.RLock()
+        self._metricas = {"replica": 0, "aderencia": 0, "indisponivel": 0}
+
+    def init_app(self, app, engine_leitura=None):
+        """Registre os hooks de requisição e o monitoramento da réplica."""
+        self.aderencia = app.config["LEITURA_ADERENCIA_SEGUNDOS"]
+        self.intervalo_verificacao = app.config["LEITURA_VERIFICACAO_SEGUNDOS"]
+
+        app.before_request(self._iniciar_requisicao)
+        app.after_request(self._registrar_escrita)
+        app.teardown_request(self._encerrar_requisicao)
+
+        if engine_leitura is not None:
+            event.listen(engine_leitura, "handle_error", self._erro_replica)
+
+    # Estado por requisição
+
+    def _chave_usuario(self):
+        """Identifique o usuário pelo JWT ou, sem token, pelo endereço de origem."""
+        from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+        try:
+            verify_jwt_in_request(optional=True)
+            identidade = get_jwt_identity()
+        except Exception:
+            identidade = None
+        return f"usuario:{identidade}" if identidade else f"ip:{request.remote_addr}"
+
+    def _aderente(self):
+        """Verifique se o usuário da requisição escreveu há pouco tempo."""
+        if request.cookies.get(COOKIE_ADERENCIA):
+            return True
+        expira = self._escritas_recentes.get(self._chave_usuario())
+        return expira is not None and expira > time.monotonic()
+
+    def _iniciar_requisicao(self):
+        if request.method not in METODOS_LEITURA:
+            return
+        if self._aderente():
+            self._contar("aderencia")
+            return
+        request.environ["jurisrem.modo_leitura"] = _modo_leitura.set(True)
+
+    def _registrar_escrita(self, response):
+        """Mantenha o autor de uma escrita bem-sucedida no banco principal."""
+        if request.method in METODOS_LEITURA or response.status_code >= 400:
+            return response
+
+        agora = time.monotonic()
+        with self._lock:
+            self._escritas_recentes[self._chave_usuario()] = agora + self.aderencia
+
+            # Descarta entradas expiradas para limitar o tamanho do mapa
+            if len(self._escritas_recentes) > 10000:
+                self._escritas_recentes = {
+                    chave: expira
+                    for chave, expira in self._escritas_recentes.items()
+                    if expira > agora
+                }
+
+        response.set_cookie(
+            COOKIE_ADERENCIA, "1", max_age=max(1, int(self.aderencia)), httponly=True
+        )
+        return response
+
+    def _encerrar_requisicao(self, exc=None):
+        token = request.environ.pop("jurisrem.modo_leitura", None)
+        if token is not None:
+            _modo_leitura.reset(token)
+
+    # Disponibilidade da réplica
+
+    def _erro_replica(self, contexto):
+        """Marque a réplica como indisponível ao perder a conexão."""
+        if contexto.is_disconnect or contexto.connection is None:
+            with self._lock:
+                self._disponivel = False
+                self._verificar_em = time.monotonic() + self.intervalo_verificacao
+
+    def _replica_disponivel(self, engine):
+        """Retorne se a réplica responde, verificando-a periodicamente."""
+        agora = time.monotonic()
+        if agora < self._verificar_em:
+            return self._disponivel
+
+        with self._lock:
+            if agora < self._verificar_em:
+                return self._disponivel
+            try:
+                with engine.connect() as conexao:
+                    conexao.exec_driver_sql("SELECT 1")
+                self._disponivel = True
+            except Exception:
+                self._disponivel = False
+            self._verificar_em = agora + self.intervalo_verificacao
+            return self._disponivel
+
+    def engine_para(self, engines, clause):
+        """Retorne o engine da réplica para a consulta, ou None para o principal."""
+        if not _modo_leitura.get() or BIND_LEITURA not in engines:
+            return None
+
+        # Apenas SELECTs sem bloqueio de linha podem ir para a réplica
+        if not isinstance(clause, Select) or clause._for_update_arg is not None:
+            return None
+
+        engine = engines[BIND_LEITURA]
+        if not self._replica_disponivel(engine):
+            self._contar("indisponivel")
+            return None
+
+        self._contar("replica")
+        return engine
+
+    # Métricas
+
+    def _contar(self, chave):
+        with self._lock:
+            self._metricas[chave] += 1
+
+    def metricas(self):
+        """Retorne contadores de consultas roteadas e estado da réplica."""
+        with self._lock:
+            return {**self._metricas, "replica_disponivel": self._disponivel}
+
+
+# Roteador compartilhado pelas sessões deste worker
+roteador_leitura = RoteadorLeitura()
+
+
+@contextmanager
+def leitura():
+    """Permita que as consultas do bloco usem a réplica.
+
+    Em uma requisição cujo usuário escreveu há pouco, o bloco continua no
+    banco principal para que ele veja as próprias alterações.
+    """
+    if has_request_context() and roteador_leitura._aderente():
+        yield
+        return
+
+    token = _modo_leitura.set(True)
+    try:
+        yield
+    finally:
+        _modo_leitura.reset(token)
+
+
+def somente_leitura(funcao):
+    """Decore funções de consulta para que utilizem a réplica."""
+
+    @wraps(funcao)
+    def wrapper(*args, **kwargs):
+        with leitura():
+            return funcao(*args, **kwargs)
+
+    return wrapper
+
+
+class SessaoRoteada(Session):
+    """Sessão que envia SELECTs elegíveis ao bind somente leitura."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing:
+            engine = roteador_leitura.engine_para(self._db.engines, clause)
+            if engine is not None:
+                return engine
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
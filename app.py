@@ -1,10 +1,14 @@
 """Execute a aplicação Flask JurisREM API."""
 
+import json
 import os
 
+import click
+
 from api import create_app, db
 from api.models.advogado import Advogado
 from api.models.cliente import Cliente
+from api.models.prazo import Feriado, Prazo
 from api.models.processo import Andamento, Processo
 from api.models.usuario import Usuario
 
@@ -15,9 +19,22 @@ app = create_app(config_name)
 
 @app.cli.command()
 def init_db():
-    """Initialize banco de dados criando todas as tabelas necessárias."""
-    # Cria todas as tabelas definidas nos modelos
-    db.create_all()
+    """Initialize banco de dados criando ou migrando as tabelas necessárias."""
+    from api.services.documentos import popular_colunas_documento
+    from api.services.esquema import migrar_banco
+
+    # Bancos vazios são criados a partir dos modelos; os existentes recebem as
+    # migrações pendentes (flask db upgrade)
+    anterior, atual = migrar_banco()
+    if anterior is None:
+        print(f"Tabelas criadas na revisão {atual}.")
+    elif anterior != atual:
+        print(f"Esquema migrado da revisão {anterior} para {atual}.")
+
+    # Registros gravados antes das colunas de dígitos do CPF/CNPJ são preenchidos
+    for tabela, resumo in popular_colunas_documento().items():
+        if resumo["preenchidos"] or resumo["duplicados"]:
+            _imprimir_resumo_documentos(tabela, resumo)
     print("Banco de dados inicializado com sucesso!")
 
 
@@ -97,6 +114,247 @@ def seed_data():
     print("Dados de exemplo criados com sucesso!")
 
 
+@app.cli.command()
+def sync_backfill():
+    """Registre registros existentes no log de sincronização incremental."""
+    from api.services.sincronizacao import popular_log
+
+    # Inclui no log todos os registros anteriores à criação do log
+    total = popular_log([Processo, Andamento, Cliente, Advogado])
+    print(f"{total} registros incluídos no log de sincronização.")
+
+
+@app.cli.command()
+def sync_compactar():
+    """Remova entradas do log de sincronização superadas por outras mais recentes."""
+    from api.services.sincronizacao import compactar_log
+
+    total = compactar_log()
+    print(f"{total} entradas removidas do log de sincronização.")
+
+
+@app.cli.command()
+@click.option("--lote", default=1000, help="Processos atualizados por transação")
+def movimentacao_backfill(lote):
+    """Preencha a última movimentação dos processos a partir dos andamentos."""
+    from api.services.movimentacao import popular_ultima_movimentacao
+
+    total = popular_ultima_movimentacao(lote)
+    print(f"Última movimentação recalculada para {total} processos.")
+
+
+@app.cli.command()
+@click.option("--lote", default=1000, help="Registros lidos por transação")
+def documentos_backfill(lote):
+    """Preencha os dígitos normalizados do CPF/CNPJ de clientes e advogados."""
+    from api.services.documentos import colunas_documento, popular_documentos
+
+    for modelo, coluna, coluna_digitos, normalizar in colunas_documento():
+        resumo = popular_documentos(
+            modelo, coluna, coluna_digitos, lote, normalizar
+        )
+        _imprimir_resumo_documentos(modelo.__tablename__, resumo)
+
+
+def _imprimir_resumo_documentos(tabela, resumo):
+    """Exiba o resumo do preenchimento dos dígitos do CPF/CNPJ de uma tabela."""
+    print(
+        f"{tabela}: {resumo['preenchidos']} preenchidos, "
+        f"{resumo['invalidos']} com dígito verificador inválido, "
+        f"{resumo['sem_documento']} sem CPF/CNPJ reconhecível."
+    )
+    if resumo["duplicados"]:
+        print(f"  Duplicados (não preenchidos), IDs: {resumo['duplicados']}")
+
+
+@app.cli.command()
+@click.option("--dias", default=365, help="Idade mínima (última atualização) em dias")
+@click.option("--lote", default=500, help="Processos movidos por transação")
+@click.option("--vacuum/--sem-vacuum", default=True, help="Liberar espaço ao final")
+def arquivo_mover(dias, lote, vacuum):
+    """Mova processos finalizados/arquivados antigos para as tabelas de arquivo."""
+    from api.services.arquivamento import arquivar_processos, liberar_espaco
+
+    processos, andamentos = arquivar_processos(dias, lote)
+    print(f"{processos} processos e {andamentos} andamentos arquivados.")
+
+    # Devolve ao sistema as páginas liberadas pela remoção
+    if vacuum and processos:
+        livres = liberar_espaco()
+        print(f"Espaço liberado ({livres} páginas livres restantes).")
+
+
+@app.cli.command()
+@click.argument("processo_ids", nargs=-1, type=int, required=True)
+def arquivo_restaurar(processo_ids):
+    """Devolva processos arquivados e seus andamentos à tabela principal."""
+    from api.services.arquivamento import NumeroProcessoEmUso, restaurar_processos
+
+    try:
+        processos, andamentos = restaurar_processos(list(processo_ids))
+    except NumeroProcessoEmUso as erro:
+        raise click.ClickException(
+            f"{erro}. Altere o número do processo ativo antes de restaurar."
+        ) from erro
+    print(f"{processos} processos e {andamentos} andamentos restaurados.")
+
+
+@app.cli.command()
+@click.option("--carencia", default=None, type=int, help="Carência em horas")
+def anexos_gc(carencia):
+    """Remova anexos não referenciados por andamentos e uploads interrompidos."""
+    from api.services.anexos import coletar_orfaos
+
+    removidos = coletar_orfaos(carencia)
+    print(
+        f"{removidos['registros']} anexos, {removidos['arquivos']} arquivos órfãos "
+        f"e {removidos['temporarios']} temporários removidos."
+    )
+
+
+@app.cli.command()
+@click.option("--ano", default=None, type=int, help="Ano (padrão: o atual)")
+def feriados_carregar(ano):
+    """Inclua os feriados nacionais e o recesso forense do ano no calendário."""
+    from datetime import date
+
+    from api.services.escrita import coordenador_escrita
+    from api.services.prazos import feriados_nacionais, recalcular_prazos
+
+    ano = ano or date.today().year
+    with coordenador_escrita.transacao() as session:
+        # Ignora datas nacionais já cadastradas
+        existentes = set(
+            session.execute(
+                db.select(Feriado.data_inicio, Feriado.descricao).where(
+                    Feriado.tribunal.is_(None)
+                )
+            ).all()
+        )
+        novos = [
+            Feriado(data_inicio=inicio, data_fim=fim, descricao=descricao, suspensao=s)
+            for inicio, fim, descricao, s in feriados_nacionais(ano)
+            if (inicio, descricao) not in existentes
+        ]
+        session.add_all(novos)
+        session.flush()
+        recalculados = recalcular_prazos(session=session) if novos else 0
+
+    print(f"{len(novos)} feriados incluídos, {recalculados} prazos recalculados.")
+
+
+@app.cli.command()
+def prazos_recalcular():
+    """Recalcule o vencimento dos prazos abertos pelo calendário atual."""
+    from api.services.escrita import coordenador_escrita
+    from api.services.prazos import recalcular_prazos
+
+    with coordenador_escrita.transacao() as session:
+        total = recalcular_prazos(session=session)
+    print(f"{total} prazos com vencimento alterado.")
+
+
+@app.cli.command()
+def idempotencia_limpar():
+    """Remova as chaves de idempotência expiradas e suas respostas gravadas."""
+    from api.services.idempotencia import limpar_expiradas
+
+    print(f"{limpar_expiradas()} chaves de idempotência removidas.")
+
+
+@app.cli.command()
+def db_relatorio():
+    """Exiba as configurações efetivas do engine, do pool e dos PRAGMAs."""
+    from api.services.banco import relatorio_engine
+
+    relatorio = relatorio_engine(db.engine, app.config.get("SQLITE_PRAGMAS", {}))
+    print(json.dumps(relatorio, indent=2, default=str))
+
+
+@app.cli.command()
+@click.option("--leitores", default=4, help="Threads de leitura concorrentes")
+@click.option("--duracao", default=3.0, help="Duração de cada medição (segundos)")
+def db_benchmark(leitores, duracao):
+    """Compare leituras concorrentes a escritas em rollback-journal e no perfil atual."""
+    from api.services.banco import benchmark_leitura_escrita
+
+    pragmas = app.config.get("SQLITE_PRAGMAS", {})
+    perfis = {
+        "rollback-journal": {
+            "journal_mode": "DELETE",
+            "busy_timeout": pragmas.get("busy_timeout", 5000),
+        },
+        "perfil atual": pragmas,
+    }
+
+    # Executa a mesma carga em um banco temporário para cada perfil
+    resultados = {
+        nome: benchmark_leitura_escrita(pragmas, leitores=leitores, duracao=duracao)
+        for nome, pragmas in perfis.items()
+    }
+    print(json.dumps(resultados, indent=2))
+
+
+@app.cli.command()
+@click.option("--threads", default=8, help="Clientes concorrentes")
+@click.option("--duracao", default=30.0, help="Duração da medição (segundos)")
+@click.option("--aquecimento", default=2.0, help="Segundos iniciais descartados")
+@click.option("--pensamento-ms", default=200.0, help="Espera média entre requisições")
+@click.option(
+    "--mix",
+    default=None,
+    help="Peso de cada cenário (ex.: listagem=40,detalhe=30,andamento=10)",
+)
+@click.option("--processos", default=2000, help="Processos da massa de dados")
+@click.option("--semente", default=42, help="Semente dos sorteios")
+@click.option("--saida", type=click.Path(dir_okay=False), help="Gravar o relatório JSON")
+@click.option(
+    "--permitir-producao", is_flag=True, help="Executar com a configuração de produção"
+)
+def carga_teste(
+    threads,
+    duracao,
+    aquecimento,
+    pensamento_ms,
+    mix,
+    processos,
+    semente,
+    saida,
+    permitir_producao,
+):
+    """Meça vazão e latência sob carga concorrente em um servidor local."""
+    from api.services.carga import executar_carga, interpretar_mix
+
+    # A massa de dados é gravada no banco configurado
+    if config_name == "production" and not permitir_producao:
+        raise click.UsageError(
+            "Configuração de produção: use um banco de testes (DATABASE_URL) "
+            "ou informe --permitir-producao"
+        )
+
+    try:
+        pesos = interpretar_mix(mix) if mix else None
+    except ValueError as erro:
+        raise click.BadParameter(str(erro), param_hint="--mix") from erro
+
+    relatorio = executar_carga(
+        app,
+        threads=threads,
+        duracao=duracao,
+        aquecimento=aquecimento,
+        pensamento_ms=pensamento_ms,
+        mix=pesos,
+        processos=processos,
+        semente=semente,
+    )
+
+    texto = json.dumps(relatorio, indent=2)
+    if saida:
+        with open(saida, "w") as arquivo:
+            arquivo.write(texto)
+    print(texto)
+
+
 @app.shell_context_processor
 def make_shell_context():
     """Configure contexto do shell Flask com modelos importados."""
@@ -107,6 +365,8 @@ def make_shell_context():
         "Advogado": Advogado,
         "Processo": Processo,
         "Andamento": Andamento,
+        "Prazo": Prazo,
+        "Feriado": Feriado,
     }
 
 
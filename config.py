@@ -21,6 +21,162 @@ class Config:
     # Configuração CORS para permitir requisições de diferentes origens
     CORS_ORIGINS = ['http://localhost:3000', 'http://127.0.0.1:3000']
 
+    # Controle de concorrência otimista: exige If-Match nas atualizações (PUT)
+    REQUIRE_IF_MATCH = os.environ.get('REQUIRE_IF_MATCH', 'true').lower() == 'true'
+
+    # Compressão de respostas: tamanho mínimo (bytes), nível e cache de bytes comprimidos
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE') or 1024)
+    COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL') or 6)
+    COMPRESSION_CACHE_MAX_BYTES = int(os.environ.get('COMPRESSION_CACHE_MAX_BYTES') or 16 * 1024 * 1024)
+
+    # Quantidade máxima de IDs por busca em lote (?ids=1,2,3) nas listagens
+    LOTE_IDS_MAXIMO = 1000
+
+    # Quantidade de andamentos recentes incorporados ao detalhe do processo
+    ANDAMENTOS_DETALHE_LIMITE = 20
+    ANDAMENTOS_DETALHE_LIMITE_MAXIMO = 100
+
+    # Autocompletar em memória: itens por resposta (padrão e máximo) e idade
+    # máxima do índice antes de relê-lo do banco (segundos)
+    AUTOCOMPLETE_LIMITE = 10
+    AUTOCOMPLETE_LIMITE_MAXIMO = 50
+    AUTOCOMPLETE_TTL_SEGUNDOS = int(os.environ.get('AUTOCOMPLETE_TTL_SEGUNDOS') or 300)
+
+    # Histórico de alterações do processo: entradas por página (padrão e máximo)
+    HISTORICO_LIMITE = 50
+    HISTORICO_LIMITE_MAXIMO = 200
+
+    # Sincronização incremental: tamanho padrão e máximo do lote de alterações
+    SYNC_LOTE_PADRAO = 200
+    SYNC_LOTE_MAXIMO = 1000
+
+    # Stream (SSE) de alterações: conexões por worker, fila por conexão,
+    # intervalo de heartbeat (segundos) e tamanho do buffer de replay
+    SSE_MAX_CONEXOES = int(os.environ.get('SSE_MAX_CONEXOES') or 50)
+    SSE_TAMANHO_FILA = 100
+    SSE_HEARTBEAT_SEGUNDOS = 15
+    SSE_BUFFER_REPLAY = 500
+
+    # PRAGMAs aplicados a cada nova conexão SQLite: WAL permite leituras
+    # concorrentes com a escrita; busy_timeout (ms) aguarda bloqueios em vez
+    # de falhar; cache_size negativo é em KiB; mmap_size em bytes;
+    # auto_vacuum incremental vale para bancos novos (ver flask arquivo-mover);
+    # foreign_keys faz o SQLite validar as chaves estrangeiras nas escritas
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT') or 5000),
+        'cache_size': -20000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'auto_vacuum': 'INCREMENTAL',
+        'foreign_keys': 'ON',
+    }
+
+    # Coordenação de escritas: prazo para obter o bloqueio de escrita, espera
+    # inicial e máxima entre tentativas (segundos) e escritor único opcional
+    # que agrupa inserções de várias requisições em um commit (group commit)
+    ESCRITA_PRAZO_SEGUNDOS = float(os.environ.get('ESCRITA_PRAZO_SEGUNDOS') or 10)
+    ESCRITA_ESPERA_BASE_SEGUNDOS = 0.01
+    ESCRITA_ESPERA_MAXIMA_SEGUNDOS = 0.5
+    ESCRITA_FILA_UNICA = os.environ.get('ESCRITA_FILA_UNICA', 'false').lower() == 'true'
+    ESCRITA_LOTE_MAXIMO = 50
+    ESCRITA_JANELA_LOTE_MS = 2
+
+    # Leituras (GET, dashboard e relatórios) em banco somente leitura: URL de
+    # réplica ou, em SQLite, pool mode=ro sobre o mesmo arquivo (desativado
+    # por padrão; ative onde o ganho foi medido). Após escrever, o usuário lê
+    # do banco principal por LEITURA_ADERENCIA_SEGUNDOS
+    LEITURA_DATABASE_URL = os.environ.get('LEITURA_DATABASE_URL')
+    LEITURA_SQLITE_SOMENTE_LEITURA = os.environ.get('LEITURA_SQLITE_SOMENTE_LEITURA', 'false').lower() == 'true'
+    LEITURA_ADERENCIA_SEGUNDOS = 5
+    LEITURA_VERIFICACAO_SEGUNDOS = 5
+
+    # Cache das respostas de detalhe (processo, cliente, advogado): orçamento
+    # de memória por worker, validade das entradas (segundos) e diretório
+    # opcional compartilhado entre workers
+    CACHE_REGISTROS_HABILITADO = os.environ.get('CACHE_REGISTROS_HABILITADO', 'true').lower() == 'true'
+    CACHE_REGISTROS_MAX_BYTES = int(os.environ.get('CACHE_REGISTROS_MAX_BYTES') or 32 * 1024 * 1024)
+    CACHE_REGISTROS_TTL_SEGUNDOS = 300
+    CACHE_REGISTROS_DIRETORIO = os.environ.get('CACHE_REGISTROS_DIRETORIO')
+
+    # Perfilamento de requisições com cProfile: fração sorteada (0 a 1; admins
+    # também podem usar ?__profile=1), diretório dos perfis (padrão:
+    # instance/perfis) e quantidade de perfis mantidos
+    PERFIL_AMOSTRAGEM = float(os.environ.get('PERFIL_AMOSTRAGEM') or 0)
+    PERFIL_DIRETORIO = os.environ.get('PERFIL_DIRETORIO')
+    PERFIL_MAXIMO_ARQUIVOS = int(os.environ.get('PERFIL_MAXIMO_ARQUIVOS') or 200)
+
+    # Diagnóstico de memória (tracemalloc): iniciar o rastreamento com o worker,
+    # níveis de pilha por alocação, snapshots mantidos e fração das requisições
+    # com pico de alocação medido (somente com o rastreamento ativo)
+    MEMORIA_TRACEMALLOC = os.environ.get('MEMORIA_TRACEMALLOC', 'false').lower() == 'true'
+    MEMORIA_QUADROS = int(os.environ.get('MEMORIA_QUADROS') or 1)
+    MEMORIA_MAX_SNAPSHOTS = 10
+    MEMORIA_AMOSTRAGEM = float(os.environ.get('MEMORIA_AMOSTRAGEM') or 0.1)
+
+    # Controle de admissão: listagens paginadas e máximos de per_page/limite
+    # nelas (acima deles, 400), taxa sustentada por usuário (requisições/s, token bucket; 0 desativa) e
+    # rajada, requisições simultâneas por endpoint custoso, vagas na fila de
+    # espera de cada endpoint e espera máxima na fila (segundos) antes do 503
+    ADMISSAO_PAGINACAO_ENDPOINTS = (
+        'processos.listar_processos',
+        'processos.listar_andamentos',
+        'clientes.listar_clientes',
+        'advogados.listar_advogados',
+        'dashboard.obter_processos_recentes',
+    )
+    ADMISSAO_MAXIMO_PER_PAGE = 100
+    ADMISSAO_MAXIMO_LIMITE = 1000
+    ADMISSAO_TAXA_POR_SEGUNDO = float(os.environ.get('ADMISSAO_TAXA_POR_SEGUNDO') or 20)
+    ADMISSAO_RAJADA = int(os.environ.get('ADMISSAO_RAJADA') or 40)
+    ADMISSAO_CONCORRENCIA = {
+        'processos.listar_processos': 8,
+        'processos.listar_processos_parados': 4,
+        'dashboard.obter_estatisticas': 4,
+        'dashboard.obter_produtividade_advogados': 4,
+        'dashboard.obter_processos_parados': 4,
+        'dashboard.gerar_relatorio_periodo': 2,
+        'dashboard.obter_clientes_sem_processos': 2,
+    }
+    ADMISSAO_FILA = int(os.environ.get('ADMISSAO_FILA') or 8)
+    ADMISSAO_ESPERA_SEGUNDOS = 0.5
+
+    # Agrupamento de GETs idênticos e simultâneos (single-flight): endpoints e
+    # escopo de autorização da resposta compartilhada ('perfil' ou 'usuario'),
+    # e espera máxima (segundos) pela resposta da primeira requisição
+    AGRUPAMENTO_ENDPOINTS = {
+        'dashboard.obter_estatisticas': 'perfil',
+        'dashboard.obter_processos_recentes': 'perfil',
+        'dashboard.obter_produtividade_advogados': 'perfil',
+        'dashboard.obter_processos_parados': 'perfil',
+        'dashboard.obter_clientes_sem_processos': 'perfil',
+    }
+    AGRUPAMENTO_ESPERA_SEGUNDOS = float(os.environ.get('AGRUPAMENTO_ESPERA_SEGUNDOS') or 5)
+
+    # Chaves de idempotência (cabeçalho Idempotency-Key) nos POSTs de criação:
+    # endpoints atendidos, validade da resposta gravada (horas), validade da
+    # reserva em andamento (segundos), espera de uma repetição pela resposta da
+    # original (segundos) e intervalo da limpeza das chaves expiradas (segundos)
+    IDEMPOTENCIA_ENDPOINTS = (
+        'processos.criar_processo',
+        'processos.criar_andamento',
+        'clientes.criar_cliente',
+    )
+    IDEMPOTENCIA_TTL_HORAS = int(os.environ.get('IDEMPOTENCIA_TTL_HORAS') or 24)
+    IDEMPOTENCIA_RESERVA_SEGUNDOS = 60
+    IDEMPOTENCIA_ESPERA_SEGUNDOS = 2.0
+    IDEMPOTENCIA_LIMPEZA_SEGUNDOS = 600
+
+    # Anexos armazenados por conteúdo (SHA-256): diretório (padrão: instance/anexos),
+    # tamanho máximo por arquivo, bloco de leitura do upload (bytes), carência
+    # antes de remover arquivos sem referência (horas) e cache do download (segundos)
+    ANEXOS_DIRETORIO = os.environ.get('ANEXOS_DIRETORIO')
+    ANEXOS_TAMANHO_MAXIMO = int(os.environ.get('ANEXOS_TAMANHO_MAXIMO') or 50 * 1024 * 1024)
+    ANEXOS_TAMANHO_BLOCO = 64 * 1024
+    ANEXOS_CARENCIA_HORAS = 24
+    ANEXOS_CACHE_SEGUNDOS = 365 * 24 * 3600
+
 
 class DevelopmentConfig(Config):
     """Configure a aplicação para o ambiente de desenvolvimento."""
@@ -28,6 +184,14 @@ class DevelopmentConfig(Config):
     DEBUG = True  # Habilita modo debug para desenvolvimento
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///jurisrem_dev.db'
 
+    # Pool de conexões reduzido para desenvolvimento local
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': 5,
+        'max_overflow': 5,
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+    }
+
 
 class ProductionConfig(Config):
     """Configure a aplicação para o ambiente de produção."""
@@ -35,6 +199,16 @@ class ProductionConfig(Config):
     DEBUG = False  # Desabilita modo debug em produção
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///jurisrem.db'
 
+    # Pool de conexões: tamanho, conexões extras sob pico, validação antes do
+    # uso e reciclagem periódica (segundos) de conexões antigas
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE') or 10),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW') or 20),
+        'pool_timeout': 30,
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+    }
+
 
 class TestingConfig(Config):
     """Configure a aplicação para execução de testes automatizados."""
@@ -0,0 +1,53 @@
+"""Última movimentação dos processos e índice de processos parados
+
+Revision ID: 0109b0cd1f7c
+Revises: 5e60430bde3b
+Create Date: 2026-10-19 08:08:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0109b0cd1f7c'
+down_revision = '5e60430bde3b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('processos', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column('ultima_movimentacao_em', sa.DateTime(), nullable=True)
+        )
+        batch_op.create_index(
+            'ix_processos_status_movimentacao',
+            ['status', 'ultima_movimentacao_em'], unique=False
+        )
+
+    with op.batch_alter_table('processos_arquivo', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column('ultima_movimentacao_em', sa.DateTime(), nullable=True)
+        )
+
+    # Data do último andamento de cada processo (ou da criação), como em
+    # api.services.movimentacao.popular_ultima_movimentacao
+    for tabela, andamentos in (
+        ('processos', 'andamentos'),
+        ('processos_arquivo', 'andamentos_arquivo'),
+    ):
+        op.execute(
+            f'UPDATE {tabela} SET ultima_movimentacao_em = coalesce('
+            f'(SELECT max(data_andamento) FROM {andamentos} '
+            f'WHERE {andamentos}.processo_id = {tabela}.id), created_at)'
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('processos_arquivo', schema=None) as batch_op:
+        batch_op.drop_column('ultima_movimentacao_em')
+
+    with op.batch_alter_table('processos', schema=None) as batch_op:
+        batch_op.drop_index('ix_processos_status_movimentacao')
+        batch_op.drop_column('ultima_movimentacao_em')
@@ -0,0 +1,40 @@
+"""Log de alterações da sincronização incremental
+
+Revision ID: 37dc2a91f889
+Revises: 3d8383a66463
+Create Date: 2026-10-19 08:04:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '37dc2a91f889'
+down_revision = '3d8383a66463'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('alteracoes',
+    sa.Column('tabela', sa.String(length=50), nullable=False),
+    sa.Column('registro_id', sa.Integer(), nullable=False),
+    sa.Column('operacao', sa.String(length=10), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_alteracoes'))
+    )
+    with op.batch_alter_table('alteracoes', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_alteracoes_tabela_registro', ['tabela', 'registro_id'],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('alteracoes', schema=None) as batch_op:
+        batch_op.drop_index('ix_alteracoes_tabela_registro')
+
+    op.drop_table('alteracoes')
@@ -0,0 +1,70 @@
+"""Anexos endereçados pelo conteúdo e vínculo com os andamentos
+
+Revision ID: 391cea600ecb
+Revises: 71587c2968f0
+Create Date: 2026-10-19 08:06:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '391cea600ecb'
+down_revision = '71587c2968f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('anexos',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('tamanho', sa.BigInteger(), nullable=False),
+    sa.Column('tipo_conteudo', sa.String(length=100), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_anexos'))
+    )
+    with op.batch_alter_table('anexos', schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f('ix_anexos_sha256'), ['sha256'], unique=True
+        )
+
+    with op.batch_alter_table('andamentos', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('anexo_id', sa.Integer(), nullable=True))
+        batch_op.add_column(
+            sa.Column('anexo_nome', sa.String(length=255), nullable=True)
+        )
+        batch_op.create_index(
+            batch_op.f('ix_andamentos_anexo_id'), ['anexo_id'], unique=False
+        )
+        batch_op.create_foreign_key(
+            batch_op.f('fk_andamentos_anexo_id_anexos'), 'anexos',
+            ['anexo_id'], ['id']
+        )
+
+    with op.batch_alter_table('andamentos_arquivo', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('anexo_id', sa.Integer(), nullable=True))
+        batch_op.add_column(
+            sa.Column('anexo_nome', sa.String(length=255), nullable=True)
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('andamentos_arquivo', schema=None) as batch_op:
+        batch_op.drop_column('anexo_nome')
+        batch_op.drop_column('anexo_id')
+
+    with op.batch_alter_table('andamentos', schema=None) as batch_op:
+        batch_op.drop_constraint(
+            batch_op.f('fk_andamentos_anexo_id_anexos'), type_='foreignkey'
+        )
+        batch_op.drop_index(batch_op.f('ix_andamentos_anexo_id'))
+        batch_op.drop_column('anexo_nome')
+        batch_op.drop_column('anexo_id')
+
+    with op.batch_alter_table('anexos', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_anexos_sha256'))
+
+    op.drop_table('anexos')
@@ -0,0 +1,30 @@
+"""Índice (processo_id, data_andamento DESC) dos andamentos
+
+Revision ID: 3d8383a66463
+Revises: 905f8f0e89af
+Create Date: 2026-10-19 08:03:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d8383a66463'
+down_revision = '905f8f0e89af'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('andamentos', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_andamentos_processo_data',
+            ['processo_id', sa.literal_column('data_andamento DESC')],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('andamentos', schema=None) as batch_op:
+        batch_op.drop_index('ix_andamentos_processo_data')
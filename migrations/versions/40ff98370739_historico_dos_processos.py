@@ -0,0 +1,42 @@
+"""Histórico de alterações dos processos
+
+Revision ID: 40ff98370739
+Revises: bb84a501ab97
+Create Date: 2026-10-19 08:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '40ff98370739'
+down_revision = 'bb84a501ab97'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('historico_processos',
+    sa.Column('processo_id', sa.Integer(), nullable=False),
+    sa.Column('alterado_em', sa.DateTime(), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=True),
+    sa.Column('operacao', sa.String(length=10), nullable=False),
+    sa.Column('alteracoes', sa.Text(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_historico_processos'))
+    )
+    with op.batch_alter_table('historico_processos', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_historico_processos_processo_data',
+            ['processo_id', 'alterado_em'], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('historico_processos', schema=None) as batch_op:
+        batch_op.drop_index('ix_historico_processos_processo_data')
+
+    op.drop_table('historico_processos')
@@ -0,0 +1,85 @@
+"""Prazos processuais e calendário de feriados
+
+Revision ID: 5e60430bde3b
+Revises: 391cea600ecb
+Create Date: 2026-10-19 08:07:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e60430bde3b'
+down_revision = '391cea600ecb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('feriados',
+    sa.Column('data_inicio', sa.Date(), nullable=False),
+    sa.Column('data_fim', sa.Date(), nullable=False),
+    sa.Column('descricao', sa.String(length=200), nullable=False),
+    sa.Column('tribunal', sa.String(length=200), nullable=True),
+    sa.Column('suspensao', sa.Boolean(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_feriados'))
+    )
+    with op.batch_alter_table('feriados', schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f('ix_feriados_data_inicio'), ['data_inicio'], unique=False
+        )
+        batch_op.create_index(
+            batch_op.f('ix_feriados_tribunal'), ['tribunal'], unique=False
+        )
+
+    op.create_table('prazos',
+    sa.Column('processo_id', sa.Integer(), nullable=False),
+    sa.Column('andamento_id', sa.Integer(), nullable=True),
+    sa.Column('descricao', sa.String(length=200), nullable=False),
+    sa.Column('dias', sa.Integer(), nullable=False),
+    sa.Column('contagem', sa.String(length=10), nullable=False),
+    sa.Column('data_inicio', sa.Date(), nullable=False),
+    sa.Column('data_vencimento', sa.Date(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('cumprido_em', sa.DateTime(), nullable=True),
+    sa.Column('advogado_id', sa.Integer(), nullable=True),
+    sa.Column('tribunal', sa.String(length=200), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_prazos'))
+    )
+    with op.batch_alter_table('prazos', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_prazos_advogado_status_vencimento',
+            ['advogado_id', 'status', 'data_vencimento'], unique=False
+        )
+        batch_op.create_index(
+            batch_op.f('ix_prazos_andamento_id'), ['andamento_id'], unique=False
+        )
+        batch_op.create_index(
+            batch_op.f('ix_prazos_processo_id'), ['processo_id'], unique=False
+        )
+        batch_op.create_index(
+            'ix_prazos_status_vencimento', ['status', 'data_vencimento'],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('prazos', schema=None) as batch_op:
+        batch_op.drop_index('ix_prazos_status_vencimento')
+        batch_op.drop_index(batch_op.f('ix_prazos_processo_id'))
+        batch_op.drop_index(batch_op.f('ix_prazos_andamento_id'))
+        batch_op.drop_index('ix_prazos_advogado_status_vencimento')
+
+    op.drop_table('prazos')
+    with op.batch_alter_table('feriados', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_feriados_tribunal'))
+        batch_op.drop_index(batch_op.f('ix_feriados_data_inicio'))
+
+    op.drop_table('feriados')
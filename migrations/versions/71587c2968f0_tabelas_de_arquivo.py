@@ -0,0 +1,92 @@
+"""Tabelas de arquivo de processos e andamentos
+
+Revision ID: 71587c2968f0
+Revises: 37dc2a91f889
+Create Date: 2026-10-19 08:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '71587c2968f0'
+down_revision = '37dc2a91f889'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('andamentos_arquivo',
+    sa.Column('data_andamento', sa.DateTime(), nullable=True),
+    sa.Column('tipo_andamento', sa.String(length=100), nullable=True),
+    sa.Column('descricao', sa.Text(), nullable=True),
+    sa.Column('observacoes', sa.Text(), nullable=True),
+    sa.Column('documento_anexo', sa.String(length=500), nullable=True),
+    sa.Column('processo_id', sa.Integer(), nullable=True),
+    sa.Column('usuario_id', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('arquivado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_andamentos_arquivo'))
+    )
+    with op.batch_alter_table('andamentos_arquivo', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_andamentos_arquivo_processo_data',
+            ['processo_id', 'data_andamento'], unique=False
+        )
+
+    op.create_table('processos_arquivo',
+    sa.Column('numero_processo', sa.String(length=50), nullable=True),
+    sa.Column('numero_interno', sa.String(length=20), nullable=True),
+    sa.Column('titulo', sa.String(length=200), nullable=True),
+    sa.Column('descricao', sa.Text(), nullable=True),
+    sa.Column('area_juridica', sa.String(length=100), nullable=True),
+    sa.Column('tipo_acao', sa.String(length=100), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('data_distribuicao', sa.Date(), nullable=True),
+    sa.Column('data_conclusao', sa.Date(), nullable=True),
+    sa.Column('tribunal', sa.String(length=200), nullable=True),
+    sa.Column('vara', sa.String(length=100), nullable=True),
+    sa.Column('juiz', sa.String(length=200), nullable=True),
+    sa.Column('valor_causa', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column(
+        'valor_honorarios', sa.Numeric(precision=15, scale=2), nullable=True
+    ),
+    sa.Column('forma_pagamento', sa.String(length=50), nullable=True),
+    sa.Column('prioridade', sa.String(length=20), nullable=True),
+    sa.Column('observacoes', sa.Text(), nullable=True),
+    sa.Column('observacoes_internas', sa.Text(), nullable=True),
+    sa.Column('versao', sa.Integer(), nullable=True),
+    sa.Column('cliente_id', sa.Integer(), nullable=True),
+    sa.Column('advogado_id', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('arquivado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_processos_arquivo'))
+    )
+    with op.batch_alter_table('processos_arquivo', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_processos_arquivo_advogado', ['advogado_id'], unique=False
+        )
+        batch_op.create_index(
+            'ix_processos_arquivo_cliente', ['cliente_id'], unique=False
+        )
+        batch_op.create_index(
+            'ix_processos_arquivo_numero', ['numero_processo'], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('processos_arquivo', schema=None) as batch_op:
+        batch_op.drop_index('ix_processos_arquivo_numero')
+        batch_op.drop_index('ix_processos_arquivo_cliente')
+        batch_op.drop_index('ix_processos_arquivo_advogado')
+
+    op.drop_table('processos_arquivo')
+    with op.batch_alter_table('andamentos_arquivo', schema=None) as batch_op:
+        batch_op.drop_index('ix_andamentos_arquivo_processo_data')
+
+    op.drop_table('andamentos_arquivo')
@@ -0,0 +1,35 @@
+"""Versão dos registros para a concorrência otimista (If-Match)
+
+Revision ID: 7ae0220432fb
+Revises: bba2690529c0
+Create Date: 2026-10-19 08:01:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7ae0220432fb'
+down_revision = 'bba2690529c0'
+branch_labels = None
+depends_on = None
+
+TABELAS = ('advogados', 'clientes', 'processos')
+
+
+def upgrade():
+    # Registros existentes começam na versão 1
+    for tabela in TABELAS:
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            batch_op.add_column(
+                sa.Column(
+                    'versao', sa.Integer(), nullable=False, server_default='1'
+                )
+            )
+
+
+def downgrade():
+    for tabela in reversed(TABELAS):
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            batch_op.drop_column('versao')
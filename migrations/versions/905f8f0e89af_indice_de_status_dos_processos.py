@@ -0,0 +1,29 @@
+"""Índice (status, numero_processo) da listagem de processos
+
+Revision ID: 905f8f0e89af
+Revises: 7ae0220432fb
+Create Date: 2026-10-19 08:02:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '905f8f0e89af'
+down_revision = '7ae0220432fb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('processos', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_processos_status_numero', ['status', 'numero_processo'],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('processos', schema=None) as batch_op:
+        batch_op.drop_index('ix_processos_status_numero')
@@ -0,0 +1,47 @@
+"""Chaves de idempotência das criações (Idempotency-Key)
+
+Revision ID: bb84a501ab97
+Revises: 0109b0cd1f7c
+Create Date: 2026-10-19 08:09:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'bb84a501ab97'
+down_revision = '0109b0cd1f7c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('chaves_idempotencia',
+    sa.Column('escopo', sa.String(length=100), nullable=False),
+    sa.Column('chave', sa.String(length=255), nullable=False),
+    sa.Column('endpoint', sa.String(length=100), nullable=False),
+    sa.Column('impressao', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.Integer(), nullable=True),
+    sa.Column('tipo_conteudo', sa.String(length=100), nullable=True),
+    sa.Column('corpo', sa.LargeBinary(), nullable=True),
+    sa.Column('expira_em', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_chaves_idempotencia')),
+    sa.UniqueConstraint(
+        'escopo', 'chave', name='uq_chaves_idempotencia_escopo'
+    )
+    )
+    with op.batch_alter_table('chaves_idempotencia', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_chaves_idempotencia_expira_em', ['expira_em'], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('chaves_idempotencia', schema=None) as batch_op:
+        batch_op.drop_index('ix_chaves_idempotencia_expira_em')
+
+    op.drop_table('chaves_idempotencia')
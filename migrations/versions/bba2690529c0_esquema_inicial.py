@@ -0,0 +1,190 @@
+"""Esquema inicial: usuários, clientes, advogados, processos e andamentos
+
+Revision ID: bba2690529c0
+Revises:
+Create Date: 2026-10-19 08:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'bba2690529c0'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('advogados',
+    sa.Column('nome', sa.String(length=200), nullable=False),
+    sa.Column('cpf', sa.String(length=14), nullable=False),
+    sa.Column('oab_numero', sa.String(length=20), nullable=False),
+    sa.Column('oab_estado', sa.String(length=2), nullable=False),
+    sa.Column('email', sa.String(length=120), nullable=False),
+    sa.Column('telefone', sa.String(length=20), nullable=True),
+    sa.Column('especialidades', sa.Text(), nullable=True),
+    sa.Column('ativo', sa.Boolean(), nullable=False),
+    sa.Column('data_admissao', sa.Date(), nullable=True),
+    sa.Column('data_demissao', sa.Date(), nullable=True),
+    sa.Column('endereco_rua', sa.String(length=200), nullable=True),
+    sa.Column('endereco_numero', sa.String(length=10), nullable=True),
+    sa.Column('endereco_complemento', sa.String(length=100), nullable=True),
+    sa.Column('endereco_bairro', sa.String(length=100), nullable=True),
+    sa.Column('endereco_cidade', sa.String(length=100), nullable=True),
+    sa.Column('endereco_estado', sa.String(length=2), nullable=True),
+    sa.Column('endereco_cep', sa.String(length=10), nullable=True),
+    sa.Column('biografia', sa.Text(), nullable=True),
+    sa.Column('observacoes', sa.Text(), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_advogados')),
+    sa.UniqueConstraint('cpf', name=op.f('uq_advogados_cpf')),
+    sa.UniqueConstraint('email', name=op.f('uq_advogados_email'))
+    )
+    with op.batch_alter_table('advogados', schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f('ix_advogados_nome'), ['nome'], unique=False
+        )
+        batch_op.create_index(
+            batch_op.f('ix_advogados_oab_numero'), ['oab_numero'], unique=True
+        )
+
+    op.create_table('clientes',
+    sa.Column('nome', sa.String(length=200), nullable=False),
+    sa.Column('cpf_cnpj', sa.String(length=20), nullable=False),
+    sa.Column('email', sa.String(length=120), nullable=True),
+    sa.Column('telefone', sa.String(length=20), nullable=True),
+    sa.Column('tipo_pessoa', sa.String(length=20), nullable=False),
+    sa.Column('endereco_rua', sa.String(length=200), nullable=True),
+    sa.Column('endereco_numero', sa.String(length=10), nullable=True),
+    sa.Column('endereco_complemento', sa.String(length=100), nullable=True),
+    sa.Column('endereco_bairro', sa.String(length=100), nullable=True),
+    sa.Column('endereco_cidade', sa.String(length=100), nullable=True),
+    sa.Column('endereco_estado', sa.String(length=2), nullable=True),
+    sa.Column('endereco_cep', sa.String(length=10), nullable=True),
+    sa.Column('profissao', sa.String(length=100), nullable=True),
+    sa.Column('estado_civil', sa.String(length=50), nullable=True),
+    sa.Column('observacoes', sa.Text(), nullable=True),
+    sa.Column('ativo', sa.Boolean(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_clientes'))
+    )
+    with op.batch_alter_table('clientes', schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f('ix_clientes_cpf_cnpj'), ['cpf_cnpj'], unique=True
+        )
+        batch_op.create_index(
+            batch_op.f('ix_clientes_nome'), ['nome'], unique=False
+        )
+
+    op.create_table('usuarios',
+    sa.Column('nome', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=120), nullable=False),
+    sa.Column('senha_hash', sa.String(length=255), nullable=False),
+    sa.Column('ativo', sa.Boolean(), nullable=False),
+    sa.Column('tipo_usuario', sa.String(length=50), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_usuarios'))
+    )
+    with op.batch_alter_table('usuarios', schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f('ix_usuarios_email'), ['email'], unique=True
+        )
+
+    op.create_table('processos',
+    sa.Column('numero_processo', sa.String(length=50), nullable=True),
+    sa.Column('numero_interno', sa.String(length=20), nullable=True),
+    sa.Column('titulo', sa.String(length=200), nullable=True),
+    sa.Column('descricao', sa.Text(), nullable=True),
+    sa.Column('area_juridica', sa.String(length=100), nullable=True),
+    sa.Column('tipo_acao', sa.String(length=100), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('data_distribuicao', sa.Date(), nullable=True),
+    sa.Column('data_conclusao', sa.Date(), nullable=True),
+    sa.Column('tribunal', sa.String(length=200), nullable=True),
+    sa.Column('vara', sa.String(length=100), nullable=True),
+    sa.Column('juiz', sa.String(length=200), nullable=True),
+    sa.Column('valor_causa', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column(
+        'valor_honorarios', sa.Numeric(precision=15, scale=2), nullable=True
+    ),
+    sa.Column('forma_pagamento', sa.String(length=50), nullable=True),
+    sa.Column('prioridade', sa.String(length=20), nullable=True),
+    sa.Column('observacoes', sa.Text(), nullable=True),
+    sa.Column('observacoes_internas', sa.Text(), nullable=True),
+    sa.Column('cliente_id', sa.Integer(), nullable=True),
+    sa.Column('advogado_id', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(
+        ['advogado_id'], ['advogados.id'],
+        name=op.f('fk_processos_advogado_id_advogados')
+    ),
+    sa.ForeignKeyConstraint(
+        ['cliente_id'], ['clientes.id'],
+        name=op.f('fk_processos_cliente_id_clientes')
+    ),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_processos'))
+    )
+    with op.batch_alter_table('processos', schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f('ix_processos_numero_interno'), ['numero_interno'],
+            unique=False
+        )
+        batch_op.create_index(
+            batch_op.f('ix_processos_numero_processo'), ['numero_processo'],
+            unique=True
+        )
+
+    op.create_table('andamentos',
+    sa.Column('data_andamento', sa.DateTime(), nullable=True),
+    sa.Column('tipo_andamento', sa.String(length=100), nullable=True),
+    sa.Column('descricao', sa.Text(), nullable=True),
+    sa.Column('observacoes', sa.Text(), nullable=True),
+    sa.Column('documento_anexo', sa.String(length=500), nullable=True),
+    sa.Column('processo_id', sa.Integer(), nullable=True),
+    sa.Column('usuario_id', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(
+        ['processo_id'], ['processos.id'],
+        name=op.f('fk_andamentos_processo_id_processos')
+    ),
+    sa.ForeignKeyConstraint(
+        ['usuario_id'], ['usuarios.id'],
+        name=op.f('fk_andamentos_usuario_id_usuarios')
+    ),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_andamentos'))
+    )
+
+
+def downgrade():
+    op.drop_table('andamentos')
+    with op.batch_alter_table('processos', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_processos_numero_processo'))
+        batch_op.drop_index(batch_op.f('ix_processos_numero_interno'))
+
+    op.drop_table('processos')
+    with op.batch_alter_table('usuarios', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_usuarios_email'))
+
+    op.drop_table('usuarios')
+    with op.batch_alter_table('clientes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_clientes_nome'))
+        batch_op.drop_index(batch_op.f('ix_clientes_cpf_cnpj'))
+
+    op.drop_table('clientes')
+    with op.batch_alter_table('advogados', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_advogados_oab_numero'))
+        batch_op.drop_index(batch_op.f('ix_advogados_nome'))
+
+    op.drop_table('advogados')
@@ -0,0 +1,48 @@
+"""Dígitos normalizados do CPF/CNPJ de clientes e advogados
+
+Os dígitos dos registros existentes são preenchidos por ``flask init-db``
+(ou ``flask documentos-backfill``), que normaliza e valida cada documento.
+
+Revision ID: dfe79e5146d2
+Revises: 40ff98370739
+Create Date: 2026-10-19 08:11:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'dfe79e5146d2'
+down_revision = '40ff98370739'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('advogados', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column('cpf_digitos', sa.String(length=11), nullable=True)
+        )
+        batch_op.create_index(
+            batch_op.f('ix_advogados_cpf_digitos'), ['cpf_digitos'], unique=True
+        )
+
+    with op.batch_alter_table('clientes', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column('cpf_cnpj_digitos', sa.String(length=14), nullable=True)
+        )
+        batch_op.create_index(
+            batch_op.f('ix_clientes_cpf_cnpj_digitos'), ['cpf_cnpj_digitos'],
+            unique=True
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('clientes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_clientes_cpf_cnpj_digitos'))
+        batch_op.drop_column('cpf_cnpj_digitos')
+
+    with op.batch_alter_table('advogados', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_advogados_cpf_digitos'))
+        batch_op.drop_column('cpf_digitos')
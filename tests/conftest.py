@@ -5,26 +5,37 @@ import pytest  # type: ignore # noqa: F401
 from api import create_app, db
 from api.models.advogado import Advogado
 from api.models.cliente import Cliente
-from api.models.processo import Processo  # noqa: F401
+from api.models.processo import Processo
 from api.models.usuario import Usuario
 
 
+@pytest.fixture(scope="session")
+def aplicacao():
+    """Crie a aplicação uma única vez para toda a sessão de testes.
+
+    ``create_app`` configura o objeto Flask global de ``api`` e registra nele
+    extensões e hooks, que não podem ser registrados uma segunda vez.
+    """
+    return create_app("testing")
+
+
 @pytest.fixture
-def app():
-    """Crie instância da aplicação configurada para testes."""
-    # Cria aplicação em modo de teste
-    app = create_app("testing")
+def app(aplicacao):
+    """Forneça a aplicação de testes com tabelas novas a cada teste."""
+    from api.services.cache import cache_registros
 
     # Configura contexto da aplicação
-    with app.app_context():
-        # Cria todas as tabelas
-        db.create_all()
+    with aplicacao.app_context():
+        # Recria todas as tabelas (o bind somente leitura não possui tabelas)
+        db.drop_all(bind_key=None)
+        db.create_all(bind_key=None)
+        cache_registros.limpar()
 
-        yield app
+        yield aplicacao
 
         # Limpa dados após os testes
         db.session.remove()
-        db.drop_all()
+        db.drop_all(bind_key=None)
 
 
 @pytest.fixture
@@ -62,6 +73,25 @@ def auth_headers(client):
     return {"Authorization": f"Bearer {token}"}
 
 
+@pytest.fixture
+def usuario_headers(client):
+    """Crie headers de autenticação com usuário comum (não administrador)."""
+    usuario = Usuario(
+        nome="Usuário Comum",
+        email="comum@exemplo.com",
+        tipo_usuario="usuario",
+        ativo=True,
+    )
+    usuario.set_password("senha123")
+    usuario.save()
+
+    response = client.post(
+        "/api/auth/login", json={"email": "comum@exemplo.com", "senha": "senha123"}
+    )
+
+    return {"Authorization": f"Bearer {response.get_json()['token']}"}
+
+
 @pytest.fixture
 def cliente_teste():
     """Crie cliente de teste para usar nos testes."""
@@ -88,3 +118,17 @@ def advogado_teste():
     )
     advogado.save()
     return advogado
+
+
+@pytest.fixture
+def processo_teste(cliente_teste, advogado_teste):
+    """Crie processo de teste vinculado a cliente e advogado."""
+    processo = Processo(
+        numero_processo="0000001-00.2024.8.26.0001",
+        titulo="Processo de Teste",
+        area_juridica="civil",
+        cliente_id=cliente_teste.id,
+        advogado_id=advogado_teste.id,
+    )
+    processo.save()
+    return processo
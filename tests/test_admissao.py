@@ -0,0 +1,62 @@
+"""Teste o controle de admissão: paginação, taxa por usuário e concorrência."""
+
+import pytest  # type: ignore # noqa: F401
+
+from api.services.admissao import LimiteConcorrencia, controle_admissao
+
+
+def test_paginacao_acima_do_maximo(app, client):
+    """Teste o 400 para per_page acima do máximo ou não inteiro."""
+    maximo = app.config["ADMISSAO_MAXIMO_PER_PAGE"]
+
+    assert client.get(f"/api/clientes/?per_page={maximo}").status_code == 200
+
+    response = client.get(f"/api/clientes/?per_page={maximo + 1}")
+    assert response.status_code == 400
+    assert response.get_json()["erro"] == (
+        f"per_page deve ser um inteiro entre 1 e {maximo}"
+    )
+    assert client.get("/api/clientes/?per_page=abc").status_code == 400
+
+
+def test_paginacao_verificada_apenas_nas_listagens(client, processo_teste):
+    """Teste que rotas fora das listagens paginadas não são recusadas."""
+    assert client.get("/api/processos/listagem?per_page=1000").status_code == 400
+    response = client.get("/api/dashboard/processos-recentes?limite=5000")
+    assert response.status_code == 400
+
+    # O histórico limita ``limite`` ao próprio máximo
+    url = f"/api/processos/{processo_teste.id}/historico?limite=5000"
+    assert client.get(url).status_code == 200
+    assert client.get("/api/health?per_page=abc").status_code == 200
+
+
+def test_taxa_excedida_recebe_429(client, monkeypatch):
+    """Teste o 429 com Retry-After quando o balde do usuário se esgota."""
+    monkeypatch.setattr(controle_admissao, "taxa", 0.5)
+    monkeypatch.setattr(controle_admissao, "rajada", 1)
+    monkeypatch.setattr(controle_admissao, "_baldes", {})
+    recusadas = controle_admissao.metricas()["recusadas_taxa"]
+
+    assert client.get("/api/clientes/").status_code == 200
+    response = client.get("/api/clientes/")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    assert controle_admissao.metricas()["recusadas_taxa"] == recusadas + 1
+    # Endpoints de monitoramento não consomem fichas
+    assert client.get("/api/health").status_code == 200
+
+
+def test_endpoint_sem_vaga_descarta_com_503(client, monkeypatch):
+    """Teste o descarte quando o endpoint está ocupado e a fila está cheia."""
+    limites = dict(controle_admissao._limites)
+    limites["processos.listar_processos"] = LimiteConcorrencia(0, 0)
+    monkeypatch.setattr(controle_admissao, "_limites", limites)
+
+    response = client.get("/api/processos/")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    # Outros endpoints continuam admitidos
+    assert client.get("/api/clientes/").status_code == 200
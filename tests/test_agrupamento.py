@@ -0,0 +1,82 @@
+"""Teste o agrupamento de GETs idênticos e simultâneos (single-flight)."""
+
+import pytest  # type: ignore # noqa: F401
+from werkzeug.datastructures import MultiDict
+
+from api.services.agrupamento import (
+    _Execucao,
+    agrupador_requisicoes,
+    chave_requisicao,
+)
+
+ENDPOINT = "dashboard.obter_estatisticas"
+
+
+@pytest.fixture
+def em_andamento(monkeypatch):
+    """Simule uma execução já em andamento para a chave da estatística anônima."""
+    execucao = _Execucao()
+    chave = chave_requisicao(ENDPOINT, MultiDict(), "perfil:anonimo")
+    monkeypatch.setattr(agrupador_requisicoes, "_execucoes", {chave: execucao})
+    return execucao
+
+
+def test_chave_ignora_ordem_e_argumentos_vazios():
+    """Teste que a ordem e argumentos vazios não distinguem requisições."""
+    primeira = MultiDict([("b", "2"), ("a", "1"), ("c", "")])
+    segunda = MultiDict([("a", "1"), ("b", "2")])
+
+    assert chave_requisicao(ENDPOINT, primeira, "perfil:admin") == chave_requisicao(
+        ENDPOINT, segunda, "perfil:admin"
+    )
+    assert chave_requisicao(ENDPOINT, segunda, "perfil:admin") != chave_requisicao(
+        ENDPOINT, segunda, "perfil:usuario"
+    )
+
+
+def test_requisicao_identica_reutiliza_a_resposta(client, em_andamento):
+    """Teste que a requisição idêntica recebe a resposta da execução em curso."""
+    em_andamento.resposta = (
+        200,
+        [("Content-Type", "application/json")],
+        b'{"compartilhada": true}',
+    )
+    em_andamento.concluida.set()
+    compartilhadas = agrupador_requisicoes.metricas()["compartilhadas"]
+
+    response = client.get("/api/dashboard/estatisticas")
+
+    assert response.status_code == 200
+    assert response.get_json() == {"compartilhada": True}
+    assert agrupador_requisicoes.metricas()["compartilhadas"] == compartilhadas + 1
+
+
+def test_execucao_sem_resultado_executa_a_view(client, em_andamento):
+    """Teste que, se a primeira falhar, a requisição em espera executa a view."""
+    em_andamento.concluida.set()
+    sem_resultado = agrupador_requisicoes.metricas()["execucoes_sem_resultado"]
+
+    response = client.get("/api/dashboard/estatisticas")
+
+    assert response.status_code == 200
+    assert "compartilhada" not in response.get_json()
+    metricas = agrupador_requisicoes.metricas()
+    assert metricas["execucoes_sem_resultado"] == sem_resultado + 1
+    assert metricas["em_andamento"] == 1
+
+
+def test_metricas_apenas_para_administradores(client, auth_headers, usuario_headers):
+    """Teste o health check sem métricas e as métricas restritas ao admin."""
+    client.get("/api/dashboard/estatisticas?ano=2024")
+
+    health = client.get("/api/health").get_json()
+    assert set(health) == {"status", "database", "message"}
+
+    response = client.get("/api/admin/metricas", headers=usuario_headers)
+    assert response.status_code == 403
+
+    response = client.get("/api/admin/metricas", headers=auth_headers)
+    assert response.status_code == 200
+    assert "dashboard.obter_estatisticas?ano=2024" in (
+        response.get_json()["agrupamento"]["por_chave"]
+    )
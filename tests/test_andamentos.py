@@ -0,0 +1,115 @@
+"""Teste a criação de andamentos e do andamento inicial do processo."""
+
+from datetime import datetime, timedelta
+
+import pytest  # type: ignore # noqa: F401
+from sqlalchemy import select
+
+from api import db
+from api.models.processo import Andamento, Processo
+
+
+def test_criar_andamento_registra_autor_e_movimentacao(
+    client, auth_headers, processo_teste
+):
+    """Teste o autor vindo do token e a última movimentação do processo."""
+    url = f"/api/processos/{processo_teste.id}/andamentos"
+    response = client.post(
+        url,
+        json={
+            "tipo_andamento": "Despacho",
+            "descricao": "Conclusos para decisão",
+            "data_andamento": "2030-01-02T10:00:00",
+        },
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 201
+    (andamento,) = client.get(url).get_json()["andamentos"]
+    assert andamento["usuario"]["nome"] == "Usuário Teste"
+
+    movimentacao = db.session.scalar(
+        select(Processo.ultima_movimentacao_em).where(Processo.id == processo_teste.id)
+    )
+    assert movimentacao == datetime(2030, 1, 2, 10, 0)
+
+
+def test_criar_andamento_sem_token(client, processo_teste):
+    """Teste que o andamento sem token é gravado sem autor."""
+    url = f"/api/processos/{processo_teste.id}/andamentos"
+    response = client.post(
+        url, json={"tipo_andamento": "Juntada", "descricao": "Petição juntada"}
+    )
+
+    assert response.status_code == 201
+    assert client.get(url).get_json()["andamentos"][0]["usuario"] is None
+
+
+def test_andamento_de_processo_inexistente(client):
+    """Teste que a chave estrangeira do processo resulta em 404."""
+    response = client.post(
+        "/api/processos/999/andamentos",
+        json={"tipo_andamento": "Despacho", "descricao": "Sem processo"},
+    )
+
+    assert response.status_code == 404
+    assert response.get_json()["erro"] == "Processo não encontrado"
+
+
+def test_criar_processo_com_andamento_inicial(
+    client, auth_headers, cliente_teste, advogado_teste
+):
+    """Teste o andamento inicial gravado com o processo e atribuído ao usuário."""
+    response = client.post(
+        "/api/processos/criar_processo",
+        json={
+            "numeroProcesso": "0000003-00.2024.8.26.0001",
+            "titulo": "Com andamento",
+            "areaJuridica": "civil",
+            "cliente": cliente_teste.id,
+            "advogado": advogado_teste.id,
+            "andamentoInicial": "Distribuído por sorteio",
+        },
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    andamento = db.session.scalars(select(Andamento)).one()
+    assert andamento.processo_id == response.get_json()["processo"]["id"]
+    assert andamento.tipo_andamento == "Abertura do Processo"
+    assert andamento.usuario.nome == "Usuário Teste"
+
+
+def test_detalhe_incorpora_apenas_andamentos_recentes(app, client, processo_teste):
+    """Teste o limite de andamentos no detalhe, a ordem por data e o total."""
+    inicio = datetime(2024, 1, 1, 9, 0)
+    for dia in (3, 1, 5, 2, 4):
+        Andamento(
+            processo_id=processo_teste.id,
+            tipo_andamento="Despacho",
+            descricao=f"Dia {dia}",
+            data_andamento=inicio + timedelta(days=dia),
+        ).save()
+
+    url = f"/api/processos/{processo_teste.id}"
+    data = client.get(f"{url}?andamentos_limite=3").get_json()
+
+    assert [a["descricao"] for a in data["andamentos"]] == ["Dia 5", "Dia 4", "Dia 3"]
+    assert data["total_andamentos"] == 5
+
+    # O limite é restrito ao máximo configurado; zero omite os andamentos
+    maximo = app.config["ANDAMENTOS_DETALHE_LIMITE_MAXIMO"]
+    data = client.get(f"{url}?andamentos_limite={maximo + 1}").get_json()
+    assert len(data["andamentos"]) == 5
+    data = client.get(f"{url}?andamentos_limite=0").get_json()
+    assert data["andamentos"] == [] and data["total_andamentos"] == 5
+
+    assert processo_teste.get_ultimo_andamento().descricao == "Dia 5"
+
+
+def test_ultimo_andamento_de_processo_sem_andamentos(client, processo_teste):
+    """Teste o detalhe e o último andamento de um processo sem andamentos."""
+    data = client.get(f"/api/processos/{processo_teste.id}").get_json()
+
+    assert data["andamentos"] == [] and data["total_andamentos"] == 0
+    assert processo_teste.get_ultimo_andamento() is None
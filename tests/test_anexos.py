@@ -0,0 +1,98 @@
+"""Teste o armazenamento de anexos por conteúdo e o coletor de órfãos."""
+
+import hashlib
+import os
+from datetime import datetime
+
+import pytest  # type: ignore # noqa: F401
+from sqlalchemy import update
+
+from api.models.anexo import Anexo
+from api.services.anexos import caminho_blob, coletar_orfaos
+from api.services.escrita import coordenador_escrita
+
+CONTEUDO = b"%PDF-1.4 conteudo de teste"
+SHA256 = hashlib.sha256(CONTEUDO).hexdigest()
+
+
+@pytest.fixture
+def diretorio(app, tmp_path, monkeypatch):
+    """Grave os anexos em um diretório temporário."""
+    monkeypatch.setitem(app.config, "ANEXOS_DIRETORIO", str(tmp_path))
+    return tmp_path
+
+
+def _enviar(client, conteudo=CONTEUDO):
+    """Envie o conteúdo como anexo PDF."""
+    return client.post("/api/anexos/", data=conteudo, content_type="application/pdf")
+
+
+def test_envio_repetido_reaproveita_o_arquivo(client, diretorio):
+    """Teste que o mesmo conteúdo é gravado uma única vez."""
+    primeiro = _enviar(client)
+    segundo = _enviar(client)
+
+    assert primeiro.status_code == 201
+    assert segundo.status_code == 200
+    assert segundo.get_json()["anexo"]["sha256"] == SHA256
+    assert [p.name for p in diretorio.rglob("*") if p.is_file()] == [SHA256]
+
+
+def test_download_parcial_e_anexo_inexistente(client, diretorio):
+    """Teste o download com Range e o 404 de hash desconhecido."""
+    _enviar(client)
+
+    response = client.get(f"/api/anexos/{SHA256}", headers={"Range": "bytes=0-7"})
+    assert response.status_code == 206
+    assert response.get_data() == CONTEUDO[:8]
+    assert response.headers["ETag"] == f'"{SHA256}"'
+
+    assert client.get(f"/api/anexos/{'0' * 64}").status_code == 404
+
+
+def test_andamento_referencia_anexo(client, diretorio, processo_teste):
+    """Teste o andamento com anexo enviado antes e com hash desconhecido."""
+    _enviar(client)
+    url = f"/api/processos/{processo_teste.id}/andamentos"
+
+    response = client.post(
+        url,
+        json={
+            "tipo_andamento": "Juntada",
+            "descricao": "Petição inicial",
+            "anexo": SHA256,
+            "anexo_nome": "peticao.pdf",
+        },
+    )
+    assert response.status_code == 201
+
+    (andamento,) = client.get(url).get_json()["andamentos"]
+    assert andamento["anexo"]["nome"] == "peticao.pdf"
+    download = client.get(andamento["anexo"]["url"])
+    assert download.get_data() == CONTEUDO
+    assert "peticao.pdf" in download.headers["Content-Disposition"]
+
+    response = client.post(
+        url,
+        json={"tipo_andamento": "Juntada", "descricao": "Sem", "anexo": "0" * 64},
+    )
+    assert response.status_code == 400
+
+
+def test_coletor_remove_orfaos_apos_o_commit(client, diretorio, processo_teste):
+    """Teste que apenas anexos sem referência são removidos, com o arquivo."""
+    _enviar(client)
+    referenciado = _enviar(client, b"outro conteudo").get_json()["anexo"]["sha256"]
+    client.post(
+        f"/api/processos/{processo_teste.id}/andamentos",
+        json={"tipo_andamento": "Juntada", "descricao": "x", "anexo": referenciado},
+    )
+    with coordenador_escrita.transacao() as session:
+        session.execute(update(Anexo).values(updated_at=datetime(2020, 1, 1)))
+
+    removidos = coletar_orfaos(carencia_horas=1)
+
+    assert removidos["registros"] == 1
+    assert not os.path.exists(caminho_blob(SHA256))
+    assert client.get(f"/api/anexos/{SHA256}").status_code == 404
+    assert client.get(f"/api/anexos/{referenciado}").status_code == 200
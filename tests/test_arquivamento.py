@@ -0,0 +1,92 @@
+"""Teste o arquivamento e a restauração de processos encerrados."""
+
+from datetime import datetime
+
+import pytest  # type: ignore # noqa: F401
+from sqlalchemy import update
+
+from api import db
+from api.models.processo import Processo
+from api.services.arquivamento import (
+    NumeroProcessoEmUso,
+    arquivar_processos,
+    restaurar_processos,
+)
+from api.services.escrita import coordenador_escrita
+
+
+@pytest.fixture
+def processo_arquivado(processo_teste, cliente_teste, advogado_teste):
+    """Arquive o processo de teste (o de maior ID nunca é arquivado)."""
+    Processo(
+        numero_processo="0000009-00.2024.8.26.0001",
+        titulo="Processo recente",
+        area_juridica="civil",
+        cliente_id=cliente_teste.id,
+        advogado_id=advogado_teste.id,
+    ).save()
+
+    with coordenador_escrita.transacao() as session:
+        session.execute(
+            update(Processo)
+            .where(Processo.id == processo_teste.id)
+            .values(status="finalizado", updated_at=datetime(2020, 1, 1))
+        )
+    db.session.expunge(processo_teste)
+
+    assert arquivar_processos(dias=30) == (1, 0)
+    return processo_teste
+
+
+def test_arquivar_e_restaurar(client, processo_arquivado):
+    """Teste o detalhe lido do arquivo e a devolução à tabela principal."""
+    url = f"/api/processos/{processo_arquivado.id}"
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.get_json()["arquivado"] is True
+
+    assert restaurar_processos([processo_arquivado.id]) == (1, 0)
+    assert client.get(url).get_json().get("arquivado") is not True
+
+
+def test_numero_arquivado_continua_reservado(client, processo_arquivado):
+    """Teste que criar processo com o número de um arquivado retorna 409."""
+    response = client.post(
+        "/api/processos/criar_processo",
+        json={
+            "numeroProcesso": processo_arquivado.numero_processo,
+            "titulo": "Mesmo número",
+            "areaJuridica": "civil",
+            "cliente": processo_arquivado.cliente_id,
+        },
+    )
+
+    assert response.status_code == 409
+    assert response.get_json()["erro"] == "Número do processo já cadastrado"
+
+
+def test_restauracao_com_numero_em_uso(client, processo_arquivado):
+    """Teste que a restauração em conflito é recusada sem mover processos."""
+    Processo(
+        numero_processo=processo_arquivado.numero_processo,
+        titulo="Gravado sem a verificação da rota",
+        area_juridica="civil",
+    ).save()
+
+    with pytest.raises(NumeroProcessoEmUso) as erro:
+        restaurar_processos([processo_arquivado.id])
+    assert erro.value.numeros == [processo_arquivado.numero_processo]
+
+    response = client.get(f"/api/processos/{processo_arquivado.id}")
+    assert response.get_json()["arquivado"] is True
+
+
+def test_excluir_cliente_com_processo_arquivado(
+    client, auth_headers, processo_arquivado
+):
+    """Teste que processos arquivados impedem a exclusão do cliente."""
+    response = client.delete(
+        f"/api/clientes/{processo_arquivado.cliente_id}", headers=auth_headers
+    )
+
+    assert response.status_code == 400
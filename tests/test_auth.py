@@ -69,3 +69,28 @@ def test_perfil_sem_autenticacao(client):
     response = client.get("/api/auth/perfil")
 
     assert response.status_code == 401  # JWT missing returns 401
+
+
+def test_registro_nao_concede_perfil_admin(client, auth_headers):
+    """Teste que o usuário registrado como admin não acessa rotas administrativas."""
+    response = client.post(
+        "/api/auth/registro",
+        json={
+            "nome": "Intruso",
+            "email": "intruso@teste.com",
+            "senha": "senha123",
+            "tipo_usuario": "admin",
+        },
+    )
+    assert response.status_code == 201
+    assert response.get_json()["usuario"]["tipo_usuario"] == "usuario"
+
+    token = client.post(
+        "/api/auth/login", json={"email": "intruso@teste.com", "senha": "senha123"}
+    ).get_json()["token"]
+
+    response = client.get(
+        "/api/admin/perfis", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 403
+    assert client.get("/api/admin/perfis", headers=auth_headers).status_code == 200
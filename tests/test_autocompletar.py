@@ -0,0 +1,119 @@
+"""Teste o índice de prefixos usado pelo autocompletar."""
+
+from types import SimpleNamespace
+
+import pytest  # type: ignore # noqa: F401
+
+from api.models.advogado import Advogado
+from api.services.autocompletar import (
+    IndicePrefixos,
+    extrair,
+    indice_autocompletar,
+    termo_busca,
+)
+
+
+def _cliente(registro_id, nome, cpf_cnpj):
+    """Extraia os termos de um cliente a partir de uma linha simulada."""
+    linha = SimpleNamespace(id=registro_id, nome=nome, cpf_cnpj=cpf_cnpj)
+    return registro_id, extrair("cliente", linha)
+
+
+def test_busca_sem_acentos_por_palavra_e_documento():
+    """Teste prefixos do nome, de palavras seguintes e dos dígitos do CPF."""
+    indice = IndicePrefixos.construir(
+        [
+            _cliente(1, "José da Conceição", "123.456.789-09"),
+            _cliente(2, "Conceição Araújo", "987.654.321-00"),
+        ]
+    )
+
+    assert [i["id"] for i in indice.buscar(termo_busca("CONCEI"), 10)] == [2, 1]
+    assert [i["id"] for i in indice.buscar(termo_busca("123.45"), 10)] == [1]
+    assert indice.buscar(termo_busca("da"), 10) == []
+
+
+def test_atualizacao_substitui_e_remove_termos():
+    """Teste alteração de nome e remoção de um registro já indexado."""
+    indice = IndicePrefixos.construir([_cliente(1, "Zuleica Nandu", "111")])
+
+    indice.atualizar(*_cliente(1, "Zélia Nandu", "111"))
+    assert indice.buscar("zul", 10) == []
+    assert indice.buscar("zel", 10)[0]["nome"] == "Zélia Nandu"
+
+    indice.atualizar(1, None)
+    assert indice.buscar("nandu", 10) == [] and len(indice) == 0
+
+
+@pytest.fixture
+def indice(app):
+    """Descarte os índices montados por outros testes (bancos anteriores)."""
+    indice_autocompletar.init_app(app)
+    yield indice_autocompletar
+    indice_autocompletar.init_app(app)
+
+
+def _ids(client, tipo, consulta):
+    """Busque pelo endpoint e retorne os IDs encontrados."""
+    response = client.get(
+        "/api/autocomplete", query_string={"tipo": tipo, "q": consulta}
+    )
+    assert response.status_code == 200
+    return [item["id"] for item in response.get_json()["resultados"]]
+
+
+def test_endpoint_busca_advogado_por_nome_cpf_e_oab(client, indice, advogado_teste):
+    """Teste o advogado encontrado pelo nome, dígitos do CPF e OAB."""
+    advogado_id = advogado_teste.id
+
+    assert _ids(client, "advogado", "dr. adv") == [advogado_id]
+    assert _ids(client, "advogado", "987.654") == [advogado_id]
+    assert _ids(client, "advogado", "98765432100") == [advogado_id]
+    assert _ids(client, "advogado", "sp1234") == [advogado_id]
+    assert _ids(client, "advogado", "555") == []
+
+
+def test_endpoint_recusa_tipo_e_limite_invalidos(client, indice):
+    """Teste os 400 para tipo desconhecido e limite menor que um."""
+    response = client.get("/api/autocomplete?tipo=usuario&q=a")
+    assert response.status_code == 400
+    assert response.get_json()["tipos_permitidos"] == [
+        "cliente",
+        "advogado",
+        "processo",
+    ]
+
+    response = client.get("/api/autocomplete?tipo=cliente&q=a&limite=0")
+    assert response.status_code == 400
+
+
+def test_commit_atualiza_e_remove_entradas(client, indice, advogado_teste):
+    """Teste o índice montado mantido por escritas via ORM e via Core."""
+    url = f"/api/advogados/{advogado_teste.id}"
+    assert _ids(client, "advogado", "dr. adv") == [advogado_teste.id]
+    construcoes = indice.metricas()["construcoes"]
+
+    # Inclusão pelo ORM entra no índice já montado
+    novo = Advogado(
+        nome="Beatriz Quintela",
+        cpf="111.444.777-35",
+        oab_numero="654321",
+        oab_estado="RJ",
+        email="beatriz@teste.com",
+    )
+    novo.save()
+    assert _ids(client, "advogado", "111444") == [novo.id]
+
+    # Atualização via Core (atualizar_versionado) substitui os termos
+    response = client.put(
+        url, json={"nome": "Renato Prado"}, headers={"If-Match": '"1"'}
+    )
+    assert response.status_code == 200
+    assert _ids(client, "advogado", "dr. adv") == []
+    assert _ids(client, "advogado", "prado") == [advogado_teste.id]
+
+    # Exclusão lógica pelo ORM remove o registro (inativos não são indexados)
+    assert client.delete(url).status_code == 200
+    assert _ids(client, "advogado", "renato") == []
+    # O índice foi mantido pelos commits, sem nova montagem
+    assert indice.metricas()["construcoes"] == construcoes
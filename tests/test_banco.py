@@ -0,0 +1,71 @@
+"""Teste os PRAGMAs do SQLite e as opções de engine de cada ambiente."""
+
+import pytest  # type: ignore # noqa: F401
+from sqlalchemy import create_engine, text
+
+from api import db
+from api.services.banco import (
+    aplicar_pragmas,
+    benchmark_leitura_escrita,
+    relatorio_engine,
+)
+from config import Config, DevelopmentConfig, ProductionConfig
+
+
+def _pragma(conexao, nome):
+    return conexao.execute(text(f"PRAGMA {nome}")).scalar()
+
+
+def test_pragmas_aplicados_em_cada_conexao(tmp_path):
+    """Teste WAL, foreign_keys e busy_timeout lidos de novas conexões."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'banco.db'}")
+    aplicar_pragmas(engine, Config.SQLITE_PRAGMAS)
+
+    for _ in range(2):
+        with engine.connect() as conexao:
+            assert _pragma(conexao, "journal_mode") == "wal"
+            assert _pragma(conexao, "foreign_keys") == 1
+            assert _pragma(conexao, "busy_timeout") == 5000
+        # Descarta a conexão do pool: a próxima é nova
+        engine.dispose()
+
+    relatorio = relatorio_engine(engine, ("journal_mode", "synchronous"))
+    assert relatorio["pragmas"] == {"journal_mode": "wal", "synchronous": 1}
+
+
+def test_engine_da_aplicacao_valida_chaves_estrangeiras(app):
+    """Teste os PRAGMAs no engine de testes (em memória, sem WAL)."""
+    with db.engine.connect() as conexao:
+        assert _pragma(conexao, "foreign_keys") == 1
+        assert _pragma(conexao, "journal_mode") == "memory"
+
+
+@pytest.mark.parametrize(
+    "configuracao, pool_size, max_overflow",
+    [(DevelopmentConfig, 5, 5), (ProductionConfig, 10, 20)],
+)
+def test_opcoes_de_engine_por_ambiente(tmp_path, configuracao, pool_size, max_overflow):
+    """Teste o pool de cada ambiente refletido no relatório do engine."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'banco.db'}", **configuracao.SQLALCHEMY_ENGINE_OPTIONS
+    )
+
+    relatorio = relatorio_engine(engine)
+
+    assert relatorio["pool"] == "QueuePool"
+    assert relatorio["pool_size"] == pool_size
+    assert relatorio["max_overflow"] == max_overflow
+    assert relatorio["pre_ping"] is True
+    assert relatorio["recycle"] == 1800
+    assert "pragmas" not in relatorio
+
+
+def test_benchmark_leitura_escrita_em_wal():
+    """Teste uma medição curta de leituras concorrentes com um escritor."""
+    resultado = benchmark_leitura_escrita(
+        Config.SQLITE_PRAGMAS, leitores=2, duracao=0.3, linhas_por_escrita=10
+    )
+
+    assert resultado["erros"] == 0
+    assert resultado["leituras"] > 0 and resultado["escritas"] > 0
+    assert resultado["leitura_p50_ms"] <= resultado["leitura_max_ms"]
@@ -0,0 +1,55 @@
+"""Teste o cache das respostas de detalhe e sua invalidação."""
+
+import pytest  # type: ignore # noqa: F401
+
+from api.routes import clientes
+from api.services.cache import cache_registros
+
+
+def test_detalhe_em_cache_e_invalidado_pela_atualizacao(client, cliente_teste):
+    """Teste o acerto do cache e o descarte da entrada após o PUT."""
+    url = f"/api/clientes/{cliente_teste.id}"
+    acertos = cache_registros.metricas()["acertos"]
+
+    assert client.get(url).get_json()["nome"] == "Cliente Teste"
+    assert client.get(url).get_json()["nome"] == "Cliente Teste"
+    assert cache_registros.metricas()["acertos"] == acertos + 1
+
+    response = client.put(
+        url, json={"nome": "Cliente Renomeado"}, headers={"If-Match": '"1"'}
+    )
+    assert response.status_code == 200
+
+    response = client.get(url)
+    assert response.get_json()["nome"] == "Cliente Renomeado"
+    assert response.headers["ETag"] == '"2"'
+
+
+def test_andamento_invalida_detalhe_do_processo(client, processo_teste):
+    """Teste que o andamento incluído aparece no detalhe já guardado em cache."""
+    url = f"/api/processos/{processo_teste.id}"
+    assert client.get(url).get_json()["andamentos"] == []
+
+    client.post(
+        f"{url}/andamentos", json={"tipo_andamento": "Despacho", "descricao": "x"}
+    )
+
+    (andamento,) = client.get(url).get_json()["andamentos"]
+    assert andamento["tipo_andamento"] == "Despacho"
+
+
+def test_cache_desabilitado_nao_consulta_impressao(
+    client, cliente_teste, monkeypatch
+):
+    """Teste que, sem cache, o detalhe não calcula a impressão do registro."""
+    monkeypatch.setattr(cache_registros, "habilitado", False)
+
+    def impressao_indevida(*args):
+        raise AssertionError("impressão consultada com o cache desabilitado")
+
+    monkeypatch.setattr(clientes, "impressao_responsavel", impressao_indevida)
+
+    response = client.get(f"/api/clientes/{cliente_teste.id}")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"1"'
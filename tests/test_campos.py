@@ -0,0 +1,36 @@
+"""Teste a seleção de campos (fields/include) nas respostas."""
+
+import pytest  # type: ignore # noqa: F401
+
+
+def test_listagem_retorna_apenas_campos_solicitados(client, processo_teste):
+    """Teste fields substituindo o padrão e include acrescentando o cliente."""
+    response = client.get(
+        "/api/processos/listagem?fields=id,numero_processo,status&include=cliente"
+    )
+
+    assert response.status_code == 200
+    (processo,) = response.get_json()["processos"]
+    assert set(processo) == {"id", "numero_processo", "status", "cliente"}
+    assert processo["cliente"]["nome"] == "Cliente Teste"
+
+
+def test_detalhe_com_objeto_aninhado(client, processo_teste):
+    """Teste o detalhe do processo restrito a poucos campos e ao advogado."""
+    response = client.get(
+        f"/api/processos/{processo_teste.id}?fields=id,titulo&include=advogado"
+    )
+
+    assert response.status_code == 200
+    assert set(response.get_json()) == {"id", "titulo", "advogado"}
+    assert response.get_json()["advogado"]["oab_completa"] == "OAB/SP 123456"
+
+
+def test_campo_fora_da_lista_permitida(client):
+    """Teste que campos desconhecidos são recusados com a lista permitida."""
+    response = client.get("/api/clientes/?fields=id,senha")
+
+    assert response.status_code == 400
+    data = response.get_json()
+    assert data["erro"] == "Campos inválidos: senha"
+    assert "nome" in data["campos_permitidos"]
@@ -0,0 +1,67 @@
+"""Teste o teste de carga contra a aplicação de testes."""
+
+import pytest  # type: ignore # noqa: F401
+
+from api.services.admissao import controle_admissao
+from api.services.carga import _resumo, executar_carga, interpretar_mix
+
+
+def test_carga_curta_resume_requisicoes_e_latencias(app):
+    """Teste o relatório de uma execução curta com leituras e escritas.
+
+    O banco de testes em memória tem uma única conexão: um cliente virtual
+    mantém as requisições em sequência.
+    """
+    taxa = controle_admissao.taxa
+    relatorio = executar_carga(
+        app,
+        threads=1,
+        duracao=0.5,
+        aquecimento=0.1,
+        pensamento_ms=0,
+        mix={"listagem": 2, "detalhe": 2, "andamento": 1},
+        processos=10,
+    )
+
+    assert relatorio["configuracao"]["processos"] == 10
+    total = relatorio["total"]
+    cenarios = relatorio["cenarios"]
+    assert set(cenarios) == {"listagem", "detalhe", "andamento"}
+    assert total["requisicoes"] == sum(c["requisicoes"] for c in cenarios.values())
+    assert total["requisicoes"] > 0
+    assert total["erros"] == 0 and total["taxa_erros"] == 0.0
+    assert set(total["status"]) <= {"200", "201"}
+    assert 0 < total["p50_ms"] <= total["p95_ms"] <= total["p99_ms"] <= total["max_ms"]
+    assert relatorio["servidor_escrita"]["transacoes"] > 0
+
+    # O limite de taxa por usuário é restaurado ao fim da execução
+    assert controle_admissao.taxa == taxa
+
+
+def test_resumo_conta_erros_e_falhas_de_conexao():
+    """Teste a contagem de erros 5xx, bloqueios e falhas de conexão."""
+    medicoes = [(10.0, 200, False)] * 7 + [
+        (50.0, 500, False),
+        (80.0, 503, True),
+        (30000.0, None, False),
+    ]
+
+    resumo = _resumo(medicoes, duracao=2.0)
+
+    assert resumo["requisicoes"] == 10 and resumo["por_segundo"] == 5.0
+    assert resumo["erros"] == 3 and resumo["taxa_erros"] == 0.3
+    assert resumo["erros_bloqueio"] == 1
+    assert resumo["p50_ms"] == 10.0 and resumo["p95_ms"] == 30000.0
+    assert resumo["status"] == {"200": 7, "500": 1, "503": 1, "falha_conexao": 1}
+
+
+def test_mix_invalido():
+    """Teste os erros de cenário desconhecido e de pesos inválidos."""
+    assert interpretar_mix("listagem=3, detalhe") == {"listagem": 3.0, "detalhe": 1.0}
+
+    with pytest.raises(ValueError, match="Cenário desconhecido: exportar"):
+        interpretar_mix("exportar=1")
+    with pytest.raises(ValueError, match="Peso negativo"):
+        interpretar_mix("listagem=-1")
+    with pytest.raises(ValueError, match="ao menos um cenário"):
+        interpretar_mix("listagem=0")
@@ -0,0 +1,58 @@
+"""Teste o middleware de compressão de respostas."""
+
+import gzip
+import json
+
+import pytest  # type: ignore # noqa: F401
+from flask import Flask, Response, request
+from werkzeug.test import Client
+
+from api.middleware import CompressaoMiddleware
+
+CORPO = json.dumps([{"id": i, "titulo": f"Processo {i}"} for i in range(200)])
+
+
+def _cliente():
+    """Crie cliente WSGI de uma aplicação mínima envolvida pelo middleware."""
+    app = Flask(__name__)
+
+    @app.route("/grande")
+    def grande():
+        return Response(
+            CORPO,
+            mimetype="application/json",
+            headers={"ETag": '"3"', "X-If-Match": request.headers.get("If-Match")},
+        )
+
+    @app.route("/pequeno")
+    def pequeno():
+        return Response('{"ok": true}', mimetype="application/json")
+
+    return Client(CompressaoMiddleware(app.wsgi_app, tamanho_minimo=1024))
+
+
+def test_comprime_com_etag_forte_por_codificacao():
+    """Teste corpo gzip, Vary e ETag forte distinta da representação original."""
+    response = _cliente().get("/grande", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.headers["ETag"] == '"3-gzip"'
+    assert gzip.decompress(response.get_data()).decode() == CORPO
+
+
+def test_if_match_recebe_etag_sem_sufixo_da_codificacao():
+    """Teste que a aplicação compara a ETag que ela mesma gerou."""
+    response = _cliente().get("/grande", headers={"If-Match": '"3-gzip", "4"'})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == '"3"'
+    assert response.headers["X-If-Match"] == '"3", "4"'
+
+
+def test_resposta_pequena_nao_e_comprimida():
+    """Teste que respostas abaixo do tamanho mínimo seguem sem compressão."""
+    response = _cliente().get("/pequeno", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.get_json() == {"ok": True}
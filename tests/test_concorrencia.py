@@ -0,0 +1,52 @@
+"""Teste controle de concorrência otimista nas atualizações (PUT)."""
+
+import pytest  # type: ignore # noqa: F401
+
+from api.services.concorrencia import versoes_if_match
+
+
+def test_versoes_if_match():
+    """Teste interpretação do cabeçalho If-Match."""
+    assert versoes_if_match(None) is None
+    assert versoes_if_match("*") is None
+    assert versoes_if_match('"3"') == [3]
+    assert versoes_if_match('"3", "4"') == [3, 4]
+    assert versoes_if_match('W/"3", "4"') == [4]
+
+    with pytest.raises(ValueError):
+        versoes_if_match('"abc"')
+
+
+def test_obter_processo_retorna_etag(client, processo_teste):
+    """Teste que o detalhe do processo expõe a versão como ETag."""
+    response = client.get(f"/api/processos/{processo_teste.id}")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"1"'
+    assert response.get_json()["versao"] == 1
+
+
+def test_atualizar_processo_sem_if_match(client, processo_teste):
+    """Teste que a atualização sem If-Match é recusada."""
+    response = client.put(
+        f"/api/processos/{processo_teste.id}", json={"titulo": "Título alterado"}
+    )
+
+    assert response.status_code == 428
+
+
+def test_atualizar_processo_versao_desatualizada(client, processo_teste):
+    """Teste que a segunda escrita com a mesma versão recebe 412."""
+    url = f"/api/processos/{processo_teste.id}"
+    headers = {"If-Match": '"1"'}
+
+    primeira = client.put(url, json={"titulo": "Primeira edição"}, headers=headers)
+    assert primeira.status_code == 200
+    assert primeira.headers["ETag"] == '"2"'
+
+    segunda = client.put(url, json={"titulo": "Segunda edição"}, headers=headers)
+    assert segunda.status_code == 412
+    assert segunda.get_json()["versao_atual"] == 2
+
+    response = client.get(url)
+    assert response.get_json()["titulo"] == "Primeira edição"
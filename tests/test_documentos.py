@@ -0,0 +1,70 @@
+"""Teste a normalização e a validação de CPF/CNPJ."""
+
+import pytest  # type: ignore # noqa: F401
+from sqlalchemy import select, update
+
+from api import db
+from api.models.cliente import Cliente
+from api.services.documentos import (
+    busca_por_documento,
+    documentos_validos,
+    normalizar_cpf,
+    normalizar_documento,
+    popular_colunas_documento,
+)
+from api.services.escrita import coordenador_escrita
+
+
+def _apagar_digitos():
+    """Simule registros gravados antes da coluna de dígitos existir."""
+    with coordenador_escrita.transacao() as session:
+        session.execute(update(Cliente).values(cpf_cnpj_digitos=None))
+
+
+def test_normaliza_formatacoes_do_mesmo_documento():
+    """Teste que formatações diferentes resultam nos mesmos dígitos."""
+    assert normalizar_documento("123.456.789-09") == "12345678909"
+    assert normalizar_documento(" 12345678909 ") == "12345678909"
+    assert normalizar_documento("11.222.333/0001-81") == "11222333000181"
+    assert normalizar_documento("123.456") is None
+    assert normalizar_cpf("11.222.333/0001-81") is None
+    assert busca_por_documento("123.456-")
+    assert not busca_por_documento("Maria 123")
+
+
+def test_valida_digitos_verificadores_em_lote():
+    """Teste CPFs e CNPJs válidos, dígitos incorretos e sequências repetidas."""
+    assert documentos_validos(
+        [
+            "12345678909",
+            "98765432100",
+            "11222333000181",
+            "12345678900",
+            "11222333000180",
+            "11111111111",
+            "00000000000000",
+            None,
+        ]
+    ) == [True, True, True, False, False, False, False, False]
+
+
+def test_busca_numerica_encontra_registro_sem_digitos(client, cliente_teste):
+    """Teste a busca pelo documento digitado quando a coluna de dígitos é nula."""
+    _apagar_digitos()
+
+    response = client.get("/api/clientes/?search=123.456")
+    assert [c["nome"] for c in response.get_json()["clientes"]] == ["Cliente Teste"]
+
+    response = client.get("/api/clientes/?search=999.888")
+    assert response.get_json()["clientes"] == []
+
+
+def test_colunas_de_digitos_nulas_sao_preenchidas(app, cliente_teste, advogado_teste):
+    """Teste o preenchimento dos dígitos de registros gravados sem eles."""
+    _apagar_digitos()
+
+    resumo = popular_colunas_documento()
+
+    assert resumo["clientes"]["preenchidos"] == 1
+    assert resumo["advogados"]["preenchidos"] == 0
+    assert db.session.scalar(select(Cliente.cpf_cnpj_digitos)) == "12345678900"
@@ -0,0 +1,71 @@
+"""Teste a coordenação de escritas e a resposta de banco ocupado."""
+
+import threading
+
+import pytest  # type: ignore # noqa: F401
+
+from api.models.cliente import Cliente
+from api.services.escrita import BancoOcupado, coordenador_escrita
+
+
+def _cliente(numero):
+    """Crie cliente ainda não gravado."""
+    return Cliente(nome=f"Cliente {numero}", cpf_cnpj=str(numero), tipo_pessoa="fisica")
+
+
+@pytest.fixture
+def fila_unica(app, monkeypatch):
+    """Ative o escritor único com prazo curto, descartando-o ao final."""
+    monkeypatch.setattr(coordenador_escrita, "fila_unica", True)
+    monkeypatch.setattr(coordenador_escrita, "prazo", 0.2)
+    monkeypatch.setattr(coordenador_escrita, "_escritor", None)
+    return coordenador_escrita
+
+
+def test_banco_ocupado_responde_503(client, auth_headers, monkeypatch):
+    """Teste que o bloqueio não obtido no prazo vira 503 com Retry-After."""
+
+    def ocupado(session):
+        raise BancoOcupado("Banco de dados ocupado: tente novamente")
+
+    monkeypatch.setattr(coordenador_escrita, "_iniciar_imediato", ocupado)
+    response = client.post(
+        "/api/clientes/",
+        json={"nome": "Novo", "cpf_cnpj": "12345678909", "tipo_pessoa": "fisica"},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert Cliente.query.count() == 0
+
+
+def test_escritor_unico_grava_insercoes(fila_unica):
+    """Teste a inserção gravada pelo escritor único e anexada à sessão."""
+    cliente = _cliente(1)
+    fila_unica.salvar(cliente)
+
+    assert cliente.id is not None
+    assert Cliente.query.filter_by(cpf_cnpj="1").one().id == cliente.id
+
+
+def test_escritor_parado_nao_bloqueia_a_requisicao(fila_unica, monkeypatch):
+    """Teste que sem escritor o item é cancelado e a espera termina no prazo."""
+    monkeypatch.setattr(fila_unica, "_executar_escritor", lambda: None)
+
+    with pytest.raises(BancoOcupado):
+        fila_unica.salvar(_cliente(2))
+
+
+def test_escritor_travado_nao_bloqueia_a_requisicao(fila_unica, monkeypatch):
+    """Teste que um lote travado em gravação também respeita o prazo."""
+    liberar = threading.Event()
+    monkeypatch.setattr(
+        fila_unica, "_gravar_lote", lambda session, lote: liberar.wait(5)
+    )
+
+    try:
+        with pytest.raises(BancoOcupado):
+            fila_unica.salvar(_cliente(3))
+    finally:
+        liberar.set()
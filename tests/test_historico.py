@@ -0,0 +1,66 @@
+"""Teste o histórico de alterações dos processos."""
+
+import pytest  # type: ignore # noqa: F401
+
+
+def test_atualizacao_registra_apenas_campos_alterados(
+    client, auth_headers, processo_teste
+):
+    """Teste as diferenças por campo, o autor e a ordem das entradas."""
+    url = f"/api/processos/{processo_teste.id}"
+    response = client.put(
+        url,
+        json={
+            "titulo": "Processo Alterado",
+            "area_juridica": "civil",
+            "valor_causa": "1500.00",
+        },
+        headers={**auth_headers, "If-Match": '"1"'},
+    )
+    assert response.status_code == 200
+
+    data = client.get(f"{url}/historico").get_json()
+
+    atualizacao, criacao = data["historico"]
+    assert atualizacao["operacao"] == "update"
+    assert atualizacao["alteracoes"] == {
+        "titulo": ["Processo de Teste", "Processo Alterado"],
+        "valor_causa": [None, 1500.0],
+    }
+    assert atualizacao["usuario_id"] is not None
+    assert criacao["operacao"] == "insert"
+    assert criacao["alteracoes"]["numero_processo"] == [
+        None,
+        "0000001-00.2024.8.26.0001",
+    ]
+    assert data["proximo"] is None
+
+
+def test_paginacao_por_chave(client, processo_teste):
+    """Teste a continuação da listagem a partir do parâmetro antes."""
+    url = f"/api/processos/{processo_teste.id}"
+    client.put(url, json={"titulo": "Segundo"}, headers={"If-Match": '"1"'})
+
+    primeira = client.get(f"{url}/historico?limite=1").get_json()
+    (entrada,) = primeira["historico"]
+    assert entrada["alteracoes"]["titulo"] == ["Processo de Teste", "Segundo"]
+    assert primeira["proximo"] == entrada["id"]
+
+    segunda = client.get(
+        f"{url}/historico?limite=1&antes={primeira['proximo']}"
+    ).get_json()
+    assert segunda["historico"][0]["operacao"] == "insert"
+    assert segunda["proximo"] is None
+
+
+def test_historico_de_processo_inexistente_e_parametros_invalidos(
+    client, processo_teste
+):
+    """Teste o 404 para processo inexistente e o 400 para parâmetros inválidos."""
+    url = f"/api/processos/{processo_teste.id}/historico"
+
+    assert client.get("/api/processos/9999/historico").status_code == 404
+    assert client.get(f"{url}?limite=0").status_code == 400
+    response = client.get(f"{url}?antes=abc")
+    assert response.status_code == 400
+    assert response.get_json()["erro"] == "Parâmetro antes inválido"
@@ -0,0 +1,60 @@
+"""Teste as requisições POST repetíveis com o cabeçalho Idempotency-Key."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest  # type: ignore # noqa: F401
+
+from api.models.idempotencia import ChaveIdempotencia
+from api.services.idempotencia import controle_idempotencia, impressao_requisicao
+
+CLIENTE = {"nome": "Maria", "cpf_cnpj": "123.456.789-09", "tipo_pessoa": "fisica"}
+
+
+def test_repeticao_reproduz_resposta_original(client):
+    """Teste que a repetição recebe a resposta gravada sem criar outro cliente."""
+    headers = {"Idempotency-Key": "cliente-maria"}
+    original = client.post("/api/clientes/", json=CLIENTE, headers=headers)
+    repeticao = client.post("/api/clientes/", json=CLIENTE, headers=headers)
+
+    assert original.status_code == 201
+    assert repeticao.status_code == 201
+    assert repeticao.headers["Idempotent-Replayed"] == "true"
+    assert repeticao.get_json() == original.get_json()
+    assert client.get("/api/clientes/").get_json()["pagination"]["total"] == 1
+
+
+def test_chave_reutilizada_com_outro_corpo(client):
+    """Teste que a mesma chave com outra requisição é recusada com 422."""
+    headers = {"Idempotency-Key": "cliente-maria"}
+    client.post("/api/clientes/", json=CLIENTE, headers=headers)
+
+    response = client.post(
+        "/api/clientes/", json={**CLIENTE, "nome": "Joana"}, headers=headers
+    )
+
+    assert response.status_code == 422
+    assert "Idempotency-Key" in response.get_json()["erro"]
+
+
+def test_chave_em_andamento(client, monkeypatch):
+    """Teste que a repetição da requisição ainda em andamento recebe 409."""
+    monkeypatch.setattr(controle_idempotencia, "espera", 0.05)
+    corpo = json.dumps(CLIENTE)
+    ChaveIdempotencia(
+        escopo="ip:127.0.0.1",
+        chave="cliente-maria",
+        endpoint="clientes.criar_cliente",
+        impressao=impressao_requisicao("POST", "/api/clientes/", corpo.encode()),
+        expira_em=datetime.utcnow() + timedelta(minutes=1),
+    ).save()
+
+    response = client.post(
+        "/api/clientes/",
+        data=corpo,
+        content_type="application/json",
+        headers={"Idempotency-Key": "cliente-maria"},
+    )
+
+    assert response.status_code == 409
+    assert response.headers["Retry-After"] == "1"
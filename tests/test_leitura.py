@@ -0,0 +1,56 @@
+"""Teste o roteamento das consultas de leitura para a réplica."""
+
+import pytest  # type: ignore # noqa: F401
+from flask import Response
+from sqlalchemy import create_engine, select, update
+
+from api.models.cliente import Cliente
+from api.sessao import BIND_LEITURA, COOKIE_ADERENCIA, leitura, roteador_leitura
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """Forneça um engine de réplica disponível e restaure o estado do roteador."""
+    monkeypatch.setattr(roteador_leitura, "_disponivel", True)
+    monkeypatch.setattr(roteador_leitura, "_verificar_em", 0.0)
+    monkeypatch.setattr(roteador_leitura, "_escritas_recentes", {})
+    return {BIND_LEITURA: create_engine("sqlite://")}
+
+
+def test_apenas_selects_em_modo_leitura_usam_a_replica(replica):
+    """Teste SELECT na réplica e escritas, bloqueios e modo normal no principal."""
+    consulta = select(Cliente.id)
+    engine_para = roteador_leitura.engine_para
+    assert engine_para(replica, consulta) is None
+
+    with leitura():
+        assert engine_para(replica, consulta) is replica[BIND_LEITURA]
+        assert engine_para(replica, consulta.with_for_update()) is None
+        assert engine_para(replica, update(Cliente)) is None
+
+
+def test_escrita_mantem_o_autor_no_principal(app, replica):
+    """Teste a aderência ao banco principal após uma escrita bem-sucedida."""
+    with app.test_request_context("/api/clientes/", method="POST"):
+        response = roteador_leitura._registrar_escrita(Response(status=201))
+    assert COOKIE_ADERENCIA in response.headers["Set-Cookie"]
+
+    with app.test_request_context("/api/clientes/"), leitura():
+        assert roteador_leitura.engine_para(replica, select(Cliente.id)) is None
+
+    # Outro usuário (sem token, identificado pelo IP) continua na réplica
+    outro = {"REMOTE_ADDR": "10.0.0.2"}
+    with app.test_request_context("/api/clientes/", environ_base=outro), leitura():
+        assert roteador_leitura.engine_para(replica, select(Cliente.id)) is not None
+
+
+def test_replica_indisponivel_usa_o_principal(replica):
+    """Teste que a réplica sem conexão é substituída pelo banco principal."""
+    indisponivel = {BIND_LEITURA: create_engine("sqlite:////caminho/inexistente/db")}
+    antes = roteador_leitura.metricas()["indisponivel"]
+
+    with leitura():
+        assert roteador_leitura.engine_para(indisponivel, select(Cliente.id)) is None
+
+    assert roteador_leitura.metricas()["indisponivel"] == antes + 1
+    assert roteador_leitura.metricas()["replica_disponivel"] is False
@@ -0,0 +1,40 @@
+"""Teste a busca em lote por IDs (parâmetro ids) nas listagens."""
+
+import pytest  # type: ignore # noqa: F401
+
+from api.models.cliente import Cliente
+
+
+def test_lote_mantem_a_ordem_e_lista_ausentes(client, cliente_teste):
+    """Teste a ordem solicitada, IDs repetidos e IDs inexistentes."""
+    segundo = Cliente(nome="Segundo", cpf_cnpj="123.456.789-09", tipo_pessoa="fisica")
+    segundo.save()
+
+    response = client.get(f"/api/clientes/?ids={segundo.id},99,{cliente_teste.id},99")
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [c["nome"] for c in data["clientes"]] == ["Segundo", "Cliente Teste"]
+    assert data["nao_encontrados"] == [99]
+
+
+def test_lote_de_processos_com_campos(client, processo_teste):
+    """Teste que o lote de processos aceita fields/include como a listagem."""
+    response = client.get(
+        f"/api/processos/listagem?ids={processo_teste.id}&fields=id&include=cliente"
+    )
+
+    (processo,) = response.get_json()["processos"]
+    assert set(processo) == {"id", "cliente"}
+
+
+def test_lote_acima_do_limite_e_ids_invalidos(app, client):
+    """Teste os 400 para IDs além de LOTE_IDS_MAXIMO e valores não numéricos."""
+    limite = app.config["LOTE_IDS_MAXIMO"]
+    ids = ",".join(str(i) for i in range(1, limite + 2))
+
+    response = client.get(f"/api/processos/listagem?ids={ids}")
+    assert response.status_code == 400
+    assert response.get_json()["erro"] == f"Máximo de {limite} IDs por requisição"
+
+    assert client.get("/api/advogados/?ids=1,abc").status_code == 400
@@ -0,0 +1,91 @@
+"""Teste o diagnóstico de memória (tracemalloc) pelas rotas administrativas."""
+
+import tracemalloc
+
+import pytest  # type: ignore # noqa: F401
+
+from api.services.memoria import diagnostico_memoria
+
+URL = "/api/admin/memoria"
+
+
+@pytest.fixture
+def memoria(app):
+    """Encerre o rastreamento e descarte os snapshots ao fim do teste."""
+    yield diagnostico_memoria
+    tracemalloc.stop()
+    diagnostico_memoria.descartar()
+
+
+def test_rotas_de_memoria_restritas_a_administradores(client, usuario_headers, memoria):
+    """Teste o 401 sem token e o 403 para usuários comuns."""
+    assert client.get(URL).status_code == 401
+    for metodo, caminho in (
+        ("get", URL),
+        ("post", f"{URL}/iniciar"),
+        ("post", f"{URL}/snapshots"),
+        ("get", f"{URL}/comparar?antigo=1&novo=2"),
+    ):
+        response = getattr(client, metodo)(caminho, headers=usuario_headers)
+        assert response.status_code == 403
+    assert not tracemalloc.is_tracing()
+
+
+def test_snapshots_e_comparacao(client, auth_headers, memoria):
+    """Teste iniciar, guardar snapshots, comparar, descartar e parar."""
+    response = client.post(f"{URL}/snapshots", headers=auth_headers)
+    assert response.status_code == 409
+
+    response = client.post(f"{URL}/iniciar", json={"quadros": 0}, headers=auth_headers)
+    assert response.status_code == 400
+    response = client.post(f"{URL}/iniciar", json={"quadros": 5}, headers=auth_headers)
+    assert response.get_json()["rastreando"] is True
+    assert response.get_json()["quadros"] == 5
+
+    antigo = client.post(
+        f"{URL}/snapshots", json={"nome": "antes"}, headers=auth_headers
+    ).get_json()
+    retidos = [bytearray(4096) for _ in range(256)]  # noqa: F841
+    novo = client.post(
+        f"{URL}/snapshots", json={"nome": "depois"}, headers=auth_headers
+    ).get_json()
+
+    comparar = f"{URL}/comparar?antigo={antigo['id']}&novo={novo['id']}"
+    response = client.get(comparar, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.get_json()["diferenca_total_kib"] >= 1024
+    assert response.get_json()["diferencas"][0]["arquivo"] == __file__
+
+    response = client.get(f"{comparar}&agrupar=modulo", headers=auth_headers)
+    assert response.status_code == 400
+    response = client.get(f"{URL}/comparar?antigo={antigo['id']}", headers=auth_headers)
+    assert response.status_code == 400
+
+    snapshot = f"{URL}/snapshots/{antigo['id']}"
+    assert client.delete(snapshot, headers=auth_headers).status_code == 200
+    assert client.delete(snapshot, headers=auth_headers).status_code == 404
+    assert client.get(comparar, headers=auth_headers).status_code == 404
+
+    # Parar mantém os snapshots já guardados
+    estado = client.post(f"{URL}/parar", headers=auth_headers).get_json()
+    assert estado["rastreando"] is False
+    assert [s["nome"] for s in estado["snapshots"]] == ["depois"]
+
+
+def test_pico_por_requisicao_amostrada(client, auth_headers, memoria, monkeypatch):
+    """Teste a medição de pico das requisições amostradas, por endpoint."""
+    monkeypatch.setattr(memoria, "amostragem", 1.0)
+    client.post(f"{URL}/iniciar", headers=auth_headers)
+
+    client.get("/api/clientes/?per_page=5")
+
+    response = client.get(f"{URL}/requisicoes", headers=auth_headers)
+    assert response.status_code == 200
+    medicoes = response.get_json()
+    assert medicoes["recentes"][0]["caminho"] == "/api/clientes/?per_page=5"
+    assert "clientes.listar_clientes" in {
+        item["endpoint"] for item in medicoes["por_endpoint"]
+    }
+
+    response = client.get(f"{URL}/orm", headers=auth_headers)
+    assert "Cliente" in response.get_json()["objetos_por_modelo"]
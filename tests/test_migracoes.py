@@ -0,0 +1,124 @@
+"""Teste as migrações do esquema (Alembic) e a verificação na inicialização."""
+
+from datetime import datetime
+
+import pytest  # type: ignore # noqa: F401
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+from api import db, migrate
+from api.services.banco import aplicar_pragmas
+from api.services.esquema import REVISAO_INICIAL, preparar_esquema, revisoes
+from config import Config
+
+
+@pytest.fixture
+def banco(app, tmp_path):
+    """Forneça um banco em arquivo vazio, com os PRAGMAs da aplicação."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migracoes.db'}")
+    aplicar_pragmas(engine, Config.SQLITE_PRAGMAS)
+    yield engine
+    engine.dispose()
+
+
+def _migrar(engine, comando, revisao):
+    """Execute um comando do Alembic (upgrade/downgrade) no banco informado."""
+    configuracao = migrate.get_config()
+    # Mantém a configuração de logging da sessão de testes
+    configuracao.config_file_name = None
+    # Sem transação aberta: o Alembic confirma as migrações antes de o env.py
+    # restaurar o PRAGMA foreign_keys (ignorado dentro de uma transação)
+    with engine.connect() as conexao:
+        configuracao.attributes["connection"] = conexao
+        comando(configuracao, revisao)
+
+
+def test_migracoes_reproduzem_os_modelos(banco):
+    """Teste que o banco migrado até a última revisão coincide com os modelos."""
+    _migrar(banco, command.upgrade, "head")
+
+    with banco.connect() as conexao:
+        contexto = MigrationContext.configure(conexao, opts={"compare_type": True})
+        assert compare_metadata(contexto, db.metadatas[None]) == []
+        atual, recente = revisoes(conexao)
+    assert atual == recente
+
+
+def test_migracoes_preservam_registros_existentes(banco):
+    """Teste versão, movimentação e dígitos de registros do esquema inicial."""
+    _migrar(banco, command.upgrade, REVISAO_INICIAL)
+    agora = datetime(2024, 1, 10, 12, 0)
+    with banco.begin() as conexao:
+        conexao.execute(
+            text(
+                "INSERT INTO clientes (id, nome, cpf_cnpj, tipo_pessoa, ativo, "
+                "created_at, updated_at) "
+                "VALUES (1, 'Cliente', '123.456.789-09', 'fisica', 1, :c, :c)"
+            ),
+            {"c": agora},
+        )
+        conexao.execute(
+            text(
+                "INSERT INTO processos (id, numero_processo, cliente_id, "
+                "created_at, updated_at) VALUES (1, '1', 1, :c, :c), "
+                "(2, '2', 1, :c, :c)"
+            ),
+            {"c": agora},
+        )
+        conexao.execute(
+            text(
+                "INSERT INTO andamentos (processo_id, data_andamento, "
+                "created_at, updated_at) VALUES (1, :d, :c, :c)"
+            ),
+            {"d": datetime(2024, 3, 5, 9, 0), "c": agora},
+        )
+
+    _migrar(banco, command.upgrade, "head")
+
+    with banco.connect() as conexao:
+        processos = conexao.execute(
+            text(
+                "SELECT id, versao, ultima_movimentacao_em FROM processos "
+                "ORDER BY id"
+            )
+        ).all()
+        cliente = conexao.execute(
+            text("SELECT versao, cpf_cnpj_digitos FROM clientes")
+        ).one()
+        andamentos = conexao.execute(
+            text("SELECT count(*) FROM andamentos WHERE anexo_id IS NULL")
+        ).scalar()
+
+    assert [(p.id, p.versao) for p in processos] == [(1, 1), (2, 1)]
+    assert processos[0].ultima_movimentacao_em.startswith("2024-03-05 09:00")
+    assert processos[1].ultima_movimentacao_em.startswith("2024-01-10 12:00")
+    # Os dígitos são preenchidos por flask init-db após as migrações
+    assert tuple(cliente) == (1, None)
+    assert andamentos == 1
+
+
+def test_downgrade_remove_todas_as_tabelas(banco):
+    """Teste que as migrações podem ser desfeitas até o banco vazio."""
+    _migrar(banco, command.upgrade, "head")
+    _migrar(banco, command.downgrade, "base")
+
+    assert inspect(banco).get_table_names() == ["alembic_version"]
+
+
+def test_inicializacao_marca_revisao_e_avisa_pendencias(app, caplog):
+    """Teste a revisão do banco criado na inicialização e o aviso de pendências."""
+    with db.engine.connect() as conexao:
+        atual, recente = revisoes(conexao)
+    assert atual == recente
+
+    _migrar(db.engine, command.stamp, REVISAO_INICIAL)
+    try:
+        assert preparar_esquema(app) is False
+        assert "flask init-db" in caplog.text
+    finally:
+        _migrar(db.engine, command.stamp, "head")
+
+    with db.engine.connect() as conexao:
+        assert conexao.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
@@ -0,0 +1,128 @@
+"""Teste a busca de processos parados e o preenchimento da última movimentação."""
+
+from datetime import datetime, timedelta
+
+import pytest  # type: ignore # noqa: F401
+from sqlalchemy import select, update
+
+from api import db
+from api.models.processo import Andamento, Processo
+from api.services.movimentacao import popular_ultima_movimentacao
+
+
+def _processo(titulo, cliente, advogado, **campos):
+    """Crie um processo de teste com os campos informados."""
+    processo = Processo(
+        numero_processo=f"PARADO-{titulo}",
+        titulo=titulo,
+        area_juridica="civil",
+        cliente_id=cliente.id,
+        advogado_id=advogado.id,
+        **campos,
+    )
+    processo.save()
+    return processo
+
+
+@pytest.fixture
+def processos_parados(cliente_teste, advogado_teste):
+    """Crie processos com a última movimentação há 200, 120, 10 e 300 dias."""
+    agora = datetime.utcnow()
+    for titulo, dias, status in (
+        ("medio", 120, "em_andamento"),
+        ("antigo", 200, "em_andamento"),
+        ("recente", 10, "em_andamento"),
+        ("suspenso", 300, "suspenso"),
+    ):
+        _processo(
+            titulo,
+            cliente_teste,
+            advogado_teste,
+            status=status,
+            ultima_movimentacao_em=agora - timedelta(days=dias),
+        )
+
+
+def _titulos(client, parametros=""):
+    """Liste os títulos retornados por /parados e a resposta completa."""
+    response = client.get(f"/api/processos/parados{parametros}")
+    assert response.status_code == 200
+    data = response.get_json()
+    return [p["titulo"] for p in data["processos"]], data
+
+
+def test_parados_pelo_limite_de_dias_e_status(client, processos_parados):
+    """Teste o limite de dias, a ordem (mais antigos primeiro) e os status."""
+    titulos, data = _titulos(client)
+    assert titulos == ["antigo", "medio"]
+    assert [p["dias_parado"] for p in data["processos"]] == [200, 120]
+
+    assert _titulos(client, "?dias=150")[0] == ["antigo"]
+    assert _titulos(client, "?status=em_andamento,suspenso")[0] == [
+        "suspenso",
+        "antigo",
+        "medio",
+    ]
+
+
+def test_parados_paginacao_e_dias_invalidos(client, processos_parados):
+    """Teste a segunda página com o total e o 400 para dias menor que um."""
+    titulos, data = _titulos(client, "?per_page=1&page=2")
+
+    assert titulos == ["medio"]
+    assert data["pagination"] == {
+        "page": 2,
+        "per_page": 1,
+        "total": 2,
+        "pages": 2,
+        "has_next": False,
+        "has_prev": True,
+    }
+
+    response = client.get("/api/processos/parados?dias=0")
+    assert response.status_code == 400
+    assert response.get_json()["erro"] == "Dias deve ser um inteiro positivo"
+
+
+def test_dashboard_processos_parados(client, processos_parados):
+    """Teste o total e os mais antigos no widget do dashboard."""
+    response = client.get("/api/dashboard/processos-parados?dias=100&limite=1")
+
+    assert response.status_code == 200
+    parados = response.get_json()["processos_parados"]
+    assert parados["dias"] == 100
+    assert parados["total"] == 2
+    assert [p["titulo"] for p in parados["processos"]] == ["antigo"]
+
+
+def test_backfill_recalcula_pelos_andamentos(app, cliente_teste, advogado_teste):
+    """Teste o preenchimento em lotes pelo último andamento ou pela criação."""
+    agora = datetime.utcnow().replace(microsecond=0)
+    criado_em = agora - timedelta(days=60)
+    com_andamentos = _processo("com", cliente_teste, advogado_teste)
+    sem_andamentos = _processo(
+        "sem", cliente_teste, advogado_teste, created_at=criado_em
+    )
+    for dias in (30, 5):
+        Andamento(
+            processo_id=com_andamentos.id,
+            tipo_andamento="Despacho",
+            descricao=f"Há {dias} dias",
+            data_andamento=agora - timedelta(days=dias),
+        ).save()
+
+    # Simula processos anteriores à coluna (sem movimentação preenchida)
+    db.session.execute(update(Processo).values(ultima_movimentacao_em=None))
+    db.session.commit()
+
+    assert popular_ultima_movimentacao(tamanho_lote=1) == 2
+
+    movimentacoes = dict(
+        db.session.execute(select(Processo.id, Processo.ultima_movimentacao_em))
+        .tuples()
+        .all()
+    )
+    assert movimentacoes == {
+        com_andamentos.id: agora - timedelta(days=5),
+        sem_andamentos.id: criado_em,
+    }
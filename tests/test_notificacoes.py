@@ -0,0 +1,77 @@
+"""Teste o stream (SSE) de alterações de processos e andamentos."""
+
+import json
+
+import pytest  # type: ignore # noqa: F401
+
+from api.services.notificacoes import canal_eventos
+
+
+def _evento(bloco):
+    """Converta um bloco text/event-stream em (tipo, dados)."""
+    campos = dict(
+        linha.split(": ", 1) for linha in bloco.decode().strip().splitlines()
+    )
+    return campos["event"], json.loads(campos["data"])
+
+
+def test_stream_recebe_andamento_do_processo(client, processo_teste):
+    """Teste que o andamento confirmado chega ao stream filtrado pelo processo."""
+    response = client.get(
+        f"/api/processos/stream?processo_id={processo_teste.id}", buffered=False
+    )
+    assert response.mimetype == "text/event-stream"
+
+    client.post(
+        f"/api/processos/{processo_teste.id}/andamentos",
+        json={"tipo_andamento": "Despacho", "descricao": "Conclusos"},
+    )
+
+    blocos = iter(response.response)
+    assert next(blocos).startswith(b"retry: ")
+    tipo, dados = _evento(next(blocos))
+    response.close()
+
+    assert tipo == "andamento"
+    assert dados["operacao"] == "insert"
+    assert dados["processo_id"] == processo_teste.id
+    assert dados["cliente_id"] == processo_teste.cliente_id
+    assert canal_eventos.conexoes == 0
+
+
+def test_filtro_e_retomada_pelo_ultimo_evento(client, processo_teste):
+    """Teste o filtro por cliente e o reenvio a partir do Last-Event-ID."""
+    outro_cliente = canal_eventos.assinar(
+        {"cliente_id": processo_teste.cliente_id + 1}
+    )
+    client.put(
+        f"/api/processos/{processo_teste.id}",
+        json={"titulo": "Alterado"},
+        headers={"If-Match": '"1"'},
+    )
+    assert outro_cliente.fila.empty()
+    canal_eventos.cancelar(outro_cliente)
+
+    retomada = canal_eventos.assinar(
+        {"processo_id": processo_teste.id}, f"{canal_eventos.epoca}-0"
+    )
+    eventos = []
+    while not retomada.fila.empty():
+        eventos.append(retomada.fila.get_nowait())
+    canal_eventos.cancelar(retomada)
+    assert eventos[-1]["tipo"] == "processo"
+    assert eventos[-1]["dados"]["operacao"] == "update"
+
+    desconhecida = canal_eventos.assinar({}, "outra-epoca-7")
+    assert desconhecida.fila.get_nowait()["tipo"] == "reset"
+    canal_eventos.cancelar(desconhecida)
+
+
+def test_limite_de_conexoes(client, monkeypatch):
+    """Teste que o stream além do limite do worker recebe 503."""
+    monkeypatch.setattr(canal_eventos, "max_conexoes", 0)
+
+    response = client.get("/api/processos/stream")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
@@ -0,0 +1,77 @@
+"""Teste o perfilamento de requisições e as rotas administrativas de perfis."""
+
+import pstats
+
+import pytest  # type: ignore # noqa: F401
+
+from api.services.perfilamento import perfilador
+
+
+@pytest.fixture
+def diretorio(app, tmp_path, monkeypatch):
+    """Grave os perfis em um diretório temporário."""
+    monkeypatch.setitem(app.config, "PERFIL_DIRETORIO", str(tmp_path))
+    return tmp_path
+
+
+def test_perfilamento_desativado_por_padrao(client, usuario_headers, diretorio):
+    """Teste que sem amostragem, e sem token de admin, nada é perfilado."""
+    assert perfilador.amostragem == 0
+
+    response = client.get("/api/clientes/")
+    assert "X-Perfil-Id" not in response.headers
+
+    response = client.get("/api/clientes/?__profile=1", headers=usuario_headers)
+    assert "X-Perfil-Id" not in response.headers
+    assert list(diretorio.iterdir()) == []
+
+
+def test_requisicao_amostrada_grava_perfil(
+    client, auth_headers, diretorio, monkeypatch
+):
+    """Teste o perfil gravado pela amostragem e a listagem dos metadados."""
+    monkeypatch.setattr(perfilador, "amostragem", 1.0)
+    response = client.get("/api/clientes/?page=1")
+    monkeypatch.setattr(perfilador, "amostragem", 0.0)
+
+    perfil_id = response.headers["X-Perfil-Id"]
+    assert {p.name for p in diretorio.iterdir()} == {
+        f"{perfil_id}.prof",
+        f"{perfil_id}.json",
+    }
+
+    response = client.get("/api/admin/perfis", headers=auth_headers)
+    assert response.status_code == 200
+    (perfil,) = response.get_json()["perfis"]
+    assert perfil["id"] == perfil_id
+    assert perfil["motivo"] == "amostragem"
+    assert perfil["endpoint"] == "clientes.listar_clientes"
+    assert perfil["argumentos"] == {"page": ["1"]}
+    assert perfil["status"] == 200
+
+
+def test_download_em_pstats_e_speedscope(client, auth_headers, diretorio, tmp_path):
+    """Teste o perfil solicitado pelo admin e os formatos de download."""
+    response = client.get("/api/clientes/?__profile=1", headers=auth_headers)
+    url = f"/api/admin/perfis/{response.headers['X-Perfil-Id']}"
+
+    response = client.get(url, headers=auth_headers)
+    assert response.status_code == 200
+    (tmp_path / "baixados").mkdir()
+    arquivo = tmp_path / "baixados" / "perfil.prof"
+    arquivo.write_bytes(response.data)
+    assert pstats.Stats(str(arquivo)).total_calls > 0
+
+    response = client.get(f"{url}?formato=speedscope", headers=auth_headers)
+    assert response.status_code == 200
+    assert "speedscope.json" in response.headers["Content-Disposition"]
+    (perfil,) = response.get_json()["profiles"]
+    assert perfil["type"] == "sampled"
+    assert len(perfil["samples"]) == len(perfil["weights"]) > 0
+
+    response = client.get(f"{url}?formato=csv", headers=auth_headers)
+    assert response.status_code == 400
+    response = client.get(
+        "/api/admin/perfis/20240101T000000000000-00000000", headers=auth_headers
+    )
+    assert response.status_code == 404
@@ -0,0 +1,57 @@
+"""Teste a contagem de prazos pelo calendário forense."""
+
+from datetime import date
+
+import pytest  # type: ignore # noqa: F401
+
+from api.services.prazos import Calendario, feriados_nacionais
+
+
+def _ordinais(*periodos):
+    """Converta períodos (início, fim) em ordinais de dias."""
+    return {
+        ordinal
+        for inicio, fim in periodos
+        for ordinal in range(inicio.toordinal(), fim.toordinal() + 1)
+    }
+
+
+def test_dias_uteis_excluem_inicio_e_fins_de_semana():
+    """Teste prazo em dias úteis iniciado na segunda e na sexta-feira."""
+    calendario = Calendario()
+
+    assert calendario.vencimento(date(2026, 3, 2), 5) == date(2026, 3, 9)
+    assert calendario.vencimento(date(2026, 3, 6), 1) == date(2026, 3, 9)
+
+
+def test_feriado_e_prorrogacao_de_dias_corridos():
+    """Teste feriado na contagem e vencimento corrido em dia sem expediente."""
+    tiradentes = date(2026, 4, 21)
+    calendario = Calendario(_ordinais((tiradentes, tiradentes)))
+
+    assert calendario.vencimento(date(2026, 4, 20), 1) == date(2026, 4, 22)
+    assert calendario.vencimento(date(2026, 4, 17), 4, "corridos") == date(
+        2026, 4, 22
+    )
+    assert calendario.vencimento(date(2026, 3, 2), 3, "corridos") == date(2026, 3, 5)
+
+
+def test_suspensao_interrompe_contagem_corrida():
+    """Teste recesso forense nas contagens em dias úteis e corridos."""
+    recesso = _ordinais((date(2026, 12, 20), date(2027, 1, 20)))
+    calendario = Calendario(suspensoes=recesso)
+
+    assert calendario.vencimentos(
+        [(date(2026, 12, 18), 2, "uteis"), (date(2026, 12, 18), 2, "corridos")]
+    ) == [date(2027, 1, 22), date(2027, 1, 21)]
+
+
+def test_feriados_nacionais_moveis():
+    """Teste datas móveis calculadas a partir da Páscoa."""
+    feriados = {
+        descricao: inicio for inicio, _, descricao, _ in feriados_nacionais(2026)
+    }
+
+    assert feriados["Sexta-feira Santa"] == date(2026, 4, 3)
+    assert feriados["Corpus Christi"] == date(2026, 6, 4)
+    assert feriados["Recesso forense"] == date(2026, 12, 20)
@@ -0,0 +1,58 @@
+"""Teste a tradução de violações de restrições do banco em respostas da API."""
+
+import pytest  # type: ignore # noqa: F401
+
+
+def test_cpf_duplicado_com_outra_formatacao(client):
+    """Teste que o mesmo CPF, com formatação diferente, é recusado com 409."""
+    dados = {"nome": "Maria", "cpf_cnpj": "123.456.789-09", "tipo_pessoa": "fisica"}
+    assert client.post("/api/clientes/", json=dados).status_code == 201
+
+    response = client.post(
+        "/api/clientes/", json={**dados, "nome": "Outra", "cpf_cnpj": "12345678909"}
+    )
+
+    assert response.status_code == 409
+    assert response.get_json()["erro"] == "CPF/CNPJ já cadastrado"
+
+
+def test_processo_com_cliente_inexistente(client, advogado_teste):
+    """Teste que a chave estrangeira inválida resulta em 404 sem gravar o processo."""
+    response = client.post(
+        "/api/processos/criar_processo",
+        json={
+            "numeroProcesso": "0000002-00.2024.8.26.0001",
+            "titulo": "Sem cliente",
+            "areaJuridica": "civil",
+            "cliente": 999,
+            "advogado": advogado_teste.id,
+        },
+    )
+
+    assert response.status_code == 404
+    assert response.get_json()["erro"] == "Cliente não encontrado"
+    assert client.get("/api/processos/listagem").get_json()["processos"] == []
+
+
+def test_atualizacao_com_email_de_outro_advogado(client, advogado_teste):
+    """Teste que o UPDATE condicionado à versão também tem a violação traduzida."""
+    outro = client.post(
+        "/api/advogados/",
+        json={
+            "nome": "Dra. Outra",
+            "cpf": "123.456.789-09",
+            "oab_numero": "654321",
+            "oab_estado": "SP",
+            "email": "outra@teste.com",
+        },
+    )
+    assert outro.status_code == 201
+
+    response = client.put(
+        f"/api/advogados/{outro.get_json()['advogado']['id']}",
+        json={"email": advogado_teste.email},
+        headers={"If-Match": '"1"'},
+    )
+
+    assert response.status_code == 409
+    assert response.get_json()["erro"] == "Email já cadastrado"
@@ -0,0 +1,37 @@
+"""Teste a sincronização incremental (delta-sync) com tombstones."""
+
+import pytest  # type: ignore # noqa: F401
+
+
+def test_sincroniza_criacoes_e_remocoes(client, auth_headers, cliente_teste):
+    """Teste criação em ``atualizados`` e exclusão lógica em ``removidos``."""
+    response = client.get("/api/sync?since=0")
+
+    assert response.status_code == 200
+    data = response.get_json()
+    clientes = data["alteracoes"]["clientes"]
+    assert [c["id"] for c in clientes["atualizados"]] == [cliente_teste.id]
+    assert data["tem_mais"] is False
+
+    response = client.delete(f"/api/clientes/{cliente_teste.id}", headers=auth_headers)
+    assert response.status_code == 200
+
+    response = client.get(f"/api/sync?since={data['token']}")
+    clientes = response.get_json()["alteracoes"]["clientes"]
+    assert clientes == {"atualizados": [], "removidos": [cliente_teste.id]}
+
+
+def test_lotes_limitados_continuam_pelo_token(client, cliente_teste, advogado_teste):
+    """Teste ``tem_mais`` e a continuação a partir do token do lote."""
+    primeiro = client.get("/api/sync?since=0&limite=1").get_json()
+    assert primeiro["tem_mais"] is True
+
+    segundo = client.get(f"/api/sync?since={primeiro['token']}&limite=1").get_json()
+    assert segundo["tem_mais"] is False
+    assert int(segundo["token"]) > int(primeiro["token"])
+
+
+def test_token_invalido(client):
+    """Teste que tokens não numéricos ou negativos são recusados."""
+    assert client.get("/api/sync?since=abc").status_code == 400
+    assert client.get("/api/sync?since=-1").status_code == 400